@@ -0,0 +1,3 @@
+"""
+Support modules for the Architect PDF generators (generate_intro_pdf.py).
+"""
@@ -0,0 +1,204 @@
+"""
+Appendix merging: existing PDFs grafted after the generated document.
+
+Customer specs, earlier PRD/LLD renders and signed quotes are appended as
+they are. The generated document is cloned into a pypdf writer and every
+page object of each appendix is grafted after it. Grafting copies object
+references, so content streams, fonts and images keep their encoded bytes
+and are never decoded, re-encoded or laid out again. Objects that pages of
+one appendix share stay shared.
+
+Across appendices, identical objects are written once. Before an
+appendix is grafted, every object its pages reach through /Resources and
+/Contents gets a digest of its dictionary and raw stream bytes, in which
+references count by the digest of their target. An object whose digest
+was already grafted is mapped onto the existing copy, so a font or logo
+embedded by fifty appendices appears in the output once, and nothing
+below it is visited again.
+
+Appendix pages get the document's footer, numbered on from the last
+generated page. The footer is a separate content stream appended to the
+page (see `pagecache.stamp_footers`), and the page's own content is wrapped
+in q/Q so a graphics state it leaves changed cannot move the footer. The
+footer sits centred at the bottom of each page's media box as displayed,
+so it follows the page's size and its /Rotate. Every appendix
+gets an outline entry at its first page.
+
+    python generate_intro_pdf.py --appendix spec.pdf --appendix quote.pdf [-o out.pdf]
+    python -m architect_pdf.appendix document.pdf spec.pdf quote.pdf -o out.pdf [--footer TEXT]
+"""
+from io import BytesIO
+import argparse
+import hashlib
+import os
+import string
+import time
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+import generate_intro_pdf as intro
+from architect_pdf.pagecache import stamp_footers
+
+# Back-references that would make every resource depend on the page it is drawn on
+_UNHASHED_KEYS = frozenset(("/Parent", "/P", "/StructParent", "/StructParents"))
+
+
+class _Digests:
+    """Content digests of the objects of one reader, memoized by object number"""
+    __slots__ = ("memo", "_active")
+
+    def __init__(self):
+        self.memo = {}
+        self._active = set()
+
+    def of(self, obj):
+        if isinstance(obj, IndirectObject):
+            digest = self.memo.get(obj.idnum)
+            if digest is None:
+                if obj.idnum in self._active:
+                    # A reference cycle: the objects on it are not merged with other files'
+                    return b"cycle %d" % obj.idnum
+                self._active.add(obj.idnum)
+                digest = self.memo[obj.idnum] = self.of(obj.get_object())
+                self._active.discard(obj.idnum)
+            return digest
+        h = hashlib.sha256()
+        if isinstance(obj, DictionaryObject):
+            h.update(b"stream" if isinstance(obj, StreamObject) else b"dict")
+            for key in sorted(obj):
+                if key not in _UNHASHED_KEYS:
+                    h.update(key.encode("latin-1"))
+                    h.update(self.of(obj.raw_get(key)))
+            if isinstance(obj, StreamObject):
+                # The raw bytes, still encoded: comparing them needs no decoding
+                h.update(obj._data)
+        elif isinstance(obj, ArrayObject):
+            h.update(b"array")
+            for item in list.__iter__(obj):
+                h.update(self.of(item))
+        else:
+            h.update(f"{type(obj).__name__} {obj!r}".encode("utf-8", "surrogatepass"))
+        return h.digest()
+
+
+class Grafter:
+    """Appends the pages of other PDFs to a writer, sharing identical objects"""
+    __slots__ = ("writer", "_seen", "deduplicated")
+
+    def __init__(self, writer):
+        self.writer = writer
+        # Object digest -> object number in the writer
+        self._seen = {}
+        self.deduplicated = 0
+
+    def graft(self, reader):
+        """Append every page of `reader`; returns the new pages"""
+        digests = _Digests()
+        for page in reader.pages:
+            for key in ("/Resources", "/Contents"):
+                if key in page:
+                    digests.of(page.raw_get(key))
+        # pypdf's clone consults this map before copying an object, so seeding it
+        # maps a duplicate (and everything below it) onto the existing copy
+        translated = self.writer._id_translated.setdefault(id(reader), {"PreventGC": reader})
+        for idnum, digest in digests.memo.items():
+            if digest in self._seen and idnum not in translated:
+                translated[idnum] = self._seen[digest]
+                self.deduplicated += 1
+        pages = [self.writer.add_page(page) for page in reader.pages]
+        for idnum, digest in digests.memo.items():
+            if idnum in translated:
+                self._seen.setdefault(digest, translated[idnum])
+        return pages
+
+
+def footer_overlay(pages, first, footer_text):
+    """One overlay page per grafted page with its footer, numbered from `first`"""
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4, pageCompression=0, invariant=1)
+    for number, page in enumerate(pages, first):
+        box = page.mediabox
+        left, bottom, width, height = float(box.left), float(box.bottom), float(box.width), float(box.height)
+        c.setPageSize((width, height))
+        rotate = page.rotation % 360
+        # Draw in the page as displayed: /Rotate turns it clockwise, so turn
+        # the footer back and move it to the corner that is shown bottom left
+        origin = {0: (left, bottom), 90: (left + width, bottom), 180: (left + width, bottom + height),
+                  270: (left, bottom + height)}[rotate]
+        c.translate(*origin)
+        c.rotate(rotate)
+        shown_width = height if rotate in (90, 270) else width
+        c.setFont(intro.NORMAL_FONT, 7)
+        c.setFillColor(intro.SLATE_LIGHT)
+        c.drawCentredString(shown_width / 2, 12*mm, footer_text.format(page=number))
+        c.showPage()
+    c.save()
+    buf.seek(0)
+    return PdfReader(buf)
+
+
+def _title(reader, path, index):
+    title = str((reader.metadata or {}).get("/Title") or "").strip()
+    # reportlab's placeholders for a document nobody gave a title, older and newer releases
+    if title in ("", "(anonymous)", "untitled"):
+        title = os.path.splitext(os.path.basename(path))[0]
+    letter = string.ascii_uppercase[index] if index < 26 else str(index + 1)
+    return f"Appendix {letter}: {title}"
+
+
+def append_appendices(document, appendices, output, *, footer_text=intro.DEFAULT_FOOTER):
+    """Write `document` (bytes, path or stream) followed by the `appendices` PDFs to `output`.
+
+    Returns a dict with the page counts, how many objects were shared
+    instead of copied, and the seconds spent grafting and writing.
+    """
+    start = time.perf_counter()
+    if isinstance(document, bytes):
+        document = BytesIO(document)
+    writer = PdfWriter(clone_from=PdfReader(document))
+    intro_pages = len(writer.pages)
+    grafter = Grafter(writer)
+    grafted, outline = [], []
+    for i, path in enumerate(appendices):
+        reader = PdfReader(path)
+        if reader.is_encrypted and not reader.decrypt(""):
+            raise ValueError(f"{path}: encrypted appendices are not supported")
+        outline.append((_title(reader, path, i), intro_pages + len(grafted)))
+        grafted.extend(grafter.graft(reader))
+    if grafted:
+        stamp_footers(writer, footer_overlay(grafted, intro_pages + 1, footer_text), pages=grafted, isolate=True)
+    for title, page in outline:
+        writer.add_outline_item(title, page)
+    graft = time.perf_counter() - start
+    writer.write(output)
+    return {
+        "pages": len(writer.pages),
+        "appendix_pages": len(grafted),
+        "deduplicated": grafter.deduplicated,
+        "timings": {"graft": graft, "write": time.perf_counter() - start - graft},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append PDFs to a generated document with continued page numbers")
+    parser.add_argument("document", help="the generated PDF")
+    parser.add_argument("appendices", nargs="+", help="PDFs to append, in order")
+    parser.add_argument("-o", "--output", required=True, help="output PDF path")
+    parser.add_argument("--footer", default=intro.DEFAULT_FOOTER, help="footer text, {page} is the page number")
+    args = parser.parse_args(argv)
+
+    intro.register_fonts()
+    result = append_appendices(args.document, args.appendices, args.output, footer_text=args.footer)
+    print(
+        f"PDF written: {args.output} ({result['pages']} pages, {result['appendix_pages']} from "
+        f"{len(args.appendices)} appendices, {result['deduplicated']} shared objects merged, "
+        f"{sum(result['timings'].values()):.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
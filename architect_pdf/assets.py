@@ -0,0 +1,163 @@
+"""
+Decoded-image asset cache for theme logos and cover images.
+
+A PNG drawn with `canvas.drawImage` is decoded by PIL and deflated again
+in every document that draws it, at its full resolution. Theme images are
+instead prepared once: decoded, converted to RGB or grey, downscaled to
+the largest size they are drawn at (`max_px` on the long side) and stored
+as the finished PDF image stream, already compressed, with the alpha
+channel as a separate soft mask. A JPEG that needs no downscaling is kept
+as its original bytes and embedded with DCTDecode, so it is never decoded
+at all.
+
+Prepared images are pickled under `<cache>/assets`, keyed by the SHA-256
+of the source file and `max_px`, so every process and every theme using
+the same file shares one entry. Within a process they are also memoized
+by path, modification time and size, so a worker rendering 100 variants
+reads and hashes a logo once. `stats` counts decodes, disk-cache loads and
+memo hits.
+
+`draw_asset` embeds an image once per document and references that one
+XObject from every page or form that draws it.
+"""
+from io import BytesIO
+import hashlib
+import os
+import pickle
+import zlib
+
+from PIL import Image
+from reportlab.pdfbase import pdfdoc
+
+from architect_pdf.fonts import _write_cache, default_cache_dir
+
+CACHE_FORMAT = 1
+JPEG_QUALITY = 90
+
+stats = {"decoded": 0, "loaded": 0, "memo": 0}
+_hashes = {}
+_assets = {}
+
+
+class Asset:
+    """A prepared image: the PDF stream of its pixels, plus a soft mask if it has alpha"""
+    __slots__ = ("key", "width", "height", "color_space", "filters", "data", "alpha")
+
+    def __init__(self, key, width, height, color_space, filters, data, alpha=None):
+        self.key = key
+        self.width = width
+        self.height = height
+        self.color_space = color_space
+        self.filters = filters
+        self.data = data
+        self.alpha = alpha
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+def content_hash(path):
+    """SHA-256 of a file, memoized per path, mtime and size"""
+    stamp = _stamp(path)
+    digest = _hashes.get(stamp)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _hashes[stamp] = h.hexdigest()
+    return digest
+
+
+def prepare(path, max_px, key=None):
+    """Decode, convert and downscale the image at `path` into an `Asset`"""
+    stats["decoded"] += 1
+    key = key or f"{content_hash(path)}-{max_px}"
+    with Image.open(path) as im:
+        source_format = im.format
+        if source_format == "JPEG" and im.mode in ("L", "RGB") and max(im.size) <= max_px:
+            with open(path, "rb") as f:
+                return Asset(key, im.width, im.height, "DeviceGray" if im.mode == "L" else "DeviceRGB",
+                             ("DCTDecode",), f.read())
+        has_alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if has_alpha else ("L" if im.mode in ("1", "L", "I", "I;16", "F") else "RGB"))
+    im.thumbnail((max_px, max_px), Image.LANCZOS)
+    alpha = None
+    if has_alpha:
+        channel = im.getchannel("A")
+        im = im.convert("RGB")
+        # A fully opaque alpha channel needs no mask
+        if channel.getextrema() != (255, 255):
+            alpha = zlib.compress(channel.tobytes())
+    color_space = "DeviceGray" if im.mode == "L" else "DeviceRGB"
+    if source_format == "JPEG":
+        # A downscaled photo stays a JPEG: far smaller than deflated pixels
+        buf = BytesIO()
+        im.save(buf, "JPEG", quality=JPEG_QUALITY)
+        return Asset(key, im.width, im.height, color_space, ("DCTDecode",), buf.getvalue())
+    return Asset(key, im.width, im.height, color_space, ("FlateDecode",), zlib.compress(im.tobytes()), alpha)
+
+
+def load_asset(path, max_px, cache_dir=None):
+    """Prepared `Asset` for the image at `path`, from memory, the disk cache or a fresh decode"""
+    memo = (*_stamp(path), max_px)
+    asset = _assets.get(memo)
+    if asset is not None:
+        stats["memo"] += 1
+        return asset
+    key = f"{content_hash(path)}-{max_px}"
+    cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+    cache_file = os.path.join(cache_dir, "assets", f"{CACHE_FORMAT}-{key}.pickle") if cache_dir else None
+    if cache_file:
+        try:
+            with open(cache_file, "rb") as f:
+                asset = pickle.load(f)
+            stats["loaded"] += 1
+        except Exception:
+            asset = None
+    if asset is None:
+        asset = prepare(path, max_px, key)
+        if cache_file:
+            _write_cache(cache_file, asset)
+    _assets[memo] = asset
+    return asset
+
+
+def _xobject(name, asset, data, color_space, filters):
+    image = pdfdoc.PDFImageXObject(name)
+    image.width, image.height = asset.width, asset.height
+    image.bitsPerComponent = 8
+    image.colorSpace = color_space
+    image._filters = filters
+    image.streamContent = data
+    image.mask = None
+    return image
+
+
+def embed(canv, asset):
+    """Register `asset` as an image XObject of the canvas's document once; returns its form name"""
+    name = f"Asset{asset.key[:24]}"
+    doc = canv._doc
+    if not doc.hasForm(name):
+        image = _xobject(name, asset, asset.data, asset.color_space, asset.filters)
+        if asset.alpha is not None:
+            mask = _xobject(f"{name}Mask", asset, asset.alpha, "DeviceGray", ("FlateDecode",))
+            image.smask = doc.Reference(mask, doc.getXObjectName(f"{name}Mask"))
+        # As `canvas.drawImage` does, but from the prepared stream instead of the file
+        doc.addForm(name, image)
+    return name
+
+
+def draw_asset(canv, asset, x, y, width, height):
+    """Draw `asset` fitted into the box, keeping its aspect ratio, centred"""
+    scale = min(width / asset.width, height / asset.height)
+    w, h = asset.width * scale, asset.height * scale
+    name = embed(canv, asset)
+    canv._currentPageHasImages = 1
+    canv.saveState()
+    canv.translate(x + (width - w) / 2, y + (height - h) / 2)
+    canv.scale(w, h)
+    canv.doForm(name)
+    canv.restoreState()
@@ -0,0 +1,210 @@
+"""
+Batch rendering of document variants across a process pool.
+
+A manifest is a JSON list of variants, or an object with `variants` and
+optional `defaults` applied to every variant:
+
+    {
+      "defaults": {"lang": "ko"},
+      "variants": [
+        {"name": "acme-ko", "customer": "ACME 물류"},
+        {"name": "acme-en", "lang": "en", "customer": "ACME Logistics",
+         "toc_items": [["1", "Overview", "..."]],
+         "scenario": {"title": "<b>Scenario: ...</b>", "rows": [["Step", "Action", "Result"], ...]},
+         "content": {"footer": "Internal  |  Page {page}"}},
+        {"name": "acme-branded", "customer": "ACME 물류", "theme": "acme"}
+      ]
+    }
+
+Variant names, and the files they are written to (`output`, by default
+`<name>.pdf`), must be unique. `theme` selects a branding profile (see
+architect_pdf.themes). Each worker registers fonts and builds the styles
+once in its initializer, then renders variants until the pool shuts
+down. Results stream back as files finish; a failing variant is reported
+without stopping the batch.
+architect_pdf.jobqueue runs the same renders from a durable SQLite queue
+that survives crashes and resumes where it stopped.
+
+    python -m architect_pdf.batch manifest.json [-j N] [--out-dir DIR]
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+
+import generate_intro_pdf as intro
+
+
+def load_manifest(path):
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"variants": manifest}
+    defaults = manifest.get("defaults", {})
+    variants, names, outputs = [], set(), set()
+    for i, variant in enumerate(manifest["variants"]):
+        variant = {**defaults, **variant}
+        variant.setdefault("name", f"variant-{i + 1}")
+        # Two variants writing one file would silently overwrite each other
+        output = os.path.normpath(_output_path(variant, ""))
+        if variant["name"] in names:
+            raise ValueError(f"{path}: duplicate variant name {variant['name']!r}")
+        if output in outputs:
+            raise ValueError(f"{path}: variant {variant['name']!r} writes {output!r} like an earlier one")
+        names.add(variant["name"])
+        outputs.add(output)
+        variants.append(variant)
+    return variants
+
+
+def variant_content(variant):
+    """Built-in content for the variant's language with its overrides applied"""
+    lang = variant.get("lang", "ko")
+    if lang not in intro.INTRO_CONTENT:
+        raise ValueError(f"Unsupported language: {lang!r}")
+    overrides = dict(variant.get("content", {}))
+    if "customer" in variant:
+        overrides.setdefault("cover", {})["customer"] = variant["customer"]
+    if "toc_items" in variant:
+        overrides.setdefault("toc", {})["items"] = variant["toc_items"]
+    content = intro.merge_content(intro.INTRO_CONTENT[lang], overrides)
+
+    if "scenario" in variant:
+        # The scenario is the "lead" title and the table following it in use_cases
+        scenario = variant["scenario"]
+        section = next(s for s in content["sections"] if s["key"] == "use_cases")
+        blocks = section["blocks"]
+        lead = next(i for i, block in enumerate(blocks) if block[0] == "lead")
+        table = next(i for i, block in enumerate(blocks) if block[0] == "table" and i > lead)
+        if "title" in scenario:
+            blocks[lead] = ("lead", scenario["title"])
+        if "rows" in scenario:
+            blocks[table] = ("table", scenario["rows"], *blocks[table][2:])
+    return content
+
+
+def _init_worker(fonts):
+    # Fonts are parsed once per worker; styles are built at import time
+    intro.register_fonts(fonts)
+
+
+def _output_path(variant, out_dir):
+    return os.path.join(out_dir, variant.get("output") or f"{variant['name']}.pdf")
+
+
+def render_variant(variant, out_dir="."):
+    """Render one variant; never raises, errors are returned in the result"""
+    name = variant["name"]
+    output = _output_path(variant, out_dir)
+    start = time.perf_counter()
+    try:
+        content = variant_content(variant)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        pages = intro.build_intro_pdf(output, lang=variant.get("lang", "ko"), content=content,
+                                      theme=variant.get("theme"))
+        return {
+            "name": name, "output": output, "ok": True, "pages": pages,
+            "bytes": os.path.getsize(output), "seconds": time.perf_counter() - start,
+        }
+    except Exception as e:
+        return {
+            "name": name, "output": output, "ok": False,
+            "error": "".join(traceback.format_exception_only(type(e), e)).strip(),
+            "seconds": time.perf_counter() - start,
+        }
+
+
+def _run_pool(variants, workers, out_dir, fonts, lost):
+    """Yield the results of `variants` rendered on `workers` processes.
+
+    Variants whose result was lost because a worker died and broke the
+    pool are appended to `lost` instead.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(fonts,)) as pool:
+        futures = {}
+        for i, variant in enumerate(variants):
+            try:
+                futures[pool.submit(render_variant, variant, out_dir)] = variant
+            except BrokenProcessPool:
+                # A worker died before the rest were submitted
+                lost.extend(variants[i:])
+                break
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except BrokenProcessPool:
+                lost.append(futures[future])
+
+
+def iter_batch(variants, workers=None, out_dir=".", fonts=None):
+    """Render `variants` in a process pool, yielding results as they finish.
+
+    A worker that dies (killed for memory, a crash in C code, a failing
+    initializer) breaks the pool and every variant still in it. Those are
+    rendered again in a fresh pool; the ones lost a second time run one at
+    a time, each in its own pool, so a variant that kills its worker fails
+    alone and the rest of the batch still renders.
+    """
+    workers = workers or os.cpu_count() or 1
+    variants = list(variants)
+    lost = []
+    yield from _run_pool(variants, workers, out_dir, fonts, lost)
+    if lost:
+        retry, lost = lost, []
+        yield from _run_pool(retry, workers, out_dir, fonts, lost)
+    for variant in lost:
+        again = []
+        yield from _run_pool([variant], 1, out_dir, fonts, again)
+        if again:
+            yield {
+                "name": variant["name"], "output": _output_path(variant, out_dir), "ok": False,
+                "error": "BrokenProcessPool: the worker process died while rendering this variant", "seconds": 0.0,
+            }
+
+
+def format_report(results, elapsed, workers):
+    lines = [f"{'variant':<28} {'status':<6} {'pages':>5} {'KB':>8} {'seconds':>8}"]
+    for r in sorted(results, key=lambda r: r["name"]):
+        if r["ok"]:
+            lines.append(f"{r['name']:<28} {'ok':<6} {r['pages']:>5} {r['bytes'] / 1024:>8.1f} {r['seconds']:>8.3f}")
+        else:
+            lines.append(f"{r['name']:<28} {'FAIL':<6} {'-':>5} {'-':>8} {r['seconds']:>8.3f}")
+    done = sum(r["ok"] for r in results)
+    lines.append(
+        f"{done}/{len(results)} documents in {elapsed:.2f}s on {workers} workers "
+        f"({done / elapsed if elapsed else 0:.1f} documents/s)"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render document variants from a manifest in parallel")
+    parser.add_argument("manifest", help="JSON manifest of variants")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: one per core)")
+    parser.add_argument("--out-dir", help="output directory (default: next to the manifest)")
+    args = parser.parse_args(argv)
+
+    try:
+        variants = load_manifest(args.manifest)
+    except ValueError as e:
+        parser.error(str(e))
+    out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.manifest))
+    start = time.perf_counter()
+    results = []
+    for r in iter_batch(variants, workers=args.workers, out_dir=out_dir):
+        results.append(r)
+        if r["ok"]:
+            print(f"done  {r['name']} ({r['seconds']:.2f}s) -> {r['output']}", flush=True)
+        else:
+            print(f"FAIL  {r['name']}: {r['error']}", flush=True)
+    print()
+    print(format_report(results, time.perf_counter() - start, args.workers))
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""
+Client proposal and developer PRD/LLD PDFs from an exported blueprint JSON.
+
+Accepts the `SolutionBlueprint` JSON the web app downloads
+(architect-blueprint.json / blueprint.json) or a bare `ImplementationPlan`
+(developer/implementation.json). The file is read with a pull parser and
+flowables are produced as each part is parsed, so hundreds of endpoints or
+tables never sit in memory as parsed JSON and flowables at the same time.
+The layout follows services/reportGenerator.ts; the Mermaid diagrams are
+drawn natively (architect_pdf.mermaid), with their source shown instead
+when it uses syntax outside the supported subset.
+
+    python -m architect_pdf.blueprint blueprint.json --client client.pdf --developer developer.pdf
+"""
+from reportlab.lib.units import mm
+from reportlab.lib.enums import TA_CENTER
+from reportlab.platypus import Paragraph, Spacer, Preformatted
+from xml.sax.saxutils import escape
+import argparse
+import contextlib
+import re
+import sys
+
+import generate_intro_pdf as intro
+from generate_intro_pdf import (
+    make_style, info_box, data_table, bullet, numbered, section_divider, mermaid_diagram,
+)
+from architect_pdf.jsonstream import JsonStream
+from architect_pdf.mermaid import MermaidError
+
+# Labels shared with services/reportGenerator.ts
+REPORT_LABELS = {
+    "ko": {
+        "client_title": "솔루션 제안서", "client_subtitle": "AI 기반 맞춤 설계",
+        "problem": "현재 겪고 계신 문제", "solution": "우리의 해결 방안",
+        "key_features": "제공되는 핵심 기능", "schedule": "추진 일정",
+        "expected_outcomes": "도입 후 기대 효과", "investment": "투자 대비 효과",
+        "data_protection": "데이터 보호 및 보안", "references": "참고 자료",
+        "dev_title": "개발 설계 문서", "dev_subtitle": "Architecture & Implementation Plan",
+        "sprint_plan": "스프린트 계획", "duration": "기간", "goals": "목표",
+        "deliverables": "산출물", "dependencies": "의존성",
+        "project_structure": "프로젝트 구조", "tech_stack": "기술 스택",
+        "th_category": "분류", "th_name": "이름", "th_version": "버전", "th_purpose": "목적",
+        "api_endpoints": "API 엔드포인트", "auth_required": "인증 필요", "auth_public": "공개",
+        "request_body": "요청 본문", "response": "응답", "error_codes": "에러 코드",
+        "db_schema": "데이터베이스 스키마",
+        "th_column": "컬럼", "th_type": "타입", "th_constraint": "제약",
+        "key_modules": "핵심 모듈", "deploy_plan": "배포 계획", "test_strategy": "테스트 전략",
+        "roadmap": "실행 로드맵", "analysis_summary": "분석 요약",
+        "estimated_roi": "예상 ROI", "security_strategy": "보안 전략",
+        "report_title": "아키텍트 설계 보고서",
+        "th_phase": "단계", "th_duration": "기간", "th_outcome": "산출물",
+        "architecture_diagrams": "아키텍처 다이어그램", "system_architecture": "시스템 아키텍처",
+        "sequence_diagram": "시퀀스 다이어그램", "tech_stack_diagram": "기술 스택",
+        "mermaid_note": "아래 코드를 Mermaid 렌더러(mermaid.live 등)에서 시각화할 수 있습니다.",
+        "client_header": "Architect Enterprise Builder  |  Solution Proposal",
+        "dev_header": "Architect Enterprise Builder  |  Developer Design Document",
+    },
+    "en": {
+        "client_title": "Solution Proposal", "client_subtitle": "AI-Powered Custom Design",
+        "problem": "Current Challenges", "solution": "Our Solution",
+        "key_features": "Key Features", "schedule": "Project Timeline",
+        "expected_outcomes": "Expected Outcomes", "investment": "Return on Investment",
+        "data_protection": "Data Protection & Security", "references": "References",
+        "dev_title": "Developer Design Document", "dev_subtitle": "Architecture & Implementation Plan",
+        "sprint_plan": "Sprint Plan", "duration": "Duration", "goals": "Goals",
+        "deliverables": "Deliverables", "dependencies": "Dependencies",
+        "project_structure": "Project Structure", "tech_stack": "Tech Stack",
+        "th_category": "Category", "th_name": "Name", "th_version": "Version", "th_purpose": "Purpose",
+        "api_endpoints": "API Endpoints", "auth_required": "Auth required", "auth_public": "Public",
+        "request_body": "Request Body", "response": "Response", "error_codes": "Error Codes",
+        "db_schema": "Database Schema",
+        "th_column": "Column", "th_type": "Type", "th_constraint": "Constraint",
+        "key_modules": "Key Modules", "deploy_plan": "Deployment Plan", "test_strategy": "Testing Strategy",
+        "roadmap": "Execution Roadmap", "analysis_summary": "Analysis Summary",
+        "estimated_roi": "Estimated ROI", "security_strategy": "Security Strategy",
+        "report_title": "Architect Design Report",
+        "th_phase": "Phase", "th_duration": "Duration", "th_outcome": "Outcome",
+        "architecture_diagrams": "Architecture Diagrams", "system_architecture": "System Architecture",
+        "sequence_diagram": "Sequence Diagram", "tech_stack_diagram": "Tech Stack",
+        "mermaid_note": "Paste the code below into a Mermaid renderer (e.g. mermaid.live) to visualize.",
+        "client_header": "Architect Enterprise Builder  |  Solution Proposal",
+        "dev_header": "Architect Enterprise Builder  |  Developer Design Document",
+    },
+}
+
+PLAN_KEYS = {
+    "prd", "lld", "projectStructure", "sprintPlan", "deploymentPlan", "testingStrategy",
+    "techStack", "apiDesign", "databaseDesign", "keyModules",
+}
+
+
+# Styles and colors are read from generate_intro_pdf as each flowable is made,
+# since use_theme rebinds them there
+def _code_style():
+    return make_style("Code", size=8, color=intro.DARK, leading=11, space_before=6, space_after=8,
+                      backColor=intro.SLATE_BG, borderColor=intro.BORDER, borderWidth=0.5, borderPadding=6)
+
+
+# ── Markdown ──
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_CODE = re.compile(r"`(.+?)`")
+_ORDERED = re.compile(r"^\d+\.\s")
+
+
+def inline(text):
+    """Escape text for Paragraph markup, keeping **bold** and `code`"""
+    text = escape(text)
+    text = _BOLD.sub(r"<b>\1</b>", text)
+    return _CODE.sub(r'<font color="#2563eb">\1</font>', text)
+
+
+def code_block(text):
+    return Preformatted(text.rstrip("\n"), _code_style())
+
+
+def iter_markdown(md):
+    """Flowables for the markdown subset handled by markdownToHtml()"""
+    code = None
+    number = 0
+    for line in md.split("\n"):
+        trimmed = line.strip()
+        if trimmed.startswith("```"):
+            if code is None:
+                code = []
+            else:
+                yield code_block("\n".join(code))
+                code = None
+            continue
+        if code is not None:
+            code.append(line)
+            continue
+
+        if not _ORDERED.match(trimmed):
+            number = 0
+        if trimmed.startswith("#### "):
+            yield Paragraph(inline(trimmed[5:]), intro.style_h3)
+        elif trimmed.startswith("### "):
+            yield Paragraph(inline(trimmed[4:]), intro.style_h3)
+        elif trimmed.startswith("## ") or trimmed.startswith("# "):
+            yield Paragraph(inline(trimmed.lstrip("#").strip()), intro.style_h2)
+        elif trimmed.startswith("- ") or trimmed.startswith("* "):
+            yield bullet(inline(trimmed[2:]))
+        elif _ORDERED.match(trimmed):
+            number += 1
+            yield numbered(number, inline(_ORDERED.sub("", trimmed)))
+        elif trimmed == "---":
+            yield section_divider()
+        elif trimmed:
+            yield Paragraph(inline(trimmed), intro.style_body)
+    if code is not None:
+        yield code_block("\n".join(code))
+
+
+# ── Shared pieces ──
+def title_block(title, subtitle):
+    yield Spacer(1, 10*mm)
+    yield Paragraph(escape(title), make_style("DocTitle", size=24, color=intro.DARK, leading=32, bold=True,
+                                              align=TA_CENTER))
+    yield Paragraph(escape(subtitle), make_style("DocSubtitle", size=11, color=intro.SLATE_LIGHT, leading=16,
+                                                 align=TA_CENTER, space_after=12))
+
+
+def heading(text):
+    yield Paragraph(escape(text), intro.style_h1)
+    yield section_divider()
+
+
+def ordered_list(items):
+    for i, item in enumerate(items):
+        yield numbered(i + 1, escape(item))
+
+
+def markdown_section(title, md):
+    if md:
+        yield from heading(title)
+        yield from iter_markdown(md)
+
+
+# ── Client proposal ──
+def iter_client_story(stream, lang="ko"):
+    """Flowables of the client proposal, following generateClientReportHtml()"""
+    L = REPORT_LABELS[lang]
+    proposal, sources, summary = None, None, {}
+    for key in stream.items():
+        if key == "clientProposal":
+            proposal = stream.value()
+        elif key == "sources":
+            sources = stream.value()
+        elif key in ("analysisSummary", "roadmap", "estimatedROI", "securityStrategy"):
+            summary[key] = stream.value()
+        else:
+            stream.skip()
+
+    if proposal:
+        yield from title_block(L["client_title"], L["client_subtitle"])
+        yield from heading(L["problem"])
+        yield info_box(L["problem"], escape(proposal.get("problemStatement", "")))
+        yield from heading(L["solution"])
+        yield Paragraph(escape(proposal.get("solutionOverview", "")), intro.style_body_dark)
+        yield from heading(L["key_features"])
+        for feature in proposal.get("keyFeatures", []):
+            yield Paragraph(f"<font color=\"#059669\">&#10003;</font>&nbsp;&nbsp;{escape(feature)}", intro.style_body)
+        milestones = proposal.get("milestones", [])
+        if milestones:
+            yield from heading(L["schedule"])
+            rows = [["#", L["th_phase"], L["th_duration"], L["th_outcome"]]]
+            rows += [[str(i + 1), f"<b>{escape(m.get('phase', ''))}</b>", escape(m.get("duration", "")), escape(m.get("outcome", ""))]
+                     for i, m in enumerate(milestones)]
+            yield data_table(rows, [10, 45, 30, 75], header="BLUE", padding=5)
+        yield from heading(L["expected_outcomes"])
+        yield Paragraph(escape(proposal.get("expectedOutcomes", "")), intro.style_body)
+        yield from heading(L["investment"])
+        yield Paragraph(escape(proposal.get("investmentSummary", "")), intro.style_body)
+        yield from heading(L["data_protection"])
+        yield Paragraph(escape(proposal.get("dataProtection", "")), intro.style_body)
+    else:
+        yield from title_block(L["report_title"], L["client_subtitle"])
+        yield from markdown_section(L["analysis_summary"], summary.get("analysisSummary"))
+        if summary.get("roadmap"):
+            yield from heading(L["roadmap"])
+            yield from ordered_list(summary["roadmap"])
+        yield from markdown_section(L["estimated_roi"], summary.get("estimatedROI"))
+        yield from markdown_section(L["security_strategy"], summary.get("securityStrategy"))
+
+    valid = [s for s in sources or [] if str(s.get("uri", "")).startswith(("http://", "https://"))]
+    if valid:
+        yield from heading(L["references"])
+        for s in valid:
+            yield bullet(f'<link href="{escape(s["uri"])}" color="#2563eb">{escape(s.get("title") or s["uri"])}</link>')
+
+
+# ── Developer document ──
+def _plan_part(stream, key, L):
+    """Flowables for one ImplementationPlan field, read from the stream"""
+    if key in ("prd", "lld"):
+        title = "PRD (Product Requirements Document)" if key == "prd" else "LLD (Low-Level Design)"
+        yield from markdown_section(title, stream.value())
+    elif key == "projectStructure":
+        text = stream.value()
+        if text:
+            yield from heading(L["project_structure"])
+            yield code_block(text)
+    elif key == "sprintPlan":
+        for i in stream.elements():
+            if i == 0:
+                yield from heading(L["sprint_plan"])
+            sp = stream.value()
+            yield Paragraph(f"Sprint {escape(str(sp.get('sprint', i + 1)))}: {escape(sp.get('title', ''))}", intro.style_h2)
+            yield Paragraph(f"<b>{L['duration']}:</b> {escape(sp.get('duration', ''))}", intro.style_body)
+            for label, field in (("goals", "goals"), ("deliverables", "deliverables"), ("dependencies", "dependencies")):
+                if sp.get(field):
+                    yield Paragraph(L[label], intro.style_h3)
+                    for item in sp[field]:
+                        yield bullet(escape(item))
+    elif key in ("deploymentPlan", "testingStrategy"):
+        title = L["deploy_plan"] if key == "deploymentPlan" else L["test_strategy"]
+        yield from markdown_section(title, stream.value())
+    elif key == "techStack":
+        rows = [[L["th_category"], L["th_name"], L["th_version"], L["th_purpose"]]]
+        for t in stream.iter_array():
+            rows.append([escape(t.get("category", "")), f"<b>{escape(t.get('name', ''))}</b>",
+                         escape(t.get("version", "")), escape(t.get("purpose", ""))])
+        if len(rows) > 1:
+            yield from heading(L["tech_stack"])
+            yield data_table(rows, [30, 40, 25, 65])
+    elif key == "apiDesign":
+        for i in stream.elements():
+            if i == 0:
+                yield from heading(L["api_endpoints"])
+            a = stream.value()
+            auth = L["auth_required"] if a.get("auth") else L["auth_public"]
+            yield Paragraph(
+                f'<font color="#2563eb">{escape(a.get("method", ""))}</font>&nbsp;&nbsp;{escape(a.get("path", ""))}'
+                f'&nbsp;&nbsp;<font size="8" color="#059669">{auth}</font>', intro.style_h3)
+            yield Paragraph(escape(a.get("description", "")), intro.style_body)
+            if a.get("requestBody"):
+                yield Paragraph(L["request_body"], intro.style_small)
+                yield code_block(a["requestBody"])
+            if a.get("responseBody"):
+                yield Paragraph(L["response"], intro.style_small)
+                yield code_block(a["responseBody"])
+            if a.get("errorCodes"):
+                yield Paragraph(L["error_codes"], intro.style_small)
+                for code in a["errorCodes"]:
+                    yield bullet(escape(code))
+    elif key == "databaseDesign":
+        for i in stream.elements():
+            if i == 0:
+                yield from heading(L["db_schema"])
+            table = stream.value()
+            yield Paragraph(escape(table.get("name", "")), intro.style_h3)
+            if table.get("description"):
+                yield Paragraph(escape(table["description"]), intro.style_body)
+            rows = [[L["th_column"], L["th_type"], L["th_constraint"]]]
+            rows += [[escape(c.get("name", "")), escape(c.get("type", "")), escape(c.get("constraint", ""))]
+                     for c in table.get("columns", [])]
+            yield data_table(rows, [50, 40, 70], padding=4)
+    elif key == "keyModules":
+        for i in stream.elements():
+            if i == 0:
+                yield from heading(L["key_modules"])
+            mod = stream.value()
+            yield Paragraph(f'{escape(mod.get("name", ""))}&nbsp;&nbsp;<font size="8" color="#94a3b8">{escape(mod.get("file", ""))}</font>', intro.style_h3)
+            yield Paragraph(escape(mod.get("description", "")), intro.style_body)
+            if mod.get("code"):
+                yield code_block(mod["code"])
+    else:
+        stream.skip()
+
+
+def iter_developer_story(stream, lang="ko"):
+    """Flowables of the developer PRD/LLD document, in the plan's field order"""
+    L = REPORT_LABELS[lang]
+    yield from title_block(L["dev_title"], L["dev_subtitle"])
+    tail = {}
+    for key in stream.items():
+        if key == "implementationPlan":
+            if stream.peek() == "{":
+                for plan_key in stream.items():
+                    yield from _plan_part(stream, plan_key, L)
+            else:
+                stream.skip()
+        elif key in PLAN_KEYS:
+            # A bare ImplementationPlan export
+            yield from _plan_part(stream, key, L)
+        elif key in ("roadmap", "architectureDiagram", "sequenceDiagram", "techStackGraph",
+                     "analysisSummary", "estimatedROI", "securityStrategy"):
+            tail[key] = stream.value()
+        else:
+            stream.skip()
+
+    if tail.get("roadmap"):
+        yield from heading(L["roadmap"])
+        yield from ordered_list(tail["roadmap"])
+    diagrams = [(L[label], tail.get(key)) for label, key in (
+        ("system_architecture", "architectureDiagram"),
+        ("sequence_diagram", "sequenceDiagram"),
+        ("tech_stack_diagram", "techStackGraph"),
+    ) if tail.get(key)]
+    if diagrams:
+        yield from heading(L["architecture_diagrams"])
+        for title, source in diagrams:
+            yield Paragraph(title, intro.style_h3)
+            try:
+                yield mermaid_diagram(source)
+            except MermaidError:
+                # Syntax outside the supported subset: show the source to paste elsewhere
+                yield Paragraph(L["mermaid_note"], intro.style_small)
+                yield code_block(source)
+    yield from markdown_section(L["analysis_summary"], tail.get("analysisSummary"))
+    yield from markdown_section(L["estimated_roi"], tail.get("estimatedROI"))
+    yield from markdown_section(L["security_strategy"], tail.get("securityStrategy"))
+
+
+# ── Build ──
+def _render(source, output, story_fn, header, lang, fonts):
+    intro.register_fonts(fonts)
+    # Blueprints keep the built-in look, whatever an earlier intro render themed
+    intro.use_theme()
+    doc = intro.make_doc(output)
+    doc.header_text = header
+    # The story is pulled while the JSON is parsed, so the file stays open for the build
+    with open(source, encoding="utf-8") if isinstance(source, str) else contextlib.nullcontext(source) as f:
+        doc.build(story_fn(JsonStream(f), lang), onFirstPage=intro.draw_page, onLaterPages=intro.draw_page)
+    return doc.page
+
+
+def build_client_pdf(blueprint_path, output, *, lang="ko", fonts=None):
+    """Render the client proposal from a JSON path or text file object; returns the page count"""
+    return _render(blueprint_path, output, iter_client_story, REPORT_LABELS[lang]["client_header"], lang, fonts)
+
+
+def build_developer_pdf(blueprint_path, output, *, lang="ko", fonts=None):
+    """Render the developer PRD/LLD document from a JSON path or text file object; returns the page count"""
+    return _render(blueprint_path, output, iter_developer_story, REPORT_LABELS[lang]["dev_header"], lang, fonts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render client/developer PDFs from an exported blueprint JSON")
+    parser.add_argument("blueprint", help="SolutionBlueprint or ImplementationPlan JSON")
+    parser.add_argument("--lang", default="ko", choices=sorted(REPORT_LABELS))
+    parser.add_argument("--client", help="client proposal PDF path")
+    parser.add_argument("--developer", help="developer PRD/LLD PDF path")
+    args = parser.parse_args(argv)
+    if not args.client and not args.developer:
+        parser.error("nothing to do: pass --client and/or --developer")
+
+    if args.client:
+        pages = build_client_pdf(args.blueprint, args.client, lang=args.lang)
+        print(f"PDF generated: {args.client} ({pages} pages)")
+    if args.developer:
+        pages = build_developer_pdf(args.blueprint, args.developer, lang=args.lang)
+        print(f"PDF generated: {args.developer} ({pages} pages)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
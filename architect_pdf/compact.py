@@ -0,0 +1,390 @@
+"""
+Compact output: the smallest PDF for storage and email.
+
+reportlab deflates every content stream and then ASCII85-encodes it, which
+makes it a quarter larger again. It writes one indirect object per
+dictionary, and every 256-glyph subset of a TrueType font gets a full copy
+of the font's name table. Its subsets already hold only the glyphs the
+document draws. The compact pass rewrites a finished PDF:
+
+- streams that are only deflated or ASCII85-encoded are deflated again at
+  `level` (0 stores them uncompressed); JPEGs and predictor-coded images
+  keep their bytes
+- embedded TrueType subsets keep names 0-6 of their name table (copyright,
+  family, style, unique and PostScript name) in English for Windows;
+  license texts and other languages are dropped, glyphs and hinting are
+  untouched
+- identical objects are merged and unreferenced ones dropped (pypdf's
+  `compress_identical_objects`, repeated until nothing changes, with
+  dictionary keys sorted first so their order does not matter): an image
+  or font subset embedded twice, say by a document and its appendix, is
+  written once
+- every object that is not a stream is packed into compressed object
+  streams, indexed by a cross-reference stream (PDF 1.5)
+
+`size_breakdown` attributes the stream bytes of a PDF to fonts (font files
+and their ToUnicode maps), content (page and form content streams) and
+images (with their soft masks); `structure` is the rest: dictionaries,
+object streams and the cross-reference. It also lists every embedded font
+file with its glyph count, so a font embedded whole stands out.
+`build_compact` renders, compacts and raises `SizeBudgetError` when the
+result is over `max_bytes`; nothing is written then.
+
+    python generate_intro_pdf.py --compact [LEVEL] [--max-kb 120]
+    python -m architect_pdf.compact in.pdf -o out.pdf [--level 9] [--max-kb 120]
+"""
+from io import BytesIO
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, EncodedStreamObject, IndirectObject, NameObject, NumberObject,
+    StreamObject,
+)
+from reportlab.pdfbase.ttfonts import TTFontMaker
+
+import generate_intro_pdf as intro
+
+DEFAULT_LEVEL = 9
+OBJECTS_PER_STREAM = 100
+# Copyright, family, subfamily, unique ID, full name, version, PostScript name
+KEPT_NAME_IDS = frozenset(range(7))
+FONT_FILE_KEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+_REFLATABLE = frozenset(("/FlateDecode", "/ASCII85Decode"))
+_SFNT_VERSIONS = (b"\x00\x01\x00\x00", b"true")
+
+
+class SizeBudgetError(Exception):
+    """The compact PDF is larger than the size budget"""
+
+    def __init__(self, size, max_bytes, breakdown):
+        super().__init__(f"PDF is {size / 1024:.1f} KB, over the {max_bytes / 1024:.1f} KB budget "
+                         f"({describe(breakdown)})")
+        self.size = size
+        self.max_bytes = max_bytes
+        self.breakdown = breakdown
+
+
+# ── Fonts ──
+def _trim_names(table):
+    """A name table with only the `KEPT_NAME_IDS` records, English Windows ones where there are any"""
+    version, count, offset = struct.unpack(">HHH", table[:6])
+    if version != 0:
+        return table
+    records = [struct.unpack(">6H", table[6 + 12 * i:18 + 12 * i]) for i in range(count)]
+    kept = [r for r in records if r[3] in KEPT_NAME_IDS]
+    kept = [r for r in kept if r[0] == 3 and r[2] == 0x409] or kept
+    entries, strings = [], BytesIO()
+    for platform, encoding, language, name_id, length, start in sorted(kept):
+        entries.append(struct.pack(">6H", platform, encoding, language, name_id, length, strings.tell()))
+        strings.write(table[offset + start:offset + start + length])
+    return struct.pack(">HHH", 0, len(entries), 6 + 12 * len(entries)) + b"".join(entries) + strings.getvalue()
+
+
+def trim_font(font):
+    """TrueType font file bytes with the name table cut down; other fonts are returned as they are"""
+    if font[:4] not in _SFNT_VERSIONS:
+        return font
+    maker = TTFontMaker()
+    for i in range(struct.unpack(">H", font[4:6])[0]):
+        tag, _, offset, length = struct.unpack(">4sLLL", font[12 + 16 * i:28 + 16 * i])
+        tag = tag.decode("latin-1")
+        data = font[offset:offset + length]
+        maker.add(tag, _trim_names(data) if tag == "name" else data)
+    return maker.makeStream()
+
+
+def _glyph_count(font):
+    if font[:4] not in _SFNT_VERSIONS:
+        return None
+    for i in range(struct.unpack(">H", font[4:6])[0]):
+        tag, _, offset, _ = struct.unpack(">4sLLL", font[12 + 16 * i:28 + 16 * i])
+        if tag == b"maxp":
+            return struct.unpack(">H", font[offset + 4:offset + 6])[0]
+    return None
+
+
+# ── Compaction ──
+def _filters(stream):
+    filters = stream.get("/Filter", ())
+    return [filters] if isinstance(filters, str) else list(filters)
+
+
+def _set_stream_data(stream, data, level):
+    if level:
+        stream._data = zlib.compress(data, level)
+        stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+    else:
+        stream._data = data
+        stream.pop("/Filter", None)
+
+
+def _reflate(stream, level):
+    """`stream` deflated at `level`, or as it is if it has other filters"""
+    if not set(_filters(stream)) <= _REFLATABLE or "/DecodeParms" in stream:
+        return stream
+    data = stream.get_data()
+    # A new object of one class for all: pypdf's hash of a stream includes its class name
+    reflated = EncodedStreamObject() if level else DecodedStreamObject()
+    reflated.update(stream)
+    reflated.indirect_reference = stream.indirect_reference
+    if "/Length1" in stream:
+        trimmed = trim_font(data)
+        if trimmed is not data:
+            reflated[NameObject("/Length1")] = NumberObject(len(trimmed))
+            data = trimmed
+    _set_stream_data(reflated, data, level)
+    return reflated
+
+
+def _sort_keys(obj):
+    """Sort the keys of `obj` and the dictionaries inside it: pypdf hashes dictionaries in key order"""
+    if isinstance(obj, DictionaryObject):
+        items = sorted(obj.items())
+        obj.clear()
+        obj.update(items)
+        for value in obj.values():
+            _sort_keys(value)
+    elif isinstance(obj, ArrayObject):
+        for value in obj:
+            _sort_keys(value)
+
+
+def _merge_identical(writer):
+    """Merge identical objects until no more do: a merge can make the objects referring to them equal"""
+    while True:
+        count = sum(obj is not None for obj in writer._objects)
+        writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+        if sum(obj is not None for obj in writer._objects) == count:
+            return
+
+
+def _serialize(obj):
+    buf = BytesIO()
+    obj.write_to_stream(buf)
+    return buf.getvalue()
+
+
+def _write_object_streams(writer, output, level):
+    """Write `writer`'s objects with every non-stream object inside an object stream"""
+    objects = writer._objects
+    write = output.write
+    start = output.tell()
+    write(b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n")
+    # Cross-reference entries: (type, offset or object stream, generation or index)
+    entries = [None] * (len(objects) + 1)
+    free = [idnum for idnum, obj in enumerate(objects, 1) if obj is None]
+    entries[0] = (0, free[0] if free else 0, 65535)
+    for idnum, following in zip(free, free[1:] + [0]):
+        entries[idnum] = (0, following, 1)
+
+    def write_object(idnum, obj):
+        entries[idnum] = (1, output.tell() - start, 0)
+        write(b"%d 0 obj\n" % idnum)
+        obj.write_to_stream(output)
+        write(b"\nendobj\n")
+
+    packed = []
+    for idnum, obj in enumerate(objects, 1):
+        if isinstance(obj, StreamObject):
+            write_object(idnum, obj)
+        elif obj is not None:
+            packed.append((idnum, _serialize(obj)))
+    for i in range(0, len(packed), OBJECTS_PER_STREAM):
+        chunk = packed[i:i + OBJECTS_PER_STREAM]
+        number = len(entries)
+        entries.append(None)
+        header, body = [], BytesIO()
+        for index, (idnum, data) in enumerate(chunk):
+            header.append(b"%d %d" % (idnum, body.tell()))
+            body.write(data + b"\n")
+            entries[idnum] = (2, number, index)
+        header = b" ".join(header) + b"\n"
+        stream = StreamObject()
+        stream[NameObject("/Type")] = NameObject("/ObjStm")
+        stream[NameObject("/N")] = NumberObject(len(chunk))
+        stream[NameObject("/First")] = NumberObject(len(header))
+        _set_stream_data(stream, header + body.getvalue(), level)
+        write_object(number, stream)
+
+    number = len(entries)
+    entries.append((1, output.tell() - start, 0))
+    width = max(1, (max(entry[1] for entry in entries).bit_length() + 7) // 8)
+    xref = StreamObject()
+    xref[NameObject("/Type")] = NameObject("/XRef")
+    xref[NameObject("/Size")] = NumberObject(len(entries))
+    xref[NameObject("/W")] = ArrayObject([NumberObject(1), NumberObject(width), NumberObject(2)])
+    xref[NameObject("/Root")] = writer.root_object.indirect_reference
+    if writer._info is not None:
+        xref[NameObject("/Info")] = writer._info.indirect_reference
+    if writer._ID:
+        xref[NameObject("/ID")] = writer._ID
+    _set_stream_data(xref, b"".join(bytes((kind,)) + field.to_bytes(width, "big") + extra.to_bytes(2, "big")
+                                    for kind, field, extra in entries), level)
+    location = entries[number][1]
+    write(b"%d 0 obj\n" % number)
+    xref.write_to_stream(output)
+    write(b"\nendobj\nstartxref\n%d\n%%%%EOF\n" % location)
+
+
+def compact_pdf(data, *, level=DEFAULT_LEVEL, object_streams=True):
+    """The compact form of the PDF `data` (bytes), deflated at zlib `level` 0-9"""
+    if not 0 <= level <= 9:
+        raise ValueError(f"Compression level must be 0-9, got {level}")
+    reader = PdfReader(BytesIO(data))
+    if reader.is_encrypted:
+        raise ValueError("Encrypted PDFs cannot be compacted")
+    writer = PdfWriter(clone_from=reader)
+    for i, obj in enumerate(writer._objects):
+        if isinstance(obj, StreamObject):
+            obj = writer._objects[i] = _reflate(obj, level)
+        _sort_keys(obj)
+    _merge_identical(writer)
+    out = BytesIO()
+    if object_streams:
+        _write_object_streams(writer, out, level)
+    else:
+        writer.write(out)
+    return out.getvalue()
+
+
+# ── Size breakdown ──
+def size_breakdown(data):
+    """Bytes of `data` by fonts, content, images and structure, plus the embedded font files"""
+    reader = PdfReader(BytesIO(data))
+    sizes = {"fonts": 0, "content": 0, "images": 0}
+    font_files = []
+    seen = set()
+
+    def count(kind, ref):
+        if not isinstance(ref, IndirectObject) or ref.idnum in seen:
+            return None
+        seen.add(ref.idnum)
+        stream = ref.get_object()
+        if not isinstance(stream, StreamObject):
+            return None
+        sizes[kind] += len(stream._data)
+        return stream
+
+    def font(ref):
+        obj = ref.get_object()
+        count("fonts", obj.raw_get("/ToUnicode") if "/ToUnicode" in obj else None)
+        for descendant in obj.get("/DescendantFonts", ()):
+            font(descendant)
+        descriptor = obj.get("/FontDescriptor")
+        for key in FONT_FILE_KEYS if descriptor is not None else ():
+            if key in descriptor:
+                stream = count("fonts", descriptor.raw_get(key))
+                if stream is not None:
+                    name = str(descriptor.get("/FontName", obj.get("/BaseFont", "?")))[1:]
+                    font_files.append({
+                        "name": name, "bytes": len(stream._data), "glyphs": _glyph_count(stream.get_data()),
+                        # Subsets are named with a six-letter tag: AAAAAA+Name
+                        "subset": name[6:7] == "+",
+                    })
+
+    def resources(res):
+        res = res.get_object() if res is not None else {}
+        for ref in res.get("/Font", {}).values():
+            font(ref)
+        for ref in res.get("/XObject", {}).values():
+            obj = ref.get_object()
+            if obj.get("/Subtype") == "/Image":
+                count("images", ref)
+                for key in ("/SMask", "/Mask"):
+                    count("images", obj.raw_get(key) if key in obj else None)
+            elif count("content", ref) is not None:
+                resources(obj.get("/Resources"))
+
+    for page in reader.pages:
+        contents = page.raw_get("/Contents") if "/Contents" in page else None
+        if isinstance(contents, IndirectObject) and isinstance(contents.get_object(), ArrayObject):
+            contents = contents.get_object()
+        for ref in contents if isinstance(contents, ArrayObject) else [contents]:
+            count("content", ref)
+        resources(page.get("/Resources"))
+    return {"total": len(data), **sizes, "structure": len(data) - sum(sizes.values()), "font_files": font_files}
+
+
+def describe(breakdown):
+    return ", ".join(f"{kind} {breakdown[kind] / 1024:.1f} KB"
+                     for kind in ("fonts", "content", "images", "structure"))
+
+
+def check_budget(breakdown, max_bytes):
+    if max_bytes is not None and breakdown["total"] > max_bytes:
+        raise SizeBudgetError(breakdown["total"], max_bytes, breakdown)
+
+
+def build_compact(output, *, level=DEFAULT_LEVEL, max_bytes=None, **kwargs):
+    """Render like `build_intro_pdf` (with its keyword arguments), compacted, to `output`.
+
+    Returns a dict with the page count, the size before and after, the
+    size breakdown and the seconds spent rendering and compacting. Raises
+    `SizeBudgetError`, writing nothing, when the result is over `max_bytes`.
+    """
+    start = time.perf_counter()
+    buf = BytesIO()
+    pages = intro.build_intro_pdf(buf, **kwargs)
+    render = time.perf_counter() - start
+    original = buf.getvalue()
+    data = compact_pdf(original, level=level)
+    breakdown = size_breakdown(data)
+    compact = time.perf_counter() - start - render
+    check_budget(breakdown, max_bytes)
+    _write(output, data)
+    return {
+        "pages": pages, "original_bytes": len(original), "bytes": len(data), "breakdown": breakdown,
+        "timings": {"render": render, "compact": compact},
+    }
+
+
+def _write(output, data):
+    if hasattr(output, "write"):
+        output.write(data)
+    else:
+        with open(output, "wb") as f:
+            f.write(data)
+
+
+def report(breakdown):
+    """Size breakdown as printable lines"""
+    lines = [f"{breakdown['total'] / 1024:.1f} KB: {describe(breakdown)}"]
+    for font in breakdown["font_files"]:
+        glyphs = "" if font["glyphs"] is None else f", {font['glyphs']} glyphs"
+        lines.append(f"  font {font['name']}: {font['bytes'] / 1024:.1f} KB{glyphs}"
+                     + ("" if font["subset"] else " (embedded whole)"))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact a PDF and report its size breakdown")
+    parser.add_argument("input", help="PDF to compact")
+    parser.add_argument("-o", "--output", required=True, help="output PDF path")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL, choices=range(10), help="zlib compression level")
+    parser.add_argument("--max-kb", type=float, help="fail when the output is larger than this")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "rb") as f:
+        original = f.read()
+    data = compact_pdf(original, level=args.level)
+    breakdown = size_breakdown(data)
+    print(f"{args.input}: {len(original) / 1024:.1f} KB -> ", end="")
+    print("\n".join(report(breakdown)))
+    try:
+        check_budget(breakdown, None if args.max_kb is None else int(args.max_kb * 1024))
+    except SizeBudgetError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    _write(args.output, data)
+    print(f"PDF written: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""
+Bulk delivery of finished PDFs by email and to Google Drive.
+
+A delivery names a document and a target, as in the app's `ExportTarget`:
+
+    {"document": "out/acme-ko.pdf", "target": "email", "to": "pm@acme.example",
+     "subject": "ACME proposal", "body": "Attached."}
+    {"document": "out/acme-ko.pdf", "target": "gdrive", "folder": "<folder id>", "name": "ACME.pdf"}
+
+Deliveries run on `concurrency` threads. Messages go out over a pool of
+SMTP sessions and uploads over a pool of keep-alive HTTP connections, each
+pool holding at most `concurrency` connections that are reused from one
+delivery to the next; a connection that fails is dropped and replaced.
+Uploads use Drive's multipart upload against `upload_url`, so the same
+code talks to googleapis.com with an OAuth token or to a local stand-in.
+
+Transient failures (SMTP 4xx, HTTP 429 and 5xx, dropped connections) are
+retried up to `attempts` times with exponential backoff and full jitter,
+honouring Retry-After; permanent ones (SMTP 5xx, other HTTP 4xx) fail at
+once. Every delivery has an idempotency key, a hash of the target, the
+destination and the PDF bytes. Delivered keys are recorded in a SQLite
+ledger and skipped when the same delivery is sent again. The key also
+travels with the delivery, as the Message-ID of the mail and the
+Idempotency-Key header of the upload, so a receiver can drop the
+duplicate left by a send whose acknowledgement was lost.
+
+`--jobs` delivers the finished documents of an architect_pdf.jobqueue
+database, taking the targets from each variant's `deliver` list.
+architect_pdf.standins provides local SMTP and upload servers for testing.
+
+    python -m architect_pdf.delivery deliveries.json [--smtp HOST:PORT] [--from ADDR]
+                                     [--upload-url URL] [--token TOKEN] [-c 8] [--ledger deliveries.db]
+    python -m architect_pdf.delivery --jobs jobs.db ...
+"""
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from urllib.parse import urlencode, urlsplit
+import argparse
+import contextlib
+import email.policy
+import email.utils
+import hashlib
+import http.client
+import json
+import os
+import queue
+import random
+import smtplib
+import sqlite3
+import sys
+import threading
+import time
+
+CONCURRENCY = 8
+ATTEMPTS = 4
+BACKOFF = 0.2
+MAX_BACKOFF = 10.0
+TIMEOUT = 30.0
+MIME_CACHE = 32
+UPLOAD_URL = "https://www.googleapis.com"
+UPLOAD_PATH = "/upload/drive/v3/files"
+BOUNDARY = "architect-pdf-upload"
+
+
+class DeliveryError(Exception):
+    """A delivery failed; `transient` failures are worth retrying"""
+
+    def __init__(self, message, transient=False, retry_after=None):
+        super().__init__(message)
+        self.transient = transient
+        self.retry_after = retry_after
+
+
+class ConnectionPool:
+    """At most `size` connections made by `connect`, idle ones reused most recent first.
+
+    A connection is handed back to the pool only when the block using it
+    ends without an error and without closing it; otherwise it is closed and
+    the next user opens a fresh one. With `reuse=False` every use gets a new connection, the
+    unpooled baseline.
+    """
+
+    def __init__(self, connect, size, reuse=True):
+        self._connect = connect
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self.reuse = reuse
+        self.opened = 0
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                self.opened += 1
+            try:
+                yield conn
+            except BaseException:
+                _close(conn)
+                raise
+            if self.reuse and not _closed(conn):
+                self._idle.put(conn)
+            else:
+                _close(conn)
+
+    def close(self):
+        while True:
+            try:
+                _close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def _closed(conn):
+    # Both smtplib and http.client drop `sock` once the connection is closed
+    return getattr(conn, "sock", None) is None
+
+
+def _close(conn):
+    try:
+        if isinstance(conn, smtplib.SMTP):
+            conn.quit()
+        else:
+            conn.close()
+    except (OSError, smtplib.SMTPException):
+        pass
+
+
+class Ledger:
+    """Idempotency keys of completed deliveries, in SQLite"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS delivered (key TEXT PRIMARY KEY, target TEXT NOT NULL,"
+            " destination TEXT NOT NULL, document TEXT NOT NULL, receipt TEXT, delivered_at REAL NOT NULL)"
+        )
+
+    def get(self, key):
+        with self._lock:
+            row = self.db.execute("SELECT receipt FROM delivered WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def record(self, key, delivery, destination, receipt):
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO delivered VALUES (?, ?, ?, ?, ?, ?)",
+                (key, delivery["target"], destination, delivery["document"], receipt, time.time()),
+            )
+
+    def close(self):
+        self.db.close()
+
+
+def destination(delivery):
+    if delivery["target"] == "email":
+        return delivery["to"]
+    if delivery["target"] == "gdrive":
+        return f"{delivery.get('folder', '')}/{delivery.get('name') or os.path.basename(delivery['document'])}"
+    raise DeliveryError(f"unknown target {delivery['target']!r} (expected email or gdrive)")
+
+
+def idempotency_key(delivery, data):
+    payload = "\0".join([delivery["target"], destination(delivery), hashlib.sha256(data).hexdigest()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Deliverer:
+    def __init__(self, *, smtp=None, sender="architect-pdf@localhost", smtp_user=None, smtp_password=None,
+                 starttls=False, upload_url=UPLOAD_URL, token=None, concurrency=CONCURRENCY,
+                 attempts=ATTEMPTS, backoff=BACKOFF, ledger=None, reuse=True, timeout=TIMEOUT):
+        self.sender = sender
+        self.token = token
+        self.concurrency = concurrency
+        self.attempts = attempts
+        self.backoff = backoff
+        self.ledger = ledger
+        self.timeout = timeout
+        # Base64-encoding the attachment costs more than sending it, so each document is encoded once
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.smtp_pool = None
+        if smtp:
+            host, _, port = smtp.rpartition(":")
+            self.smtp_pool = ConnectionPool(
+                lambda: self._smtp_connect(host, int(port), smtp_user, smtp_password, starttls), concurrency, reuse)
+        url = urlsplit(upload_url)
+        self.upload_base = url.path.rstrip("/")
+        conn_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        self.http_pool = ConnectionPool(lambda: conn_class(url.netloc, timeout=timeout), concurrency, reuse)
+
+    def _smtp_connect(self, host, port, user, password, starttls):
+        conn = smtplib.SMTP(host, port, timeout=self.timeout)
+        if starttls:
+            conn.starttls()
+        if user:
+            conn.login(user, password)
+        return conn
+
+    def close(self):
+        if self.smtp_pool:
+            self.smtp_pool.close()
+        self.http_pool.close()
+
+    def _mime_body(self, data, filename, text):
+        """MIME headers and body carrying the text and the PDF, encoded once per document"""
+        key = (hashlib.sha256(data).digest(), filename, text)
+        with self._lock:
+            body = self._bodies.get(key)
+        if body is None:
+            msg = EmailMessage(policy=email.policy.SMTP)
+            msg.set_content(text)
+            msg.add_attachment(data, maintype="application", subtype="pdf", filename=filename)
+            body = msg.as_bytes()
+            with self._lock:
+                if len(self._bodies) >= MIME_CACHE:
+                    self._bodies.clear()
+                self._bodies[key] = body
+        return body
+
+    # ── Targets ──
+    def send_email(self, delivery, data, key):
+        if self.smtp_pool is None:
+            raise DeliveryError("email delivery needs an SMTP server (--smtp)")
+        sender = delivery.get("from", self.sender)
+        head = EmailMessage(policy=email.policy.SMTP)
+        filename = delivery.get("name") or os.path.basename(delivery["document"])
+        try:
+            head["From"] = sender
+            head["To"] = delivery["to"]
+            head["Subject"] = delivery.get("subject", os.path.basename(delivery["document"]))
+            head["Message-ID"] = f"<{key[:40]}@architect-pdf>"
+            head["Date"] = email.utils.formatdate()
+            message = head.as_bytes().rstrip(b"\r\n") + b"\r\n" + self._mime_body(data, filename, delivery.get("body", ""))
+        except (ValueError, TypeError) as e:
+            # A malformed address or header (e.g. a line break in the subject) fails every time
+            raise DeliveryError(f"bad message: {e}")
+        refused = None
+        try:
+            with self.smtp_pool.connection() as conn:
+                try:
+                    conn.sendmail(sender, [delivery["to"]], message)
+                except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                    # smtplib resets the transaction, so the session goes back to the pool
+                    refused = e
+        except (OSError, smtplib.SMTPException) as e:
+            raise DeliveryError(f"SMTP connection: {e}", transient=True)
+        if isinstance(refused, smtplib.SMTPResponseException):
+            raise DeliveryError(f"SMTP {refused.smtp_code}: {refused.smtp_error.decode('utf-8', 'replace')}",
+                                transient=400 <= refused.smtp_code < 500)
+        if refused is not None:
+            codes = [code for code, _ in refused.recipients.values()]
+            raise DeliveryError(f"recipients refused: {refused.recipients}",
+                                transient=all(400 <= code < 500 for code in codes))
+        return head["Message-ID"]
+
+    def upload(self, delivery, data, key):
+        metadata = {"name": delivery.get("name") or os.path.basename(delivery["document"]), "mimeType": "application/pdf"}
+        if delivery.get("folder"):
+            metadata["parents"] = [delivery["folder"]]
+        body = b"".join([
+            f"--{BOUNDARY}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode(),
+            json.dumps(metadata).encode("utf-8"),
+            f"\r\n--{BOUNDARY}\r\nContent-Type: application/pdf\r\n\r\n".encode(),
+            data,
+            f"\r\n--{BOUNDARY}--\r\n".encode(),
+        ])
+        headers = {"Content-Type": f"multipart/related; boundary={BOUNDARY}", "Idempotency-Key": key}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        target = f"{self.upload_base}{UPLOAD_PATH}?{urlencode({'uploadType': 'multipart'})}"
+        try:
+            with self.http_pool.connection() as conn:
+                conn.request("POST", target, body, headers)
+                response = conn.getresponse()
+                payload = response.read()
+                if response.will_close:
+                    # The answer stands; only the connection ends, so the pool drops it
+                    conn.close()
+        except (OSError, http.client.HTTPException) as e:
+            raise DeliveryError(f"upload connection: {e}", transient=True)
+        if response.status >= 300:
+            retry_after = response.getheader("Retry-After")
+            raise DeliveryError(
+                f"HTTP {response.status}: {payload[:200].decode('utf-8', 'replace')}",
+                transient=response.status == 429 or response.status >= 500,
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        try:
+            receipt = json.loads(payload)
+        except ValueError:
+            receipt = None
+        if not isinstance(receipt, dict):
+            # A 2xx that is not the API's answer, e.g. a proxy's HTML page: the upload is unconfirmed
+            raise DeliveryError(f"HTTP {response.status} with an unexpected body: "
+                                f"{payload[:200].decode('utf-8', 'replace')}", transient=False)
+        return receipt.get("id")
+
+    # ── Delivery ──
+    def deliver(self, delivery):
+        """Deliver one document with retries; never raises, errors are returned in the result"""
+        start = time.perf_counter()
+        result = {"document": delivery["document"], "target": delivery["target"], "attempts": 0}
+        try:
+            result["destination"] = destination(delivery)
+            with open(delivery["document"], "rb") as f:
+                data = f.read()
+            key = idempotency_key(delivery, data)
+            receipt = self.ledger.get(key) if self.ledger else None
+            if receipt is not None:
+                result.update(status="skipped", receipt=receipt, seconds=time.perf_counter() - start)
+                return result
+            send = self.send_email if delivery["target"] == "email" else self.upload
+            while True:
+                result["attempts"] += 1
+                try:
+                    receipt = send(delivery, data, key)
+                    break
+                except DeliveryError as e:
+                    if not e.transient or result["attempts"] >= self.attempts:
+                        raise
+                    # Full jitter: spread the retries of a burst of failures apart
+                    delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** (result["attempts"] - 1)))
+                    time.sleep(max(delay, e.retry_after or 0))
+            if self.ledger:
+                self.ledger.record(key, delivery, result["destination"], receipt)
+            result.update(status="delivered", receipt=receipt)
+        except (OSError, KeyError, ValueError, DeliveryError) as e:
+            result.update(status="failed", error=f"{type(e).__name__}: {e}")
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    def deliver_all(self, deliveries):
+        """Deliver on `concurrency` threads, yielding results in input order"""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            yield from pool.map(self.deliver, deliveries)
+
+
+def load_deliveries(path):
+    with open(path, encoding="utf-8") as f:
+        deliveries = json.load(f)
+    return deliveries["deliveries"] if isinstance(deliveries, dict) else deliveries
+
+
+def deliveries_from_jobs(path):
+    """Deliveries for the finished documents of a job queue, from each variant's `deliver` list"""
+    db = sqlite3.connect(path)
+    try:
+        rows = db.execute("SELECT variant, output FROM jobs WHERE status = 'done' ORDER BY id").fetchall()
+    finally:
+        db.close()
+    return [{**target, "document": output} for variant, output in rows for target in json.loads(variant).get("deliver", [])]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deliver finished PDFs by email and to Google Drive")
+    parser.add_argument("deliveries", nargs="?", help="JSON list of deliveries")
+    parser.add_argument("--jobs", help="deliver the finished documents of this architect_pdf.jobqueue database")
+    parser.add_argument("--smtp", help="SMTP server as HOST:PORT")
+    parser.add_argument("--smtp-user", default=os.environ.get("SMTP_USER"))
+    parser.add_argument("--smtp-password", default=os.environ.get("SMTP_PASSWORD"))
+    parser.add_argument("--starttls", action="store_true")
+    parser.add_argument("--from", dest="sender", default="architect-pdf@localhost", help="sender address")
+    parser.add_argument("--upload-url", default=UPLOAD_URL, help="Drive API base URL (or a local stand-in)")
+    parser.add_argument("--token", default=os.environ.get("GDRIVE_TOKEN"), help="OAuth access token for uploads")
+    parser.add_argument("-c", "--concurrency", type=int, default=CONCURRENCY, help="deliveries in flight and connections per pool")
+    parser.add_argument("--attempts", type=int, default=ATTEMPTS, help="tries per delivery on transient errors")
+    parser.add_argument("--ledger", default="deliveries.db", help="SQLite ledger of completed deliveries")
+    args = parser.parse_args(argv)
+    if bool(args.deliveries) == bool(args.jobs):
+        parser.error("give either a deliveries file or --jobs")
+
+    deliveries = deliveries_from_jobs(args.jobs) if args.jobs else load_deliveries(args.deliveries)
+    ledger = Ledger(args.ledger)
+    deliverer = Deliverer(smtp=args.smtp, sender=args.sender, smtp_user=args.smtp_user,
+                          smtp_password=args.smtp_password, starttls=args.starttls, upload_url=args.upload_url,
+                          token=args.token, concurrency=args.concurrency, attempts=args.attempts, ledger=ledger)
+    start = time.perf_counter()
+    counts = dict.fromkeys(("delivered", "skipped", "failed"), 0)
+    try:
+        for r in deliverer.deliver_all(deliveries):
+            counts[r["status"]] += 1
+            if r["status"] == "failed":
+                print(f"FAIL  {r['target']} {r['document']}: {r['error']} (after {r['attempts']} attempts)", flush=True)
+    finally:
+        deliverer.close()
+        ledger.close()
+    elapsed = time.perf_counter() - start
+    print(f"{counts['delivered']} delivered, {counts['skipped']} already delivered, {counts['failed']} failed "
+          f"in {elapsed:.2f}s ({counts['delivered'] / elapsed if elapsed else 0:.1f} documents/s)")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
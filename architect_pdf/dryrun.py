@@ -0,0 +1,180 @@
+"""
+Dry-run layout: pagination of the introduction document without a PDF.
+
+The story goes through reportlab's ordinary build loop, so wrap, split,
+keep-with-next and page breaks behave exactly as in `build_intro_pdf`, but
+nothing is drawn or serialized. Each page's frame is a `LayoutFrame`, which
+places a flowable by recording it instead of calling its `drawOn`. The page
+callbacks (header and footer) are skipped and the canvas never saves.
+
+The JSON report holds the page count, the page each section starts on
+(the numbers a TOC would print) and how many pages it touches, and two
+kinds of warning:
+
+    overflow   a flowable wider than its frame, drawn past the right margin
+    too_large  a flowable that fits no empty frame; reportlab would abort
+               the build, the dry run drops it and continues
+
+    python -m architect_pdf.dryrun [--lang ko] [--content JSON] [--theme NAME] [-o report.json]
+    python generate_intro_pdf.py --dry-run [--lang ko] [--content JSON] [--theme NAME]
+"""
+from io import BytesIO
+import argparse
+import functools
+import json
+import re
+import sys
+import time
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Frame, PageBreak
+from reportlab.platypus.doctemplate import LayoutError
+
+import generate_intro_pdf as intro
+from architect_pdf.pagecache import plain_text
+from architect_pdf.streaming import StreamingDocTemplate
+
+# Overflow below this many points is rounding in the column widths
+OVERFLOW_TOLERANCE = 0.01
+IDENTITY_CHARS = 60
+# Object addresses in reportlab's flowable identities differ from run to run
+_ADDRESS = re.compile(r"(?:@| at )0x[0-9a-fA-F]+")
+
+
+def _clean(identity):
+    return _ADDRESS.sub("", " ".join(identity.split()))
+
+
+class LayoutCanvas(Canvas):
+    """Canvas whose pages are never serialized"""
+
+    def save(self):
+        pass
+
+
+class LayoutFrame(Frame):
+    """Frame that places flowables without drawing them, noting those wider than itself"""
+
+    def _add(self, flowable, canv, trySplit=0):
+        # Frame._add ends by calling drawOn; an instance attribute shadows the method
+        flowable.drawOn = functools.partial(self._place, flowable)
+        try:
+            return super()._add(flowable, canv, trySplit)
+        finally:
+            del flowable.drawOn
+
+    # Frame binds `add` to its own _add
+    add = _add
+
+    def _place(self, flowable, canv, x, y, _sW=0):
+        # _sW is the frame width left over beside the flowable
+        if _sW < -OVERFLOW_TOLERANCE:
+            canv._doctemplate.warnings.append({
+                "kind": "overflow",
+                "page": canv.getPageNumber(),
+                "flowable": _clean(flowable.identity(IDENTITY_CHARS)),
+                "width": round(self._getAvailableWidth() - _sW, 2),
+                "available": round(self._getAvailableWidth(), 2),
+            })
+
+
+class LayoutDocTemplate(StreamingDocTemplate):
+    """Document template that paginates the story and collects warnings"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.warnings = []
+
+    def addPageTemplates(self, pageTemplates):
+        if not isinstance(pageTemplates, (list, tuple)):
+            pageTemplates = [pageTemplates]
+        layout_frames = {}
+        for template in pageTemplates:
+            template.frames = [layout_frames.get(id(frame)) or layout_frames.setdefault(id(frame), LayoutFrame(
+                frame._x1, frame._y1, frame._width, frame._height,
+                leftPadding=frame._leftPadding, bottomPadding=frame._bottomPadding,
+                rightPadding=frame._rightPadding, topPadding=frame._topPadding, id=frame.id,
+            )) for frame in template.frames]
+        super().addPageTemplates(pageTemplates)
+
+    def handle_flowable(self, flowables):
+        try:
+            super().handle_flowable(flowables)
+        except LayoutError as e:
+            # The flowable is already off the list, so the build goes on without it
+            self.warnings.append({"kind": "too_large", "page": self.page, "message": _clean(str(e))})
+
+
+def layout_report(*, lang="ko", content=None, fonts=None, theme=None):
+    """Paginate the document like `build_intro_pdf` and return the report as a dict"""
+    if content is None:
+        if lang not in intro.INTRO_CONTENT:
+            raise ValueError(f"Unsupported language: {lang!r} (expected one of {sorted(intro.INTRO_CONTENT)})")
+        content = intro.INTRO_CONTENT[lang]
+    intro.register_fonts(fonts)
+    # A theme's fonts change the line breaks
+    intro.use_theme(theme)
+
+    start = time.perf_counter()
+    story, starts = [], {}
+    for i, group in enumerate(intro.page_groups(content)):
+        if i:
+            story.append(PageBreak())
+        for part in group:
+            flowables = intro.group_flowables([part])
+            if part[0] == "section":
+                starts[id(flowables[0])] = part[1]
+            story.extend(flowables)
+
+    doc = intro.make_doc(BytesIO(), doc_class=LayoutDocTemplate)
+    sections = []
+
+    def after_flowable(flowable):
+        section = starts.get(id(flowable))
+        if section is not None:
+            sections.append({"key": section["key"], "title": plain_text(section["title"]), "page": doc.page})
+
+    doc.afterFlowable = after_flowable
+    doc.build(story, canvasmaker=LayoutCanvas)
+    by_key = {section["key"]: section for section in content["sections"]}
+    for section, following in zip(sections, sections[1:] + [None]):
+        if following is None:
+            last = doc.page
+        else:
+            # A section without a page break after it shares its last page with the next one
+            last = following["page"] - (1 if by_key[section["key"]].get("page_break", True) else 0)
+        section["pages"] = last - section["page"] + 1
+    return {
+        "pages": doc.page,
+        "sections": sections,
+        "warnings": doc.warnings,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the pagination of the introduction PDF without rendering it")
+    parser.add_argument("--lang", default="ko", choices=sorted(intro.INTRO_CONTENT))
+    parser.add_argument("--content", help="JSON file replacing the built-in content")
+    parser.add_argument("--theme", help="theme profile name or JSON file (see architect_pdf.themes)")
+    parser.add_argument("-o", "--output", help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    content = None
+    if args.content:
+        with open(args.content, encoding="utf-8") as f:
+            content = json.load(f)
+    report = layout_report(lang=args.lang, content=content, theme=args.theme)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    # Content a real build would fail on fails the dry run too
+    if any(warning["kind"] == "too_large" for warning in report["warnings"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
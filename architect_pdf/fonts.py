@@ -0,0 +1,334 @@
+"""
+Korean font discovery and a persistent cache of parsed TrueType faces.
+
+Discovery searches the Windows, macOS and fontconfig-style Linux font
+directories for known Korean faces. Parsing a multi-megabyte CJK font
+through `TTFont` dominates start-up, so the parsed tables and metrics are
+pickled to disk, keyed by path, mtime and size; later processes only read
+the raw font bytes (still needed for subsetting) and unpickle the metrics.
+Registered fonts measure text through the width tables of
+architect_pdf.metrics.
+
+Glyphs the Korean face lacks (emoji, rare Hanja, arrows and other symbols)
+are drawn from a fallback chain. The code points each font covers are
+stored as a bitset, cached on disk next to the parsed faces, and combined
+into a `CoverageIndex` naming the font that draws each character: the
+primary face wherever it has the glyph, otherwise the first fallback that
+has it. `FallbackTTFont` splits every string into runs by that index and
+routes each run to the subsets of its own font; a fallback face is only
+parsed and embedded once a character actually needs it.
+"""
+from reportlab import rl_config
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace, TTEncoding, TTFError
+from reportlab.pdfbase import pdfmetrics
+from fnmatch import fnmatch
+from itertools import groupby
+from weakref import WeakKeyDictionary
+import functools
+import hashlib
+import os
+import pickle
+import reportlab
+import sys
+
+from architect_pdf.metrics import CoverageIndex, WidthTable, bitset
+
+# Preference order. The Windows entries keep the original generator's
+# choice (Malgun Gothic Bold for body text) so its output is unchanged.
+KOREAN_REGULAR_FACES = [
+    "malgunbd.ttf",
+    "malgun.ttf",
+    "NanumGothic.ttf",
+    "NanumBarunGothic.ttf",
+    "NotoSansKR-Regular.ttf",
+    "NotoSansKR-VariableFont_wght.ttf",
+    "UnDotum.ttf",
+    "AppleSDGothicNeo.ttc",
+    "gulim.ttc",
+    # Most Noto Sans CJK builds use CFF outlines, which reportlab cannot
+    # embed; they are tried last and the failure is cached.
+    "NotoSansCJK-Regular.ttc",
+    "NotoSansCJKkr-Regular.otf",
+]
+KOREAN_BOLD_FACES = [
+    "malgunbd.ttf",
+    "NanumGothicBold.ttf",
+    "NanumBarunGothicBold.ttf",
+    "NotoSansKR-Bold.ttf",
+    "UnDotumBold.ttf",
+    "NotoSansCJK-Bold.ttc",
+    "NotoSansCJKkr-Bold.otf",
+]
+# Symbol, emoji and wide-coverage faces tried, in order, for glyphs the
+# Korean face lacks
+FALLBACK_FACES = [
+    "seguisym.ttf",
+    "seguiemj.ttf",
+    "batang.ttc",
+    "Apple Symbols.ttf",
+    "NotoSansSymbols-Regular.ttf",
+    "NotoSansSymbols2-Regular.ttf",
+    "NotoEmoji-Regular.ttf",
+    "Symbola.ttf",
+    "DejaVuSans.ttf",
+    "NanumMyeongjo.ttf",
+    "UnBatang.ttf",
+]
+FALLBACK_PREFIX = "Fallback"
+
+CACHE_FORMAT = 1
+
+
+def font_dirs():
+    """Font directories in search order, following the fontconfig defaults"""
+    home = os.path.expanduser("~")
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(home, ".local", "share")
+    data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    dirs = [os.path.join(data_home, "fonts"), os.path.join(home, ".fonts")]
+    dirs += [os.path.join(d, "fonts") for d in data_dirs if d]
+    if sys.platform == "darwin":
+        dirs += [os.path.join(home, "Library", "Fonts"), "/Library/Fonts", "/System/Library/Fonts"]
+    windir = os.environ.get("WINDIR", "C:/Windows")
+    dirs.append(os.path.join(windir, "Fonts"))
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+_font_index = None
+
+
+def _index_fonts():
+    """Map lower-cased file name -> path for every font under font_dirs()"""
+    global _font_index
+    if _font_index is None:
+        index = {}
+        for root in font_dirs():
+            for dirpath, _, filenames in os.walk(root, followlinks=True):
+                for filename in filenames:
+                    index.setdefault(filename.lower(), os.path.join(dirpath, filename))
+        _font_index = index
+    return _font_index
+
+
+def find_fonts(names):
+    """Paths of the installed fonts among `names`, in the given order"""
+    index = _index_fonts()
+    return [index[name.lower()] for name in names if name.lower() in index]
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.environ.get("ARCHITECT_PDF_CACHE") or os.path.join(base, "architect-pdf")
+
+
+_font_digests = {}
+
+
+def font_digest(path):
+    """SHA-256 of a font file, memoized per path, mtime and size"""
+    st = os.stat(path)
+    memo = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if memo not in _font_digests:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _font_digests[memo] = h.hexdigest()
+    return _font_digests[memo]
+
+
+def _cache_path(cache_dir, path, subfont_index, kind="fonts"):
+    st = os.stat(path)
+    key = repr((CACHE_FORMAT, reportlab.Version, os.path.abspath(path), st.st_mtime_ns, st.st_size, subfont_index))
+    return os.path.join(cache_dir, kind, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".pickle")
+
+
+def _pdf_scale(units_per_em, x):
+    return x * (1000 / units_per_em)
+
+
+def _read_cached_face(cache_file, path):
+    try:
+        with open(cache_file, "rb") as f:
+            state = pickle.load(f)
+    except Exception:
+        # Missing, truncated or stale entry: parse the font and overwrite it
+        return None
+    if isinstance(state, str):
+        raise TTFError(state)
+    face = TTFontFace.__new__(TTFontFace)
+    pdfmetrics.TypeFace.__init__(face, None)
+    face.__dict__.update(state)
+    # The parser's glyph-unit scaler is a closure; rebuild it from the metrics
+    face._pdfScale = functools.partial(_pdf_scale, face.unitsPerEm)
+    with open(path, "rb") as f:
+        face._ttf_data = f.read()
+    return face
+
+
+def _write_cache(cache_file, state):
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        # A read-only cache directory only costs us the speed-up
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_face(path, subfont_index=0, cache_dir=None):
+    """Parsed `TTFontFace` for `path`, served from the on-disk cache if possible"""
+    cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+    if not cache_dir:
+        return TTFontFace(path, subfontIndex=subfont_index)
+    cache_file = _cache_path(cache_dir, path, subfont_index)
+    face = _read_cached_face(cache_file, path)
+    if face is not None:
+        return face
+    try:
+        face = TTFontFace(path, subfontIndex=subfont_index)
+    except TTFError as e:
+        # Remember unsupported files (e.g. CFF outlines) so they are not re-parsed
+        _write_cache(cache_file, str(e))
+        raise
+    state = dict(face.__dict__)
+    state.pop("_ttf_data", None)
+    state.pop("_pdfScale", None)
+    _write_cache(cache_file, state)
+    return face
+
+
+class CachedTTFont(TTFont):
+    """`TTFont` built around an already parsed face, measuring through a `WidthTable`"""
+
+    def __init__(self, name, face, asciiReadable=None, shapable=True):
+        self.fontName = name
+        self.face = face
+        self.encoding = TTEncoding()
+        self.state = WeakKeyDictionary()
+        if asciiReadable is None:
+            asciiReadable = rl_config.ttfAsciiReadable
+        self._asciiReadable = asciiReadable
+        self.shapable = shapable and not any(fnmatch(name, g) for g in rl_config.unShapedFontGlob)
+        self.width_table = WidthTable(face)
+
+    def stringWidth(self, text, size, encoding="utf8"):
+        if isinstance(text, bytes):
+            text = text.decode(encoding or "utf8")
+        return 0.001 * size * self.width_table[text]
+
+
+class FallbackTTFont(CachedTTFont):
+    """`CachedTTFont` drawing the glyphs its face lacks from a chain of fallback fonts.
+
+    `fallbacks` lists (name, path) pairs; owner i of `coverage` is the
+    i-th of them. Runs drawn by a fallback get the subset `(owner, n)`,
+    which `getSubsetInternalName` resolves to subset n of that font, so
+    reportlab's text output switches fonts wherever the subset changes.
+    Shaping works on one font at a time and is turned off.
+    """
+
+    def __init__(self, name, face, fallbacks, coverage, asciiReadable=None):
+        super().__init__(name, face, asciiReadable, shapable=False)
+        self.fallbacks = fallbacks
+        self.coverage = coverage
+        self.width_table = WidthTable(face, self)
+
+    def member(self, owner):
+        return _member_font(*self.fallbacks[owner - 1])
+
+    def face_at(self, owner):
+        return self.member(owner).face
+
+    def splitString(self, text, doc, encoding="utf-8"):
+        if isinstance(text, bytes):
+            text = text.decode(encoding)
+        owners = self.coverage.owners(text)
+        if owners is None:
+            return super().splitString(text, doc)
+        results, start = [], 0
+        for owner, run in groupby(owners):
+            end = start + sum(1 for _ in run)
+            if owner:
+                results += [((owner, subset), chunk) for subset, chunk in self.member(owner).splitString(text[start:end], doc)]
+            else:
+                results += super().splitString(text[start:end], doc)
+            start = end
+        return results
+
+    def getSubsetInternalName(self, subset, doc):
+        if isinstance(subset, tuple):
+            owner, subset = subset
+            return self.member(owner).getSubsetInternalName(subset, doc)
+        return super().getSubsetInternalName(subset, doc)
+
+
+def load_font(alias, path, cache_dir=None):
+    subfont_index = 0  # first face of a .ttc collection
+    return CachedTTFont(alias, load_face(path, subfont_index, cache_dir))
+
+
+def load_first_font(alias, candidates, cache_dir=None):
+    """Load the first usable font among `candidates`; returns (font, path)"""
+    errors = []
+    for path in candidates:
+        try:
+            return load_font(alias, path, cache_dir), path
+        except (OSError, TTFError) as e:
+            errors.append(f"{path}: {e}")
+    detail = "; ".join(errors) or f"searched {', '.join(font_dirs()) or 'no font directories'}"
+    raise TTFError(
+        f"No usable font for {alias!r} ({detail}). "
+        "Install a Korean TrueType font such as fonts-nanum, or pass fonts={...} explicitly."
+    )
+
+
+def coverage(path, cache_dir=None):
+    """Bitset of the code points `path` has glyphs for, or None if the font is unusable"""
+    cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+    cache_file = _cache_path(cache_dir, path, 0, "coverage") if cache_dir else None
+    if cache_file:
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass
+    try:
+        bits = bitset(load_face(path, 0, cache_dir).charToGlyph)
+    except (OSError, TTFError):
+        bits = None
+    if cache_file:
+        _write_cache(cache_file, bits)
+    return bits
+
+
+def fallback_chain(paths, cache_dir=None):
+    """(name, path) of every usable font among `paths`, named Fallback1, Fallback2, ..."""
+    usable = [path for path in paths if coverage(path, cache_dir) is not None]
+    return [(f"{FALLBACK_PREFIX}{i}", path) for i, path in enumerate(usable, 1)]
+
+
+_members = {}
+_indexes = {}
+
+
+def _member_font(name, path):
+    # Shared by every font whose chain holds it, so its subsets are embedded once per document
+    font = _members.get((name, path))
+    if font is None:
+        font = _members[name, path] = load_font(name, path)
+    return font
+
+
+def with_fallbacks(font, path, chain, cache_dir=None):
+    """`font` (loaded from `path`) drawing missing glyphs from the (name, path) pairs of `chain`"""
+    chain = [(name, p) for name, p in chain if os.path.realpath(p) != os.path.realpath(path)]
+    if not chain:
+        return font
+    key = (path, tuple(chain))
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = CoverageIndex([coverage(p, cache_dir) or b"" for p in [path] + [p for _, p in chain]])
+    return FallbackTTFont(font.fontName, font.face, chain, index, font._asciiReadable)
@@ -0,0 +1,384 @@
+"""
+Durable, resumable batch rendering backed by a SQLite job table.
+
+`add` loads a batch manifest (see architect_pdf.batch) into the table, one
+job per variant, keyed by variant name. Each job stores a hash of its
+render inputs, the ones architect_pdf.outputcache keys renders by: the
+variant's content and language, the theme digest (images and fonts by
+content), the font files and the renderer source. Adding the same manifest
+again keeps finished jobs and only resets those whose inputs or output
+path changed, so an edited logo or generator re-renders what it affects. `run` starts worker processes that
+claim pending jobs one at a time, render them and record the outcome:
+status, attempts, duration, page count, output size, error.
+
+A claim is a single `BEGIN IMMEDIATE` transaction that picks the oldest
+claimable job and marks it running under the worker's host and PID with
+a lease of `LEASE` seconds, so any number of workers, in one `run` or in
+several, never take the same job. While it renders, the worker renews
+the lease from a heartbeat thread. A failed render goes back to pending
+until it has used `max_attempts`, then stays failed. If a run dies, its
+running jobs are reclaimed by the next claim on the same host as soon as
+the PID is gone, and from any host once their lease has expired (a live
+PID on the same host may be a new process that reused the number). A
+result is only recorded while its worker still owns the job; a worker
+whose job was reclaimed meanwhile discards its result. Rerunning therefore resumes
+exactly where the last run stopped; finished jobs are never rendered
+twice.
+
+    python -m architect_pdf.jobqueue jobs.db add manifest.json [--out-dir DIR] [--max-attempts 3]
+    python -m architect_pdf.jobqueue jobs.db run [-j N]
+    python -m architect_pdf.jobqueue jobs.db summary [--slowest 10]
+    python -m architect_pdf.jobqueue jobs.db retry
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+import generate_intro_pdf as intro
+from architect_pdf import batch
+from architect_pdf.outputcache import render_key
+
+MAX_ATTEMPTS = 3
+# A running job whose lease was not renewed for this long is taken over, whatever its PID
+LEASE = 600
+# Lease renewals per lease period while a job renders
+HEARTBEATS = 3
+STATUSES = ("pending", "running", "done", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    variant TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    output TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    claimed_at REAL,
+    lease_until REAL,
+    finished_at REAL,
+    seconds REAL,
+    pages INTEGER,
+    bytes INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+def variant_hash(variant, fonts):
+    """Hash of the variant's render inputs with the alias -> path `fonts` (see outputcache.render_key)"""
+    try:
+        content = batch.variant_content(variant)
+        # Applied first, like outputcache.build_cached, so the key sees the theme's colors
+        theme = intro.use_theme(variant.get("theme"))
+    except Exception:
+        # The render will fail and say why; until the variant changes, so does its hash
+        return hashlib.sha256(json.dumps(variant, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return render_key(content, variant.get("lang", "ko"), fonts, theme)
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to someone else (PermissionError), or kill is unsupported
+        return True
+    return True
+
+
+class JobQueue:
+    def __init__(self, path, lease=LEASE):
+        self.path = path
+        self.lease = lease
+        # Autocommit mode: transactions are opened explicitly where they matter
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SCHEMA)
+        if "lease_until" not in {row["name"] for row in self.db.execute("PRAGMA table_info(jobs)")}:
+            # Databases from before leases were renewed
+            self.db.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+
+    def close(self):
+        self.db.close()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        # IMMEDIATE takes the write lock up front, so two claims cannot read the same row
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def add(self, variants, out_dir=".", max_attempts=MAX_ATTEMPTS, fonts=None):
+        """Queue `variants`; returns (added, changed, unchanged) counts"""
+        counts = [0, 0, 0]
+        fonts = intro.register_fonts(fonts)
+        try:
+            digests = [variant_hash(variant, fonts) for variant in variants]
+        finally:
+            intro.use_theme()
+        with self.transaction() as db:
+            for variant, digest in zip(variants, digests):
+                output = os.path.abspath(os.path.join(out_dir, variant.get("output") or f"{variant['name']}.pdf"))
+                row = db.execute("SELECT content_hash, output FROM jobs WHERE name = ?", (variant["name"],)).fetchone()
+                if row is None:
+                    db.execute(
+                        "INSERT INTO jobs (name, variant, content_hash, output, max_attempts) VALUES (?, ?, ?, ?, ?)",
+                        (variant["name"], json.dumps(variant, ensure_ascii=False), digest, output, max_attempts),
+                    )
+                    counts[0] += 1
+                elif row["content_hash"] != digest or row["output"] != output:
+                    db.execute(
+                        "UPDATE jobs SET variant = ?, content_hash = ?, output = ?, max_attempts = ?, status = 'pending',"
+                        " attempts = 0, worker = NULL, claimed_at = NULL, lease_until = NULL, finished_at = NULL, seconds = NULL,"
+                        " pages = NULL, bytes = NULL, error = NULL WHERE name = ?",
+                        (json.dumps(variant, ensure_ascii=False), digest, output, max_attempts, variant["name"]),
+                    )
+                    counts[1] += 1
+                else:
+                    counts[2] += 1
+        return tuple(counts)
+
+    def _reclaim(self, db, now):
+        """Return running jobs whose worker is gone to the queue; they count the failed attempt"""
+        host = socket.gethostname()
+        for row in db.execute("SELECT id, worker, claimed_at, lease_until, attempts, max_attempts FROM jobs"
+                              " WHERE status = 'running'").fetchall():
+            worker_host, _, pid = row["worker"].rpartition(":")
+            gone = worker_host == host and not _pid_alive(int(pid))
+            lease_until = row["lease_until"] if row["lease_until"] is not None else row["claimed_at"] + self.lease
+            if not gone and lease_until > now:
+                continue
+            status = "pending" if row["attempts"] < row["max_attempts"] else "failed"
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL, error = ? WHERE id = ?",
+                (status, f"worker {row['worker']} stopped during the render", row["id"]),
+            )
+
+    def claim(self, worker=None):
+        """Mark the oldest pending job running for `worker`; returns (id, variant, output) or None"""
+        now = time.time()
+        with self.transaction() as db:
+            self._reclaim(db, now)
+            row = db.execute("SELECT id, variant, output FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, claimed_at = ?, lease_until = ?,"
+                " attempts = attempts + 1 WHERE id = ?",
+                (worker or worker_id(), now, now + self.lease, row["id"]),
+            )
+        return row["id"], json.loads(row["variant"]), row["output"]
+
+    def renew(self, job_id, worker=None):
+        """Extend the lease of a job `worker` is running; False if it no longer owns it"""
+        with self.transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time() + self.lease, job_id, worker or worker_id()),
+            ).rowcount == 1
+
+    def complete(self, job_id, result, worker=None):
+        """Record a render result from batch.render_variant.
+
+        Returns False, recording nothing, if `worker` no longer owns the job
+        because it was reclaimed while rendering.
+        """
+        owner = (job_id, worker or worker_id())
+        with self.transaction() as db:
+            if result["ok"]:
+                updated = db.execute(
+                    "UPDATE jobs SET status = 'done', worker = NULL, lease_until = NULL, finished_at = ?, seconds = ?,"
+                    " pages = ?, bytes = ?, error = NULL WHERE id = ? AND worker = ? AND status = 'running'",
+                    (time.time(), result["seconds"], result["pages"], result["bytes"], *owner),
+                ).rowcount
+            else:
+                updated = db.execute(
+                    "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'pending' ELSE 'failed' END,"
+                    " worker = NULL, lease_until = NULL, finished_at = ?, seconds = ?, error = ?"
+                    " WHERE id = ? AND worker = ? AND status = 'running'",
+                    (time.time(), result["seconds"], result["error"], *owner),
+                ).rowcount
+        return updated == 1
+
+    def retry_failed(self):
+        """Give every failed job a fresh set of attempts; returns how many"""
+        with self.transaction() as db:
+            return db.execute("UPDATE jobs SET status = 'pending', attempts = 0 WHERE status = 'failed'").rowcount
+
+    def counts(self):
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return counts
+
+    def summary(self, slowest=10):
+        """Status counts, throughput and the slowest and failed jobs"""
+        done, busy, size, pages, retried = self.db.execute(
+            "SELECT COUNT(*), SUM(seconds), SUM(bytes), SUM(pages), SUM(attempts > 1) FROM jobs WHERE status = 'done'"
+        ).fetchone()
+        # Wall time is the union of the claim-to-finish spans, so the pause
+        # between an interrupted run and its resumption does not count
+        wall, end = 0, None
+        for claimed, finished in self.db.execute(
+                "SELECT claimed_at, finished_at FROM jobs WHERE status = 'done' ORDER BY claimed_at"):
+            if end is None or claimed > end:
+                wall, end = wall + finished - claimed, finished
+            elif finished > end:
+                wall, end = wall + finished - end, finished
+        return {
+            "counts": self.counts(),
+            "done": {
+                "documents": done, "pages": pages or 0, "bytes": size or 0, "retried": retried or 0,
+                "render_seconds": busy or 0, "wall_seconds": wall,
+                "documents_per_second": done / wall if wall else 0,
+            },
+            "slowest": [dict(row) for row in self.db.execute(
+                "SELECT name, seconds, pages, bytes, attempts FROM jobs WHERE status = 'done'"
+                " ORDER BY seconds DESC LIMIT ?", (slowest,))],
+            "failed": [dict(row) for row in self.db.execute(
+                "SELECT name, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id")],
+        }
+
+
+@contextlib.contextmanager
+def heartbeat(path, job_id, worker, lease=LEASE):
+    """Renew the lease of `job_id` every `lease / HEARTBEATS` seconds while the block runs"""
+    stop = threading.Event()
+
+    def beat():
+        # SQLite connections stay in their thread; this one is the heartbeat's own
+        queue = JobQueue(path, lease)
+        try:
+            while not stop.wait(lease / HEARTBEATS):
+                if not queue.renew(job_id, worker):
+                    return
+        finally:
+            queue.close()
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def work(path, lease=LEASE):
+    """Claim and render jobs until none is pending; returns how many were rendered"""
+    queue = JobQueue(path, lease)
+    worker = worker_id()
+    rendered = 0
+    try:
+        while True:
+            job = queue.claim(worker)
+            if job is None:
+                return rendered
+            job_id, variant, output = job
+            with heartbeat(path, job_id, worker, lease):
+                result = batch.render_variant({**variant, "output": output})
+            if not queue.complete(job_id, result, worker):
+                print(f"LOST  {variant['name']}: reclaimed by another worker, result discarded", flush=True)
+                continue
+            rendered += 1
+            if result["ok"]:
+                print(f"done  {variant['name']} ({result['seconds']:.2f}s) -> {output}", flush=True)
+            else:
+                print(f"FAIL  {variant['name']}: {result['error']}", flush=True)
+    finally:
+        queue.close()
+
+
+def run(path, workers=None, fonts=None, lease=LEASE):
+    """Render every claimable job of the queue at `path` in `workers` processes"""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=batch._init_worker, initargs=(fonts,)) as pool:
+        return sum(pool.map(work, [path] * workers, [lease] * workers))
+
+
+def format_summary(summary):
+    counts, done = summary["counts"], summary["done"]
+    lines = [
+        "  ".join(f"{status} {counts[status]}" for status in STATUSES),
+        f"{done['documents']} documents, {done['pages']} pages, {done['bytes'] / 2**20:.1f} MB; "
+        f"{done['render_seconds']:.1f}s rendering over {done['wall_seconds']:.1f}s wall "
+        f"({done['documents_per_second']:.1f} documents/s), {done['retried']} needed a retry",
+    ]
+    if summary["slowest"]:
+        lines += ["", f"{'slowest':<28} {'seconds':>8} {'pages':>5} {'KB':>8} {'attempts':>8}"]
+        for job in summary["slowest"]:
+            lines.append(f"{job['name']:<28} {job['seconds']:>8.3f} {job['pages']:>5} "
+                         f"{job['bytes'] / 1024:>8.1f} {job['attempts']:>8}")
+    if summary["failed"]:
+        lines += ["", "failed:"]
+        lines += [f"  {job['name']} after {job['attempts']} attempts: {job['error']}" for job in summary["failed"]]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render document variants through a durable SQLite job queue")
+    parser.add_argument("database", help="SQLite job database (created if missing)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="queue the variants of a manifest")
+    add.add_argument("manifest", help="JSON manifest of variants (see architect_pdf.batch)")
+    add.add_argument("--out-dir", help="output directory (default: next to the manifest)")
+    add.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    run_ = commands.add_parser("run", help="render pending jobs, resuming any interrupted run")
+    run_.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: one per core)")
+    summary = commands.add_parser("summary", help="report progress, throughput and the slowest jobs")
+    summary.add_argument("--slowest", type=int, default=10)
+    summary.add_argument("--json", action="store_true", help="print the summary as JSON")
+    commands.add_parser("retry", help="queue the failed jobs again")
+    args = parser.parse_args(argv)
+
+    queue = JobQueue(args.database)
+    try:
+        if args.command == "add":
+            out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.manifest))
+            try:
+                variants = batch.load_manifest(args.manifest)
+            except ValueError as e:
+                parser.error(str(e))
+            added, changed, unchanged = queue.add(variants, out_dir, args.max_attempts)
+            print(f"{added} added, {changed} changed and queued again, {unchanged} unchanged")
+        elif args.command == "run":
+            rendered = run(args.database, args.workers)
+            print()
+            print(f"{rendered} renders this run")
+            print(format_summary(queue.summary()))
+            counts = queue.counts()
+            return 1 if counts["failed"] or counts["pending"] else 0
+        elif args.command == "summary":
+            report = queue.summary(args.slowest)
+            print(json.dumps(report, indent=2, ensure_ascii=False) if args.json else format_summary(report))
+        else:
+            print(f"{queue.retry_failed()} failed jobs queued again")
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Minimal pull parser for large JSON documents.
+
+Objects and arrays are walked key by key / element by element and only the
+values a caller asks for are materialized, so a multi-megabyte blueprint
+never has to be loaded as a whole:
+
+    stream = JsonStream(f)
+    for key in stream.items():
+        if key == "apiDesign":
+            for _ in stream.elements():
+                endpoint = stream.value()
+        else:
+            stream.skip()
+
+Every key yielded by `items()` and every index yielded by `elements()` must
+be consumed with `value()`, `skip()` or a nested `items()`/`elements()`.
+`value()` materializes one whole value; to stream a long array, walk it
+with `elements()` instead.
+"""
+import json
+import re
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_decoder = json.JSONDecoder()
+
+
+class JsonStream:
+    def __init__(self, f, chunk_size=1 << 16):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=None):
+        if self._eof:
+            return False
+        chunk = self._f.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, msg):
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self):
+        """Next non-whitespace character ("" at end of input)"""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, ch):
+        if self.peek() != ch:
+            raise self._error(f"Expecting {ch!r}")
+        self._pos += 1
+
+    def value(self):
+        """Parse and return the next complete value"""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Decoding restarts at the value's start, so each read doubles: a value
+                # spanning many chunks is decoded in linear, not quadratic, time
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number cut at the chunk boundary may continue in the next chunk
+            if (isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and _NUMBER_TAIL.fullmatch(self._buf, end) and self._fill()):
+                continue
+            self._pos = end
+            return obj
+
+    def skip(self):
+        """Consume the next value without building containers"""
+        ch = self.peek()
+        if ch == "{":
+            for _ in self.items():
+                self.skip()
+        elif ch == "[":
+            for _ in self.elements():
+                self.skip()
+        else:
+            self.value()
+
+    def items(self):
+        """Iterate an object, yielding each key before its value"""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name")
+            self._expect(":")
+            yield key
+            ch = self.peek()
+            self._pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise self._error("Expecting ',' delimiter")
+
+    def elements(self):
+        """Iterate an array, yielding each index before its element"""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            ch = self.peek()
+            self._pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_array(self):
+        """Iterate an array, yielding each parsed element"""
+        for _ in self.elements():
+            yield self.value()
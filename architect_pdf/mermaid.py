@@ -0,0 +1,806 @@
+"""
+Native rendering of the Mermaid flowchart and sequence-diagram subset.
+
+Blueprints carry their architecture, sequence and tech-stack diagrams as
+Mermaid source. `diagram()` parses the source, lays it out in pure Python
+and returns a reportlab `Drawing` scaled to fit the given box; no browser
+is involved.
+
+Flowcharts (`graph`/`flowchart` with TD, TB, BT, LR or RL): node shapes
+[], (), ([]), [()], (()), {}, {{}}, [[]] and >], quoted labels and <br>
+line breaks; edges -->, ---, -.->, ==>, --x, --o and <--> with |text| or
+`-- text -->` labels, chains (A --> B --> C) and & groups. Subgraphs are
+flattened; classDef, class, style, linkStyle and click lines are ignored.
+The layout is layered: cycles are broken at DFS back edges, nodes are
+ranked by longest path, edges spanning several ranks get dummy nodes,
+layers are ordered by barycenter sweeps and edges are drawn as polylines
+through their dummies.
+
+Sequence diagrams: participant/actor (with `as` aliases), messages ->>,
+-->>, ->, -->, -x, --x, -) and --), self messages, notes (left of, right
+of, over), autonumber, and loop/alt/else/opt/par/and/critical/break/rect
+blocks drawn as labeled frames. activate/deactivate are ignored.
+
+Parsing and layout depend only on the source, font and size, so layouts
+are cached in-process under the SHA-256 of the three, together with the
+shapes built for the last few palettes: a document that repeats a diagram,
+or a service rendering the same blueprint again, gets a new Drawing around
+the shapes it already has. The font enters the key by the digests of the
+files behind its alias, fallbacks included, so a theme that maps the alias
+to another file gets new text widths. Source outside the subset raises
+`MermaidError` (a ValueError), so callers can fall back to the source text.
+"""
+from collections import OrderedDict
+import hashlib
+import math
+import re
+
+from reportlab.graphics.shapes import Circle, Drawing, Ellipse, Group, Line, Polygon, PolyLine, Rect, String
+from reportlab.lib.colors import HexColor, white
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from architect_pdf.fonts import font_digest
+
+DEFAULT_PALETTE = {
+    "fill": HexColor("#eff6ff"),
+    "stroke": HexColor("#2563eb"),
+    "text": HexColor("#0f172a"),
+    "line": HexColor("#475569"),
+    "note": HexColor("#f8fafc"),
+    "border": HexColor("#e2e8f0"),
+    "background": white,
+}
+CACHE_SIZE = 128
+# Palettes whose shapes are kept per cached layout
+PALETTES = 8
+
+# Flowchart geometry, in points before scaling
+PAD_X, PAD_Y = 10, 6
+NODE_GAP = 18
+RANK_GAP = 34
+DUMMY_SIZE = 6
+SWEEPS = 4
+MARGIN = 8
+# Sequence geometry
+BOX_H = 24
+MIN_COLUMN = 70
+ROW_GAP = 10
+
+_cache = OrderedDict()
+
+
+class MermaidError(ValueError):
+    pass
+
+
+# ══════════════════════════════════════
+#  PARSING
+# ══════════════════════════════════════
+class _Node:
+    __slots__ = ("id", "lines", "shape", "w", "h")
+
+    def __init__(self, node_id, lines, shape):
+        self.id = node_id
+        self.lines = lines
+        self.shape = shape
+        self.w = self.h = 0
+
+
+class _Edge:
+    __slots__ = ("src", "dst", "label", "style", "head", "tail")
+
+    def __init__(self, src, dst, label, style, head, tail):
+        self.src, self.dst, self.label = src, dst, label
+        self.style, self.head, self.tail = style, head, tail
+
+
+class Flowchart:
+    def __init__(self, direction):
+        self.direction = direction
+        self.nodes = {}
+        self.edges = []
+
+    def node(self, node_id, lines=None, shape=None):
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = self.nodes[node_id] = _Node(node_id, lines or [node_id], shape or "rect")
+        elif shape is not None:
+            node.lines, node.shape = lines, shape
+        return node_id
+
+
+class Sequence:
+    def __init__(self):
+        self.participants = {}
+        self.items = []
+        self.autonumber = False
+
+    def participant(self, name, label=None):
+        if name not in self.participants or label is not None:
+            self.participants[name] = label or name
+        return name
+
+
+_FLOW_HEADER = re.compile(r"^(?:graph|flowchart)(?:\s+(TD|TB|BT|LR|RL))?\s*;?$", re.I)
+_IGNORED = re.compile(r"^(?:classDef|class|style|linkStyle|click|direction|accTitle|accDescr)\b")
+_ID = re.compile(r"[\w$]+")
+_SHAPES = [
+    ("([", "])", "stadium"), ("[(", ")]", "cylinder"), ("((", "))", "circle"), ("[[", "]]", "subroutine"),
+    ("{{", "}}", "hexagon"), ("[", "]", "rect"), ("(", ")", "round"), ("{", "}", "diamond"), (">", "]", "flag"),
+]
+# [<] [inline text: -- text / == text / -. text] line [head] [|label|]
+_EDGE = re.compile(r"\s*(<)?(?:(--|==|-\.)(?![->.=])\s*([^|]+?)\s*)?(-{2,}|={2,}|-?\.+-)(>|x|o)?(?:\|([^|]*)\|)?\s*")
+_BR = re.compile(r"<br\s*/?>|\\n", re.I)
+_CLASS_SUFFIX = re.compile(r":::[\w-]+")
+
+
+def _label_lines(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        text = text[1:-1]
+    text = text.replace("#quot;", '"').replace("`", "")
+    return [line.strip() for line in _BR.split(text)] or [""]
+
+
+def _statements(text):
+    """Split a line at `;` outside brackets and quotes"""
+    out, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth = max(0, depth - 1)
+        elif ch == ";" and depth == 0:
+            out.append(text[start:i])
+            start = i + 1
+    out.append(text[start:])
+    return [s.strip() for s in out if s.strip()]
+
+
+def _parse_node(stmt, pos, chart):
+    while pos < len(stmt) and stmt[pos].isspace():
+        pos += 1
+    m = _ID.match(stmt, pos)
+    if not m:
+        raise MermaidError(f"expected a node id at {stmt[pos:pos + 20]!r}")
+    node_id, pos = m.group(), m.end()
+    for opener, closer, shape in _SHAPES:
+        if not stmt.startswith(opener, pos):
+            continue
+        start = pos + len(opener)
+        if stmt.startswith('"', start):
+            quote_end = stmt.find('"', start + 1)
+            end = stmt.find(closer, quote_end + 1) if quote_end >= 0 else -1
+        else:
+            end = stmt.find(closer, start)
+        if end < 0:
+            continue
+        chart.node(node_id, _label_lines(stmt[start:end]), shape)
+        pos = end + len(closer)
+        break
+    else:
+        chart.node(node_id)
+    m = _CLASS_SUFFIX.match(stmt, pos)
+    return node_id, m.end() if m else pos
+
+
+def _parse_group(stmt, pos, chart):
+    ids = []
+    while True:
+        node_id, pos = _parse_node(stmt, pos, chart)
+        ids.append(node_id)
+        rest = stmt[pos:].lstrip()
+        if not rest.startswith("&"):
+            return ids, pos
+        pos = len(stmt) - len(rest) + 1
+
+
+def _parse_flow_statement(stmt, chart):
+    ids, pos = _parse_group(stmt, 0, chart)
+    while pos < len(stmt) and stmt[pos:].strip():
+        m = _EDGE.match(stmt, pos)
+        if not m:
+            raise MermaidError(f"unsupported syntax: {stmt[pos:pos + 30]!r}")
+        tail, _, inline_text, line, head, pipe_text = m.groups()
+        label = (pipe_text if pipe_text is not None else inline_text or "").strip()
+        style = "thick" if "=" in line else "dotted" if "." in line else "solid"
+        targets, pos = _parse_group(stmt, m.end(), chart)
+        for src in ids:
+            for dst in targets:
+                chart.edges.append(_Edge(src, dst, _label_lines(label) if label else None, style, head, bool(tail)))
+        ids = targets
+
+
+_PARTICIPANT = re.compile(r"^(participant|actor)\s+(.+?)(?:\s+as\s+(.+))?$", re.I)
+_MESSAGE = re.compile(r"^(.+?)\s*(-->>|->>|--x|-x|--\)|-\)|-->|->)\s*([+-]?)\s*(.+?)\s*:\s*(.*)$")
+_NOTE = re.compile(r"^note\s+(left of|right of|over)\s+(.+?)\s*:\s*(.*)$", re.I)
+_BLOCK = re.compile(r"^(loop|alt|else|opt|par|and|critical|option|break|rect)\b\s*(.*)$", re.I)
+_SEQ_IGNORED = re.compile(r"^(?:activate|deactivate|title|box|links?|properties|details|create|destroy)\b", re.I)
+
+
+def _parse_sequence(lines):
+    seq = Sequence()
+    depth = 0
+    for text in lines:
+        if _SEQ_IGNORED.match(text):
+            continue
+        if text.lower() == "autonumber" or text.lower().startswith("autonumber "):
+            seq.autonumber = True
+            continue
+        m = _PARTICIPANT.match(text)
+        if m:
+            seq.participant(m.group(2).strip(), m.group(3) and m.group(3).strip())
+            continue
+        m = _NOTE.match(text)
+        if m:
+            names = [seq.participant(name.strip()) for name in m.group(2).split(",")]
+            seq.items.append(("note", m.group(1).lower(), names, _label_lines(m.group(3))))
+            continue
+        m = _MESSAGE.match(text)
+        if m:
+            src, arrow, _, dst, message = m.groups()
+            seq.items.append(("message", seq.participant(src.strip()), seq.participant(dst.strip()), arrow,
+                              _label_lines(message)))
+            continue
+        m = _BLOCK.match(text)
+        if m:
+            kind = m.group(1).lower()
+            if kind in ("else", "and", "option"):
+                if not depth:
+                    raise MermaidError(f"{kind!r} outside a block")
+                seq.items.append(("divider", m.group(2).strip()))
+            else:
+                depth += 1
+                seq.items.append(("block", kind, m.group(2).strip()))
+            continue
+        if text.lower() == "end":
+            if not depth:
+                raise MermaidError("'end' without an open block")
+            depth -= 1
+            seq.items.append(("end",))
+            continue
+        raise MermaidError(f"unsupported sequence syntax: {text[:40]!r}")
+    if depth:
+        raise MermaidError("unclosed block")
+    if not seq.participants:
+        raise MermaidError("sequence diagram without participants")
+    return seq
+
+
+def parse(source):
+    """Flowchart or Sequence for Mermaid `source`"""
+    lines = [line.strip() for line in source.replace("\r", "").split("\n")]
+    lines = [line for line in lines if line and not line.startswith("%%")]
+    if not lines:
+        raise MermaidError("empty diagram")
+    # One-line sources put the statements after the header: `graph LR; A-->B`
+    header, *rest = _statements(lines[0]) or [""]
+    body = rest + lines[1:]
+    if header.lower().startswith("sequencediagram"):
+        return _parse_sequence(body)
+    m = _FLOW_HEADER.match(header)
+    if not m:
+        raise MermaidError(f"unsupported diagram type: {header[:40]!r}")
+    chart = Flowchart((m.group(1) or "TD").upper().replace("TB", "TD"))
+    for line in body:
+        for stmt in _statements(line):
+            if _IGNORED.match(stmt) or stmt == "end" or stmt.startswith("subgraph"):
+                continue
+            _parse_flow_statement(_CLASS_SUFFIX.sub("", stmt) if stmt.startswith("class ") else stmt, chart)
+    if not chart.nodes:
+        raise MermaidError("flowchart without nodes")
+    return chart
+
+
+# ══════════════════════════════════════
+#  FLOWCHART LAYOUT
+# ══════════════════════════════════════
+def _size_node(node, font, size, leading):
+    text_w = max(stringWidth(line, font, size) for line in node.lines)
+    w, h = text_w + 2 * PAD_X, len(node.lines) * leading + 2 * PAD_Y
+    if node.shape == "diamond":
+        w, h = w * 1.5, h * 1.6
+    elif node.shape == "circle":
+        w = h = max(w, h)
+    elif node.shape in ("hexagon", "flag", "stadium"):
+        w += h / 2
+    elif node.shape == "cylinder":
+        h += 8
+    node.w, node.h = w, h
+
+
+def _break_cycles(n, succ):
+    """Edges (v, w) closing a cycle in a DFS over vertices in index order"""
+    state, back = [0] * n, set()
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(succ[root]))]
+        while stack:
+            v, it = stack[-1]
+            for w in it:
+                if state[w] == 0:
+                    state[w] = 1
+                    stack.append((w, iter(succ[w])))
+                    break
+                if state[w] == 1:
+                    back.add((v, w))
+            else:
+                state[v] = 2
+                stack.pop()
+    return back
+
+
+def _rank(n, edges):
+    """Longest-path ranks of a DAG given as (src, dst) pairs"""
+    succ = [[] for _ in range(n)]
+    indegree = [0] * n
+    for s, d in edges:
+        succ[s].append(d)
+        indegree[d] += 1
+    rank = [0] * n
+    ready = [v for v in range(n) if not indegree[v]]
+    while ready:
+        v = ready.pop()
+        for w in succ[v]:
+            rank[w] = max(rank[w], rank[v] + 1)
+            indegree[w] -= 1
+            if not indegree[w]:
+                ready.append(w)
+    return rank
+
+
+def _order_layers(layers, pred, succ):
+    """Barycenter sweeps, down then up; `layers` are reordered in place"""
+    pos = {}
+    for layer in layers:
+        for i, v in enumerate(layer):
+            pos[v] = i
+    for sweep in range(SWEEPS):
+        down = sweep % 2 == 0
+        indices = range(1, len(layers)) if down else range(len(layers) - 2, -1, -1)
+        neighbours = pred if down else succ
+        for r in indices:
+            layer = layers[r]
+            keys = {}
+            for v in layer:
+                adjacent = neighbours[v]
+                keys[v] = sum(pos[u] for u in adjacent) / len(adjacent) if adjacent else pos[v]
+            layer.sort(key=keys.__getitem__)
+            for i, v in enumerate(layer):
+                pos[v] = i
+
+
+def _place_layer(layer, sizes, desired):
+    """Centers as close to `desired` as the minimum spacing allows"""
+    count = len(layer)
+    if not count:
+        return []
+    sep = [(sizes[layer[i]] + sizes[layer[i + 1]]) / 2 + NODE_GAP for i in range(count - 1)]
+    left = [0.0] * count
+    for i in range(count):
+        left[i] = desired[i] if i == 0 else max(desired[i], left[i - 1] + sep[i - 1])
+    right = [0.0] * count
+    for i in range(count - 1, -1, -1):
+        right[i] = desired[i] if i == count - 1 else min(desired[i], right[i + 1] - sep[i])
+    centers = [(a + b) / 2 for a, b in zip(left, right)]
+    for i in range(1, count):
+        centers[i] = max(centers[i], centers[i - 1] + sep[i - 1])
+    return centers
+
+
+def _clip(center, toward, node):
+    """Point where the segment center -> toward leaves the node outline"""
+    (cx, cy), (px, py) = center, toward
+    dx, dy = px - cx, py - cy
+    if not dx and not dy:
+        return center
+    hw, hh = node.w / 2, node.h / 2
+    if node.shape == "circle":
+        t = hw / math.hypot(dx, dy)
+    elif node.shape == "diamond":
+        t = 1 / (abs(dx) / hw + abs(dy) / hh)
+    else:
+        t = min(hw / abs(dx) if dx else math.inf, hh / abs(dy) if dy else math.inf)
+    t = min(t, 1)
+    return cx + dx * t, cy + dy * t
+
+
+class FlowLayout:
+    """Positioned flowchart: node centers and edge polylines in points"""
+
+    def __init__(self, chart, font, size):
+        self.font, self.size = font, size
+        self.leading = leading = size * 1.25
+        # Shapes already built, per palette
+        self.drawn = OrderedDict()
+        nodes = list(chart.nodes.values())
+        for node in nodes:
+            _size_node(node, font, size, leading)
+        n = len(nodes)
+        index = {node.id: i for i, node in enumerate(nodes)}
+        horizontal = chart.direction in ("LR", "RL")
+
+        links = [(index[e.src], index[e.dst]) for e in chart.edges]
+        succ = [[] for _ in range(n)]
+        for s, d in links:
+            if s != d:
+                succ[s].append(d)
+        back = _break_cycles(n, succ)
+        dag = [(d, s) if (s, d) in back else (s, d) for s, d in links if s != d]
+        rank = _rank(n, dag)
+
+        # Dummy vertices for edges spanning several ranks
+        chains = {}
+        pred_l, succ_l = [[] for _ in range(n)], [[] for _ in range(n)]
+        for s, d in set(dag):
+            chain = [s]
+            for r in range(rank[s] + 1, rank[d]):
+                rank.append(r)
+                pred_l.append([])
+                succ_l.append([])
+                chain.append(len(rank) - 1)
+            chain.append(d)
+            for a, b in zip(chain, chain[1:]):
+                succ_l[a].append(b)
+                pred_l[b].append(a)
+            chains[(s, d)] = chain
+        total = len(rank)
+        layers = [[] for _ in range(max(rank) + 1)]
+        for v in range(total):
+            layers[rank[v]].append(v)
+        _order_layers(layers, pred_l, succ_l)
+
+        # Along-layer size and rank-axis thickness of every vertex
+        along = [(node.h if horizontal else node.w) for node in nodes] + [DUMMY_SIZE] * (total - n)
+        across = [(node.w if horizontal else node.h) for node in nodes] + [0] * (total - n)
+        u = [0.0] * total
+        for layer in layers:
+            for v, c in zip(layer, _place_layer(layer, along, [0.0] * len(layer))):
+                u[v] = c
+        for sweep in range(2):
+            ordered = layers[1:] if sweep == 0 else layers[-2::-1]
+            neighbours = pred_l if sweep == 0 else succ_l
+            for layer in ordered:
+                desired = [sum(u[w] for w in neighbours[v]) / len(neighbours[v]) if neighbours[v] else u[v]
+                           for v in layer]
+                for v, c in zip(layer, _place_layer(layer, along, desired)):
+                    u[v] = c
+        low = min(u[v] - along[v] / 2 for v in range(total))
+        for v in range(total):
+            u[v] += MARGIN - low
+        extent_u = max(u[v] + along[v] / 2 for v in range(total)) + MARGIN
+
+        rank_gap = RANK_GAP + (leading if any(e.label for e in chart.edges) else 0)
+        thickness = [max([across[v] for v in layer] or [0]) for layer in layers]
+        starts, cursor = [], MARGIN
+        for t in thickness:
+            starts.append(cursor)
+            cursor += t + rank_gap
+        extent_v = cursor - rank_gap + MARGIN
+        v_pos = [starts[rank[v]] + thickness[rank[v]] / 2 for v in range(total)]
+
+        if horizontal:
+            self.width, self.height = extent_v, extent_u
+        else:
+            self.width, self.height = extent_u, extent_v
+
+        def point(v):
+            a, b = u[v], v_pos[v]
+            if chart.direction == "TD":
+                return a, self.height - b
+            if chart.direction == "BT":
+                return a, b
+            if chart.direction == "LR":
+                return b, self.height - a
+            return self.width - b, self.height - a
+
+        self.nodes = [(node, point(i)) for i, node in enumerate(nodes)]
+        self.edges = []
+        for e, (s, d) in zip(chart.edges, links):
+            src, dst = nodes[s], nodes[d]
+            if s == d:
+                x, y = point(s)
+                r = src.h / 2
+                pts = [(x + src.w / 2, y + r / 2), (x + src.w / 2 + r, y + r / 2),
+                       (x + src.w / 2 + r, y - r / 2), (x + src.w / 2, y - r / 2)]
+            else:
+                chain = chains[(s, d)] if (s, d) not in back else chains[(d, s)][::-1]
+                pts = [point(v) for v in chain]
+                pts[0] = _clip(pts[0], pts[1], src)
+                pts[-1] = _clip(pts[-1], pts[-2], dst)
+            self.edges.append((e, pts))
+
+    def shapes(self, palette):
+        out = []
+        for e, pts in self.edges:
+            out.extend(_edge_shapes(e, pts, palette, self.font, self.size, self.leading))
+        for node, (x, y) in self.nodes:
+            out.extend(_node_shapes(node, x, y, palette))
+            out.extend(_text_lines(node.lines, x, y, palette["text"], self.font, self.size, self.leading))
+        return out
+
+
+def _text_lines(lines, x, y, color, font, size, leading, anchor="middle"):
+    first = y - size * 0.35 + (len(lines) - 1) / 2 * leading
+    return [String(x, first - i * leading, line, fontName=font, fontSize=size, fillColor=color, textAnchor=anchor)
+            for i, line in enumerate(lines)]
+
+
+def _node_shapes(node, x, y, palette):
+    w, h = node.w, node.h
+    x0, y0 = x - w / 2, y - h / 2
+    style = {"fillColor": palette["fill"], "strokeColor": palette["stroke"], "strokeWidth": 0.8}
+    shape = node.shape
+    if shape == "circle":
+        return [Circle(x, y, w / 2, **style)]
+    if shape == "diamond":
+        return [Polygon([x, y0, x0 + w, y, x, y0 + h, x0, y], **style)]
+    if shape == "hexagon":
+        d = h / 4
+        return [Polygon([x0 + d, y0, x0 + w - d, y0, x0 + w, y, x0 + w - d, y0 + h, x0 + d, y0 + h, x0, y], **style)]
+    if shape == "flag":
+        return [Polygon([x0, y0, x0 + w, y0, x0 + w, y0 + h, x0, y0 + h, x0 + h / 3, y], **style)]
+    if shape == "cylinder":
+        ry = 4
+        body = Rect(x0, y0 + ry, w, h - 2 * ry, fillColor=palette["fill"], strokeColor=None)
+        return [
+            Ellipse(x, y0 + ry, w / 2, ry, **style), body,
+            Line(x0, y0 + ry, x0, y0 + h - ry, strokeColor=palette["stroke"], strokeWidth=0.8),
+            Line(x0 + w, y0 + ry, x0 + w, y0 + h - ry, strokeColor=palette["stroke"], strokeWidth=0.8),
+            Ellipse(x, y0 + h - ry, w / 2, ry, **style),
+        ]
+    radius = {"round": 5, "stadium": h / 2}.get(shape, 0)
+    out = [Rect(x0, y0, w, h, rx=radius, ry=radius, **style)]
+    if shape == "subroutine":
+        out += [Line(x0 + 5, y0, x0 + 5, y0 + h, strokeColor=palette["stroke"], strokeWidth=0.8),
+                Line(x0 + w - 5, y0, x0 + w - 5, y0 + h, strokeColor=palette["stroke"], strokeWidth=0.8)]
+    return out
+
+
+def _arrow_head(kind, tip, before, color):
+    dx, dy = tip[0] - before[0], tip[1] - before[1]
+    length = math.hypot(dx, dy) or 1
+    ux, uy = dx / length, dy / length
+    nx, ny = -uy, ux
+    x, y = tip
+    if kind == "x":
+        c = (x - ux * 4, y - uy * 4)
+        return [Line(c[0] - 3 * (ux + nx), c[1] - 3 * (uy + ny), c[0] + 3 * (ux + nx), c[1] + 3 * (uy + ny),
+                     strokeColor=color, strokeWidth=1),
+                Line(c[0] - 3 * (ux - nx), c[1] - 3 * (uy - ny), c[0] + 3 * (ux - nx), c[1] + 3 * (uy - ny),
+                     strokeColor=color, strokeWidth=1)]
+    if kind == "o":
+        return [Circle(x - ux * 3, y - uy * 3, 3, fillColor=white, strokeColor=color, strokeWidth=0.8)]
+    if kind == "open":
+        return [PolyLine([x - ux * 6 + nx * 3, y - uy * 6 + ny * 3, x, y, x - ux * 6 - nx * 3, y - uy * 6 - ny * 3],
+                         strokeColor=color, strokeWidth=0.8)]
+    return [Polygon([x, y, x - ux * 6 + nx * 3, y - uy * 6 + ny * 3, x - ux * 6 - nx * 3, y - uy * 6 - ny * 3],
+                    fillColor=color, strokeColor=color, strokeWidth=0.5)]
+
+
+def _edge_shapes(e, pts, palette, font, size, leading):
+    color = palette["line"]
+    line = PolyLine([c for p in pts for c in p], strokeColor=color,
+                    strokeWidth=1.6 if e.style == "thick" else 0.8,
+                    strokeDashArray=[2, 2] if e.style == "dotted" else None)
+    out = [line]
+    if e.head:
+        out += _arrow_head({">": "filled"}.get(e.head, e.head), pts[-1], pts[-2], color)
+    if e.tail:
+        out += _arrow_head("filled", pts[0], pts[1], color)
+    if e.label:
+        mid = len(pts) // 2
+        (ax, ay), (bx, by) = pts[mid - 1], pts[mid]
+        x, y = (ax + bx) / 2, (ay + by) / 2
+        label_size = size * 0.9
+        w = max(stringWidth(text, font, label_size) for text in e.label) + 4
+        h = len(e.label) * leading * 0.9
+        out.append(Rect(x - w / 2, y - h / 2, w, h, fillColor=palette["background"], strokeColor=None))
+        out += _text_lines(e.label, x, y, color, font, label_size, leading * 0.9)
+    return out
+
+
+# ══════════════════════════════════════
+#  SEQUENCE LAYOUT
+# ══════════════════════════════════════
+class SequenceLayout:
+    """Positioned sequence diagram: participant columns and rows in points"""
+
+    def __init__(self, seq, font, size):
+        self.font, self.size = font, size
+        self.leading = leading = size * 1.25
+        self.drawn = OrderedDict()
+        self.seq = seq
+        names = list(seq.participants)
+        column = {name: i for i, name in enumerate(names)}
+        box_w = [max(stringWidth(seq.participants[name], font, size) + 16, MIN_COLUMN) for name in names]
+
+        # Gaps between neighbouring lifelines, widened for the labels between them
+        gaps = [(box_w[i] + box_w[i + 1]) / 2 + 16 for i in range(len(names) - 1)]
+        number = 0
+        for item in seq.items:
+            if item[0] != "message":
+                continue
+            number += 1
+            prefix = f"{number}. " if seq.autonumber else ""
+            width = max(stringWidth(prefix + line, font, size) for line in item[4]) + 24
+            a, b = sorted((column[item[1]], column[item[2]]))
+            if a == b:
+                if a < len(gaps):
+                    gaps[a] = max(gaps[a], width + 30)
+                continue
+            deficit = width - sum(gaps[a:b])
+            if deficit > 0:
+                for i in range(a, b):
+                    gaps[i] += deficit / (b - a)
+        xs = [MARGIN + box_w[0] / 2]
+        for gap in gaps:
+            xs.append(xs[-1] + gap)
+        self.columns = dict(zip(names, xs))
+        self.box_w = dict(zip(names, box_w))
+        last_label = 0
+        for item in seq.items:
+            if item[0] == "message" and item[1] == item[2] and column[item[1]] == len(names) - 1:
+                last_label = max(last_label, max(stringWidth(line, font, size) for line in item[4]) + 40)
+        self.width = xs[-1] + max(box_w[-1] / 2, last_label) + MARGIN
+
+        # Rows, top down: y grows downwards here and is flipped when drawing
+        self.rows = []
+        y = MARGIN + BOX_H + ROW_GAP
+        open_blocks = []
+        number = 0
+        for item in seq.items:
+            kind = item[0]
+            if kind == "message":
+                number += 1
+                lines = [(f"{number}. " if seq.autonumber else "") + item[4][0]] + item[4][1:]
+                height = len(lines) * leading + (18 if item[1] == item[2] else 6)
+                self.rows.append(("message", y, item[1], item[2], item[3], lines))
+            elif kind == "note":
+                height = len(item[3]) * leading + 8
+                self.rows.append(("note", y, item[1], item[2], item[3], height))
+                height += 6
+            elif kind == "block":
+                open_blocks.append((item[1], item[2], y, len(self.rows), []))
+                height = leading + 8
+            elif kind == "divider":
+                open_blocks[-1][4].append((y, item[1]))
+                height = leading + 8
+            else:
+                block, label, top, first, dividers = open_blocks.pop()
+                self.rows.insert(first, ("block", top, y, block, label, dividers, len(open_blocks)))
+                height = 6
+            y += height + ROW_GAP
+        self.bottom = y
+        self.height = y + BOX_H + MARGIN
+
+    def shapes(self, palette):
+        font, size, leading = self.font, self.size, self.leading
+        top = self.height
+        flip = lambda y: top - y  # noqa: E731
+        out = []
+        left = MARGIN / 2
+        right = self.width - MARGIN / 2
+        for row in self.rows:
+            if row[0] != "block":
+                continue
+            _, y0, y1, block, label, dividers, depth = row
+            inset = depth * 5
+            out.append(Rect(left + inset, flip(y1), right - left - 2 * inset, y1 - y0, fillColor=None,
+                            strokeColor=palette["stroke"], strokeWidth=0.6))
+            tab = f"{block} {label}".strip() if label else block
+            out.append(String(left + inset + 4, flip(y0) - size - 2, f"[{tab}]", fontName=font, fontSize=size * 0.9,
+                              fillColor=palette["stroke"]))
+            for y, text in dividers:
+                out.append(Line(left + inset, flip(y), right - inset, flip(y), strokeColor=palette["stroke"],
+                                strokeWidth=0.5, strokeDashArray=[3, 2]))
+                if text:
+                    out.append(String(left + inset + 4, flip(y) - size - 2, f"[{text}]", fontName=font,
+                                      fontSize=size * 0.9, fillColor=palette["stroke"]))
+        for name, x in self.columns.items():
+            out.append(Line(x, flip(MARGIN + BOX_H), x, flip(self.bottom), strokeColor=palette["border"],
+                            strokeWidth=0.8, strokeDashArray=[3, 3]))
+            for y in (MARGIN, self.bottom):
+                w = self.box_w[name]
+                out.append(Rect(x - w / 2, flip(y + BOX_H), w, BOX_H, rx=3, ry=3, fillColor=palette["fill"],
+                                strokeColor=palette["stroke"], strokeWidth=0.8))
+                out += _text_lines([self.seq.participants[name]], x, flip(y + BOX_H / 2), palette["text"],
+                                   font, size, leading)
+        for row in self.rows:
+            if row[0] == "message":
+                _, y, src, dst, arrow, lines = row
+                x0, x1 = self.columns[src], self.columns[dst]
+                label_y = flip(y) - size
+                color = palette["line"]
+                dash = [3, 2] if arrow.startswith("--") else None
+                head = {">>": "filled", "x": "x", ")": "open"}.get(arrow.lstrip("-"))
+                line_y = flip(y + len(lines) * leading + 2)
+                if src == dst:
+                    pts = [(x0, line_y), (x0 + 30, line_y), (x0 + 30, line_y - 12), (x0, line_y - 12)]
+                    anchor_x, anchor = x0 + 6, "start"
+                else:
+                    pts = [(x0, line_y), (x1, line_y)]
+                    anchor_x, anchor = (x0 + x1) / 2, "middle"
+                out.append(PolyLine([c for p in pts for c in p], strokeColor=color, strokeWidth=0.8,
+                                    strokeDashArray=dash))
+                if head:
+                    out += _arrow_head(head, pts[-1], pts[-2], color)
+                out += [String(anchor_x, label_y - i * leading, line, fontName=font, fontSize=size,
+                               fillColor=palette["text"], textAnchor=anchor) for i, line in enumerate(lines)]
+            elif row[0] == "note":
+                _, y, position, names, lines, height = row
+                xs = [self.columns[name] for name in names]
+                w = max(max(stringWidth(line, font, size) for line in lines) + 12, max(xs) - min(xs) + 40)
+                if position == "left of":
+                    x0 = min(xs) - 8 - w
+                elif position == "right of":
+                    x0 = max(xs) + 8
+                else:
+                    x0 = (min(xs) + max(xs)) / 2 - w / 2
+                out.append(Rect(x0, flip(y + height), w, height, fillColor=palette["note"],
+                                strokeColor=palette["border"], strokeWidth=0.8))
+                out += _text_lines(lines, x0 + w / 2, flip(y + height / 2), palette["text"], font, size, leading)
+        return out
+
+
+# ══════════════════════════════════════
+#  CACHE AND DRAWING
+# ══════════════════════════════════════
+def _font_key(font):
+    """Digests of the files behind the registered `font`, fallbacks included; a standard font is its name"""
+    registered = pdfmetrics.getFont(font)
+    path = getattr(registered.face, "filename", None)
+    if not path:
+        return font
+    try:
+        return ",".join(font_digest(p) for p in [path, *(p for _, p in getattr(registered, "fallbacks", ()))])
+    except OSError:
+        # The file is gone since it was registered; the registered metrics still stand
+        return f"{font}\0{path}"
+
+
+def layout(source, font="Helvetica", size=8):
+    """Parsed and positioned diagram, cached by the SHA-256 of source, font and size"""
+    key = hashlib.sha256(f"{_font_key(font)}\0{size}\0{source}".encode("utf-8")).hexdigest()
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+    parsed = parse(source)
+    result = SequenceLayout(parsed, font, size) if isinstance(parsed, Sequence) else FlowLayout(parsed, font, size)
+    _cache[key] = result
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def diagram(source, width, height=None, font="Helvetica", size=8, palette=None):
+    """Drawing of Mermaid `source`, scaled down (never up) to fit width x height"""
+    placed = layout(source, font, size)
+    scale = min(1, width / placed.width, height / placed.height if height else 1)
+    palette = {**DEFAULT_PALETTE, **(palette or {})}
+    swatch = tuple((name, palette[name].hexval()) for name in sorted(palette))
+    # Shapes are only read when drawn, so drawings of one diagram can share them
+    shapes = placed.drawn.get(swatch)
+    if shapes is None:
+        shapes = placed.drawn[swatch] = placed.shapes(palette)
+        if len(placed.drawn) > PALETTES:
+            placed.drawn.popitem(last=False)
+    else:
+        placed.drawn.move_to_end(swatch)
+    group = Group(*shapes)
+    group.transform = (scale, 0, 0, scale, 0, 0)
+    drawing = Drawing(placed.width * scale, placed.height * scale)
+    drawing.add(group)
+    return drawing
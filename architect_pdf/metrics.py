@@ -0,0 +1,257 @@
+"""
+Flat glyph width tables for the registered TrueType faces.
+
+Line breaking measures every word of every paragraph it wraps, and
+reportlab measures a TrueType string with a generator of `charWidths.get`
+calls, one per character. Body text here is almost all Hangul, so that
+generator runs for nearly every character of the document.
+
+`WidthTable` holds one slot per BMP code point, which takes in the Hangul
+syllables (U+AC00-D7A3), both Jamo blocks (U+1100-11FF, U+3130-318F), CJK
+punctuation (U+3000-303F) and fullwidth forms (U+FF00-FFEF). Each slot holds
+the face's width, or its default width where it has no glyph, and the slots
+share the face's few hundred distinct width objects. The table entries a
+string selects are summed in C: by code point for words, and through one
+UTF-16 encode for longer text such as whole lines. Text outside the BMP
+falls back to per-character lookups. The widths of
+strings already measured are memoized, and most words of running text have
+been seen before. `units_many()` measures the new words of a whole list
+with a single encode.
+
+The sums add the same floats in the same order as reportlab does, so
+widths, and therefore line breaks, are unchanged. `CachedTTFont` measures
+through its table, so reportlab's own paragraph wrapping goes through it as
+well.
+
+With a fallback chain (see `CoverageIndex` and fonts.FallbackTTFont) each
+character is measured in the font that draws it; the table entries of a
+fallback face are filled in the first time one of its characters is
+measured, so a face that is never needed is never loaded.
+
+`fit_prefix()` cuts a word that is wider than its line, the way
+`tables.wrap_text` does for long Korean compounds, URLs and identifiers.
+It takes the running sum of the character widths from one lookup, then
+applies the CJK line-break rules: a line never starts with closing
+punctuation and never ends with an opening bracket.
+"""
+from itertools import accumulate, repeat
+import sys
+
+from reportlab.lib.textsplit import ALL_CANNOT_END, ALL_CANNOT_START
+from reportlab.pdfbase import pdfmetrics
+
+BMP = 0x10000
+MEMO_SIZE = 1 << 16
+LONG_TEXT = 16
+# reportlab's kinsoku sets plus the Korean and fullwidth marks they leave out
+CANNOT_START = frozenset(ALL_CANNOT_START + "}>…‥·’”〉》」』〗〙〛，．：；！？｝")
+CANNOT_END = frozenset(ALL_CANNOT_END + "<〈《「『〖〘〚｛")
+# UTF-16 in the native byte order, so the bytes cast straight to code units
+_UTF16 = "utf-16-le" if sys.byteorder == "little" else "utf-16-be"
+
+
+def bitset(codes):
+    """Compact coverage bitset: bit `code` is set for every code point in `codes`"""
+    codes = list(codes)
+    bits = bytearray((max(codes, default=0) >> 3) + 1)
+    for code in codes:
+        bits[code >> 3] |= 1 << (code & 7)
+    return bytes(bits)
+
+
+def iter_bits(bits):
+    """Code points set in a bitset"""
+    for i, byte in enumerate(bits):
+        if byte:
+            base = i << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+
+class CoverageIndex:
+    """Which font of a fallback chain draws each code point.
+
+    The owner of a code point is the position in the chain of the first
+    font covering it, 0 (the primary font) when none does. BMP owners sit
+    in one byte string, so finding the owner is a single lookup.
+    """
+    __slots__ = ("bmp", "astral", "owned")
+
+    def __init__(self, bitsets):
+        bmp, astral = bytearray(BMP), {}
+        # Later fonts first, so that earlier ones overwrite them
+        for owner in range(len(bitsets) - 1, -1, -1):
+            for code in iter_bits(bitsets[owner]):
+                if code < BMP:
+                    bmp[code] = owner
+                elif owner:
+                    astral[code] = owner
+                else:
+                    astral.pop(code, None)
+        self.bmp = bytes(bmp)
+        self.astral = astral
+        self.owned = {}
+        for code, owner in enumerate(self.bmp):
+            if owner:
+                self.owned.setdefault(owner, []).append(code)
+
+    def owner(self, code):
+        return self.bmp[code] if code < BMP else self.astral.get(code, 0)
+
+    def owners(self, text):
+        """Owner of each character of `text`, or None when the primary font draws it all"""
+        codes = _codes(text)
+        if codes is None:
+            owners = list(map(self.owner, map(ord, text)))
+            return owners if any(owners) else None
+        if not any(map(self.bmp.__getitem__, codes)):
+            return None
+        return list(map(self.bmp.__getitem__, codes))
+
+
+def _codes(text):
+    """UTF-16 code units of `text`, or None if it has characters outside the BMP"""
+    codes = memoryview(text.encode(_UTF16, "surrogatepass")).cast("H")
+    return codes if len(codes) == len(text) else None
+
+
+class WidthTable(dict):
+    """Width of every string measured so far, in thousandths of the font size.
+
+    Looking up a string that is not there yet measures and stores it. With
+    a `chain` (a font with `coverage` and `face_at(owner)`), characters are
+    measured in the fallback face that draws them; a fallback face is only
+    loaded when one of its characters is first measured.
+    """
+    __slots__ = ("face", "chain", "_widths")
+
+    def __init__(self, face, chain=None):
+        super().__init__()
+        self.face = face
+        self.chain = chain
+        self._widths = None
+
+    @property
+    def widths(self):
+        """Width of each BMP code point, built on first use"""
+        if self._widths is None:
+            get, default = self.face.charWidths.get, self.face.defaultWidth
+            widths = list(map(get, range(BMP), repeat(default)))
+            if self.chain is not None:
+                # None until the fallback face is loaded; summing one raises TypeError
+                for codes in self.chain.coverage.owned.values():
+                    for code in codes:
+                        widths[code] = None
+            self._widths = widths
+        return self._widths
+
+    def _load_fallbacks(self, text):
+        """Fill in the widths of the fallback faces drawing characters of `text`"""
+        coverage, widths = self.chain.coverage, self.widths
+        for owner in set(map(coverage.owner, map(ord, text))) - {0}:
+            face = self.chain.face_at(owner)
+            get, default = face.charWidths.get, face.defaultWidth
+            for code in coverage.owned.get(owner, ()):
+                widths[code] = get(code, default)
+
+    def _char_width(self, code):
+        face = self.face
+        if self.chain is not None:
+            owner = self.chain.coverage.owner(code)
+            if owner:
+                face = self.chain.face_at(owner)
+        return face.charWidths.get(code, face.defaultWidth)
+
+    def _measure(self, text):
+        try:
+            # Encoding pays off from about a dozen characters; words are shorter
+            if len(text) < LONG_TEXT:
+                try:
+                    return sum(map(self.widths.__getitem__, map(ord, text)))
+                except IndexError:
+                    codes = None
+            else:
+                codes = _codes(text)
+            if codes is not None:
+                return sum(map(self.widths.__getitem__, codes))
+        except TypeError:
+            self._load_fallbacks(text)
+            return self._measure(text)
+        return sum(map(self._char_width, map(ord, text)))
+
+    def __missing__(self, text):
+        width = self._measure(text)
+        if len(self) >= MEMO_SIZE:
+            self.clear()
+        self[text] = width
+        return width
+
+    def units_many(self, texts):
+        """Widths of every string in `texts`, encoding the unmeasured ones together"""
+        unique = dict.fromkeys(texts)
+        if len(self) + len(unique) > MEMO_SIZE:
+            self.clear()
+        missing = [text for text in unique if text not in self]
+        if missing:
+            joined = "".join(missing)
+            codes = _codes(joined)
+            if codes is None:
+                for text in missing:
+                    self[text] = self._measure(text)
+            else:
+                if self.chain is not None and self.chain.coverage.owners(joined) is not None:
+                    self._load_fallbacks(joined)
+                get, start = self.widths.__getitem__, 0
+                for text in missing:
+                    end = start + len(text)
+                    self[text] = sum(map(get, codes[start:end]))
+                    start = end
+        return list(map(self.__getitem__, texts))
+
+    def char_units(self, text):
+        """Width of each character of `text`"""
+        codes = _codes(text)
+        if codes is None:
+            return list(map(self._char_width, map(ord, text)))
+        units = list(map(self.widths.__getitem__, codes))
+        if None in units:
+            self._load_fallbacks(text)
+            units = list(map(self.widths.__getitem__, codes))
+        return units
+
+
+def width_table(font_name):
+    """WidthTable of a registered font, or None for fonts without one (the standard Type 1 fonts)"""
+    table = getattr(pdfmetrics.getFont(font_name), "width_table", None)
+    return table if isinstance(table, WidthTable) else None
+
+
+def measure_words(words, font_name, size):
+    """`stringWidth` of every string in `words`, batched where the font has a table"""
+    table = width_table(font_name)
+    if table is None:
+        return [pdfmetrics.stringWidth(word, font_name, size) for word in words]
+    scale = 0.001 * size
+    return [scale * units for units in table.units_many(words)]
+
+
+def fit_prefix(text, font_name, size, width):
+    """Length of the longest prefix of `text` (at least one character) that fits in `width`.
+
+    The cut moves back over closing punctuation that would start the next
+    line and over an opening bracket that would end this one.
+    """
+    table = width_table(font_name)
+    if table is None:
+        prefixes = [pdfmetrics.stringWidth(text[:end], font_name, size) for end in range(1, len(text) + 1)]
+    else:
+        scale = 0.001 * size
+        prefixes = [scale * units for units in accumulate(table.char_units(text))]
+    # prefixes[cut] is the width of the first cut + 1 characters
+    cut = 1
+    while cut < len(text) and prefixes[cut] <= width:
+        cut += 1
+    while 1 < cut < len(text) and (text[cut] in CANNOT_START or text[cut - 1] in CANNOT_END):
+        cut -= 1
+    return cut
@@ -0,0 +1,250 @@
+"""
+Content-addressed cache of finished PDFs.
+
+A render is keyed by a hash of everything that decides its bytes: the
+normalized content (JSON with sorted keys), the language, the color
+constants of generate_intro_pdf as they are at render time, the digest of
+the theme (header, footer, images and fonts by content), the SHA-256 of
+every font file in use, the renderer sources (generate_intro_pdf and the
+architect_pdf modules it renders with, see architect_pdf.pagecache) and
+the reportlab version. Cached renders are built in reportlab's
+invariant mode (fixed creation date and document ID), so equal keys mean
+equal bytes. On a hit the stored PDF is returned without building anything.
+
+Entries are plain files named by key. They are written to a temporary file
+and renamed into place, so readers in other processes see a whole entry or
+none; two processes missing the same key both render it and the second
+rename replaces identical bytes. A hit touches the entry's mtime, which is
+its last-use time: after every store, entries unused for `max_age` seconds
+are removed, then the least recently used ones until the directory fits in
+`max_bytes`. Eviction and the shared hit/miss counters in `stats.json` are
+serialized with an advisory lock on `.lock` where the platform has fcntl.
+
+    python -m architect_pdf.outputcache [-o out.pdf] [--lang ko] [--content JSON] [--theme NAME] [--cache-dir DIR]
+    python -m architect_pdf.outputcache --stats
+"""
+from io import BytesIO
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from reportlab import Version as reportlab_version
+from reportlab.lib.colors import Color
+
+import generate_intro_pdf as intro
+from architect_pdf.fonts import default_cache_dir, font_digest
+from architect_pdf.pagecache import renderer_digest
+from architect_pdf.themes import load_theme
+
+try:
+    import fcntl
+except ImportError:  # Windows: entries stay atomic, eviction and counters are unlocked
+    fcntl = None
+
+CACHE_FORMAT = 1
+MAX_BYTES = 512 * 2**20
+MAX_AGE = 30 * 24 * 3600
+# Temporary files older than this were left by a writer that died
+STALE_TMP = 3600
+COUNTERS = ("hits", "misses", "stores", "evictions")
+
+def style_constants():
+    """Module-level colors of the renderer (DARK, BLUE, ...) as hex strings"""
+    return {name: value.hexval() for name, value in vars(intro).items()
+            if name.isupper() and isinstance(value, Color)}
+
+
+def render_key(content, lang, fonts, theme=None):
+    """Cache key of rendering `content` in `lang` with the alias -> path `fonts` and `theme`"""
+    payload = json.dumps({
+        "format": CACHE_FORMAT,
+        "reportlab": reportlab_version,
+        "renderer": renderer_digest(),
+        "colors": style_constants(),
+        "theme": load_theme(theme).digest(),
+        "fonts": {alias: font_digest(path) for alias, path in fonts.items()},
+        "lang": lang,
+        "content": content,
+    }, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class OutputCache:
+    def __init__(self, directory=None, max_bytes=MAX_BYTES, max_age=MAX_AGE):
+        self.directory = os.path.join(default_cache_dir(), "output") if directory is None else directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # This process's counts; `shared_stats()` has every process's
+        self.stats = dict.fromkeys(COUNTERS, 0)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pdf")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, ".lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _count(self, **deltas):
+        for name, n in deltas.items():
+            self.stats[name] += n
+        stats_file = os.path.join(self.directory, "stats.json")
+        try:
+            with self._locked():
+                try:
+                    with open(stats_file, encoding="utf-8") as f:
+                        shared = json.load(f)
+                except (OSError, ValueError):
+                    shared = {}
+                for name, n in deltas.items():
+                    shared[name] = shared.get(name, 0) + n
+                self._write(stats_file, json.dumps(shared).encode())
+        except OSError:
+            pass
+
+    def _write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    def shared_stats(self):
+        """Counters summed over every process that used this directory"""
+        try:
+            with open(os.path.join(self.directory, "stats.json"), encoding="utf-8") as f:
+                shared = json.load(f)
+        except (OSError, ValueError):
+            shared = {}
+        return {name: shared.get(name, 0) for name in COUNTERS}
+
+    def get(self, key):
+        """Stored bytes for `key`, or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._count(misses=1)
+            return None
+        # An entry evicted meanwhile was still read whole; it just is not touched
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        self._count(hits=1)
+        return data
+
+    def put(self, key, data):
+        try:
+            self._write(self._path(key), data)
+        except OSError:
+            # A read-only or full cache directory only costs us the speed-up
+            return
+        self._count(stores=1)
+        self.evict()
+
+    def evict(self):
+        """Drop entries older than `max_age`, then LRU entries over `max_bytes`; returns the count"""
+        now = time.time()
+        removed = 0
+        with self._locked():
+            entries = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if entry.name.endswith(".pdf"):
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                    elif entry.name.endswith(".tmp") and now - st.st_mtime > STALE_TMP:
+                        with contextlib.suppress(OSError):
+                            os.unlink(entry.path)
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            for mtime, size, path in entries:
+                if now - mtime <= self.max_age and total <= self.max_bytes:
+                    break
+                with contextlib.suppress(OSError):
+                    os.unlink(path)
+                    removed += 1
+                total -= size
+        if removed:
+            self._count(evictions=removed)
+        return removed
+
+
+def build_cached(output, *, lang="ko", content=None, fonts=None, cache=None, theme=None):
+    """Render like `build_intro_pdf`, or copy the stored bytes of an equal earlier render.
+
+    Returns `{"key", "hit", "bytes", "pages"}`; `pages` is None on a hit.
+    """
+    if content is None:
+        if lang not in intro.INTRO_CONTENT:
+            raise ValueError(f"Unsupported language: {lang!r} (expected one of {sorted(intro.INTRO_CONTENT)})")
+        content = intro.INTRO_CONTENT[lang]
+    cache = OutputCache() if cache is None else cache
+    fonts = intro.register_fonts(fonts)
+    # Applied before the key is taken, so the key sees the theme's colors
+    theme = intro.use_theme(theme)
+    key = render_key(content, lang, fonts, theme)
+    data, pages = cache.get(key), None
+    if data is None:
+        buf = BytesIO()
+        pages = intro.build_intro_pdf(buf, lang=lang, content=content, fonts=fonts, invariant=True,
+                                     theme=theme)
+        data = buf.getvalue()
+        cache.put(key, data)
+    if hasattr(output, "write"):
+        output.write(data)
+    else:
+        with open(output, "wb") as f:
+            f.write(data)
+    return {"key": key, "hit": pages is None, "bytes": len(data), "pages": pages}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the introduction PDF through the content-addressed output cache")
+    parser.add_argument("-o", "--output", default=intro.DEFAULT_OUTPUT, help="output PDF path")
+    parser.add_argument("--lang", default="ko", choices=sorted(intro.INTRO_CONTENT))
+    parser.add_argument("--content", help="JSON file replacing the built-in content")
+    parser.add_argument("--theme", help="theme profile name or JSON path (see architect_pdf.themes)")
+    parser.add_argument("--cache-dir", help="cache directory (default: ~/.cache/architect-pdf/output)")
+    parser.add_argument("--max-mib", type=float, default=MAX_BYTES / 2**20, help="cache size limit in MiB")
+    parser.add_argument("--max-days", type=float, default=MAX_AGE / 86400, help="drop entries unused for this many days")
+    parser.add_argument("--stats", action="store_true", help="print the shared hit/miss counters and exit")
+    args = parser.parse_args(argv)
+
+    cache = OutputCache(args.cache_dir, max_bytes=int(args.max_mib * 2**20), max_age=args.max_days * 86400)
+    if args.stats:
+        stats = cache.shared_stats()
+        lookups = stats["hits"] + stats["misses"]
+        print(", ".join(f"{name} {n}" for name, n in stats.items())
+              + (f" (hit rate {stats['hits'] / lookups:.0%})" if lookups else ""))
+        return
+    content = None
+    if args.content:
+        with open(args.content, encoding="utf-8") as f:
+            content = json.load(f)
+    start = time.perf_counter()
+    result = build_cached(args.output, lang=args.lang, content=content, cache=cache, theme=args.theme)
+    print(f"PDF {'from cache' if result['hit'] else 'generated'}: {args.output} "
+          f"({result['bytes'] / 1024:.0f} KB, {time.perf_counter() - start:.2f}s, key {result['key'][:12]})")
+
+
+if __name__ == "__main__":
+    main()
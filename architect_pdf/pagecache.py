@@ -0,0 +1,336 @@
+"""
+Incremental rebuilds with a per-section page cache.
+
+The document is split into page groups (cover, TOC, then each section or
+run of sections joined by `page_break: False`), and every group starts on a
+fresh page, so it lays out the same on its own as inside the whole
+document. Each group is rendered in the built-in look (no theme) to a
+small PDF keyed by a hash of its content, the header text, the fonts and
+the renderer source. On rebuild
+only groups whose key changed are laid out again; the rest are spliced in
+from the cache.
+
+Cached pages carry the header and rules but no footer text, because their
+page numbers depend on how many pages precede them. The footer is stamped
+onto every spliced page in one final pass, so a section that grows or
+shrinks simply shifts the numbers of the pages after it. The group PDFs
+are stored like finished renders (architect_pdf.outputcache): written
+atomically, and evicted after 30 days unused or least recently used first
+beyond `MAX_BYTES`.
+
+Every group embeds its own font subsets, so the spliced file is larger
+than a single-pass build. It is meant for the edit/preview loop; release
+builds should still go through `build_intro_pdf`.
+
+    python -m architect_pdf.pagecache [-o out.pdf] [--lang ko] [--content JSON]
+"""
+from io import BytesIO
+import argparse
+import ast
+import hashlib
+import html
+import json
+import os
+import re
+import time
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+from reportlab import Version as reportlab_version
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import PageBreak
+
+import generate_intro_pdf as intro
+from architect_pdf.fonts import default_cache_dir
+
+CACHE_FORMAT = 1
+# Page groups kept in the cache; the least recently used go first (see architect_pdf.outputcache)
+MAX_BYTES = 128 * 2**20
+_renderer_digest = (None, None)
+_imports = {}
+
+
+def _package_imports(path):
+    """architect_pdf modules imported at the top level of the source at `path`, memoized per mtime and size"""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    memo = _imports.get(path)
+    if memo is not None and memo[0] == stamp:
+        return memo[1]
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module == "architect_pdf":
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and (node.module or "").startswith("architect_pdf."):
+            names.append(node.module.split(".")[1])
+        elif isinstance(node, ast.Import):
+            names += [alias.name.split(".")[1] for alias in node.names if alias.name.startswith("architect_pdf.")]
+    _imports[path] = (stamp, names)
+    return names
+
+
+def renderer_sources():
+    """generate_intro_pdf and every architect_pdf module it imports, dependencies first.
+
+    Imports inside functions (compaction, appendices, the CLI modes) post-
+    process a finished render and are not part of it.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    order = []
+
+    def visit(path):
+        if path in order:
+            return
+        for name in _package_imports(path):
+            visit(os.path.join(here, name + ".py"))
+        order.append(path)
+
+    visit(os.path.abspath(intro.__file__))
+    return order
+
+
+def _without_content(source):
+    """The renderer source minus the INTRO_CONTENT literal, which group keys cover on their own"""
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "INTRO_CONTENT" for t in node.targets):
+            lines = source.splitlines(keepends=True)
+            return "".join(lines[:node.lineno - 1] + lines[node.end_lineno:])
+    return source
+
+
+def renderer_digest():
+    """Hash of the renderer sources: a style, layout or measuring change invalidates every page.
+
+    Editing the built-in content only changes the keys of the groups it
+    touches. Recomputed when a source file changes on disk.
+    """
+    global _renderer_digest
+    paths = renderer_sources()
+    stamp = [(path, st.st_mtime_ns, st.st_size) for path, st in zip(paths, map(os.stat, paths))]
+    if _renderer_digest[0] != stamp:
+        h = hashlib.sha256()
+        for path in paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            if path == intro.__file__:
+                data = _without_content(data.decode("utf-8")).encode("utf-8")
+            h.update(data)
+        _renderer_digest = (stamp, h.hexdigest())
+    return _renderer_digest[1]
+
+
+def _font_key(fonts):
+    key = []
+    for alias, path in sorted(fonts.items()):
+        st = os.stat(path)
+        key.append([alias, os.path.abspath(path), st.st_mtime_ns, st.st_size])
+    return key
+
+
+def group_key(group, first, header, fonts):
+    """Content hash of one page group and everything that affects its layout"""
+    payload = json.dumps({
+        "format": CACHE_FORMAT,
+        "reportlab": reportlab_version,
+        "renderer": renderer_digest(),
+        "fonts": _font_key(fonts),
+        "header": header,
+        "first": first,
+        "group": group,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_groups(groups, first, header):
+    """PDF bytes for consecutive page groups: header and rules, no footer text.
+
+    `first` marks the group holding the cover. Each section start gets an
+    outline entry, which `splice` moves to the section's global page.
+    Rendered in reportlab's invariant mode (fixed dates and IDs), so equal
+    input always gives equal bytes.
+    """
+    # Cached pages have the built-in look, whatever an earlier render in this process themed
+    intro.use_theme()
+    story, starts = [], {}
+    for i, group in enumerate(groups):
+        if i:
+            story.append(PageBreak())
+        for part in group:
+            flowables = intro.group_flowables([part])
+            if part[0] == "section":
+                starts[id(flowables[0])] = part[1]
+            story.extend(flowables)
+
+    buf = BytesIO()
+    doc = intro.make_doc(buf)
+    doc.invariant = 1
+    doc.header_text = header
+    doc.footer_text = ""
+
+    def after_flowable(flowable):
+        section = starts.get(id(flowable))
+        if section is not None:
+            doc.canv.bookmarkPage(section["key"])
+            doc.canv.addOutlineEntry(plain_text(section["title"]), section["key"], level=0)
+
+    doc.afterFlowable = after_flowable
+    doc.build(
+        story,
+        onFirstPage=intro.draw_cover if first else intro.draw_page,
+        onLaterPages=intro.draw_page,
+    )
+    return buf.getvalue()
+
+
+def footer_overlay(pages, footer_text):
+    """One page per output page carrying only the footer text (blank on the cover)"""
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4, pageCompression=0, invariant=1)
+    w, _ = A4
+    for page in range(1, pages + 1):
+        if page > 1:
+            c.setFont(intro.NORMAL_FONT, 7)
+            c.setFillColor(intro.SLATE_LIGHT)
+            c.drawCentredString(w/2, 12*mm, footer_text.format(page=page))
+        c.showPage()
+    c.save()
+    buf.seek(0)
+    return PdfReader(buf)
+
+
+_FONT_SELECT = re.compile(rb"/(F\d+(?:\+\d+)?)( [\d.]+ Tf)")
+
+
+def stamp_footers(writer, overlay, pages=None, isolate=False):
+    """Append each overlay page's content stream to the matching output page.
+
+    `PageObject.merge_page` parses and rewrites both content streams, which
+    costs more than the rest of a warm rebuild. The overlay only selects a
+    font and shows one string, so its stream is appended as is, with its
+    font resources renamed so they cannot clash with the page's own.
+    `pages` are the pages to stamp, one per overlay page (default: every
+    page of the writer). With `isolate` the page's own content is wrapped
+    in q/Q first, for pages from other producers that may leave the
+    graphics state changed.
+    """
+    fonts = overlay.pages[0]["/Resources"]["/Font"]
+    fonts = {NameObject("/PageNo" + name[1:]): ref.clone(writer) for name, ref in fonts.items()}
+    if isolate:
+        save, restore = DecodedStreamObject(), DecodedStreamObject()
+        save.set_data(b"q\n")
+        restore.set_data(b"\nQ\n")
+        save, restore = writer._add_object(save), writer._add_object(restore)
+    for page, stamp in zip(writer.pages if pages is None else pages, overlay.pages):
+        data = stamp.get_contents().get_data()
+        if b"Tj" not in data:
+            continue
+        # Resource dicts may be shared between pages: give each page its own
+        # copy, whose entries still point at the shared fonts and images
+        resources = DictionaryObject(page.get("/Resources", DictionaryObject()).get_object())
+        page_fonts = resources.get("/Font", DictionaryObject()).get_object()
+        resources[NameObject("/Font")] = DictionaryObject({**page_fonts, **fonts})
+        page[NameObject("/Resources")] = resources
+        stream = stamp.raw_get("/Contents").clone(writer)
+        stream.get_object().set_data(_FONT_SELECT.sub(rb"/PageNo\1\2", data))
+        contents = page.raw_get("/Contents") if "/Contents" in page else ArrayObject()
+        if isinstance(contents.get_object(), ArrayObject):
+            contents = contents.get_object()
+        else:
+            contents = ArrayObject([contents])
+        if isolate:
+            contents = [save, *contents, restore]
+        page[NameObject("/Contents")] = ArrayObject([*contents, stream])
+
+
+def plain_text(markup):
+    return html.unescape(re.sub(r"<[^>]*>", "", markup))
+
+
+def splice(output, parts, footer_text):
+    """Concatenate rendered group PDFs, stamp the footers and write `output`.
+
+    Outline entries of the parts are rebuilt pointing at their global page.
+    Returns the page count.
+    """
+    writer = PdfWriter()
+    outline = []
+    for data in parts:
+        reader = PdfReader(BytesIO(data))
+        offset = len(writer.pages)
+        for item in reader.outline:
+            outline.append((item.title, offset + reader.get_destination_page_number(item)))
+        for page in reader.pages:
+            writer.add_page(page)
+
+    stamp_footers(writer, footer_overlay(len(writer.pages), footer_text))
+    for title, page in outline:
+        writer.add_outline_item(title, page)
+    writer.write(output)
+    return len(writer.pages)
+
+
+def build_incremental(output, *, lang="ko", content=None, fonts=None, cache_dir=None):
+    """Render like `build_intro_pdf`, re-laying out only changed page groups.
+
+    Returns a dict with the page count, how many groups were rendered or
+    reused from the cache and the seconds spent laying out groups and
+    splicing the output.
+    """
+    if content is None:
+        if lang not in intro.INTRO_CONTENT:
+            raise ValueError(f"Unsupported language: {lang!r} (expected one of {sorted(intro.INTRO_CONTENT)})")
+        content = intro.INTRO_CONTENT[lang]
+    # Imported here: the output cache keys renders by this module's renderer digest
+    from architect_pdf.outputcache import OutputCache
+
+    fonts = intro.register_fonts(fonts)
+    cache = OutputCache(os.path.join(default_cache_dir() if cache_dir is None else cache_dir, "pages"),
+                        max_bytes=MAX_BYTES)
+    header = content.get("header", intro.DEFAULT_HEADER)
+
+    parts = []
+    rendered = reused = 0
+    start = time.perf_counter()
+    for i, group in enumerate(intro.page_groups(content)):
+        key = group_key(group, i == 0, header, fonts)
+        data = cache.get(key)
+        if data is not None:
+            reused += 1
+        else:
+            data = render_groups([group], i == 0, header)
+            cache.put(key, data)
+            rendered += 1
+        parts.append(data)
+
+    layout = time.perf_counter() - start
+    pages = splice(output, parts, content.get("footer", intro.DEFAULT_FOOTER))
+    timings = {"layout": layout, "splice": time.perf_counter() - start - layout}
+    return {"pages": pages, "rendered": rendered, "reused": reused, "timings": timings}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the introduction PDF, re-rendering only changed sections")
+    parser.add_argument("-o", "--output", default=intro.DEFAULT_OUTPUT, help="output PDF path")
+    parser.add_argument("--lang", default="ko", choices=sorted(intro.INTRO_CONTENT))
+    parser.add_argument("--content", help="JSON file replacing the built-in content")
+    parser.add_argument("--cache-dir", help="cache directory (default: ARCHITECT_PDF_CACHE or ~/.cache/architect-pdf)")
+    args = parser.parse_args(argv)
+
+    content = None
+    if args.content:
+        with open(args.content, encoding="utf-8") as f:
+            content = json.load(f)
+    start = time.perf_counter()
+    result = build_incremental(args.output, lang=args.lang, content=content, cache_dir=args.cache_dir)
+    print(
+        f"PDF generated: {args.output} ({result['pages']} pages, {result['rendered']} groups rendered, "
+        f"{result['reused']} reused, {time.perf_counter() - start:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
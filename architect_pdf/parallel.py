@@ -0,0 +1,97 @@
+"""
+Parallel rendering of page groups across worker processes.
+
+Page groups (cover, TOC, each section or run of joined sections) lay out
+independently because each starts on a fresh page. Consecutive groups are
+packed into chunks of about `chunk_size` characters of content, workers
+render each chunk to a partial PDF the way the page cache renders a group
+(see architect_pdf.pagecache), and the parent splices the parts in
+document order, stamps the footer with global page numbers and rebuilds
+the outline with global page references.
+
+Chunking depends only on the content, parts are rendered in reportlab's
+invariant mode and merged in a fixed order, so the output is
+byte-identical for any number of workers, including the in-process
+`workers=1` build. Every part embeds its own font subsets, which is why
+chunks span many pages instead of one section each.
+
+    python -m architect_pdf.parallel [-o out.pdf] [--lang ko] [--content JSON] [-j N]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import time
+
+import generate_intro_pdf as intro
+from architect_pdf.pagecache import render_groups, splice
+
+# Characters of content JSON per chunk: roughly 15-20 pages
+CHUNK_SIZE = 24000
+
+
+def _init_worker(fonts):
+    intro.register_fonts(fonts)
+
+
+def _render(task):
+    return render_groups(*task)
+
+
+def chunk_groups(groups, chunk_size=CHUNK_SIZE):
+    """Pack consecutive page groups into chunks of about `chunk_size` characters"""
+    chunks, current, size = [], [], 0
+    for group in groups:
+        current.append(group)
+        size += len(json.dumps(group, ensure_ascii=False))
+        if size >= chunk_size:
+            chunks.append(current)
+            current, size = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def build_parallel(output, *, lang="ko", content=None, fonts=None, workers=None, chunk_size=CHUNK_SIZE):
+    """Render like `build_intro_pdf`, laying out page groups in `workers` processes.
+
+    Returns the page count.
+    """
+    if content is None:
+        if lang not in intro.INTRO_CONTENT:
+            raise ValueError(f"Unsupported language: {lang!r} (expected one of {sorted(intro.INTRO_CONTENT)})")
+        content = intro.INTRO_CONTENT[lang]
+    # The parent needs the fonts for the footer stamp; workers get the same files
+    fonts = intro.register_fonts(fonts)
+    header = content.get("header", intro.DEFAULT_HEADER)
+    chunks = chunk_groups(intro.page_groups(content), chunk_size)
+    tasks = [(chunk, i == 0, header) for i, chunk in enumerate(chunks)]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        parts = [_render(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(fonts,)) as pool:
+            parts = list(pool.map(_render, tasks))
+    return splice(output, parts, content.get("footer", intro.DEFAULT_FOOTER))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the introduction PDF with sections laid out in parallel")
+    parser.add_argument("-o", "--output", default=intro.DEFAULT_OUTPUT, help="output PDF path")
+    parser.add_argument("--lang", default="ko", choices=sorted(intro.INTRO_CONTENT))
+    parser.add_argument("--content", help="JSON file replacing the built-in content")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    content = None
+    if args.content:
+        with open(args.content, encoding="utf-8") as f:
+            content = json.load(f)
+    start = time.perf_counter()
+    pages = build_parallel(args.output, lang=args.lang, content=content, workers=args.workers)
+    print(f"PDF generated: {args.output} ({pages} pages, {args.workers} workers, {time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
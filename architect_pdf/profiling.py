@@ -0,0 +1,162 @@
+"""
+Opt-in layout profiling: where does `doc.build` spend its time?
+
+While a `LayoutProfiler` is enabled, the `wrap`, `split` and `draw` methods
+of every loaded Flowable class are replaced by timing wrappers; they are
+restored on exit, so a build without a profiler runs the original methods
+untouched. Only the outermost call is recorded: the cells of a table or
+the contents of a KeepTogether count towards the flowable the frame is
+laying out. Pieces produced by `split` keep the label of the flowable they
+came from, so a paragraph split across three pages shows up as one entry.
+
+    profiler = LayoutProfiler()
+    build_intro_pdf("out.pdf", profiler=profiler)
+    profiler.write_trace("trace.json")      # chrome://tracing or Perfetto
+    print(profiler.summary(top=15))
+"""
+from collections import defaultdict
+import functools
+import json
+import time
+
+from reportlab.platypus import Flowable, Paragraph
+
+OPS = ("wrap", "split", "draw")
+
+
+def _flowable_classes():
+    seen, todo = set(), [Flowable]
+    while todo:
+        cls = todo.pop()
+        if cls not in seen:
+            seen.add(cls)
+            todo.extend(cls.__subclasses__())
+    return seen
+
+
+class LayoutProfiler:
+    def __init__(self):
+        # (category, name, page, start, duration) in perf_counter seconds
+        self.events = []
+        self._depth = 0
+        self._count = 0
+        self._patched = []
+        self._origin = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def enable(self):
+        if self._patched:
+            return
+        if self._origin is None:
+            self._origin = time.perf_counter()
+        for cls in _flowable_classes():
+            for op in OPS:
+                method = cls.__dict__.get(op)
+                if callable(method):
+                    self._patched.append((cls, op, method))
+                    setattr(cls, op, self._timed(op, method))
+
+    def disable(self):
+        for cls, op, method in reversed(self._patched):
+            setattr(cls, op, method)
+        self._patched = []
+
+    def _label(self, flowable):
+        label = flowable.__dict__.get("_profile_label")
+        if label is None:
+            self._count += 1
+            label = f"#{self._count} {type(flowable).__name__}"
+            if isinstance(flowable, Paragraph):
+                text = " ".join(flowable.getPlainText().split())
+                label += f" {text[:40]!r}"
+            flowable._profile_label = label
+        return label
+
+    def _record(self, category, name, page, start):
+        self.events.append((category, name, page, start, time.perf_counter() - start))
+
+    def _timed(self, op, method):
+        profiler = self
+
+        @functools.wraps(method)
+        def timed(self, *args, **kwargs):
+            if profiler._depth:
+                return method(self, *args, **kwargs)
+            canv = getattr(self, "canv", None)
+            page = canv.getPageNumber() if canv is not None else None
+            label = profiler._label(self)
+            profiler._depth = 1
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                profiler._depth = 0
+                profiler._record(op, label, page, start)
+            if op == "split":
+                for piece in result:
+                    piece.__dict__.setdefault("_profile_label", label)
+            return result
+        return timed
+
+    def page_callback(self, callback):
+        """Wrap an onPage callback (such as `draw_page`) so its time is recorded per page"""
+        @functools.wraps(callback)
+        def timed(canvas_obj, doc):
+            start = time.perf_counter()
+            try:
+                return callback(canvas_obj, doc)
+            finally:
+                self._record("page", callback.__name__, doc.page, start)
+        return timed
+
+    # ── Reports ──
+    def trace_events(self):
+        """Events in Chrome trace-event format (complete events, microseconds)"""
+        return [
+            {"name": name, "cat": category, "ph": "X", "pid": 1, "tid": 1,
+             "ts": round((start - self._origin) * 1e6, 1), "dur": round(duration * 1e6, 1),
+             "args": {"page": page}}
+            for category, name, page, start, duration in self.events
+        ]
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+
+    def summary(self, top=20):
+        by_flowable = defaultdict(lambda: {op: [0, 0.0] for op in OPS})
+        pages = defaultdict(float)
+        totals = defaultdict(float)
+        spans = defaultdict(set)
+        for category, name, page, _, duration in self.events:
+            totals[category] += duration
+            if page is not None:
+                pages[page] += duration
+            if category != "page":
+                stats = by_flowable[name][category]
+                stats[0] += 1
+                stats[1] += duration
+                spans[name].add(page)
+
+        def total(item):
+            return sum(seconds for _, seconds in item[1].values())
+
+        lines = ["Time by phase: " + ", ".join(
+            f"{category} {totals[category] * 1000:.1f} ms" for category in (*OPS, "page") if category in totals)]
+        lines.append("")
+        lines.append(f"Top {top} flowables by total time (ms; calls in parentheses):")
+        lines.append(f"{'flowable':<60} {'wrap':>13} {'split':>13} {'draw':>13} {'pages':>6}")
+        for name, stats in sorted(by_flowable.items(), key=total, reverse=True)[:top]:
+            cells = " ".join(f"{seconds * 1000:>8.2f} ({calls:>2})" for calls, seconds in (stats[op] for op in OPS))
+            lines.append(f"{name[:60]:<60} {cells} {len(spans[name] - {None}):>6}")
+        lines.append("")
+        lines.append(f"Top {top} pages by layout + page callback time:")
+        for page, seconds in sorted(pages.items(), key=lambda item: item[1], reverse=True)[:top]:
+            lines.append(f"  page {page:>4}  {seconds * 1000:8.2f} ms")
+        return "\n".join(lines)
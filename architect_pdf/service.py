@@ -0,0 +1,365 @@
+"""
+HTTP render service: JSON in, PDF out, rendered by a pool of warm processes.
+
+    POST /intro                  variant JSON as in architect_pdf.batch (lang,
+                                 customer, toc_items, scenario, content,
+                                 theme); {} renders the built-in document
+    POST /blueprint/client       SolutionBlueprint or ImplementationPlan JSON
+    POST /blueprint/developer
+    GET  /health                 pool, queue and request counters as JSON
+
+`?lang=en` picks the language where the body does not. Unlike the CLI and
+batch manifests, `theme` must be a profile name from architect_pdf.themes:
+a theme JSON path is rejected with 400, since a request must not make the
+service read files of its choosing. With `--cache-dir`,
+/intro renders go through architect_pdf.outputcache and a repeated request
+is answered from the cache (`X-Cache: hit`). Workers register the
+fonts and render one document when they start, so the first request does
+not pay for font parsing or cold code paths. At most `concurrency` renders
+run at once and at most `queue_size` more wait for a slot; past that the
+service answers 429 with Retry-After instead of queueing without bound. A
+request that has not been answered `timeout` seconds after it arrived gets
+504. Its render cannot be interrupted inside the worker, so it keeps its
+slot until it finishes and timeouts never oversubscribe the pool.
+
+The server is a minimal HTTP/1.1 implementation on asyncio streams
+(keep-alive, Content-Length bodies, no chunked uploads), so the service
+needs nothing beyond the renderer's own dependencies.
+
+    python -m architect_pdf.service [--host 127.0.0.1] [--port 8088] [-j N]
+                                    [--concurrency N] [--queue 16] [--timeout 60] [--cache-dir DIR]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from io import BytesIO, StringIO
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import time
+
+import generate_intro_pdf as intro
+from architect_pdf import blueprint
+from architect_pdf.batch import variant_content
+from architect_pdf.outputcache import OutputCache, build_cached
+
+ROUTES = {"/intro": "intro", "/blueprint/client": "client", "/blueprint/developer": "developer"}
+MAX_BODY = 16 * 2**20
+# Header lines and total bytes of request line plus headers; past either the answer is 431
+MAX_HEADERS = 100
+MAX_HEAD = 64 * 2**10
+# Seconds a client may take to send the request line and headers
+HEADER_TIMEOUT = 10
+# Answers sent before the body was read: the connection cannot be reused
+_BODY_UNREAD = {HTTPStatus.LENGTH_REQUIRED, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, HTTPStatus.REQUEST_TIMEOUT}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+# ── Worker side ──
+def _init_worker(fonts):
+    intro.register_fonts(fonts)
+    intro.build_intro_pdf(BytesIO())
+
+
+def render_job(kind, lang, body, cache_dir=None):
+    """Render one request in a worker; returns (PDF bytes, page count or None on a cache hit)"""
+    output = BytesIO()
+    if kind == "intro":
+        variant = json.loads(body or b"{}")
+        if not isinstance(variant, dict):
+            raise ValueError("expected a JSON object")
+        variant.setdefault("lang", lang)
+        theme = variant.get("theme")
+        if theme is not None and (not isinstance(theme, str) or not re.fullmatch(r"[\w-]+", theme)):
+            # Profile names only: a request must not name files on the server
+            raise ValueError(f"theme must be a profile name, got {theme!r}")
+        content = variant_content(variant)
+        if cache_dir is not None:
+            result = build_cached(output, lang=variant["lang"], content=content, cache=OutputCache(cache_dir),
+                                  theme=theme)
+            return output.getvalue(), result["pages"]
+        pages = intro.build_intro_pdf(output, lang=variant["lang"], content=content, theme=theme)
+    else:
+        build = blueprint.build_client_pdf if kind == "client" else blueprint.build_developer_pdf
+        pages = build(StringIO(body.decode("utf-8")), output, lang=lang)
+    return output.getvalue(), pages
+
+
+# ── Server side ──
+class RenderService:
+    def __init__(self, workers=None, concurrency=None, queue_size=None, timeout=60.0, fonts=None,
+                 max_body=MAX_BODY, access_log=True, cache_dir=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency or self.workers
+        self.queue_size = 2 * self.concurrency if queue_size is None else queue_size
+        self.timeout = timeout
+        self.fonts = fonts
+        self.max_body = max_body
+        self.access_log = access_log
+        self.cache_dir = cache_dir
+        self.counters = {"completed": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+        self.running = 0
+        self.waiting = 0
+        self._pool = None
+        self._slots = None
+
+    async def start(self):
+        """Start the worker processes and wait until every one has warmed up"""
+        self.fonts = intro.register_fonts(self.fonts)
+        self._pool = self._new_pool()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        # One task per worker: the pool starts a process for each while none is idle
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+
+    def _new_pool(self, context=None):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.fonts,),
+                                   mp_context=context)
+
+    def _replace_pool(self, broken):
+        """Swap a pool broken by a dead worker for a fresh one; the renders it still held are lost"""
+        if self._pool is broken:
+            # Spawned, not forked: a worker forked now would inherit the open client
+            # sockets and keep them from ever closing
+            self._pool = self._new_pool(multiprocessing.get_context("spawn"))
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def health(self):
+        return {
+            "workers": self.workers, "concurrency": self.concurrency, "queue_size": self.queue_size,
+            "running": self.running, "waiting": self.waiting, **self.counters,
+        }
+
+    def _release(self, future):
+        self.running -= 1
+        self._slots.release()
+        if not future.cancelled():
+            future.exception()  # retrieved, so a timed-out failure is not logged as unhandled
+
+    async def render(self, kind, lang, body, deadline):
+        if self.running + self.waiting >= self.concurrency + self.queue_size:
+            self.counters["rejected"] += 1
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, "render queue is full", {"Retry-After": "1"})
+        loop = asyncio.get_running_loop()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), deadline - loop.time())
+        except asyncio.TimeoutError:
+            self.counters["timed_out"] += 1
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, "timed out waiting for a worker")
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        pool = self._pool
+        try:
+            future = loop.run_in_executor(pool, render_job, kind, lang, body, self.cache_dir)
+        except BrokenProcessPool:
+            future = loop.create_future()
+            future.set_exception(BrokenProcessPool("the worker pool is broken"))
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), deadline - loop.time())
+        except BrokenProcessPool:
+            # A worker died (killed for memory, a crash in C code): later requests get a fresh pool
+            self.counters["failed"] += 1
+            self._replace_pool(pool)
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "the worker process died; retry the request",
+                            {"Retry-After": "1"})
+        except asyncio.TimeoutError:
+            self.counters["timed_out"] += 1
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, f"render did not finish within {self.timeout:g}s")
+        except (ValueError, KeyError, TypeError) as e:
+            self.counters["failed"] += 1
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{type(e).__name__}: {e}")
+        except Exception as e:
+            self.counters["failed"] += 1
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+
+    # ── HTTP ──
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it closes"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_head(reader), HEADER_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HTTPError as e:
+                    # The rest of the request cannot be framed: answer and close
+                    await _respond(writer, *_error_response(e), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                start = time.perf_counter()
+                status, body, extra = await self._dispatch(reader, method, target, headers)
+                await _respond(writer, status, body, extra, keep_alive)
+                if self.access_log:
+                    print(f"{method} {target} {int(status)} {len(body)} {time.perf_counter() - start:.3f}s", flush=True)
+                if not keep_alive or status in _BODY_UNREAD:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            # A request the checks above missed still gets an answer, and the handler does not die unanswered
+            with contextlib.suppress(Exception):
+                error = HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+                await _respond(writer, *_error_response(error), keep_alive=False)
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader, method, target, headers):
+        """(status, body, extra headers) for one request; reads the request body"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        url = urlsplit(target)
+        try:
+            length = int(headers.get("content-length", 0))
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "chunked uploads are not supported; send Content-Length")
+            if length > self.max_body:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"body exceeds {self.max_body} bytes")
+            try:
+                body = await asyncio.wait_for(reader.readexactly(length), deadline - loop.time()) if length else b""
+            except asyncio.TimeoutError:
+                raise HTTPError(HTTPStatus.REQUEST_TIMEOUT, "request body not received in time")
+
+            if url.path == "/health":
+                if method != "GET":
+                    raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET", {"Allow": "GET"})
+                return HTTPStatus.OK, json.dumps(self.health()).encode(), {"Content-Type": "application/json"}
+            kind = ROUTES.get(url.path)
+            if kind is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"no route for {url.path}")
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST", {"Allow": "POST"})
+            lang = parse_qs(url.query).get("lang", ["ko"])[0]
+            if lang not in (intro.INTRO_CONTENT if kind == "intro" else blueprint.REPORT_LABELS):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"unsupported language: {lang!r}")
+            if kind != "intro" and not body:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "blueprint JSON body required")
+
+            started = time.perf_counter()
+            pdf, pages = await self.render(kind, lang, body, deadline)
+            self.counters["completed"] += 1
+            extra = {"Content-Type": "application/pdf", "X-Render-Seconds": f"{time.perf_counter() - started:.3f}"}
+            if pages is None:
+                extra["X-Cache"] = "hit"
+            else:
+                extra["X-Pages"] = str(pages)
+            return HTTPStatus.OK, pdf, extra
+        except HTTPError as e:
+            return _error_response(e)
+
+
+def _error_response(e):
+    return e.status, json.dumps({"error": str(e)}).encode(), {"Content-Type": "application/json", **e.headers}
+
+
+async def _read_line(reader):
+    try:
+        return await reader.readline()
+    except ValueError:
+        # asyncio's stream limit: the line does not fit the 64 KiB buffer
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "request line or header field too large")
+
+
+async def _read_head(reader):
+    """(method, target, lower-cased headers), or None at end of stream.
+
+    Raises `HTTPError` for a request that cannot be parsed; the connection
+    must be closed after answering it.
+    """
+    line = await _read_line(reader)
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line")
+    headers = {}
+    count, size = 0, len(line)
+    while True:
+        line = await _read_line(reader)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        count, size = count + 1, size + len(line)
+        if count > MAX_HEADERS or size > MAX_HEAD:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                            f"request headers exceed {MAX_HEADERS} lines or {MAX_HEAD} bytes")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get("content-length", "0")
+    if not (length.isascii() and length.isdigit()):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"invalid Content-Length: {length!r}")
+    return method, target, headers
+
+
+async def _respond(writer, status, body, headers, keep_alive):
+    status = HTTPStatus(status)
+    head = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    head += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(service, host, port):
+    """Run `service` on host:port until SIGINT/SIGTERM"""
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    port = server.sockets[0].getsockname()[1]
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"Listening on http://{host}:{port} ({service.workers} workers, "
+          f"{service.concurrency} concurrent, queue {service.queue_size})", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PDF renders over HTTP from a pool of warm worker processes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088, help="0 picks a free port")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: one per core)")
+    parser.add_argument("--concurrency", type=int, help="renders in flight at once (default: one per worker)")
+    parser.add_argument("--queue", type=int, help="requests waiting for a slot before 429 (default: 2x concurrency)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per request, queueing included")
+    parser.add_argument("--max-body", type=int, default=MAX_BODY, help="largest accepted request body in bytes")
+    parser.add_argument("--cache-dir", help="serve repeated /intro renders from an output cache in this directory")
+    parser.add_argument("--quiet", action="store_true", help="no access log")
+    args = parser.parse_args(argv)
+
+    service = RenderService(workers=args.workers, concurrency=args.concurrency, queue_size=args.queue,
+                            timeout=args.timeout, max_body=args.max_body, access_log=not args.quiet,
+                            cache_dir=args.cache_dir)
+    asyncio.run(serve(service, args.host, args.port))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Local stand-ins for the delivery targets: a minimal SMTP server and a
+Google Drive style upload endpoint.
+
+Both run on one asyncio loop and only record what they receive, so
+architect_pdf.delivery can be exercised and benchmarked without a mail
+relay or a Drive account. The SMTP side speaks enough ESMTP for smtplib
+(EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT) over keep-alive sessions.
+The HTTP side accepts Drive's multipart upload
+(`POST /upload/drive/v3/files?uploadType=multipart`) and answers with a
+file id; `GET /stats` returns the counters of both as JSON.
+
+Duplicates are counted, not rejected: a message whose Message-ID, or an
+upload whose Idempotency-Key, was seen before is a re-send, and the
+upload answers with the file id it gave the first time. With
+`fail_every` every n-th message or upload is refused with a transient
+error (SMTP 451, HTTP 503) to exercise retries.
+
+    python -m architect_pdf.standins [--host 127.0.0.1] [--smtp-port 2525] [--http-port 8089] [--fail-every N]
+"""
+from http import HTTPStatus
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import itertools
+import json
+import signal
+import sys
+
+from architect_pdf.service import _read_head, _respond
+
+MAX_MESSAGE = 64 * 2**20
+UPLOAD_PATH = "/upload/drive/v3/files"
+
+
+class StandIns:
+    """Counters and handlers shared by the SMTP and HTTP stand-ins"""
+
+    def __init__(self, fail_every=0):
+        self.fail_every = fail_every
+        self.counters = dict.fromkeys(
+            ("smtp_sessions", "messages", "duplicate_messages", "message_bytes", "smtp_refused",
+             "http_connections", "uploads", "duplicate_uploads", "upload_bytes", "http_refused"), 0)
+        self._message_ids = set()
+        self._files = {}
+        self._ids = itertools.count(1)
+        self._seen = {"smtp": 0, "http": 0}
+
+    def _refuse(self, kind):
+        self._seen[kind] += 1
+        return bool(self.fail_every) and self._seen[kind] % self.fail_every == 0
+
+    # ── SMTP ──
+    async def smtp(self, reader, writer):
+        self.counters["smtp_sessions"] += 1
+
+        async def reply(line):
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+
+        try:
+            await reply("220 localhost ESMTP stand-in")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb = line[:4].decode("ascii", "replace").upper()
+                if verb in ("EHLO", "HELO"):
+                    await reply(f"250-localhost\r\n250-8BITMIME\r\n250 SIZE {MAX_MESSAGE}" if verb == "EHLO" else "250 localhost")
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await self._read_data(reader)
+                    if self._refuse("smtp"):
+                        self.counters["smtp_refused"] += 1
+                        await reply("451 Temporary failure, try again")
+                        continue
+                    message_id = _header(data, b"message-id")
+                    if message_id and message_id in self._message_ids:
+                        self.counters["duplicate_messages"] += 1
+                    self._message_ids.add(message_id)
+                    self.counters["messages"] += 1
+                    self.counters["message_bytes"] += len(data)
+                    await reply(f"250 OK queued as {self.counters['messages']}")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_data(reader):
+        lines = []
+        while True:
+            line = await reader.readline()
+            if line in (b".\r\n", b".\n", b""):
+                return b"".join(lines)
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    # ── HTTP ──
+    async def http(self, reader, writer):
+        self.counters["http_connections"] += 1
+        try:
+            while True:
+                request = await _read_head(reader)
+                if request is None:
+                    break
+                method, target, headers = request
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = self._upload(method, urlsplit(target).path, headers, body)
+                await _respond(writer, status, json.dumps(payload).encode(), {"Content-Type": "application/json"}, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _upload(self, method, path, headers, body):
+        if method == "GET" and path == "/stats":
+            return HTTPStatus.OK, self.counters
+        if method != "POST" or path != UPLOAD_PATH:
+            return HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {path}"}
+        if self._refuse("http"):
+            self.counters["http_refused"] += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "temporarily unavailable"}
+        key = headers.get("idempotency-key")
+        self.counters["uploads"] += 1
+        self.counters["upload_bytes"] += len(body)
+        if key in self._files:
+            self.counters["duplicate_uploads"] += 1
+            return HTTPStatus.OK, {"id": self._files[key]}
+        file_id = f"file-{next(self._ids)}"
+        if key:
+            self._files[key] = file_id
+        return HTTPStatus.OK, {"id": file_id}
+
+
+def _header(data, name):
+    """Value of header `name` (lower-case bytes) in a raw message, or None"""
+    for line in data.split(b"\n"):
+        if not line.strip():
+            return None
+        key, _, value = line.partition(b":")
+        if key.strip().lower() == name:
+            return value.strip().decode("ascii", "replace")
+    return None
+
+
+async def serve(standins, host, smtp_port, http_port):
+    smtp = await asyncio.start_server(standins.smtp, host, smtp_port)
+    http = await asyncio.start_server(standins.http, host, http_port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    smtp_port = smtp.sockets[0].getsockname()[1]
+    http_port = http.sockets[0].getsockname()[1]
+    print(f"SMTP on {host}:{smtp_port}, HTTP on http://{host}:{http_port}", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        smtp.close()
+        http.close()
+        print(json.dumps(standins.counters), flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run local SMTP and upload stand-ins for delivery tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--smtp-port", type=int, default=2525, help="0 picks a free port")
+    parser.add_argument("--http-port", type=int, default=8089, help="0 picks a free port")
+    parser.add_argument("--fail-every", type=int, default=0, help="refuse every n-th message and upload with a transient error")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(StandIns(args.fail_every), args.host, args.smtp_port, args.http_port))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Bounded-memory rendering: a document template that pulls flowables lazily.
+
+`SimpleDocTemplate.build` takes the whole story as a list, so every
+flowable of a 2,000-page document exists before the first page is laid
+out. `StreamingDocTemplate.build` also accepts any iterable, typically a
+generator: flowables are pulled a few at a time as frames need content and
+are dropped once drawn, so only a short window of the story is alive.
+
+reportlab serializes the PDF object table in `canvas.save()`, which means
+pages cannot be written to the output before the build ends. What it does
+keep per page is the content stream: the page's drawing operators as one
+string, compressed only at save time. `PageStreamCanvas` compresses each
+page's stream as soon as the page is finished and drops the string, so
+finished pages cost their compressed size.
+
+At save time reportlab collects every serialized object in a list, joins
+them into one bytes object and hands that to a single `write`: twice the
+file size in memory, and not a byte out until the end. `PageStreamCanvas`
+instead sends the objects to the output as they are serialized, in chunks
+of `FLUSH_SIZE` bytes, flushing after each. The output can be a path or
+any writable binary stream (stdout, a pipe, a socket, a BytesIO). The
+bytes written are identical to an ordinary build.
+
+    doc = StreamingDocTemplate("out.pdf", pagesize=A4)
+    doc.build(iter_story(content), onFirstPage=draw_cover, onLaterPages=draw_page)
+"""
+import itertools
+
+from reportlab import rl_config
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFBase85Encode, PDFDocument, PDFName, PDFStream, PDFZCompress
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate
+
+# Flowables held ahead of the frame: covers keepWithNext runs (headings
+# kept with their first paragraph) with room to spare
+LOOKAHEAD = 16
+
+# Serialized bytes collected before each write to the output
+FLUSH_SIZE = 64 * 1024
+
+
+class FlowableStream(list):
+    """The pending part of a story, refilled from an iterator.
+
+    reportlab's build loop polls `len(flowables)` before handling the next
+    flowable and then only indexes, slices and deletes from the front, so
+    topping the list up in `__len__` is enough to feed it lazily.
+    """
+
+    def __init__(self, iterable, lookahead=LOOKAHEAD):
+        super().__init__()
+        self._source = iter(iterable)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        missing = self._lookahead - list.__len__(self)
+        if missing > 0 and self._source is not None:
+            self.extend(itertools.islice(self._source, missing))
+            if list.__len__(self) < self._lookahead:
+                self._source = None
+        return list.__len__(self)
+
+
+class ChunkedWriter:
+    """Buffers small writes and passes them on to `raw` in chunks"""
+
+    def __init__(self, raw, chunk_size=FLUSH_SIZE):
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+
+    def write(self, data):
+        self._parts.append(data)
+        self._size += len(data)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.raw.write(b"".join(self._parts))
+            self._parts, self._size = [], 0
+        if hasattr(self.raw, "flush"):
+            self.raw.flush()
+
+
+class _IncrementalDocument(PDFDocument):
+    """PDFDocument that writes objects out while `format()` serializes them.
+
+    `format()` assigns its output collector (a PDFFile) to `__accum__`
+    before serializing the first object and deletes it after the last, so
+    a property there can redirect the collector's writes to `_sink`.
+    """
+    _sink = None
+
+    @property
+    def __accum__(self):
+        return self.__dict__["__accum__"]
+
+    @__accum__.setter
+    def __accum__(self, pdf_file):
+        # The header was written by PDFFile.__init__; the rest goes straight out
+        self._sink.write(b"".join(pdf_file.strings))
+        pdf_file.strings.clear()
+        pdf_file.write = self._sink.write
+        self.__dict__["__accum__"] = pdf_file
+
+    @__accum__.deleter
+    def __accum__(self):
+        del self.__dict__["__accum__"]
+
+
+class PageStreamCanvas(Canvas):
+    """Canvas that compresses each page's content stream when the page ends
+    and writes the PDF to its output incrementally"""
+
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        if not page.compression or page.Contents or not page.stream:
+            return
+        # The filters PDFPage.check_format would apply at save time, encoded
+        # now and in the same order (PDFStream.format applies them last first)
+        filters = [PDFBase85Encode, PDFZCompress] if rl_config.useA85 else [PDFZCompress]
+        data = page.stream
+        for f in reversed(filters):
+            data = f.encode(data)
+        stream = PDFStream(content=data)
+        stream.dictionary["Filter"] = PDFArray([PDFName(f.pdfname) for f in filters])
+        stream.__Comment__ = "page stream"
+        page.Contents = stream
+        page.stream = None
+
+    def save(self):
+        if len(self._code):
+            self.showPage()
+        output = self._filename
+        if isinstance(output, str):
+            with open(output, "wb") as f:
+                self._save_to(f)
+        else:
+            self._save_to(output)
+
+    def _save_to(self, f):
+        sink = ChunkedWriter(f)
+        self._doc.__class__ = _IncrementalDocument
+        self._doc._sink = sink
+        # SaveToFile ends with one write of whatever format() returned:
+        # nothing, since the collector's strings were all passed on
+        self._doc.SaveToFile(f, self)
+        sink.flush()
+
+
+class StreamingDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate whose `build` accepts any iterable of flowables"""
+
+    def build(self, flowables, *args, canvasmaker=PageStreamCanvas, **kwargs):
+        super().build(FlowableStream(flowables), *args, canvasmaker=canvasmaker, **kwargs)
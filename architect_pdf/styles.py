@@ -0,0 +1,51 @@
+"""
+Interned paragraph styles.
+
+Helpers such as `info_box()` and the per-entry loops ask for the same style
+over and over. The registry hands out one shared `ParagraphStyle` per
+distinct parameter set, so data-driven documents with thousands of entries
+do not allocate a style object per paragraph. Shared styles must never be
+mutated; pass every attribute up front instead.
+
+Styles can also be looked up by name; a name maps to the style last asked
+for under it. `clear()` drops everything, which generate_intro_pdf does
+when a theme replaces the look, so a long-lived process holds the styles
+of the current theme only.
+"""
+from reportlab.lib.styles import ParagraphStyle
+
+
+class StyleRegistry:
+    def __init__(self):
+        self._by_params = {}
+        self._by_name = {}
+
+    def style(self, name, **params):
+        """Style with these `ParagraphStyle` attributes, created on first use.
+
+        The first name used for a parameter set is kept on the shared
+        object; `registry[name]` returns the style last requested as `name`.
+        """
+        key = tuple(sorted(params.items()))
+        style = self._by_params.get(key)
+        if style is None:
+            style = self._by_params[key] = ParagraphStyle(name=name, **params)
+        self._by_name[name] = style
+        return style
+
+    def clear(self):
+        """Forget every style; the ones already handed out stay valid"""
+        self._by_params.clear()
+        self._by_name.clear()
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self._by_params)
+
+    def names(self):
+        return sorted(self._by_name)
@@ -0,0 +1,215 @@
+"""
+Table flowable for long data tables (API endpoints, DB columns, sprints).
+
+`Table` wraps every cell in a flowable, measures every row before it can
+split, and resolves `GRID`/`ROWBACKGROUNDS` commands cell by cell. That is
+fine for the short tables in the introduction but scales badly to the
+thousands of rows in a developer document. `DataTable` instead:
+
+- takes fixed column widths, so a row is measured only when layout reaches
+  it, and a page split only looks at the rows that fit on that page;
+- repeats the header rows at the top of every page it spans;
+- paints row stripes and the grid as one rectangle per row and one path
+  per page instead of per-cell style commands;
+- draws plain-text cells (no `<` or `&`) straight onto the canvas with its
+  own greedy line breaking, measuring each cell's words in one batch and
+  cutting overlong words under the CJK line-break rules; only cells with
+  markup become `Paragraph`s.
+
+A single row must fit on one page; rows are never split.
+"""
+import copy
+import re
+
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, Paragraph
+
+from architect_pdf.metrics import fit_prefix, measure_words
+
+_MARKUP = re.compile(r"[<&]")
+
+
+def wrap_text(text, font, size, width):
+    """Greedy line breaking at spaces; words wider than `width` are cut by character"""
+    space = stringWidth(" ", font, size)
+    words = text.split()
+    lines, line, line_width = [], [], 0
+    for word, word_width in zip(words, measure_words(words, font, size)):
+        if line and line_width + space + word_width <= width:
+            line.append(word)
+            line_width += space + word_width
+            continue
+        if line:
+            lines.append(" ".join(line))
+        while word_width > width and len(word) > 1:
+            cut = fit_prefix(word, font, size, width)
+            lines.append(word[:cut])
+            word = word[cut:]
+            word_width = stringWidth(word, font, size)
+        line, line_width = [word], word_width
+    if line:
+        lines.append(" ".join(line))
+    return lines
+
+
+class _Row:
+    __slots__ = ("height", "cells")
+
+    def __init__(self, height, cells):
+        self.height = height
+        self.cells = cells
+
+
+class DataTable(Flowable):
+    """Long table with fixed column widths (in points) and repeated header rows.
+
+    `rows` holds strings (plain text or Paragraph markup) or ready-made
+    flowables. `stripes` is a list of background colors cycled over the
+    body rows.
+    """
+
+    def __init__(self, rows, col_widths, header_style, body_style, header_rows=1,
+                 header_background=None, stripes=None, grid_color=None, grid_width=0.5,
+                 padding=6, left_padding=6, right_padding=6, valign="MIDDLE"):
+        super().__init__()
+        self._rows = rows
+        self._col_widths = list(col_widths)
+        self._header_style = header_style
+        self._body_style = body_style
+        self._header_rows = header_rows
+        self._header_background = header_background
+        self._stripes = stripes
+        self._grid_color = grid_color
+        self._grid_width = grid_width
+        self._padding = padding
+        self._left_padding = left_padding
+        self._right_padding = right_padding
+        self._valign = valign.upper()
+        self._header = None
+        self._start = header_rows
+        self._end = len(rows)
+        self._measured = []
+        self._fit = 0
+        self.width = sum(self._col_widths)
+        self.height = 0
+
+    # ── Measuring ──
+    def _measure(self, row, style):
+        cells = []
+        height = 0
+        for text, width in zip(row, self._col_widths):
+            inner = width - self._left_padding - self._right_padding
+            if isinstance(text, Flowable):
+                cell = text
+                h = cell.wrap(inner, 1e9)[1]
+            elif _MARKUP.search(text):
+                cell = Paragraph(text, style)
+                h = cell.wrap(inner, 1e9)[1]
+            else:
+                cell = wrap_text(text, style.fontName, style.fontSize, inner)
+                h = len(cell) * style.leading
+            cells.append((cell, h))
+            height = max(height, h)
+        return _Row(height + 2 * self._padding, cells)
+
+    def _header_layout(self):
+        if self._header is None:
+            self._header = [self._measure(row, self._header_style) for row in self._rows[:self._header_rows]]
+        return self._header
+
+    def wrap(self, availWidth, availHeight):
+        # Rows are measured until the page is full; the height returned for a
+        # table that does not fit is only guaranteed to exceed availHeight.
+        height = sum(row.height for row in self._header_layout())
+        fit = 0
+        while self._start + fit < self._end:
+            if fit == len(self._measured):
+                self._measured.append(self._measure(self._rows[self._start + fit], self._body_style))
+            row_height = self._measured[fit].height
+            if height + row_height > availHeight:
+                height += row_height
+                break
+            height += row_height
+            fit += 1
+        self._fit = fit
+        self.height = height
+        return self.width, height
+
+    def split(self, availWidth, availHeight):
+        self.wrap(availWidth, availHeight)
+        if self._fit == 0:
+            return []
+        if self._start + self._fit >= self._end:
+            return [self]
+        head = copy.copy(self)
+        head._end = self._start + self._fit
+        head._measured = self._measured[:self._fit]
+        tail = copy.copy(self)
+        tail._start = head._end
+        tail._measured = self._measured[self._fit:]
+        for part in (head, tail):
+            # Copies must not inherit the frame's "already moved to a new page" mark
+            part.__dict__.pop("_postponed", None)
+        return [head, tail]
+
+    # ── Drawing ──
+    def draw(self):
+        canv = self.canv
+        rows = [(row, self._header_style, self._header_background) for row in self._header_layout()]
+        for i, row in enumerate(self._measured[:self._fit], self._start - self._header_rows):
+            rows.append((row, self._body_style, self._stripes[i % len(self._stripes)] if self._stripes else None))
+
+        y = self.height = sum(row.height for row, _, _ in rows)
+        edges = [y]
+        # Plain-text cells share one text object instead of one per string
+        text = canv.beginText()
+        for row, style, background in rows:
+            y -= row.height
+            edges.append(y)
+            if background is not None:
+                canv.setFillColor(background)
+                canv.rect(0, y, self.width, row.height, stroke=0, fill=1)
+            self._draw_row(row, style, y, text)
+        canv.drawText(text)
+
+        if self._grid_color is not None:
+            path = canv.beginPath()
+            for y in edges:
+                path.moveTo(0, y)
+                path.lineTo(self.width, y)
+            x = 0
+            for width in [0] + self._col_widths:
+                x += width
+                path.moveTo(x, edges[0])
+                path.lineTo(x, edges[-1])
+            canv.setStrokeColor(self._grid_color)
+            canv.setLineWidth(self._grid_width)
+            canv.drawPath(path, stroke=1, fill=0)
+
+    def _draw_row(self, row, style, y, text):
+        text.setFont(style.fontName, style.fontSize, style.leading)
+        text.setFillColor(style.textColor)
+        x = 0
+        for (cell, content_height), width in zip(row.cells, self._col_widths):
+            inner = width - self._left_padding - self._right_padding
+            if self._valign == "TOP":
+                top = y + row.height - self._padding
+            elif self._valign == "BOTTOM":
+                top = y + self._padding + content_height
+            else:
+                top = y + (row.height + content_height) / 2
+            left = x + self._left_padding
+            if isinstance(cell, list):
+                baseline = top - style.fontSize
+                for line in cell:
+                    if style.alignment in (TA_CENTER, TA_RIGHT):
+                        slack = inner - stringWidth(line, style.fontName, style.fontSize)
+                        text.setTextOrigin(left + (slack / 2 if style.alignment == TA_CENTER else slack), baseline)
+                    else:
+                        text.setTextOrigin(left, baseline)
+                    text.textOut(line)
+                    baseline -= style.leading
+            else:
+                cell.drawOn(self.canv, left, top - content_height)
+            x += width
@@ -0,0 +1,114 @@
+"""
+Theme profiles: the branding of one render.
+
+A theme is a JSON object. Every field is optional and falls back to the
+built-in look:
+
+    {
+      "name": "acme",
+      "colors": {"BLUE": "#c2410c", "BLUE_MID": "#ea580c", "BLUE_LIGHT": "#fff7ed"},
+      "header": "ACME Logistics  |  Solution Proposal",
+      "footer": "ACME Confidential  |  Page {page}",
+      "logo": "acme/logo.png",
+      "cover_image": "acme/cover.jpg",
+      "fonts": {"regular": "acme/Brand-Regular.ttf", "bold": "acme/Brand-Bold.ttf"}
+    }
+
+`colors` overrides the named colors of generate_intro_pdf (DARK, BLUE,
+SLATE, ...); `header` and `footer` replace the content's. The logo is drawn
+on the cover and at the right end of every page header, the cover image
+across the top of the cover. Images go through the asset cache
+(architect_pdf.assets). Paths are relative to the theme file.
+
+A render selects its theme by profile name (`themes/<name>.json`, or
+`<name>.json` in the ARCHITECT_PDF_THEMES directory), by path or as a
+dict: `build_intro_pdf(..., theme="acme")`, `--theme acme`, or
+`"theme": "acme"` in a batch variant. Profiles are memoized by path and
+modification time. `Theme.digest()` hashes everything a theme changes in
+the output, images and fonts by content, for cache keys.
+"""
+import hashlib
+import json
+import os
+
+from architect_pdf.assets import content_hash
+
+FIELDS = ("name", "colors", "header", "footer", "logo", "cover_image", "fonts")
+FONT_FACES = ("regular", "bold")
+
+_profiles = {}
+
+
+class Theme:
+    __slots__ = FIELDS
+
+    def __init__(self, name="default", colors=None, header=None, footer=None, logo=None, cover_image=None, fonts=None):
+        self.name = name
+        self.colors = dict(colors or {})
+        self.header = header
+        self.footer = footer
+        self.logo = logo
+        self.cover_image = cover_image
+        self.fonts = dict(fonts or {})
+
+    @classmethod
+    def from_dict(cls, data, base_dir="."):
+        """Theme from a parsed profile; relative file paths are resolved against `base_dir`"""
+        unknown = set(data) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown theme fields: {sorted(unknown)} (expected some of {list(FIELDS)})")
+        fonts = data.get("fonts") or {}
+        if set(fonts) - set(FONT_FACES):
+            raise ValueError(f"Theme fonts must be some of {list(FONT_FACES)}, got {sorted(fonts)}")
+
+        def resolve(path):
+            return os.path.join(base_dir, path) if path else None
+
+        return cls(
+            name=data.get("name", "custom"), colors=data.get("colors"), header=data.get("header"),
+            footer=data.get("footer"), logo=resolve(data.get("logo")), cover_image=resolve(data.get("cover_image")),
+            fonts={face: resolve(path) for face, path in fonts.items()},
+        )
+
+    def digest(self):
+        """SHA-256 of everything this theme changes in the output"""
+        payload = json.dumps({
+            "colors": self.colors,
+            "header": self.header,
+            "footer": self.footer,
+            "logo": self.logo and content_hash(self.logo),
+            "cover_image": self.cover_image and content_hash(self.cover_image),
+            "fonts": {face: content_hash(path) for face, path in self.fonts.items()},
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+DEFAULT_THEME = Theme()
+
+
+def themes_dir():
+    return os.environ.get("ARCHITECT_PDF_THEMES") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "themes")
+
+
+def load_theme(spec=None):
+    """The `Theme` for a profile name, a JSON path, a dict or a Theme; None is the default"""
+    if spec is None:
+        return DEFAULT_THEME
+    if isinstance(spec, Theme):
+        return spec
+    if isinstance(spec, dict):
+        return Theme.from_dict(spec)
+    path = spec if spec.endswith(".json") or os.sep in spec else os.path.join(themes_dir(), f"{spec}.json")
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise ValueError(f"Unknown theme {spec!r}: {path} does not exist") from None
+    memo = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    theme = _profiles.get(memo)
+    if theme is None:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        theme = _profiles[memo] = Theme.from_dict(data, os.path.dirname(os.path.abspath(path)))
+    return theme
@@ -0,0 +1,184 @@
+"""
+Watch mode: rebuild the introduction PDF in a warm process whenever its sources change.
+
+The process imports reportlab, registers the fonts and builds the styles
+once, then polls the modification times of the content sources: the
+`--content` JSON file if one is given, generate_intro_pdf itself (which
+holds the built-in content) and the other renderer sources. A burst of
+saves is collapsed into one rebuild once the files have been quiet for
+`debounce` seconds.
+
+A change to the script or to an architect_pdf module it renders with
+(see `pagecache.renderer_sources`) reloads that module and every renderer
+module after it, dependencies first and the script last, in place, so the
+code in memory matches the renderer hash.
+Rebuilds go through the page cache (architect_pdf.pagecache), whose keys
+leave the built-in content literal out of the renderer hash, so editing
+one section's copy lays out only that section again. A change that does
+not affect the watched output, such as an edit to the other language, is
+skipped entirely. The PDF is written to a temporary file and renamed into
+place, so a viewer never reads a half-written file. Each rebuild prints
+its per-phase timings and the time from the save to the updated PDF.
+
+    python generate_intro_pdf.py --watch [-o out.pdf] [--lang ko] [--content JSON]
+    python -m architect_pdf.watch [-o out.pdf] [--lang ko] [--content JSON]
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+
+import generate_intro_pdf as intro
+from architect_pdf import pagecache
+
+INTERVAL = 0.05
+DEBOUNCE = 0.1
+
+
+def snapshot(paths):
+    """(mtime, size) of every path, None for a missing file"""
+    stamps = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamps[path] = None
+        else:
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def reload_changed(changed):
+    """Reload the renderer modules among `changed` paths, and every module after one, in dependency order.
+
+    The renderer digest hashes the files on disk, so the code in memory
+    must match them before a page is cached under it.
+    """
+    changed = set(map(os.path.abspath, changed))
+    stale = False
+    for path in pagecache.renderer_sources():
+        stale = stale or path in changed
+        name = os.path.splitext(os.path.basename(path))[0]
+        module = intro if path == os.path.abspath(intro.__file__) else sys.modules.get(f"architect_pdf.{name}")
+        if stale and module is not None:
+            importlib.reload(module)
+
+
+class Watcher:
+    """Rebuilds one output (language and content) when its sources change"""
+    __slots__ = ("output", "lang", "content_path", "fonts", "cache_dir", "log", "stamps", "key")
+
+    def __init__(self, output, *, lang="ko", content_path=None, fonts=None, cache_dir=None, log=print):
+        self.output = output
+        self.lang = lang
+        self.content_path = content_path
+        self.fonts = fonts
+        self.cache_dir = cache_dir
+        self.log = log
+        self.stamps = snapshot(self.sources())
+        self.key = None
+
+    def sources(self):
+        paths = pagecache.renderer_sources()
+        if self.content_path:
+            paths.append(self.content_path)
+        return paths
+
+    def changed(self):
+        """Paths whose modification time or size differ from the last rebuild"""
+        stamps = snapshot(self.sources())
+        return [path for path, stamp in stamps.items() if self.stamps.get(path) != stamp]
+
+    def wait(self, interval=INTERVAL, debounce=DEBOUNCE):
+        """Block until a source changed and has then been quiet for `debounce` seconds"""
+        while not self.changed():
+            time.sleep(interval)
+        stamps = snapshot(self.sources())
+        quiet = time.monotonic()
+        while time.monotonic() - quiet < debounce:
+            time.sleep(interval)
+            latest = snapshot(self.sources())
+            if latest != stamps:
+                stamps, quiet = latest, time.monotonic()
+
+    def rebuild(self):
+        """Rebuild the output if the change affects it; returns the build result or None"""
+        changed = self.changed()
+        self.stamps = snapshot(self.sources())
+        saved = max((self.stamps[path][0] for path in changed if self.stamps[path]), default=0) / 1e9
+        timings = {}
+
+        start = time.perf_counter()
+        reload_changed(changed)
+        content = None
+        if self.content_path:
+            with open(self.content_path, encoding="utf-8") as f:
+                content = json.load(f)
+        elif self.lang not in intro.INTRO_CONTENT:
+            raise ValueError(f"Unsupported language: {self.lang!r} (expected one of {sorted(intro.INTRO_CONTENT)})")
+        timings["load"] = time.perf_counter() - start
+
+        payload = json.dumps([pagecache.renderer_digest(), self.lang, content or intro.INTRO_CONTENT[self.lang]],
+                             sort_keys=True, ensure_ascii=False)
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        if key == self.key and os.path.exists(self.output):
+            self.log(f"{', '.join(map(os.path.basename, changed))} changed; {self.output} is not affected")
+            return None
+
+        tmp = f"{self.output}.{os.getpid()}.tmp"
+        try:
+            result = pagecache.build_incremental(tmp, lang=self.lang, content=content, fonts=self.fonts,
+                                                 cache_dir=self.cache_dir)
+            os.replace(tmp, self.output)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.key = key
+        timings.update(result["timings"])
+        total = time.perf_counter() - start
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items())
+        since_save = f", {(time.time() - saved) * 1000:.0f} ms after save" if saved else ""
+        self.log(
+            f"{self.output}: {result['pages']} pages, {result['rendered']} groups rendered, "
+            f"{result['reused']} reused ({phases}; total {total * 1000:.0f} ms{since_save})"
+        )
+        return result
+
+
+def watch(output, *, lang="ko", content_path=None, fonts=None, cache_dir=None,
+          interval=INTERVAL, debounce=DEBOUNCE, log=print):
+    """Build `output`, then rebuild it on every change to its sources until interrupted"""
+    start = time.perf_counter()
+    fonts = intro.register_fonts(fonts)
+    log(f"fonts registered in {(time.perf_counter() - start) * 1000:.0f} ms")
+    watcher = Watcher(output, lang=lang, content_path=content_path, fonts=fonts, cache_dir=cache_dir, log=log)
+    log(f"watching {', '.join(watcher.sources())}")
+    while True:
+        try:
+            watcher.rebuild()
+        except Exception as e:
+            # A half-saved file or a typo must not end the session; the next save retries
+            log(f"rebuild failed: {type(e).__name__}: {e}")
+        watcher.wait(interval, debounce)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the introduction PDF whenever its sources change")
+    parser.add_argument("-o", "--output", default=intro.DEFAULT_OUTPUT, help="output PDF path")
+    parser.add_argument("--lang", default="ko", choices=sorted(intro.INTRO_CONTENT))
+    parser.add_argument("--content", help="JSON file replacing the built-in content")
+    parser.add_argument("--cache-dir", help="cache directory (default: ARCHITECT_PDF_CACHE or ~/.cache/architect-pdf)")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE, help="seconds of quiet before a rebuild")
+    args = parser.parse_args(argv)
+    try:
+        watch(args.output, lang=args.lang, content_path=args.content, cache_dir=args.cache_dir,
+              debounce=args.debounce, log=lambda message: print(message, flush=True))
+    except KeyboardInterrupt:
+        print(file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: appending 50 appendices of 100 pages each, grafted vs re-merged.
+
+The appendices are rendered once with reportlab, the way other tools and
+earlier renders produce them: compressed content streams, an embedded
+TrueType subset and a logo image on every page. Every appendix embeds the
+same font subset and logo. Two ways of appending them to the generated
+introduction are timed, best of `--repeat`:
+
+    graft    architect_pdf.appendix: page objects cloned by reference,
+             identical objects shared, footer streams appended
+    rewrite  the manual merge it replaces: pages copied one by one and the
+             footer merged with `PageObject.merge_page`, which parses and
+             re-encodes every content stream; no sharing across files
+
+Reports seconds, pages per second and output size, and checks the page
+count and the footer number on the last appendix page.
+
+    python benchmarks/bench_appendix.py [--appendices 50] [--pages 100] [--lang en] [--repeat 3]
+"""
+from io import BytesIO
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image, ImageDraw
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+import generate_intro_pdf as intro
+from architect_pdf.appendix import append_appendices, footer_overlay
+
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+LINES = 40
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def make_logo(path):
+    image = Image.new("RGB", (400, 120), "white")
+    draw = ImageDraw.Draw(image)
+    for x in range(0, 400, 8):
+        draw.line([(x, 0), (400 - x, 120)], fill=(37, 99, 235), width=2)
+    image.save(path)
+
+
+def make_appendix(path, index, pages, logo):
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    c.setTitle(f"Specification {index}")
+    w, h = A4
+    for page in range(1, pages + 1):
+        c.drawImage(logo, 25*mm, h - 30*mm, width=50*mm, height=15*mm)
+        c.setFont("BenchSans", 9)
+        for line in range(LINES):
+            c.drawString(25*mm, h - 40*mm - line * 5*mm,
+                         f"Spec {index}.{page}.{line}: requirement text for the customer appendix {page * line}")
+        c.showPage()
+    c.save()
+
+
+def rewrite(document, appendices, footer_text):
+    """Copy every page and merge the footer into it, as a manual merge tool would"""
+    writer = PdfWriter(clone_from=PdfReader(BytesIO(document)))
+    first = len(writer.pages) + 1
+    pages = []
+    for path in appendices:
+        for page in PdfReader(path).pages:
+            pages.append(writer.add_page(page))
+    overlay = footer_overlay(pages, first, footer_text)
+    for page, stamp in zip(pages, overlay.pages):
+        page.merge_page(stamp)
+        page.compress_content_streams()
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def graft(document, appendices, footer_text):
+    out = BytesIO()
+    result = append_appendices(document, appendices, out, footer_text=footer_text)
+    return out.getvalue(), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--appendices", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=100, help="pages per appendix")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    intro.register_fonts()
+    pdfmetrics.registerFont(TTFont("BenchSans", FONT))
+    document = BytesIO()
+    intro_pages = intro.build_intro_pdf(document, lang=args.lang)
+    document = document.getvalue()
+    footer_text = intro.INTRO_CONTENT[args.lang].get("footer", intro.DEFAULT_FOOTER)
+    total = intro_pages + args.appendices * args.pages
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logo = os.path.join(tmp, "logo.png")
+        make_logo(logo)
+        start = time.perf_counter()
+        appendices = []
+        for i in range(args.appendices):
+            appendices.append(os.path.join(tmp, f"appendix-{i}.pdf"))
+            make_appendix(appendices[-1], i, args.pages, logo)
+        size = sum(os.path.getsize(path) for path in appendices)
+        print(f"{args.appendices} appendices x {args.pages} pages ({size / 2**20:.1f} MiB) rendered in "
+              f"{time.perf_counter() - start:.1f}s; introduction {intro_pages} pages")
+
+        graft_seconds, (grafted, result) = best(lambda: graft(document, appendices, footer_text), args.repeat)
+        rewrite_seconds, rewritten = best(lambda: rewrite(document, appendices, footer_text), args.repeat)
+
+    print(f"{'':<8} {'seconds':>8} {'pages/s':>8} {'MiB':>7}")
+    for label, seconds, data in (("graft", graft_seconds, grafted), ("rewrite", rewrite_seconds, rewritten)):
+        print(f"{label:<8} {seconds:>8.2f} {total / seconds:>8.0f} {len(data) / 2**20:>7.1f}")
+    print(f"graft: {result['deduplicated']} shared objects merged, "
+          + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result["timings"].items()))
+    print(f"graft is {rewrite_seconds / graft_seconds:.1f}x faster and {len(rewritten) / len(grafted):.1f}x smaller")
+
+    for label, data in (("graft", grafted), ("rewrite", rewritten)):
+        reader = PdfReader(BytesIO(data))
+        footer = footer_text.format(page=total)
+        if len(reader.pages) != total or footer not in reader.pages[-1].extract_text():
+            sys.exit(f"{label}: {len(reader.pages)} pages (expected {total}), last page footer {footer!r} missing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: compact output size against time at every compression level.
+
+Three documents are rendered once: the introduction in Korean and English,
+and a proposal made of the English introduction with `--appendices`
+appendices of `--pages` text pages each, which reportlab renders with the
+same fonts, so their subsets duplicate the document's. Each is compacted
+(architect_pdf.compact) at zlib levels 0-9, and at level 9 without object
+streams, best of `--repeat`. Reports the compaction milliseconds, the size
+and its breakdown, against the document as reportlab wrote it.
+
+    python benchmarks/bench_compact.py [--appendices 3] [--pages 20] [--repeat 3] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.units import mm  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+import generate_intro_pdf as intro  # noqa: E402
+from architect_pdf.compact import compact_pdf, size_breakdown  # noqa: E402
+
+LINES = 40
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def make_appendix(path, index, pages):
+    c = canvas.Canvas(path, pagesize=A4)
+    w, h = A4
+    for page in range(1, pages + 1):
+        c.setFont(intro.BOLD_FONT, 12)
+        c.drawString(25*mm, h - 30*mm, f"Specification {index}, page {page}")
+        c.setFont(intro.NORMAL_FONT, 9)
+        for line in range(LINES):
+            c.drawString(25*mm, h - 40*mm - line * 5*mm,
+                         f"{index}.{page}.{line}: requirement text for the customer appendix {page * line}")
+        c.showPage()
+    c.save()
+
+
+def render(**kwargs):
+    buf = BytesIO()
+    start = time.perf_counter()
+    intro.build_intro_pdf(buf, **kwargs)
+    return time.perf_counter() - start, buf.getvalue()
+
+
+def kb(n):
+    return f"{n / 1024:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--appendices", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=20, help="pages per appendix")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--font", help="font file for both aliases (default: discovered Korean faces)")
+    args = parser.parse_args()
+    intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        appendices = []
+        for i in range(args.appendices):
+            appendices.append(os.path.join(tmp, f"appendix-{i}.pdf"))
+            make_appendix(appendices[-1], i, args.pages)
+        documents = {
+            "intro ko": render(lang="ko"),
+            "intro en": render(lang="en"),
+            "proposal": render(lang="en", appendices=appendices),
+        }
+
+    print(f"{'':<10} {'level':>5} {'ms':>7} {'KB':>7} {'ratio':>6} {'fonts':>7} {'content':>8} {'images':>7} "
+          f"{'struct':>7}")
+    for name, (seconds, original) in documents.items():
+        rows = [("render", seconds, original)]
+        for level in range(10):
+            rows.append((level, *best(lambda: compact_pdf(original, level=level), args.repeat)))
+        rows.append(("9 flat", *best(lambda: compact_pdf(original, object_streams=False), args.repeat)))
+        for level, seconds, data in rows:
+            sizes = size_breakdown(data)
+            print(f"{name:<10} {level:>5} {seconds * 1000:>7.1f} {kb(len(data)):>7} {len(data) / len(original):>6.2f} "
+                  f"{kb(sizes['fonts']):>7} {kb(sizes['content']):>8} {kb(sizes['images']):>7} "
+                  f"{kb(sizes['structure']):>7}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
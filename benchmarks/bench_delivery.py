@@ -0,0 +1,122 @@
+"""
+Benchmark: delivered documents per second, pooled vs one connection per delivery.
+
+Starts the local stand-ins (`python -m architect_pdf.standins`) on free
+ports, renders the introduction once and delivers it `--documents` times
+per target, each time to a different recipient or file name, so every
+delivery has its own idempotency key. Each mode sends to its own
+destinations and starts from an empty ledger:
+
+    pooled    SMTP sessions and keep-alive HTTP connections reused (the default)
+    unpooled  a new connection for every delivery
+
+Then the pooled run is repeated against its own ledger, where every
+delivery must be skipped. The stand-in counters are checked after each
+run: exactly one message or upload per delivery and no duplicates. With
+`--fail-every N` the stand-ins refuse every n-th send with a transient
+error, so the figures include retries and backoff.
+
+    python benchmarks/bench_delivery.py [--documents 1000] [-c 8] [--lang en] [--fail-every N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import generate_intro_pdf as intro
+from architect_pdf.delivery import Deliverer, Ledger
+
+TARGETS = ["email", "gdrive"]
+
+
+def start_standins(fail_every):
+    cmd = [sys.executable, "-m", "architect_pdf.standins", "--smtp-port", "0", "--http-port", "0",
+           "--fail-every", str(fail_every)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("SMTP on "):
+        proc.kill()
+        sys.exit(f"stand-ins did not start: {line!r}")
+    print(line.strip())
+    smtp, url = line.split()[2].rstrip(","), line.split()[-1]
+    return proc, smtp, url
+
+
+def stats(url):
+    with urllib.request.urlopen(f"{url}/stats") as response:
+        return json.load(response)
+
+
+def deliveries(document, target, count, batch):
+    if target == "email":
+        return [{"document": document, "target": "email", "to": f"client{i}@{batch}.example.com",
+                 "subject": f"Proposal {i}"} for i in range(count)]
+    return [{"document": document, "target": "gdrive", "folder": batch, "name": f"proposal-{i}.pdf"}
+            for i in range(count)]
+
+
+def run(args, smtp, url, items, ledger_path, reuse):
+    ledger = Ledger(ledger_path)
+    deliverer = Deliverer(smtp=smtp, upload_url=url, concurrency=args.concurrency, ledger=ledger, reuse=reuse)
+    before = stats(url)
+    start = time.perf_counter()
+    try:
+        results = list(deliverer.deliver_all(items))
+    finally:
+        deliverer.close()
+        ledger.close()
+    elapsed = time.perf_counter() - start
+    after = stats(url)
+    delta = {name: after[name] - before[name] for name in after}
+    statuses = {status: sum(r["status"] == status for r in results) for status in ("delivered", "skipped", "failed")}
+    opened = (deliverer.smtp_pool.opened if items[0]["target"] == "email" else deliverer.http_pool.opened)
+    return elapsed, statuses, delta, opened
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000, help="deliveries per target")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--fail-every", type=int, default=0, help="stand-ins refuse every n-th send")
+    args = parser.parse_args()
+
+    proc, smtp, url = start_standins(args.fail_every)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            document = os.path.join(tmp, "intro.pdf")
+            intro.build_intro_pdf(document, lang=args.lang)
+            print(f"document: {os.path.getsize(document) / 1024:.0f} KiB, {args.documents} deliveries per target, "
+                  f"concurrency {args.concurrency}")
+            print(f"{'target':<8} {'mode':<9} {'seconds':>8} {'docs/s':>8} {'conns':>6} {'sent':>6} "
+                  f"{'retried':>8} {'dupes':>6} {'skipped':>8} {'failed':>7}")
+            for target in TARGETS:
+                sent, dupes, refused = (("messages", "duplicate_messages", "smtp_refused") if target == "email"
+                                        else ("uploads", "duplicate_uploads", "http_refused"))
+                for mode, reuse, ledger in (("pooled", True, "pooled"), ("unpooled", False, "unpooled"),
+                                            ("resend", True, "pooled")):
+                    # The re-send repeats the pooled batch; the unpooled one has its own destinations
+                    items = deliveries(document, target, args.documents, ledger)
+                    elapsed, statuses, delta, opened = run(
+                        args, smtp, url, items, os.path.join(tmp, f"{target}-{ledger}.db"), reuse)
+                    print(f"{target:<8} {mode:<9} {elapsed:>8.2f} {statuses['delivered'] / elapsed:>8.1f} "
+                          f"{opened:>6} {delta[sent]:>6} {delta[refused]:>8} {delta[dupes]:>6} "
+                          f"{statuses['skipped']:>8} {statuses['failed']:>7}")
+                    expected = 0 if mode == "resend" else args.documents
+                    if delta[sent] != expected or delta[dupes] or statuses["failed"]:
+                        sys.exit(f"{target} {mode}: {delta[sent]} sent, {delta[dupes]} duplicates, "
+                                 f"{statuses['failed']} failed (expected {expected} sent)")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: dry-run pagination vs a full build of the introduction PDF.
+
+Both run in one warm process with the fonts registered, so the numbers
+are the per-render cost. The dry run (architect_pdf.dryrun) builds the
+story and lays it out; the full build also draws every page and
+serializes the PDF into memory. Reports, best of `--repeat`, for each
+language, and checks that both agree on the page count.
+
+    python benchmarks/bench_dryrun.py [--repeat 5] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_intro_pdf as intro  # noqa: E402
+from architect_pdf.dryrun import layout_report  # noqa: E402
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--font", help="font file for both aliases (default: discovered Korean faces)")
+    args = parser.parse_args()
+    intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    print(f"{'lang':<5} {'pages':>5} {'dry-run ms':>11} {'full ms':>8} {'speed-up':>9} {'warnings':>9}")
+    for lang in sorted(intro.INTRO_CONTENT):
+        report = layout_report(lang=lang)
+        pages = intro.build_intro_pdf(BytesIO(), lang=lang)
+        if pages != report["pages"]:
+            sys.exit(f"{lang}: the dry run counted {report['pages']} pages, the build {pages}")
+        dry = best(lambda: layout_report(lang=lang), args.repeat)
+        full = best(lambda: intro.build_intro_pdf(BytesIO(), lang=lang), args.repeat)
+        print(f"{lang:<5} {pages:>5} {dry * 1000:>11.1f} {full * 1000:>8.1f} {full / dry:>8.1f}x {len(report['warnings']):>9}")
+
+
+if __name__ == "__main__":
+    main()
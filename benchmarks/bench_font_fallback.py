@@ -0,0 +1,99 @@
+"""
+Benchmark: splitting and measuring text with a fallback chain vs a single font.
+
+The text is the built-in Korean content, repeated to `--mb` megabytes, with
+`--symbols` of its characters replaced by arrows, check marks and other
+symbols the Korean face may lack. The same face is loaded once as a plain
+`CachedTTFont` and once behind the fallback chain (`--fallback`, default:
+the discovered FALLBACK_FACES). Reports, best of `--repeat`:
+
+    index   building the CoverageIndex from the cached coverage bitsets
+    split   `splitString` of every line into a fresh document's subsets
+    width   `stringWidth` of every line with an empty width memo
+
+    python benchmarks/bench_font_fallback.py [--mb 1] [--symbols 0.01] [--repeat 3] [--font PATH] [--fallback PATH ...]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.pdfbase.pdfdoc import PDFDocument  # noqa: E402
+
+import generate_intro_pdf as intro  # noqa: E402
+from architect_pdf.fonts import (  # noqa: E402
+    FALLBACK_FACES, KOREAN_REGULAR_FACES, coverage, fallback_chain, find_fonts, load_font, with_fallbacks,
+)
+from architect_pdf.metrics import CoverageIndex  # noqa: E402
+
+SYMBOLS = "→←↔⇒✓✗★☆※①②③♪☎⚠"
+LINE_CHARS = 60
+
+
+def lines(mb, symbols, seed=1):
+    rng = random.Random(seed)
+    text = re.sub(r"<[^>]+>|\s+", " ", json.dumps(intro.INTRO_CONTENT["ko"], ensure_ascii=False))
+    chars = []
+    while len(chars) * 3 < mb * 2**20:
+        chars.extend(rng.choice(SYMBOLS) if rng.random() < symbols else ch for ch in text)
+    text = "".join(chars)
+    return [text[i:i + LINE_CHARS] for i in range(0, len(text), LINE_CHARS)]
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=float, default=1.0, help="approximate megabytes of UTF-8 text")
+    parser.add_argument("--symbols", type=float, default=0.01, help="fraction of characters replaced by symbols")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--font", help="primary font file (default: the discovered Korean face)")
+    parser.add_argument("--fallback", nargs="+", help="fallback font files (default: the discovered FALLBACK_FACES)")
+    args = parser.parse_args()
+
+    path = args.font or find_fonts(KOREAN_REGULAR_FACES)[0]
+    chain = fallback_chain(args.fallback or find_fonts(FALLBACK_FACES))
+    plain = load_font("BenchPlain", path)
+    chained = with_fallbacks(load_font("BenchChained", path), path, chain)
+    if chained is plain or not hasattr(chained, "coverage"):
+        sys.exit("no usable fallback font; pass --fallback PATH")
+    text = lines(args.mb, args.symbols)
+    print(f"{len(text)} lines, font {os.path.basename(path)}, "
+          f"fallbacks {', '.join(os.path.basename(p) for _, p in chain)}")
+
+    bitsets = [coverage(p) for p in [path] + [p for _, p in chain]]
+    index_s = best(lambda: CoverageIndex(bitsets), args.repeat)
+    print(f"index {index_s * 1000:.1f} ms")
+
+    print(f"{'':<6} {'plain s':>8} {'chain s':>8} {'ratio':>6}")
+    for phase in ("split", "width"):
+        result = {}
+        for name, font in (("plain", plain), ("chain", chained)):
+            if phase == "split":
+                def work(font=font):
+                    doc = PDFDocument()
+                    for line in text:
+                        font.splitString(line, doc)
+            else:
+                def work(font=font):
+                    font.width_table.clear()
+                    for line in text:
+                        font.stringWidth(line, 10)
+            result[name] = best(work, args.repeat)
+        print(f"{phase:<6} {result['plain']:>8.3f} {result['chain']:>8.3f} {result['chain'] / result['plain']:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Start-up benchmark: cold vs warm registration of the Korean font aliases.
+
+Each sample runs in a fresh interpreter so the in-process registry does not
+hide the cost. "cold" empties the parsed-font cache before every sample,
+"warm" reuses the cache written by the previous sample.
+
+    python benchmarks/bench_font_startup.py [--font PATH] [--bold PATH] [--runs N]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import generate_intro_pdf
+t1 = time.perf_counter()
+generate_intro_pdf.register_fonts(json.loads(sys.argv[1]) or None)
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "register": t2 - t1}))
+"""
+
+
+def run_sample(fonts, cache_dir):
+    env = dict(os.environ, ARCHITECT_PDF_CACHE=cache_dir)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, json.dumps(fonts)],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(label, samples):
+    reg = [s["register"] * 1000 for s in samples]
+    imp = [s["import"] * 1000 for s in samples]
+    print(f"{label:<6} register median {statistics.median(reg):8.1f} ms  "
+          f"min {min(reg):8.1f} ms  (import {statistics.median(imp):6.1f} ms)")
+    return statistics.median(reg)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--font", help="regular face (default: discovery)")
+    parser.add_argument("--bold", help="bold face (default: discovery)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    fonts = {}
+    if args.font:
+        fonts["Korean"] = args.font
+    if args.bold:
+        fonts["KoreanBold"] = args.bold
+
+    cache_dir = tempfile.mkdtemp(prefix="architect-font-bench-")
+    try:
+        cold = []
+        for _ in range(args.runs):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(run_sample(fonts, cache_dir))
+        warm = [run_sample(fonts, cache_dir) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    cold_ms = summarize("cold", cold)
+    warm_ms = summarize("warm", warm)
+    print(f"speed-up {cold_ms / warm_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: full rebuild vs the per-section page cache on a long proposal.
+
+Repeats the built-in sections until the document passes `--pages` pages,
+then times a full `build_intro_pdf`, a cold incremental build, a warm build
+with nothing changed, a one-paragraph edit in the middle of the document
+and an edit that adds pages (which shifts every later page number).
+
+    python benchmarks/bench_incremental.py [--pages N] [--lang ko] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pypdf import PdfReader
+
+import generate_intro_pdf as intro
+from architect_pdf.pagecache import build_incremental
+
+
+def long_content(lang, copies):
+    base = intro.INTRO_CONTENT[lang]
+    content = copy.deepcopy(base)
+    content["sections"] = []
+    for n in range(copies):
+        for section in base["sections"]:
+            section = copy.deepcopy(section)
+            section["key"] = f"{section['key']}-{n}"
+            content["sections"].append(section)
+    return content
+
+
+def edit_paragraph(content, index, text):
+    """Replace the first body paragraph of section `index`"""
+    content = copy.deepcopy(content)
+    blocks = content["sections"][index]["blocks"]
+    i = next(i for i, block in enumerate(blocks) if block[0] == "body")
+    blocks[i] = ("body", text)
+    return content
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def last_footer(path):
+    text = PdfReader(path).pages[-1].extract_text()
+    return text.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--lang", default="ko", choices=sorted(intro.INTRO_CONTENT))
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    args = parser.parse_args()
+    intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    per_copy = intro.build_intro_pdf(BytesIO(), lang=args.lang) - 2
+    content = long_content(args.lang, max(1, -(-(args.pages - 2) // per_copy)))
+    middle = len(content["sections"]) // 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "out.pdf")
+        full_s, pages = timed(lambda: intro.build_intro_pdf(out, content=content))
+        print(f"{len(content['sections'])} sections, {pages} pages")
+        print(f"{'build':<24} {'seconds':>8} {'rendered':>9} {'reused':>7} {'pages':>6}  last footer")
+        print(f"{'full build_intro_pdf':<24} {full_s:>8.3f} {'-':>9} {'-':>7} {pages:>6}  {last_footer(out)}")
+
+        runs = [
+            ("cold cache", content),
+            ("warm, unchanged", content),
+            ("one-paragraph edit", edit_paragraph(content, middle, "Edited paragraph. " * 8)),
+            ("edit adding pages", edit_paragraph(content, middle, "Much longer paragraph. " * 600)),
+        ]
+        for label, run_content in runs:
+            seconds, r = timed(lambda: build_incremental(out, content=run_content, cache_dir=tmp))
+            print(f"{label:<24} {seconds:>8.3f} {r['rendered']:>9} {r['reused']:>7} {r['pages']:>6}  {last_footer(out)}")
+
+
+if __name__ == "__main__":
+    main()
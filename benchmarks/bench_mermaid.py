@@ -0,0 +1,103 @@
+"""
+Benchmark: native Mermaid rendering of generated flowcharts and sequence diagrams.
+
+Each flowchart has `n` nodes in layers of about sqrt(n), with edges mostly
+to the next layer, some skipping layers (dummy nodes) and a few pointing
+back (cycles to break). Each sequence diagram has n messages between 8
+participants with a loop block every 20 messages. Reports, best of
+`--repeat`:
+
+    layout  parse + layout with an empty cache
+    shapes  the reportlab shapes of the positioned diagram
+    cached  a whole `diagram()` call on a cache hit (lookup, shapes, Drawing)
+    pdf     the Drawing rendered into a one-page PDF
+
+    python benchmarks/bench_mermaid.py [--nodes 50,200,1000] [--repeat 3]
+"""
+from io import BytesIO
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from reportlab.graphics import renderPDF  # noqa: E402
+
+from architect_pdf import mermaid  # noqa: E402
+
+SHAPES = ["[{}]", "({})", "{{{}}}", "([{}])", "[({})]"]
+WIDTH, HEIGHT = 450, 640
+
+
+def flowchart(n, seed=1):
+    rng = random.Random(seed)
+    per_layer = max(2, int(n ** 0.5))
+    lines = ["graph TD"]
+    for i in range(n):
+        lines.append(f"  N{i}" + rng.choice(SHAPES).format(f"Node {i}"))
+    for i in range(per_layer, n):
+        layer_start = i - i % per_layer
+        lines.append(f"  N{rng.randrange(layer_start - per_layer, layer_start)} --> N{i}")
+        roll = rng.random()
+        if roll < 0.2 and layer_start >= 3 * per_layer:
+            lines.append(f"  N{rng.randrange(0, layer_start - 2 * per_layer)} -.->|skip| N{i}")
+        elif roll < 0.25:
+            lines.append(f"  N{i} ==> N{rng.randrange(0, layer_start)}")
+    return "\n".join(lines)
+
+
+def sequence(n, seed=1):
+    rng = random.Random(seed)
+    lines = ["sequenceDiagram", "  autonumber"] + [f"  participant P{i} as Service {i}" for i in range(8)]
+    for i in range(n):
+        if i % 20 == 0:
+            lines.append("  loop batch")
+        a, b = rng.randrange(8), rng.randrange(8)
+        lines.append(f"  P{a}{rng.choice(['->>', '-->>', '-)'])}P{b}: call {i}")
+        if i % 20 == 19 or i == n - 1:
+            lines.append("  end")
+    return "\n".join(lines)
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(source, repeat):
+    def cold():
+        mermaid.clear_cache()
+        mermaid.layout(source)
+
+    layout_s = best(cold, repeat)
+    placed = mermaid.layout(source)
+    draw_s = best(lambda: placed.shapes(mermaid.DEFAULT_PALETTE), repeat)
+    cached_s = best(lambda: mermaid.diagram(source, WIDTH, HEIGHT), repeat)
+    drawing = mermaid.diagram(source, WIDTH, HEIGHT)
+    pdf_s = best(lambda: renderPDF.drawToFile(drawing, BytesIO()), repeat)
+    return placed, layout_s, draw_s, cached_s, pdf_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", default="50,200,1000", help="comma-separated node (message) counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'diagram':<10} {'n':>6} {'layout ms':>10} {'shapes ms':>9} {'cached ms':>10} {'pdf ms':>8} {'size pt':>14}")
+    for n in (int(v) for v in args.nodes.split(",")):
+        for name, make in (("flowchart", flowchart), ("sequence", sequence)):
+            placed, layout_s, draw_s, cached_s, pdf_s = measure(make(n), args.repeat)
+            print(f"{name:<10} {n:>6} {layout_s * 1000:>10.1f} {draw_s * 1000:>9.1f} {cached_s * 1000:>10.1f} "
+                  f"{pdf_s * 1000:>8.1f} {placed.width:>6.0f}x{placed.height:<7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: time to first byte and peak memory, file output vs streaming.
+
+A consumer (the parent process) reads the PDF from a child's stdout, the
+way an upload or HTTP response would, in two ways:
+
+    file    the child renders to a temporary file with reportlab's
+            single write at save time, then reads it back and copies it
+            to stdout (the previous way to hand the PDF on)
+    stream  the child renders straight into stdout; objects are written
+            in chunks as they are serialized
+
+Both use the same layout (StreamingDocTemplate, pages compressed as they
+end), so the difference is the output path alone. Reports the time to the
+first and the last byte seen by the consumer, the number of reads and the
+child's peak RSS, best of `--repeat` interleaved runs.
+
+    python benchmarks/bench_output_stream.py [--pages 20,500] [--repeat 3] [--font PATH]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pages produced by one copy of the built-in sections (cover and TOC excluded)
+PAGES_PER_COPY = {"ko": 8, "en": 11}
+MODES = ["file", "stream"]
+
+
+def child(mode, pages, lang, font):
+    """Render into this process's stdout"""
+    sys.path.insert(0, ROOT)
+    from reportlab.pdfgen.canvas import Canvas
+
+    import generate_intro_pdf as intro
+    from architect_pdf.streaming import PageStreamCanvas
+
+    class WholeFileCanvas(PageStreamCanvas):
+        save = Canvas.save
+
+    intro.register_fonts({"Korean": font, "KoreanBold": font} if font else None)
+    content = dict(intro.INTRO_CONTENT[lang])
+    content["sections"] = content["sections"] * max(1, -(-(pages - 2) // PAGES_PER_COPY[lang]))
+
+    def build(output, canvasmaker):
+        doc = intro.make_doc(output)
+        doc.header_text = content.get("header", intro.DEFAULT_HEADER)
+        doc.footer_text = content.get("footer", intro.DEFAULT_FOOTER)
+        doc.build(intro.iter_story(content), onFirstPage=intro.draw_cover, onLaterPages=intro.draw_page,
+                  canvasmaker=canvasmaker)
+
+    out = sys.stdout.buffer
+    if mode == "stream":
+        build(out, PageStreamCanvas)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.pdf")
+            build(path, WholeFileCanvas)
+            with open(path, "rb") as f:
+                out.write(f.read())
+    out.flush()
+
+
+def run(mode, pages, lang, font):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", mode, "--pages", str(pages), "--lang", lang]
+    if font:
+        cmd += ["--font", font]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE)
+    first, size, reads = None, 0, 0
+    while True:
+        data = proc.stdout.read1(1 << 16)
+        if not data:
+            break
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(data)
+        reads += 1
+    last = time.perf_counter() - start
+    _, status, usage = os.wait4(proc.pid, 0)
+    if status:
+        sys.exit(f"{mode} child failed with status {status}")
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    rss = usage.ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+    return {"first": first, "last": last, "bytes": size, "reads": reads, "rss": rss}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", default="20,500", help="comma-separated target page counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lang", default="ko", choices=sorted(PAGES_PER_COPY))
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, int(args.pages), args.lang, args.font)
+        return
+
+    print(f"{'mode':<8} {'pages':>6} {'TTFB s':>8} {'total s':>8} {'reads':>6} {'RSS MiB':>8} {'KB':>8}")
+    for pages in (int(p) for p in args.pages.split(",")):
+        # Interleaved so that drift in machine load hits both modes alike
+        runs = {mode: [] for mode in MODES}
+        for _ in range(args.repeat):
+            for mode in MODES:
+                runs[mode].append(run(mode, pages, args.lang, args.font))
+        for mode in MODES:
+            r = min(runs[mode], key=lambda r: r["last"])
+            print(f"{mode:<8} {pages:>6} {r['first']:>8.2f} {r['last']:>8.2f} {r['reads']:>6} "
+                  f"{min(s['rss'] for s in runs[mode]):>8.1f} {r['bytes'] / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
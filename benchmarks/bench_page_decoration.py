@@ -0,0 +1,84 @@
+"""
+Benchmark: page decoration drawn inline on every page vs one form XObject.
+
+Builds a 500-page document twice: once with the header/footer drawn with
+separate canvas operations on each page (the previous `draw_page`), once
+with the current `draw_page`, which writes the static part as a form
+XObject and only emits the "Page N" footer text per page. Each page holds
+one short paragraph so the decoration is a visible share of the work.
+Reports output size, content-stream bytes and build CPU time (best of
+`--repeat` interleaved runs), with and without page compression.
+
+    python benchmarks/bench_page_decoration.py [--pages 500] [--repeat 3] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pypdf import PdfReader
+from reportlab.platypus import PageBreak, Paragraph
+
+import generate_intro_pdf as intro
+
+
+def inline_draw_page(canvas_obj, doc):
+    """The pre-XObject draw_page: every operation repeated on every page"""
+    intro.draw_page_decoration(canvas_obj, doc.header_text)
+    canvas_obj.setFont(intro.NORMAL_FONT, 7)
+    canvas_obj.setFillColor(intro.SLATE_LIGHT)
+    canvas_obj.drawCentredString(intro.A4[0]/2, 12*intro.mm, doc.footer_text.format(page=doc.page))
+
+
+def build(draw, pages, compress):
+    story = []
+    for page in range(pages):
+        if page:
+            story.append(PageBreak())
+        story.append(Paragraph(f"Page body {page + 1}", intro.style_body))
+    buf = BytesIO()
+    doc = intro.make_doc(buf)
+    doc.pageCompression = compress
+    doc.header_text = intro.DEFAULT_HEADER
+    doc.footer_text = intro.DEFAULT_FOOTER
+    # CPU time: wall-clock on a shared machine is too noisy for a ~10% effect
+    start = time.process_time()
+    doc.build(story, onFirstPage=draw, onLaterPages=draw)
+    return time.process_time() - start, buf.getvalue()
+
+
+def content_bytes(data):
+    return sum(len(page.get_contents().get_data()) for page in PdfReader(BytesIO(data)).pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    args = parser.parse_args()
+    intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    build(intro.draw_page, 20, 1)  # warm-up: font subsetting, imports
+    print(f"{'compression':<12} {'decoration':<10} {'bytes':>9} {'content':>9} {'ms':>8}")
+    for compress in (1, 0):
+        variants = (("inline", inline_draw_page), ("xobject", intro.draw_page))
+        # Interleaved so that drift in machine load hits both variants alike
+        runs = {label: [] for label, _ in variants}
+        for _ in range(args.repeat):
+            for label, draw in variants:
+                runs[label].append(build(draw, args.pages, compress))
+        results = {}
+        for label, _ in variants:
+            seconds, data = min(runs[label], key=lambda run: run[0])
+            results[label] = (len(data), seconds)
+            print(f"{'on' if compress else 'off':<12} {label:<10} {len(data):>9} {content_bytes(data):>9} {seconds * 1000:>8.1f}")
+        (size_a, time_a), (size_b, time_b) = results["inline"], results["xobject"]
+        print(f"{'':<12} {'saved':<10} {(1 - size_b / size_a) * 100:>8.1f}% {'':>9} {(1 - time_b / time_a) * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Scaling benchmark: parallel section rendering on 1, 2, 4 and 8 workers.
+
+Repeats the built-in sections until the document passes `--pages` pages,
+times the single-pass `build_intro_pdf` for reference, then
+`build_parallel` at each worker count (best of `--repeat`, pool start-up
+included). Every parallel output must be byte-identical to the
+`workers=1` build; the SHA-256 prefix is printed to show it.
+
+    python benchmarks/bench_parallel.py [--pages 300] [--workers 1,2,4,8] [--repeat 2] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_intro_pdf as intro
+from architect_pdf.parallel import build_parallel
+from bench_incremental import long_content
+
+
+def timed_build(build, repeat):
+    best, data = None, None
+    for _ in range(repeat):
+        buf = BytesIO()
+        start = time.perf_counter()
+        build(buf)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+        data = buf.getvalue()
+    return best, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--lang", default="ko", choices=sorted(intro.INTRO_CONTENT))
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    args = parser.parse_args()
+    fonts = intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    per_copy = intro.build_intro_pdf(BytesIO(), lang=args.lang) - 2
+    content = long_content(args.lang, max(1, -(-(args.pages - 2) // per_copy)))
+    print(f"{len(content['sections'])} sections, {os.cpu_count()} CPUs")
+
+    serial_s, _ = timed_build(lambda out: intro.build_intro_pdf(out, content=content), args.repeat)
+    print(f"{'build':<22} {'seconds':>8} {'speed-up':>9}  sha256")
+    print(f"{'build_intro_pdf':<22} {serial_s:>8.2f} {1:>8.2f}x  -")
+
+    reference = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        seconds, data = timed_build(lambda out: build_parallel(out, content=content, fonts=fonts, workers=workers), args.repeat)
+        digest = hashlib.sha256(data).hexdigest()
+        if reference is None:
+            reference = digest
+        status = "" if digest == reference else "  MISMATCH"
+        print(f"{f'parallel, {workers} workers':<22} {seconds:>8.2f} {serial_s / seconds:>8.2f}x  {digest[:16]}{status}")
+        if status:
+            sys.exit(f"output with {workers} workers differs from the 1-worker build")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Phase-level benchmark of the PDF generator.
+
+Every sample runs in a fresh interpreter and records, per scenario:
+
+    import     reportlab (platypus, TrueType support)
+    styles     importing generate_intro_pdf: module-level styles and content
+    fonts      register_fonts()
+    story      build_story()
+    layout     doc.build() minus serialization: wrapping, splitting, drawing
+    serialize  canvas.save(): writing the PDF objects and file
+
+plus peak RSS, output size and page count. Scenarios are the built-in
+introduction, its sections repeated 10x and 100x, and a document with one
+5,000-row table. The median of `--runs` samples is written as JSON;
+`--baseline` compares against an earlier file and exits non-zero when a
+phase got slower than `--threshold` (ignoring differences under
+`--min-delta` seconds, which are noise).
+
+    python benchmarks/bench_phases.py [-o results.json] [--scenarios intro,x10] [--runs 3]
+                                      [--baseline old.json] [--threshold 0.15] [--font PATH]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = ["import", "styles", "fonts", "story", "layout", "serialize"]
+SCENARIOS = ["intro", "x10", "x100", "table"]
+TABLE_ROWS = 5000
+
+
+def scenario_content(intro, name, lang):
+    from bench_incremental import long_content
+
+    if name == "intro":
+        return intro.INTRO_CONTENT[lang]
+    if name in ("x10", "x100"):
+        return long_content(lang, int(name[1:]))
+    if name == "table":
+        content = long_content(lang, 1)
+        rows = [["#", "Column", "Type", "Description"]]
+        rows += [[str(i), f"column_{i}", "varchar(255)", f"Value {i} copied from the source record at import time"]
+                 for i in range(TABLE_ROWS)]
+        content["sections"].append({"key": "table", "title": "Data dictionary", "blocks": [
+            ("table", rows, {"widths": [12, 40, 30, 78], "padding": 4}),
+        ]})
+        return content
+    raise ValueError(f"Unknown scenario: {name!r}")
+
+
+def child(name, lang, font):
+    """Run one sample in this (fresh) interpreter and print its record as JSON"""
+    sys.path.insert(0, ROOT)
+    import resource
+
+    timings = {}
+    t0 = time.perf_counter()
+    import reportlab.platypus
+    import reportlab.pdfbase.ttfonts
+    t1 = time.perf_counter()
+    import generate_intro_pdf as intro
+    t2 = time.perf_counter()
+    timings["import"], timings["styles"] = t1 - t0, t2 - t1
+
+    t0 = time.perf_counter()
+    intro.register_fonts({"Korean": font, "KoreanBold": font} if font else None)
+    timings["fonts"] = time.perf_counter() - t0
+
+    content = scenario_content(intro, name, lang)
+    t0 = time.perf_counter()
+    story = intro.build_story(content)
+    timings["story"] = time.perf_counter() - t0
+
+    saves = []
+
+    class TimedCanvas(reportlab.pdfgen.canvas.Canvas):
+        def save(self):
+            start = time.perf_counter()
+            super().save()
+            saves.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "out.pdf")
+        doc = intro.make_doc(output)
+        doc.header_text = content.get("header", intro.DEFAULT_HEADER)
+        doc.footer_text = content.get("footer", intro.DEFAULT_FOOTER)
+        t0 = time.perf_counter()
+        doc.build(story, onFirstPage=intro.draw_cover, onLaterPages=intro.draw_page, canvasmaker=TimedCanvas)
+        build = time.perf_counter() - t0
+        size = os.path.getsize(output)
+    timings["serialize"] = sum(saves)
+    timings["layout"] = build - timings["serialize"]
+
+    print(json.dumps({
+        "phases": timings,
+        "total": sum(timings.values()),
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10),
+        "bytes": size,
+        "pages": doc.page,
+    }))
+
+
+def run_sample(name, lang, font):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", name, "--lang", lang]
+    if font:
+        cmd += ["--font", font]
+    out = subprocess.run(cmd, cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def median_record(samples):
+    record = {
+        "phases": {phase: statistics.median(s["phases"][phase] for s in samples) for phase in PHASES},
+        "peak_rss_mib": statistics.median(s["peak_rss_mib"] for s in samples),
+        "bytes": samples[-1]["bytes"],
+        "pages": samples[-1]["pages"],
+        "runs": len(samples),
+    }
+    record["total"] = sum(record["phases"].values())
+    return record
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Regression messages for phases slower than the baseline by more than `threshold`"""
+    regressions = []
+    for name, record in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        for phase in PHASES + ["total"]:
+            new_s = record["total"] if phase == "total" else record["phases"][phase]
+            old_s = old["total"] if phase == "total" else old["phases"].get(phase)
+            if old_s is None:
+                continue
+            if new_s - old_s > min_delta and new_s > old_s * (1 + threshold):
+                regressions.append(f"{name}/{phase}: {old_s:.3f}s -> {new_s:.3f}s (+{(new_s / old_s - 1) * 100:.0f}%)")
+    return regressions
+
+
+def format_table(results):
+    lines = [f"{'scenario':<8} " + " ".join(f"{phase:>9}" for phase in PHASES + ["total"])
+             + f" {'RSS MiB':>8} {'KB':>8} {'pages':>6}"]
+    for name, r in results["scenarios"].items():
+        lines.append(f"{name:<8} " + " ".join(f"{r['phases'][phase]:>9.3f}" for phase in PHASES)
+                     + f" {r['total']:>9.3f} {r['peak_rss_mib']:>8.1f} {r['bytes'] / 1024:>8.0f} {r['pages']:>6}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", default="bench_phases.json", help="results JSON (default: %(default)s)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ",".join(SCENARIOS))
+    parser.add_argument("--lang", default="ko")
+    parser.add_argument("--runs", type=int, default=3, help="samples per scenario; the median is recorded")
+    parser.add_argument("--baseline", help="earlier results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown per phase (default: 0.15 = 15%%)")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="ignore slowdowns below this many seconds")
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.lang, args.font)
+        return 0
+
+    import reportlab
+
+    results = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "reportlab": reportlab.Version,
+        "platform": platform.platform(),
+        "scenarios": {},
+    }
+    for name in args.scenarios.split(","):
+        samples = [run_sample(name, args.lang, args.font) for _ in range(args.runs)]
+        results["scenarios"][name] = median_record(samples)
+        print(f"{name}: {results['scenarios'][name]['total']:.2f}s", file=sys.stderr, flush=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(format_table(results))
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo phase regressed by more than {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Load test for the HTTP render service on localhost.
+
+Starts `python -m architect_pdf.service` on a free port (or targets
+`--url`), then runs `--clients` concurrent clients over keep-alive
+connections until `--requests` requests are done. Each request renders the
+introduction for its own customer name. Reports the status codes, the
+p50/p95/p99 latency of successful renders and of all answers, and the
+throughput. With more clients than `--concurrency + --queue` the surplus is
+answered 429 immediately, which is the backpressure working; a client that
+gets a 429 waits `--backoff` seconds before its next request.
+
+    python benchmarks/bench_service.py [--requests 200] [--clients 8] [-j N]
+                                       [--concurrency N] [--queue N] [--backoff 0.1] [--url URL]
+"""
+from collections import Counter
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (0 < q <= 100)"""
+    ordered = sorted(values)
+    return ordered[max(0, -(-len(ordered) * q // 100) - 1)]
+
+
+def start_service(args):
+    cmd = [sys.executable, "-m", "architect_pdf.service", "--port", "0", "--quiet",
+           "--timeout", str(args.timeout)]
+    for flag, value in (("-j", args.workers), ("--concurrency", args.concurrency), ("--queue", args.queue)):
+        if value is not None:
+            cmd += [flag, str(value)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    # The service prints its address once every worker has warmed up
+    line = proc.stdout.readline()
+    if not line.startswith("Listening on "):
+        proc.kill()
+        sys.exit(f"service did not start: {line!r}")
+    print(line.strip())
+    return proc, line.split()[2]
+
+
+async def request(reader, writer, host, path, body):
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status, length
+
+
+async def load(url, lang, total, clients, backoff):
+    parts = urlsplit(url)
+    path = f"/intro?lang={lang}"
+    results = []
+    issued = 0
+
+    async def client():
+        nonlocal issued
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+        try:
+            while issued < total:
+                issued += 1
+                body = json.dumps({"customer": f"Customer {issued}"}).encode()
+                start = time.perf_counter()
+                status, size = await request(reader, writer, parts.netloc, path, body)
+                results.append((status, time.perf_counter() - start, size))
+                if status == 429:
+                    await asyncio.sleep(backoff)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return results, time.perf_counter() - start
+
+
+def report(results, elapsed):
+    statuses = Counter(status for status, _, _ in results)
+    print("status: " + ", ".join(f"{status} x{count}" for status, count in sorted(statuses.items())))
+    ok = [seconds for status, seconds, _ in results if status == 200]
+    print(f"{'':<10} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, latencies in (("200", ok), ("all", [seconds for _, seconds, _ in results])):
+        if latencies:
+            print(f"{label:<10} {len(latencies):>6} " + " ".join(
+                f"{percentile(latencies, q) * 1000:>8.1f}" for q in (50, 95, 99)) + f" {max(latencies) * 1000:>8.1f}")
+    print(f"{len(ok) / elapsed:.1f} renders/s, {len(results) / elapsed:.1f} answers/s over {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive connections")
+    parser.add_argument("--lang", default="ko")
+    parser.add_argument("--backoff", type=float, default=0.1, help="seconds a client waits after a 429")
+    parser.add_argument("--url", help="running service to target instead of starting one")
+    parser.add_argument("-j", "--workers", type=int, help="service worker processes")
+    parser.add_argument("--concurrency", type=int, help="service renders in flight")
+    parser.add_argument("--queue", type=int, help="service queue size")
+    parser.add_argument("--timeout", type=float, default=60.0, help="service request timeout")
+    args = parser.parse_args()
+
+    proc, url = (None, args.url) if args.url else start_service(args)
+    try:
+        results, elapsed = asyncio.run(load(url, args.lang, args.requests, args.clients, args.backoff))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    report(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
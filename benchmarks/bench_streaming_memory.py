@@ -0,0 +1,110 @@
+"""
+Memory benchmark: list-built story vs the streaming document template.
+
+Renders documents of about 20 and 2,000 pages (the built-in sections
+repeated) two ways, each in a fresh interpreter:
+
+    list    the whole story built up front and passed to reportlab's
+            SimpleDocTemplate with the stock canvas (the previous build)
+    stream  `iter_story` pulled lazily by StreamingDocTemplate, page
+            streams compressed as each page ends (the current build)
+
+and reports the Python heap peak during the build (tracemalloc), the
+process's peak RSS, the build time and the page count. The repeated
+sections share one content dict, so the input itself does not grow with
+the page count. Both variants keep the finished PDF in memory at save
+time, so even the streaming peak grows by the output size.
+
+    python benchmarks/bench_streaming_memory.py [--pages 20,2000] [--font PATH]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pages produced by one copy of the built-in sections (cover and TOC excluded)
+PAGES_PER_COPY = {"ko": 8, "en": 11}
+MODES = ["list", "stream"]
+
+
+def child(mode, pages, lang, font):
+    """Run one build in this (fresh) interpreter and print its record as JSON"""
+    sys.path.insert(0, ROOT)
+    import resource
+    import tracemalloc
+
+    from reportlab.platypus import SimpleDocTemplate
+
+    import generate_intro_pdf as intro
+
+    intro.register_fonts({"Korean": font, "KoreanBold": font} if font else None)
+    content = dict(intro.INTRO_CONTENT[lang])
+    content["sections"] = content["sections"] * max(1, -(-(pages - 2) // PAGES_PER_COPY[lang]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "out.pdf")
+        if mode == "list":
+            doc = SimpleDocTemplate(output, pagesize=intro.A4, topMargin=22*intro.mm, bottomMargin=22*intro.mm,
+                                    leftMargin=25*intro.mm, rightMargin=25*intro.mm)
+        else:
+            doc = intro.make_doc(output)
+        doc.header_text = content.get("header", intro.DEFAULT_HEADER)
+        doc.footer_text = content.get("footer", intro.DEFAULT_FOOTER)
+        tracemalloc.start()
+        start = time.perf_counter()
+        story = intro.build_story(content) if mode == "list" else intro.iter_story(content)
+        doc.build(story, onFirstPage=intro.draw_cover, onLaterPages=intro.draw_page)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = os.path.getsize(output)
+
+    print(json.dumps({
+        "heap_peak_mib": peak / 2**20,
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10),
+        "seconds": seconds,
+        "bytes": size,
+        "pages": doc.page,
+    }))
+
+
+def run(mode, pages, lang, font):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", mode, "--pages", str(pages), "--lang", lang]
+    if font:
+        cmd += ["--font", font]
+    out = subprocess.run(cmd, cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", default="20,2000", help="comma-separated target page counts")
+    parser.add_argument("--lang", default="ko", choices=sorted(PAGES_PER_COPY))
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, int(args.pages), args.lang, args.font)
+        return
+
+    print(f"{'mode':<8} {'pages':>6} {'heap MiB':>9} {'RSS MiB':>8} {'seconds':>8} {'KB':>8}")
+    peaks = {mode: [] for mode in MODES}
+    for pages in (int(p) for p in args.pages.split(",")):
+        for mode in MODES:
+            r = run(mode, pages, args.lang, args.font)
+            peaks[mode].append(r["heap_peak_mib"])
+            print(f"{mode:<8} {r['pages']:>6} {r['heap_peak_mib']:>9.1f} {r['peak_rss_mib']:>8.1f} "
+                  f"{r['seconds']:>8.2f} {r['bytes'] / 1024:>8.0f}")
+    for mode in MODES:
+        print(f"{mode}: heap peak grows {peaks[mode][-1] / peaks[mode][0]:.1f}x from the smallest to the largest document")
+
+
+if __name__ == "__main__":
+    main()
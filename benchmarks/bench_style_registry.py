@@ -0,0 +1,98 @@
+"""
+Micro-benchmark: per-call ParagraphStyle creation vs the interned registry.
+
+Builds a synthetic 5,000-paragraph document the way the content loops do
+(TOC-style title/description pairs plus an info box every 25 entries) twice:
+once allocating a fresh style per paragraph like the old `make_style`, once
+through the registry. Reports ParagraphStyle objects created, traced
+allocations, GC collections, story construction time and `doc.build` time.
+
+    python benchmarks/bench_style_registry.py [--paragraphs N] [--repeat N] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Table
+
+import generate_intro_pdf as intro
+
+
+def fresh_style(name, font=None, size=10, color=intro.DARK, leading=16, align=0, space_before=0, space_after=0, bold=False):
+    """The pre-registry make_style(): a new object on every call"""
+    return ParagraphStyle(
+        name=name,
+        fontName=intro.BOLD_FONT if bold else (font or intro.NORMAL_FONT),
+        fontSize=size, textColor=color, leading=leading, alignment=align,
+        spaceBefore=space_before, spaceAfter=space_after,
+    )
+
+
+def synthetic_story(paragraphs, style_fn):
+    story = []
+    for i in range(paragraphs // 2):
+        story.append(Paragraph(f"<b>{i}. 항목 제목 Entry title</b>", style_fn("TOCTitle", size=11, color=intro.DARK, leading=18, bold=True)))
+        story.append(Paragraph("&nbsp;&nbsp;설명 텍스트 description text " * 3, style_fn("TOCDesc", size=9, color=intro.SLATE, leading=14, space_after=6)))
+        if i % 25 == 0:
+            story.append(Table(
+                [[Paragraph("<b>요약</b>", style_fn("BoxTitle", size=10, color=intro.BLUE, bold=True, leading=16))],
+                 [Paragraph("info box body", style_fn("BoxBody", size=9, color=intro.SLATE, leading=15))]],
+            ))
+    return story
+
+
+def count_styles():
+    return sum(1 for o in gc.get_objects() if isinstance(o, ParagraphStyle))
+
+
+def measure(label, paragraphs, style_fn, repeat):
+    # Timed without tracemalloc, which slows allocation-heavy code a lot;
+    # best of `repeat` runs
+    story_s, build_s = [], []
+    for _ in range(repeat):
+        gc.collect()
+        collections_before = sum(s["collections"] for s in gc.get_stats())
+        t0 = time.perf_counter()
+        story = synthetic_story(paragraphs, style_fn)
+        t1 = time.perf_counter()
+        collections = sum(s["collections"] for s in gc.get_stats()) - collections_before
+        intro.make_doc(BytesIO()).build(story)
+        t2 = time.perf_counter()
+        story_s.append(t1 - t0)
+        build_s.append(t2 - t1)
+        del story
+
+    gc.collect()
+    styles_before = count_styles()
+    tracemalloc.start()
+    story = synthetic_story(paragraphs, style_fn)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    styles = count_styles() - styles_before
+    print(f"{label:<9} {styles:>8} {blocks:>10} {peak / 1024:>9.0f} {collections:>5} {min(story_s) * 1000:>9.1f} {min(build_s) * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    args = parser.parse_args()
+    intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    print(f"{'':<9} {'styles':>8} {'blocks':>10} {'peak KiB':>9} {'gc':>5} {'story ms':>9} {'build ms':>9}")
+    measure("per-call", args.paragraphs, fresh_style, args.repeat)
+    measure("registry", args.paragraphs, intro.make_style, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: reportlab `Table` vs `DataTable` on 1k, 10k and 50k-row tables.
+
+Each table looks like an API endpoint listing (method, path, description,
+auth) with markup in one row out of ten. The `Table` baseline is built the
+way `data_table()` builds short tables (a Paragraph per cell, GRID and
+ROWBACKGROUNDS styles) plus `repeatRows=1`. Layout time is measured
+without tracing; peak memory comes from a second, traced build.
+
+    python benchmarks/bench_tables.py [--rows 1000,10000,50000] [--baseline-max N] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+import generate_intro_pdf as intro
+from architect_pdf.tables import DataTable
+
+WIDTHS = [18, 50, 72, 20]
+METHODS = ["GET", "POST", "PUT", "DELETE"]
+
+
+def endpoint_rows(n):
+    rows = [["Method", "Path", "Description", "Auth"]]
+    for i in range(n):
+        description = f"Returns page {i % 50} of the records owned by the caller, filtered by status and sorted by update time"
+        if i % 10 == 0:
+            description = f"<b>Deprecated.</b> {description}"
+        rows.append([METHODS[i % 4], f"/api/v1/projects/{i}/items", description, "required" if i % 3 else "public"])
+    return rows
+
+
+def paragraph_table(rows):
+    t = Table(
+        [[Paragraph(cell, intro.style_table_header if i == 0 else intro.style_table_body) for cell in row]
+         for i, row in enumerate(rows)],
+        colWidths=[w*mm for w in WIDTHS], repeatRows=1,
+    )
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), intro.DARK),
+        ('GRID', (0,0), (-1,-1), 0.5, intro.BORDER),
+        ('TOPPADDING', (0,0), (-1,-1), 4),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+        ('LEFTPADDING', (0,0), (-1,-1), 8),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [intro.WHITE, intro.SLATE_BG]),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ]))
+    return t
+
+
+def data_table(rows):
+    return DataTable(
+        rows, [w*mm for w in WIDTHS], intro.style_table_header, intro.style_table_body,
+        header_background=intro.DARK, stripes=[intro.WHITE, intro.SLATE_BG], grid_color=intro.BORDER,
+        padding=4, left_padding=8,
+    )
+
+
+def build(make_table, rows):
+    doc = intro.make_doc(BytesIO())
+    doc.build([make_table(rows)])
+    return doc.page
+
+
+def measure(label, make_table, rows):
+    gc.collect()
+    start = time.perf_counter()
+    pages = build(make_table, rows)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    build(make_table, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(rows) - 1:>7} {label:<10} {pages:>6} {seconds:>9.2f} {(len(rows) - 1) / seconds:>9.0f} {peak / 2**20:>9.1f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", default="1000,10000,50000", help="comma-separated row counts")
+    parser.add_argument("--baseline-max", type=int, default=10000, help="skip the Table baseline above this many rows")
+    parser.add_argument("--font", help="font file for both aliases (default: discovery)")
+    args = parser.parse_args()
+    intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    print(f"{'rows':>7} {'engine':<10} {'pages':>6} {'seconds':>9} {'rows/s':>9} {'peak MiB':>9}")
+    for n in (int(n) for n in args.rows.split(",")):
+        rows = endpoint_rows(n)
+        if n <= args.baseline_max:
+            measure("Table", paragraph_table, rows)
+        measure("DataTable", data_table, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: measuring and wrapping 1 MB of Korean text, reportlab's TTFont vs width tables.
+
+The text is built from the words of the built-in Korean content (so words
+repeat the way they do in real documents), or from random Hangul
+syllables with `--vocab random`, where almost every word is new. The same
+font file is registered either as a stock `TTFont` (reportlab's
+per-character `charWidths` lookups, the previous path) or through
+`architect_pdf.fonts` (a `WidthTable`). Each sample runs in a fresh process,
+so table construction and filling the word memo are included. Reports,
+best of `--repeat`:
+
+    words      `stringWidth` of every word
+    lines      `stringWidth` of every 60-character slice, the length of a set line
+    batched    `measure_words` of every paragraph's word list
+    paragraph  `Paragraph.wrap` of every paragraph in the justified body style
+    cells      `tables.wrap_text` into 40 mm cells
+
+Widths and line breaks from both fonts are compared and must be identical.
+
+    python benchmarks/bench_text_measure.py [--mb 1] [--repeat 3] [--vocab content|random] [--font PATH]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph
+
+import generate_intro_pdf as intro
+from architect_pdf.fonts import KOREAN_REGULAR_FACES, find_fonts, load_font
+from architect_pdf.metrics import measure_words
+from architect_pdf.tables import wrap_text
+
+WORDS_PER_PARAGRAPH = 80
+LINE_CHARS = 60
+PHASES = ["words", "lines", "batched", "paragraph", "cells"]
+ALIAS = "BenchKorean"
+
+
+def korean_paragraphs(mb, vocab, seed=1):
+    rng = random.Random(seed)
+    if vocab == "content":
+        text = re.sub(r"<[^>]+>", " ", json.dumps(intro.INTRO_CONTENT["ko"], ensure_ascii=False))
+        words = [w for w in re.findall(r"[^\s\"\\,\[\]{}]+", text) if re.search("[가-힣]", w)]
+    else:
+        words = ["".join(chr(rng.randrange(0xAC00, 0xD7A4)) for _ in range(rng.randrange(1, 5)))
+                 + rng.choice(["", "은", "는", "을", "를", "의", ".", ","]) for _ in range(200000)]
+    paragraphs, size = [], 0
+    while size < mb * 2**20:
+        paragraph = [rng.choice(words) for _ in range(WORDS_PER_PARAGRAPH)]
+        paragraphs.append(paragraph)
+        size += len(" ".join(paragraph).encode("utf-8")) + 1
+    return paragraphs
+
+
+def child(kind, phase, path, args):
+    """Time one phase with a freshly registered font; prints seconds and a digest of the result"""
+    # reportlab keeps the first font registered for a face, so each process registers one
+    pdfmetrics.registerFont(TTFont(ALIAS, path) if kind == "stock" else load_font(ALIAS, path))
+    style = intro.make_style("BenchBody", font=ALIAS, size=9.5, leading=16, align=intro.TA_JUSTIFY)
+    size = style.fontSize
+    paragraphs = korean_paragraphs(args.mb, args.vocab)
+    texts = [" ".join(words) for words in paragraphs]
+    lines = [text[i:i + LINE_CHARS] for text in texts for i in range(0, len(text), LINE_CHARS)]
+
+    def wrap_paragraphs():
+        breaks = []
+        for text in texts:
+            p = Paragraph(text, style)
+            p.wrap(150*mm, 1e9)
+            breaks.append([len(words) for _, words in p.blPara.lines])
+        return breaks
+
+    work = {
+        "words": lambda: [pdfmetrics.stringWidth(w, ALIAS, size) for words in paragraphs for w in words],
+        "lines": lambda: [pdfmetrics.stringWidth(line, ALIAS, size) for line in lines],
+        "batched": lambda: [measure_words(words, ALIAS, size) for words in paragraphs],
+        "paragraph": wrap_paragraphs,
+        "cells": lambda: [wrap_text(text, ALIAS, size, 40*mm) for text in texts],
+    }[phase]
+    start = time.perf_counter()
+    result = work()
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "result": hashlib.sha256(repr(result).encode()).hexdigest()}))
+
+
+def run(kind, phase, path, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", kind, phase, "--font", path,
+           "--mb", str(args.mb), "--vocab", args.vocab]
+    return json.loads(subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True).stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=float, default=1.0, help="megabytes of UTF-8 text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--vocab", default="content", choices=["content", "random"])
+    parser.add_argument("--font", help="font file (default: the discovered Korean face)")
+    parser.add_argument("--child", nargs=2, metavar=("KIND", "PHASE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    path = args.font or find_fonts(KOREAN_REGULAR_FACES)[0]
+    if args.child:
+        child(*args.child, path, args)
+        return
+    paragraphs = korean_paragraphs(args.mb, args.vocab)
+    print(f"{len(paragraphs)} paragraphs, {sum(map(len, paragraphs))} words, font {os.path.basename(path)}")
+
+    print(f"{'':<10} {'stock s':>8} {'table s':>8} {'speed-up':>9}")
+    for phase in PHASES:
+        best, results = {}, set()
+        for _ in range(args.repeat):
+            # Interleaved so that drift in machine load hits both paths alike
+            for kind in ("stock", "table"):
+                r = run(kind, phase, path, args)
+                best[kind] = min(best.get(kind, r["seconds"]), r["seconds"])
+                results.add(r["result"])
+        if len(results) > 1:
+            sys.exit(f"{phase}: the two paths measured different widths or broke lines differently")
+        print(f"{phase:<10} {best['stock']:>8.3f} {best['table']:>8.3f} {best['stock'] / best['table']:>8.1f}x")
+    print("widths and line breaks identical")
+
+
+if __name__ == "__main__":
+    main()
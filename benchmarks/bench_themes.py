@@ -0,0 +1,113 @@
+"""
+Benchmark: 100 branded variants with a theme logo and cover image.
+
+A theme with a large RGBA logo (PNG) and a cover photo (JPEG) is written
+to a temporary directory, and `--variants` introductions with different
+customer names are rendered with it in one warm process. Three ways of
+getting the theme images are timed:
+
+    decode   no asset cache: every render decodes and downscales both images
+    cold     architect_pdf.assets with an empty disk cache: the first render
+             decodes, the rest reuse the in-process memo
+    warm     a fresh process over a filled disk cache: the prepared images
+             are unpickled once, nothing is decoded
+
+Reports seconds, renders per second, how many times the images were
+decoded, and the image XObjects in each PDF (the logo is drawn on every
+page but embedded once, plus its soft mask and the cover).
+
+    python benchmarks/bench_themes.py [--variants 100] [--lang en] [--font PATH]
+"""
+from io import BytesIO
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+import generate_intro_pdf as intro  # noqa: E402
+from architect_pdf import assets  # noqa: E402
+from architect_pdf.batch import variant_content  # noqa: E402
+
+
+def make_theme(directory):
+    logo = Image.new("RGBA", (3000, 900), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(logo)
+    draw.rounded_rectangle((0, 0, 900, 900), radius=180, fill=(194, 65, 12, 255))
+    for x in range(1000, 3000, 60):
+        draw.rectangle((x, 300, x + 30, 600), fill=(30, 41, 59, 255))
+    logo.save(os.path.join(directory, "logo.png"))
+    cover = Image.linear_gradient("L").resize((4000, 1200)).convert("RGB")
+    ImageDraw.Draw(cover).ellipse((1500, 100, 2500, 1100), fill=(234, 88, 12))
+    cover.save(os.path.join(directory, "cover.jpg"), quality=92)
+    path = os.path.join(directory, "acme.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "name": "acme",
+            "colors": {"BLUE": "#c2410c", "BLUE_MID": "#ea580c", "BLUE_LIGHT": "#fff7ed"},
+            "header": "ACME Logistics  |  Solution Proposal",
+            "footer": "ACME Confidential  |  Page {page}",
+            "logo": "logo.png",
+            "cover_image": "cover.jpg",
+        }, f)
+    return path
+
+
+def render_all(theme, variants, lang):
+    outputs = []
+    for i in range(variants):
+        content = variant_content({"lang": lang, "customer": f"Customer {i + 1:03d}"})
+        buf = BytesIO()
+        intro.build_intro_pdf(buf, lang=lang, content=content, theme=theme)
+        outputs.append(buf.getvalue())
+    return outputs
+
+
+def run(label, theme, args):
+    assets._assets.clear()
+    assets._hashes.clear()
+    before = dict(assets.stats)
+    start = time.perf_counter()
+    outputs = render_all(theme, args.variants, args.lang)
+    seconds = time.perf_counter() - start
+    decoded = assets.stats["decoded"] - before["decoded"]
+    images = {len(re.findall(rb"/Subtype /Image\b", data)) for data in outputs}
+    size = sum(map(len, outputs)) / len(outputs)
+    print(f"{label:<7} {seconds:>8.2f} {args.variants / seconds:>9.1f} {decoded:>8} "
+          f"{'/'.join(map(str, sorted(images))):>7} {size / 1024:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", type=int, default=100)
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--font", help="font file for both aliases (default: discovered Korean faces)")
+    args = parser.parse_args()
+    intro.register_fonts({"Korean": args.font, "KoreanBold": args.font} if args.font else None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["ARCHITECT_PDF_CACHE"] = os.path.join(tmp, "cache")
+        theme = make_theme(tmp)
+        # Warm the renderer itself so the first mode pays no import-time costs
+        intro.build_intro_pdf(BytesIO(), lang=args.lang)
+
+        print(f"{'images':<7} {'seconds':>8} {'renders/s':>9} {'decoded':>8} {'images':>7} {'KiB/PDF':>8}")
+        load_asset = intro.load_asset
+        intro.load_asset = lambda path, max_px: assets.prepare(path, max_px)
+        try:
+            run("decode", theme, args)
+        finally:
+            intro.load_asset = load_asset
+        run("cold", theme, args)
+        run("warm", theme, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,59 @@
 """
 Architect Enterprise Builder - System Introduction Document PDF Generator
+
+Importable render API:
+
+    from generate_intro_pdf import build_intro_pdf
+    build_intro_pdf("out.pdf", lang="ko")
+
+The output can be a path or any writable binary stream (a pipe, socket,
+HTTP response body or BytesIO); the PDF is written in chunks as it is
+serialized, not in one write at the end. `-o -` writes to stdout:
+
+    python generate_intro_pdf.py -o - | curl -T - https://upload.example/intro.pdf
+
+Importing this module has no side effects beyond creating the style objects.
+Fonts are registered lazily on the first render and reused for the lifetime
+of the process, so a long-lived worker only pays the start-up cost once.
+Many variants (language, customer, TOC, scenario) can be rendered in
+parallel with `python -m architect_pdf.batch manifest.json`,
+`python -m architect_pdf.pagecache` rebuilds only the sections that changed,
+`python -m architect_pdf.outputcache` skips renders whose inputs did not
+change and `python -m architect_pdf.service` serves renders over HTTP.
+`--watch` keeps the process running and rebuilds on every save (see
+architect_pdf.watch) and `--dry-run` reports the pagination as JSON
+without writing a PDF (see architect_pdf.dryrun). `--appendix spec.pdf`
+grafts existing PDFs after the last section (see architect_pdf.appendix)
+and `--theme acme` renders with a customer's colors, texts, logo and fonts
+(see architect_pdf.themes). `--compact` writes the smallest form and
+reports where its bytes go; with `--max-kb` the build fails when the PDF
+is over budget (see architect_pdf.compact).
 """
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.lib.colors import HexColor, white, black
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, HRFlowable
-from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageBreak, HRFlowable
+from architect_pdf import mermaid
+from architect_pdf.assets import draw_asset, load_asset
+from architect_pdf.fonts import (
+    FALLBACK_FACES, FALLBACK_PREFIX, KOREAN_BOLD_FACES, KOREAN_REGULAR_FACES,
+    fallback_chain, find_fonts, load_first_font, with_fallbacks,
+)
+from architect_pdf.profiling import LayoutProfiler
+from architect_pdf.styles import StyleRegistry
+from architect_pdf.streaming import StreamingDocTemplate
+from architect_pdf.tables import DataTable
+from architect_pdf.themes import DEFAULT_THEME, load_theme
+from io import BytesIO
+import argparse
+import copy
+import hashlib
+import json
 import os
+import sys
 
 # ── Colors ──
 DARK = HexColor("#0f172a")
@@ -26,73 +69,183 @@ ORANGE = HexColor("#ea580c")
 WHITE = HexColor("#ffffff")
 BORDER = HexColor("#e2e8f0")
 
+# Content refers to colors by name so it can be loaded from JSON
+COLORS = {
+    "DARK": DARK, "BLUE": BLUE, "BLUE_LIGHT": BLUE_LIGHT, "BLUE_MID": BLUE_MID,
+    "SLATE": SLATE, "SLATE_LIGHT": SLATE_LIGHT, "SLATE_BG": SLATE_BG,
+    "GREEN": GREEN, "PURPLE": PURPLE, "ORANGE": ORANGE, "WHITE": WHITE, "BORDER": BORDER,
+}
+# A theme rebinds the names above; these are the built-in values (see use_theme)
+DEFAULT_COLORS = dict(COLORS)
+
 # ── Font Registration ──
-# Try to use Malgun Gothic (Windows Korean font)
-font_registered = False
-for font_path in [
-    "C:/Windows/Fonts/malgunbd.ttf",
-    "C:/Windows/Fonts/malgun.ttf",
-]:
-    if os.path.exists(font_path):
-        try:
-            pdfmetrics.registerFont(TTFont("Korean", font_path))
-            font_registered = True
-            break
-        except:
-            pass
+NORMAL_FONT = "Korean"
+BOLD_FONT = "KoreanBold"
+BASE_FONTS = (NORMAL_FONT, BOLD_FONT)
 
-if not font_registered:
-    # Fallback
-    pdfmetrics.registerFont(TTFont("Korean", "C:/Windows/Fonts/gulim.ttc", subfontIndex=0))
+_registered_fonts = {}
+_fallbacks = None
 
-BOLD_FONT = "Korean"
-NORMAL_FONT = "Korean"
 
-# Try bold variant
-for bold_path in ["C:/Windows/Fonts/malgunbd.ttf"]:
-    if os.path.exists(bold_path):
-        try:
-            pdfmetrics.registerFont(TTFont("KoreanBold", bold_path))
-            BOLD_FONT = "KoreanBold"
-            break
-        except:
-            pass
+def _fallback_paths(fonts):
+    """Explicit `Fallback1`, `Fallback2`, ... entries of `fonts` in order, else the discovered faces"""
+    explicit = sorted(
+        (int(alias[len(FALLBACK_PREFIX):]), path) for alias, path in fonts.items()
+        if alias.startswith(FALLBACK_PREFIX) and alias[len(FALLBACK_PREFIX):].isdigit()
+    )
+    return [path for _, path in explicit] if explicit else find_fonts(FALLBACK_FACES)
+
+
+def register_fonts(fonts=None):
+    """Register the `Korean`/`KoreanBold` aliases once per process.
+
+    `fonts` optionally maps an alias to a font file and overrides discovery
+    (see architect_pdf.fonts); `Fallback1`, `Fallback2`, ... replace the
+    discovered fallback chain for glyphs the Korean faces lack. The chain
+    is fixed by the first call. Returns the alias -> path mapping in
+    effect, fallbacks included.
+    """
+    global _fallbacks
+    fonts = fonts or {}
+    if _fallbacks is None:
+        _fallbacks = fallback_chain(_fallback_paths(fonts))
+    for alias, faces in zip(BASE_FONTS, (KOREAN_REGULAR_FACES, KOREAN_BOLD_FACES)):
+        path = fonts.get(alias)
+        if path is None and alias in _registered_fonts:
+            continue
+        if path is not None:
+            if _registered_fonts.get(alias) == path:
+                continue
+            candidates = [path]
+        else:
+            candidates = find_fonts(faces)
+            if alias == BASE_FONTS[1]:
+                # Without a bold face the bold alias points at the regular one
+                candidates.append(_registered_fonts[BASE_FONTS[0]])
+        font, path = load_first_font(alias, candidates)
+        pdfmetrics.registerFont(with_fallbacks(font, path, _fallbacks))
+        _registered_fonts[alias] = path
+    return {**_registered_fonts, **dict(_fallbacks)}
 
 # ── Styles ──
-def make_style(name, font=None, size=10, color=DARK, leading=16, align=TA_LEFT, space_before=0, space_after=0, bold=False):
+STYLES = StyleRegistry()
+
+
+def make_style(name, font=None, size=10, color=None, leading=16, align=TA_LEFT, space_before=0, space_after=0, bold=False, **extra):
+    """Interned style: equal parameters share one object, so never mutate it.
+
+    `color` defaults to the theme's DARK; `extra` passes further
+    ParagraphStyle attributes (backColor, ...).
+    """
     f = BOLD_FONT if bold else (font or NORMAL_FONT)
-    return ParagraphStyle(
-        name=name,
+    return STYLES.style(
+        name,
         fontName=f,
         fontSize=size,
-        textColor=color,
+        textColor=DARK if color is None else color,
         leading=leading,
         alignment=align,
         spaceBefore=space_before,
         spaceAfter=space_after,
+        **extra,
     )
 
-style_cover_title = make_style("CoverTitle", size=28, color=DARK, leading=36, bold=True, align=TA_CENTER)
-style_cover_sub = make_style("CoverSub", size=14, color=BLUE, leading=20, align=TA_CENTER)
-style_cover_desc = make_style("CoverDesc", size=11, color=SLATE, leading=18, align=TA_CENTER)
-
-style_h1 = make_style("H1", size=20, color=DARK, leading=28, bold=True, space_before=10, space_after=8)
-style_h2 = make_style("H2", size=14, color=BLUE, leading=20, bold=True, space_before=16, space_after=6)
-style_h3 = make_style("H3", size=12, color=DARK, leading=18, bold=True, space_before=10, space_after=4)
 
-style_body = make_style("Body", size=10, color=SLATE, leading=17, align=TA_JUSTIFY, space_after=4)
-style_body_dark = make_style("BodyDark", size=10, color=DARK, leading=17, align=TA_JUSTIFY, space_after=4)
-style_bullet = make_style("Bullet", size=10, color=SLATE, leading=17, space_after=2)
-style_small = make_style("Small", size=9, color=SLATE_LIGHT, leading=14)
-style_badge = make_style("Badge", size=9, color=BLUE, leading=14, bold=True)
-style_footer = make_style("Footer", size=8, color=SLATE_LIGHT, leading=12, align=TA_CENTER)
-style_caption = make_style("Caption", size=9, color=SLATE, leading=14, align=TA_CENTER, space_before=4)
+def _styles():
+    """The named paragraph styles, in the current theme's colors and fonts"""
+    return {
+        "style_cover_title": make_style("CoverTitle", size=28, color=DARK, leading=36, bold=True, align=TA_CENTER),
+        "style_cover_sub": make_style("CoverSub", size=14, color=BLUE, leading=20, align=TA_CENTER),
+        "style_cover_desc": make_style("CoverDesc", size=11, color=SLATE, leading=18, align=TA_CENTER),
+
+        "style_h1": make_style("H1", size=20, color=DARK, leading=28, bold=True, space_before=10, space_after=8),
+        "style_h2": make_style("H2", size=14, color=BLUE, leading=20, bold=True, space_before=16, space_after=6),
+        "style_h3": make_style("H3", size=12, color=DARK, leading=18, bold=True, space_before=10, space_after=4),
+
+        "style_body": make_style("Body", size=10, color=SLATE, leading=17, align=TA_JUSTIFY, space_after=4),
+        "style_body_dark": make_style("BodyDark", size=10, color=DARK, leading=17, align=TA_JUSTIFY, space_after=4),
+        "style_bullet": make_style("Bullet", size=10, color=SLATE, leading=17, space_after=2),
+        "style_small": make_style("Small", size=9, color=SLATE_LIGHT, leading=14),
+        "style_badge": make_style("Badge", size=9, color=BLUE, leading=14, bold=True),
+        "style_footer": make_style("Footer", size=8, color=SLATE_LIGHT, leading=12, align=TA_CENTER),
+        "style_caption": make_style("Caption", size=9, color=SLATE, leading=14, align=TA_CENTER, space_before=4),
+
+        "style_table_header": make_style("TableHeader", size=9, color=WHITE, leading=14, bold=True, align=TA_CENTER),
+        "style_table_body": make_style("TableBody", size=9, color=DARK, leading=14),
+
+        "style_toc_title": make_style("TOCTitle", size=11, color=DARK, leading=18, bold=True),
+        "style_toc_desc": make_style("TOCDesc", size=9, color=SLATE, leading=14, space_after=6),
+        "style_box_title": make_style("BoxTitle", size=10, color=BLUE, bold=True, leading=16),
+        "style_box_body": make_style("BoxBody", size=9, color=SLATE, leading=15),
+        "style_flow_title": make_style("FlowTitle", size=10, color=WHITE, leading=15, bold=True, align=TA_CENTER),
+        "style_flow_body": make_style("FlowBody", size=9, color=SLATE, leading=14, align=TA_CENTER),
+        "style_lead": make_style("ScenTitle", size=10, color=BLUE, leading=16, bold=True, space_before=4),
+    }
+
+
+globals().update(_styles())
+
+# ── Theme ──
+# Long side in pixels the images are downscaled to: 300 dpi at their largest drawn size
+LOGO_PX = 720
+COVER_IMAGE_PX = 2480
+
+THEME = DEFAULT_THEME
+_theme_images = {"logo": None, "cover_image": None}
+_theme_fonts = {}
+
+
+def _theme_font(path):
+    """Alias of a theme's own font file, registered once per process"""
+    alias = _theme_fonts.get(path)
+    if alias is None:
+        alias = "Theme-" + hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+        font, _ = load_first_font(alias, [path])
+        pdfmetrics.registerFont(with_fallbacks(font, path, _fallbacks or []))
+        _theme_fonts[path] = alias
+    return alias
+
+
+def use_theme(theme=None):
+    """Make `theme` current for the following builds; returns the `Theme`.
+
+    `theme` is a profile name, a JSON path, a dict or a Theme (see
+    architect_pdf.themes); None is the built-in look. The color constants,
+    the font aliases and the styles are rebound, which is what the helpers
+    read as they build flowables, and the theme's images are loaded
+    through the asset cache.
+    """
+    global THEME, NORMAL_FONT, BOLD_FONT
+    theme = load_theme(theme)
+    unknown = set(theme.colors) - set(DEFAULT_COLORS)
+    if unknown:
+        raise ValueError(f"Unknown theme colors: {sorted(unknown)} (expected some of {sorted(DEFAULT_COLORS)})")
+    colors = {**DEFAULT_COLORS, **{name: HexColor(value) for name, value in theme.colors.items()}}
+    globals().update(colors)
+    COLORS.update(colors)
+    regular = theme.fonts.get("regular")
+    NORMAL_FONT = _theme_font(regular) if regular else BASE_FONTS[0]
+    bold = theme.fonts.get("bold")
+    BOLD_FONT = _theme_font(bold) if bold else (NORMAL_FONT if regular else BASE_FONTS[1])
+    # Styles of the previous look are not asked for again
+    STYLES.clear()
+    globals().update(_styles())
+    _theme_images["logo"] = theme.logo and load_asset(theme.logo, LOGO_PX)
+    _theme_images["cover_image"] = theme.cover_image and load_asset(theme.cover_image, COVER_IMAGE_PX)
+    THEME = theme
+    return theme
 
-style_table_header = make_style("TableHeader", size=9, color=WHITE, leading=14, bold=True, align=TA_CENTER)
-style_table_body = make_style("TableBody", size=9, color=DARK, leading=14)
 
 # ── Page template ──
-def draw_page(canvas_obj, doc):
+DEFAULT_HEADER = "Architect Enterprise Builder  |  System Introduction"
+DEFAULT_FOOTER = "Confidential  |  Page {page}"
+
+
+PAGE_DECORATION_FORM = "PageDecoration"
+
+
+def draw_page_decoration(canvas_obj, header_text):
+    """Header rule, text and theme logo plus footer rule: identical on every page"""
     w, h = A4
     # Header line
     canvas_obj.setStrokeColor(BLUE)
@@ -101,33 +254,53 @@ def draw_page(canvas_obj, doc):
     # Header text
     canvas_obj.setFont(BOLD_FONT, 7)
     canvas_obj.setFillColor(SLATE_LIGHT)
-    canvas_obj.drawString(25*mm, h - 13*mm, "Architect Enterprise Builder  |  System Introduction")
-    # Footer
-    canvas_obj.setFont(NORMAL_FONT, 7)
-    canvas_obj.setFillColor(SLATE_LIGHT)
-    canvas_obj.drawCentredString(w/2, 12*mm, f"Confidential  |  Page {doc.page}")
+    canvas_obj.drawString(25*mm, h - 13*mm, header_text)
+    if _theme_images["logo"]:
+        # Right-aligned above the rule; the image is the same XObject as on the cover
+        logo = _theme_images["logo"]
+        width = min(40*mm, 6*mm * logo.width / logo.height)
+        draw_asset(canvas_obj, logo, w - 25*mm - width, h - 14*mm, width, 6*mm)
     # Footer line
     canvas_obj.setStrokeColor(BORDER)
     canvas_obj.setLineWidth(0.5)
     canvas_obj.line(25*mm, 16*mm, w - 25*mm, 16*mm)
 
+
+def draw_page(canvas_obj, doc):
+    # The static decoration is written once per document as a form XObject
+    # and referenced from every page; only the footer text varies
+    if not canvas_obj.hasForm(PAGE_DECORATION_FORM):
+        canvas_obj.beginForm(PAGE_DECORATION_FORM)
+        draw_page_decoration(canvas_obj, getattr(doc, "header_text", DEFAULT_HEADER))
+        canvas_obj.endForm()
+    canvas_obj.doForm(PAGE_DECORATION_FORM)
+    # Footer
+    canvas_obj.setFont(NORMAL_FONT, 7)
+    canvas_obj.setFillColor(SLATE_LIGHT)
+    canvas_obj.drawCentredString(A4[0]/2, 12*mm, getattr(doc, "footer_text", DEFAULT_FOOTER).format(page=doc.page))
+
 def draw_cover(canvas_obj, doc):
-    pass  # No header/footer on cover
+    # No header/footer on the cover; a theme's cover image spans the top and its logo sits below
+    w, h = A4
+    if _theme_images["cover_image"]:
+        draw_asset(canvas_obj, _theme_images["cover_image"], 0, h - 50*mm, w, 50*mm)
+    if _theme_images["logo"]:
+        draw_asset(canvas_obj, _theme_images["logo"], w/2 - 30*mm, h - 76*mm, 60*mm, 18*mm)
 
 # ── Helper functions ──
-def bullet(text, style=style_bullet):
-    return Paragraph(f"&bull;&nbsp;&nbsp;{text}", style)
+def bullet(text, style=None):
+    return Paragraph(f"&bull;&nbsp;&nbsp;{text}", style or style_bullet)
 
-def numbered(num, text, style=style_bullet):
-    return Paragraph(f"<b>{num}.</b>&nbsp;&nbsp;{text}", style)
+def numbered(num, text, style=None):
+    return Paragraph(f"<b>{num}.</b>&nbsp;&nbsp;{text}", style or style_bullet)
 
 def section_divider():
     return HRFlowable(width="100%", thickness=0.5, color=BORDER, spaceBefore=8, spaceAfter=8)
 
 def info_box(title, text):
     """Create a styled info box as a table"""
-    data = [[Paragraph(f"<b>{title}</b>", make_style("BoxTitle", size=10, color=BLUE, bold=True, leading=16)),],
-            [Paragraph(text, make_style("BoxBody", size=9, color=SLATE, leading=15))]]
+    data = [[Paragraph(f"<b>{title}</b>", style_box_title),],
+            [Paragraph(text, style_box_body)]]
     t = Table(data, colWidths=[150*mm])
     t.setStyle(TableStyle([
         ('BACKGROUND', (0,0), (-1,-1), BLUE_LIGHT),
@@ -139,516 +312,934 @@ def info_box(title, text):
     ]))
     return t
 
+# Tables longer than this use the incremental DataTable engine
+LONG_TABLE_ROWS = 40
+
+
+def data_table(rows, widths, header="DARK", padding=6, left_padding=8, valign="MIDDLE"):
+    """Header row + striped body rows; `widths` are in mm"""
+    if len(rows) > LONG_TABLE_ROWS:
+        return DataTable(
+            rows, [w*mm for w in widths], style_table_header, style_table_body,
+            header_background=COLORS[header], stripes=[WHITE, SLATE_BG], grid_color=BORDER,
+            padding=padding, left_padding=left_padding, valign=valign,
+        )
+    t = Table(
+        [[Paragraph(cell, style_table_header if i == 0 else style_table_body) for cell in row]
+         for i, row in enumerate(rows)],
+        colWidths=[w*mm for w in widths]
+    )
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), COLORS[header]),
+        ('GRID', (0,0), (-1,-1), 0.5, BORDER),
+        ('TOPPADDING', (0,0), (-1,-1), padding),
+        ('BOTTOMPADDING', (0,0), (-1,-1), padding),
+        ('LEFTPADDING', (0,0), (-1,-1), left_padding),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [WHITE, SLATE_BG]),
+        ('VALIGN', (0,0), (-1,-1), valign),
+    ]))
+    return t
+
+def mermaid_diagram(source, width=160, height=200):
+    """Mermaid flowchart or sequence diagram as a vector drawing fitted into width x height mm"""
+    return mermaid.diagram(source, width*mm, height*mm, font=NORMAL_FONT, palette={
+        "fill": BLUE_LIGHT, "stroke": BLUE, "text": DARK, "line": SLATE,
+        "note": SLATE_BG, "border": BORDER, "background": WHITE,
+    })
+
+def flow_table(steps, widths):
+    """Colored step columns: `steps` is a list of (title, body, color name)"""
+    data = [
+        [Paragraph(title, style_flow_title)
+         for title, _, _ in steps],
+        [Paragraph(body, style_flow_body)
+         for _, body, _ in steps],
+    ]
+    t = Table(data, colWidths=[w*mm for w in widths])
+    t.setStyle(TableStyle(
+        [('BACKGROUND', (i,0), (i,0), COLORS[color]) for i, (_, _, color) in enumerate(steps)] + [
+        ('BACKGROUND', (0,1), (-1,1), WHITE),
+        ('BOX', (0,0), (-1,-1), 1, BORDER),
+        ('INNERGRID', (0,0), (-1,-1), 0.5, BORDER),
+        ('TOPPADDING', (0,0), (-1,-1), 10),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 10),
+        ('LEFTPADDING', (0,0), (-1,-1), 8),
+        ('RIGHTPADDING', (0,0), (-1,-1), 8),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ]))
+    return t
+
 # ══════════════════════════════════════
-#  BUILD DOCUMENT
+#  CONTENT
 # ══════════════════════════════════════
-output_path = os.path.join(os.path.dirname(__file__), "Architect_System_Introduction.pdf")
-
-doc = SimpleDocTemplate(
-    output_path,
-    pagesize=A4,
-    topMargin=22*mm,
-    bottomMargin=22*mm,
-    leftMargin=25*mm,
-    rightMargin=25*mm,
-)
+# Each section is a title plus a list of blocks: (kind, *args). Kinds are
+# rendered by `render_block`; spacer sizes and table widths are in mm.
+# One entry per language of the product UI (KO/EN, as in blueprint's
+# REPORT_LABELS): "en" is the ko document translated block for block and
+# must keep the same sections, keys and block kinds.
+INTRO_CONTENT = {
+    "ko": {
+        "header": DEFAULT_HEADER,
+        "footer": DEFAULT_FOOTER,
+        "cover": {
+            "logo": "Architect",
+            "logo_sub": "Enterprise Builder",
+            "tagline": "AI 기반 엔터프라이즈 솔루션 설계 시스템",
+            "doc_type": "시스템 소개서",
+            "description": [
+                "비즈니스 요구사항 분석부터 기술 설계서 생성까지",
+                "AI가 전문 컨설턴트처럼 설계하는 올인원 솔루션",
+            ],
+            "year": "2026",
+            "customer": None,
+            "customer_line": "{customer} 귀중",
+        },
+        "toc": {
+            "title": "목차",
+            "items": [
+                ("1", "시스템 개요", "Architect Enterprise Builder란?"),
+                ("2", "핵심 기능", "AI 진단 대화, 문서/음성 분석, 설계 자동 생성"),
+                ("3", "작동 방식", "5단계 진단 대화 → 병렬 AI 생성 → 이중 결과물"),
+                ("4", "결과물 상세", "클라이언트 제안서 & 개발자 기술 설계서"),
+                ("5", "다국어 지원", "한국어/영어 실시간 전환 및 콘텐츠 번역"),
+                ("6", "내보내기 기능", "HTML, ZIP, JSON, 인쇄 지원"),
+                ("7", "AI 기술 구성", "Google Gemini + Anthropic Claude 이중 AI"),
+                ("8", "활용 시나리오", "누가, 언제, 어떻게 사용하나?"),
+            ],
+        },
+        "sections": [
+            # ── 1. SYSTEM OVERVIEW ──
+            {
+                "key": "overview",
+                "title": "1. 시스템 개요",
+                "blocks": [
+                    ("body_dark",
+                     "Architect Enterprise Builder는 <b>AI 기반 엔터프라이즈 솔루션 설계 시스템</b>입니다. "
+                     "사업을 운영하면서 '우리 회사에 맞는 시스템을 만들고 싶은데, 어디서부터 시작해야 할지 모르겠다'는 "
+                     "고민을 가진 분들을 위해 만들어졌습니다."),
+                    ("spacer", 3),
+                    ("body_dark",
+                     "전문 IT 컨설턴트가 하는 일을 AI가 대신합니다. 사업 현황과 고민을 대화로 알려주시면, "
+                     "AI가 분석하여 <b>클라이언트용 사업 제안서</b>와 <b>개발팀용 기술 설계서</b>를 동시에 생성합니다."),
+                    ("spacer", 5),
+                    ("info_box", "한 줄 요약",
+                     "대화만으로 비즈니스 요구사항을 분석하고, 전문가 수준의 제안서와 기술 설계서를 자동으로 만들어주는 AI 설계 도구입니다."),
+                    ("spacer", 6),
+                    ("h2", "핵심 가치"),
+                    ("entries", [
+                        ("전문가 없이도 전문가 수준의 설계", "IT 전문가나 컨설턴트가 없어도, AI가 체계적인 질문을 통해 요구사항을 정밀하게 파악하고 전문적인 설계 결과물을 제공합니다."),
+                        ("대화만으로 완성", "복잡한 양식을 채울 필요 없이, 자연스러운 대화를 통해 5가지 핵심 요소를 수집합니다. 문서 첨부나 회의 녹음도 지원합니다."),
+                        ("이중 결과물 동시 생성", "사업주가 보는 제안서와 개발팀이 보는 기술 문서를 한 번에 생성합니다. 같은 내용을 두 가지 관점으로 제공하여 소통 비용을 줄입니다."),
+                        ("한국어/영어 자유 전환", "모든 결과물을 한국어와 영어로 즉시 전환할 수 있어, 글로벌 팀이나 해외 파트너와의 협업에 활용 가능합니다."),
+                    ], 4),
+                ],
+            },
+            # ── 2. KEY FEATURES ──
+            {
+                "key": "features",
+                "title": "2. 핵심 기능",
+                "blocks": [
+                    ("h2", "2.1 AI 진단 대화 (5단계 인터뷰)"),
+                    ("body",
+                     "AI가 시니어 솔루션 아키텍트 역할로 5가지 핵심 영역에 대해 체계적으로 질문합니다. "
+                     "각 단계마다 구체적인 예시와 팁을 제공하여, IT에 익숙하지 않은 분도 쉽게 답변할 수 있습니다."),
+                    ("table", [
+                        ["단계", "질문 영역", "수집 내용"],
+                        ["1단계", "비즈니스 배경", "현재 사업 현황, 겪고 있는 문제점, 시스템 도입 동기"],
+                        ["2단계", "시스템 모델", "원하는 솔루션 형태 (웹, 앱, 관리도구, SaaS 등)"],
+                        ["3단계", "업무 프로세스", "실제 사용자가 시스템을 어떻게 사용할지 (업무 흐름)"],
+                        ["4단계", "기술 환경", "현재 사용 중인 도구, 연동 필요 시스템 (엑셀, ERP 등)"],
+                        ["5단계", "성공 지표 (KPI)", "시스템 도입 후 달성하고자 하는 비즈니스 목표"],
+                    ], {"widths": [20, 30, 110], "header": "DARK"}),
+                    ("spacer", 5),
+                    ("h2", "2.2 문서 & 음성 분석"),
+                    ("body", "대화 외에도 기존 자료를 활용하여 더 정밀한 설계가 가능합니다."),
+                    ("bullets", [
+                        "<b>PDF 문서 분석</b> — 기존 사업계획서, 요구사항 정의서, ERD 등을 업로드하면 AI가 자동으로 핵심 내용을 추출하여 설계에 반영합니다.",
+                        "<b>텍스트 입력</b> — 긴 요구사항 텍스트를 직접 붙여넣어 분석할 수 있습니다.",
+                        "<b>회의 녹음 분석</b> — 미팅 내용을 녹음하면 AI가 회의록을 생성하고, 비즈니스 요구사항을 자동으로 추출합니다.",
+                        "<b>문서/회의 기반 즉시 설계</b> — 5단계 인터뷰를 건너뛰고, 문서나 회의 내용만으로 바로 설계를 시작할 수 있습니다.",
+                    ]),
+                    ("spacer", 5),
+                    ("h2", "2.3 개발 일정 제약 설정"),
+                    ("body",
+                     "희망 개발 완료 시점을 설정하면 (예: '3개월', '2026년 6월까지'), AI가 로드맵과 마일스톤을 "
+                     "해당 기간 내에 자동으로 압축 배치합니다. 기능 범위를 줄이지 않고 일정만 조정하며, "
+                     "병렬 작업 가능한 항목은 동시 진행으로 구성합니다."),
+                    ("spacer", 5),
+                    ("h2", "2.4 양식 모드"),
+                    ("body",
+                     "대화 방식 외에 구조화된 양식(폼)으로도 요구사항을 입력할 수 있습니다. "
+                     "양식 모드에서는 각 항목별로 선택지와 입력란이 제공되어, 빠르고 체계적으로 정보를 입력할 수 있습니다."),
+                ],
+            },
+            # ── 3. HOW IT WORKS ──
+            {
+                "key": "how_it_works",
+                "title": "3. 작동 방식",
+                "blocks": [
+                    ("body_dark", "Architect의 전체 프로세스는 크게 3단계로 이루어집니다."),
+                    ("spacer", 3),
+                    ("flow", [
+                        ("<b>STEP 1</b><br/>요구사항 수집", "5단계 진단 대화<br/>또는 양식 입력<br/>+ 문서/음성 분석", "BLUE"),
+                        ("<b>STEP 2</b><br/>AI 병렬 생성", "Google Gemini: 비즈니스 분석<br/>Anthropic Claude: 기술 설계<br/>(동시 병렬 처리)", "PURPLE"),
+                        ("<b>STEP 3</b><br/>결과 확인 & 내보내기", "클라이언트 제안서 확인<br/>개발자 설계서 확인<br/>HTML/ZIP/JSON 내보내기", "GREEN"),
+                    ], [50, 55, 55]),
+                    ("spacer", 6),
+                    ("h2", "상세 흐름"),
+                    ("steps", [
+                        ("요구사항 수집 (5~10분)", "AI가 사업 배경, 원하는 시스템 모델, 업무 흐름, 기술 환경, 목표 KPI를 순서대로 질문합니다. 각 질문에는 구체적인 예시와 전문가 팁이 함께 제공됩니다. 필요하면 PDF 문서를 첨부하거나 회의를 녹음하여 추가 맥락을 제공할 수 있습니다."),
+                        ("추가 정보 확인", "문서나 회의록에서 누락된 정보가 감지되면, AI가 추가 질문을 통해 빠진 정보를 보완합니다. '건너뛰기'를 입력하면 현재 정보만으로 진행합니다."),
+                        ("개발 일정 설정", "희망 완료 시점을 입력하면 일정에 맞춰 로드맵이 조정됩니다. 설정하지 않으면 유연한 일정으로 진행됩니다."),
+                        ("승인 및 생성 시작", "'시작' 또는 '승인'을 입력하면 AI가 설계를 시작합니다. Google Gemini와 Anthropic Claude 두 개의 AI가 동시에 작업하여 빠르게 결과를 생성합니다."),
+                        ("결과 확인 및 후속 대화", "생성된 결과물을 화면에서 즉시 확인할 수 있습니다. 수정이 필요하면 대화를 계속하여 추가 요청을 할 수 있습니다."),
+                    ]),
+                ],
+            },
+            # ── 4. OUTPUT DETAILS ──
+            {
+                "key": "outputs",
+                "title": "4. 결과물 상세",
+                "blocks": [
+                    ("body_dark",
+                     "Architect는 하나의 분석 결과를 <b>두 가지 관점</b>으로 제공합니다. "
+                     "같은 프로젝트에 대해 사업주와 개발팀이 각자 필요한 형태의 문서를 받을 수 있습니다."),
+                    ("spacer", 4),
+                    ("h2", "4.1 클라이언트용 제안서"),
+                    ("body", "비개발자(사업주, 의사결정자)가 읽는 문서입니다. 기술 용어 없이 비즈니스 언어로 작성됩니다."),
+                    ("table", [
+                        ["항목", "내용"],
+                        ["문제 정의", "현재 겪고 있는 비즈니스 문제를 공감하며 정리"],
+                        ["솔루션 개요", "해결 방안을 쉬운 말로 상세히 설명 (기술명 없이)"],
+                        ["핵심 기능 (7~10개)", "비즈니스 가치 중심으로 기능 서술"],
+                        ["추진 일정 (마일스톤)", "단계별 일정과 각 단계의 산출물"],
+                        ["캘린더 타임라인", "스프린트 기반 시각적 캘린더 일정표"],
+                        ["기대 효과", "도입 전후 비교 시나리오"],
+                        ["투자 대비 효과", "정성적 ROI 분석 및 업계 벤치마크 참고"],
+                        ["데이터 보호", "보안 및 개인정보 보호 방안 (쉬운 설명)"],
+                    ], {"widths": [45, 115], "header": "BLUE", "padding": 5}),
+                    ("spacer", 6),
+                    ("h2", "4.2 개발자용 기술 설계서"),
+                    ("body", "개발팀이 바로 개발에 착수할 수 있는 수준의 기술 문서입니다. 4개의 탭으로 구성됩니다."),
+                    ("h3", "<b>로드맵 탭</b>"),
+                    ("bullets", [
+                        "실행 로드맵 (6단계 이상, 기간/목표/산출물 포함)",
+                        "스프린트 계획 (목표, 산출물, 선행 조건 포함)",
+                        "캘린더 타임라인 시각화",
+                        "분석 요약, 예상 ROI, 보안 전략",
+                    ]),
+                    ("h3", "<b>아키텍처 탭</b>"),
+                    ("bullets", [
+                        "시스템 아키텍처 다이어그램 (Mermaid 시각화 + 코드)",
+                        "기술 스택 다이어그램 (프레임워크, DB, 인프라 등)",
+                        "시퀀스 플로우 다이어그램 (사용자 시나리오 흐름)",
+                    ]),
+                    ("h3", "<b>구현 탭</b>"),
+                    ("bullets", [
+                        "프로젝트 폴더 구조",
+                        "API 엔드포인트 명세 (메서드, 경로, 요청/응답, 에러코드)",
+                        "데이터베이스 스키마 (테이블, 컬럼, 타입, 제약조건)",
+                        "핵심 모듈 코드 (실제 구현 코드 포함)",
+                        "배포 계획 및 테스트 전략",
+                    ]),
+                    ("h3", "<b>문서 탭</b>"),
+                    ("bullets", [
+                        "PRD (제품 요구사항 문서) — 전체 마크다운",
+                        "LLD (상세 설계 문서) — 전체 마크다운",
+                    ]),
+                ],
+            },
+            # ── 5. MULTILINGUAL ──
+            {
+                "key": "multilingual",
+                "title": "5. 다국어 지원",
+                "page_break": False,
+                "blocks": [
+                    ("body_dark", "Architect는 <b>한국어와 영어를 완벽하게 지원</b>합니다."),
+                    ("spacer", 3),
+                    ("h3", "UI 라벨 실시간 전환"),
+                    ("body",
+                     "화면 상단의 KO/EN 버튼 하나로 모든 인터페이스 라벨이 즉시 전환됩니다. "
+                     "메뉴, 버튼, 안내 텍스트, 탭 이름 등 100개 이상의 UI 요소가 양국어로 제공됩니다."),
+                    ("h3", "AI 생성 콘텐츠 자동 번역"),
+                    ("body",
+                     "언어를 전환하면 AI가 생성한 결과물(분석, 로드맵, 제안서, PRD/LLD 등)도 자동으로 번역됩니다. "
+                     "3개의 AI 번역 엔진이 동시에 작동하여 빠르게 처리하며, 번역 결과는 캐시에 저장되어 "
+                     "재전환 시 즉시 표시됩니다 (추가 API 호출 없음)."),
+                    ("spacer", 3),
+                    ("h3", "번역 시 보존되는 항목"),
+                    ("bullets", [
+                        "Mermaid 다이어그램 (시각화 요소)",
+                        "코드 블록 및 파일 경로",
+                        "URL, 날짜, 숫자, 버전 번호",
+                        "기술 식별자 (함수명, 클래스명 등)",
+                    ]),
+                    ("spacer", 3),
+                    ("h3", "내보내기 시 번역 반영"),
+                    ("body",
+                     "내보내기 메뉴에서 '보고서 언어'를 선택하면 해당 언어의 번역된 결과물로 다운로드됩니다. "
+                     "한국어로 생성한 결과를 영어로 내보내거나, 그 반대도 가능합니다."),
+                    ("spacer", 8),
+                ],
+            },
+            # ── 6. EXPORT ──
+            {
+                "key": "export",
+                "title": "6. 내보내기 기능",
+                "blocks": [
+                    ("body_dark", "생성된 결과물을 다양한 형식으로 내보낼 수 있습니다."),
+                    ("table", [
+                        ["형식", "내용", "용도"],
+                        ["클라이언트 HTML", "제안서 전체 (마일스톤 캘린더 포함)", "고객에게 제안서 전달"],
+                        ["개발자 HTML", "로드맵, 아키텍처, 구현계획, PRD, LLD 전체", "개발팀에 기술 문서 전달"],
+                        ["ZIP 전체", "모든 결과물 (MD, HTML, JSON, 코드, 다이어그램)", "프로젝트 아카이브"],
+                        ["JSON 원본", "Blueprint 데이터 원본", "시스템 연동, 데이터 활용"],
+                        ["인쇄", "클라이언트용 / 개발자용 선택 인쇄", "오프라인 미팅, 보고"],
+                    ], {"widths": [35, 70, 55], "header": "DARK"}),
+                ],
+            },
+            # ── 7. AI TECHNOLOGY ──
+            {
+                "key": "ai_stack",
+                "title": "7. AI 기술 구성",
+                "blocks": [
+                    ("body_dark",
+                     "Architect는 <b>Google Gemini</b>와 <b>Anthropic Claude</b> 두 개의 AI를 동시에 활용하여 "
+                     "각 AI의 장점을 극대화합니다."),
+                    ("spacer", 4),
+                    ("table", [
+                        ["AI 모델", "역할", "담당 결과물"],
+                        ["Google Gemini Pro", "비즈니스 분석 전문가", "로드맵, 분석 요약, ROI, 보안 전략, 클라이언트 제안서"],
+                        ["Google Gemini Pro", "아키텍처 전문가", "시스템 아키텍처, 시퀀스, 기술스택 다이어그램"],
+                        ["Google Gemini Flash", "대화 및 분석 전문가", "진단 질문 생성, 문서 분석, 자유 대화, 콘텐츠 번역"],
+                        ["Anthropic Claude", "개발 설계 전문가", "PRD, LLD, 스프린트 계획, API 설계, DB 스키마, 코드"],
+                    ], {"widths": [35, 40, 85], "header": "PURPLE"}),
+                    ("spacer", 5),
+                    ("info_box", "병렬 처리의 장점",
+                     "두 AI가 동시에 작업하기 때문에, 순차적으로 처리하는 것보다 생성 시간이 크게 단축됩니다. "
+                     "Gemini가 비즈니스 분석을 하는 동안 Claude가 기술 설계를 진행하여, 사용자는 Gemini 결과를 먼저 확인하면서 "
+                     "Claude 결과를 기다릴 수 있습니다. Claude API 키가 없어도 Gemini 결과만으로 정상 동작합니다."),
+                    ("spacer", 5),
+                    ("h2", "추가 AI 기능"),
+                    ("bullets", [
+                        "<b>Google Search 연동</b> — Gemini Pro가 실시간 웹 검색으로 시장 동향, 경쟁사 분석, 업계 벤치마크를 반영합니다. 참고 자료 출처가 함께 제공됩니다.",
+                        "<b>기술 레퍼런스 자동 매칭</b> — 사용자가 언급한 기술 스택에 맞는 최신 공식 문서 패턴을 자동으로 참조하여 코드 품질을 높입니다.",
+                        "<b>회의 녹음 AI 분석</b> — 네이티브 오디오 AI가 회의 내용을 직접 분석하여 회의록과 설계 키워드를 추출합니다.",
+                    ]),
+                ],
+            },
+            # ── 8. USE CASES ──
+            {
+                "key": "use_cases",
+                "title": "8. 활용 시나리오",
+                "blocks": [
+                    ("h2", "누가 사용하나요?"),
+                    ("entries", [
+                        ("중소기업 대표 / 사업주", "IT 시스템을 도입하고 싶지만 어디서 시작해야 할지 모를 때. 전문 컨설턴트를 고용하기 전에 요구사항을 정리하고, 사업 타당성을 검토하고 싶을 때."),
+                        ("스타트업 창업자", "아이디어를 구체적인 기술 설계로 빠르게 전환하고 싶을 때. 개발팀에 전달할 PRD/LLD를 직접 작성하기 어려울 때."),
+                        ("IT 컨설턴트 / PM", "고객 미팅 후 제안서와 기술 문서를 빠르게 초안 작성하고 싶을 때. 고객과의 요구사항 수집 과정을 체계화하고 싶을 때."),
+                        ("기업 IT 부서", "내부 시스템 개선 프로젝트의 초기 설계를 빠르게 진행하고 싶을 때. 비개발 부서의 요구사항을 기술 문서로 변환해야 할 때."),
+                    ], 6),
+                    ("spacer", 6),
+                    ("h2", "실제 사용 예시"),
+                    ("lead", "<b>시나리오: 물류 회사가 재고 관리 시스템을 만들고 싶을 때</b>"),
+                    ("table", [
+                        ["단계", "사용자 행동", "시스템 결과"],
+                        ["1", "사업 배경 설명: '물류 창고 3개 운영 중, 엑셀로 재고 관리하는데 실수가 많아요'", "AI가 물류/재고 관리 도메인으로 분석 시작"],
+                        ["2", "시스템 모델 선택: '웹 기반 관리자 도구 + 모바일 앱'", "웹+앱 하이브리드 아키텍처 설계"],
+                        ["3", "업무 흐름 설명: '입고 → 검수 → 적재 → 출고 → 배송 추적'", "프로세스 기반 모듈 설계"],
+                        ["4", "기존 환경: '엑셀, 택배사 API, 바코드 스캐너'", "연동 아키텍처 포함한 기술 스택 선정"],
+                        ["5", "목표 KPI: '재고 오차율 5% 이하, 처리 시간 50% 단축'", "KPI 기반 ROI 분석"],
+                        ["결과", "승인 ('시작' 입력)", "제안서 + PRD + LLD + 스프린트 계획 자동 생성"],
+                    ], {"widths": [15, 70, 75], "header": "GREEN", "padding": 5, "left_padding": 6, "valign": "TOP"}),
+                    ("spacer", 10),
+                    ("closing",
+                     "Architect Enterprise Builder는 비즈니스 아이디어를 전문적인 설계 문서로 변환하는 과정을 "
+                     "AI가 자동화합니다. 대화 한 번으로 사업주와 개발팀 모두가 필요한 문서를 동시에 얻을 수 있습니다.",
+                     "www.architect-builder.com"),
+                ],
+            },
+        ],
+    },
+    "en": {
+        "header": DEFAULT_HEADER,
+        "footer": DEFAULT_FOOTER,
+        "cover": {
+            "logo": "Architect",
+            "logo_sub": "Enterprise Builder",
+            "tagline": "AI-Powered Enterprise Solution Design System",
+            "doc_type": "System Introduction",
+            "description": [
+                "From business requirements analysis to technical design documents",
+                "An all-in-one solution where AI designs like an expert consultant",
+            ],
+            "year": "2026",
+            "customer": None,
+            "customer_line": "Prepared for {customer}",
+        },
+        "toc": {
+            "title": "Table of Contents",
+            "items": [
+                ("1", "System Overview", "What is Architect Enterprise Builder?"),
+                ("2", "Key Features", "AI diagnostic interview, document/voice analysis, automatic design"),
+                ("3", "How It Works", "5-step interview → parallel AI generation → dual deliverables"),
+                ("4", "Deliverables", "Client proposal & developer technical design"),
+                ("5", "Multilingual Support", "Real-time Korean/English switching and content translation"),
+                ("6", "Export", "HTML, ZIP, JSON and print"),
+                ("7", "AI Stack", "Dual AI: Google Gemini + Anthropic Claude"),
+                ("8", "Use Cases", "Who uses it, when and how?"),
+            ],
+        },
+        "sections": [
+            {
+                "key": "overview",
+                "title": "1. System Overview",
+                "blocks": [
+                    ("body_dark",
+                     "Architect Enterprise Builder is an <b>AI-powered enterprise solution design system</b>. "
+                     "It was built for business owners who think 'we want a system that fits our company, "
+                     "but we don't know where to start'."),
+                    ("spacer", 3),
+                    ("body_dark",
+                     "AI does the work of a professional IT consultant. Describe your business and its pain points "
+                     "in a conversation, and the AI analyzes them to produce a <b>business proposal for the client</b> "
+                     "and a <b>technical design for the development team</b> at the same time."),
+                    ("spacer", 5),
+                    ("info_box", "In one sentence",
+                     "An AI design tool that analyzes business requirements through conversation alone and "
+                     "automatically produces expert-level proposals and technical designs."),
+                    ("spacer", 6),
+                    ("h2", "Core Values"),
+                    ("entries", [
+                        ("Expert-level design without an expert", "Even without IT specialists or consultants, the AI pins down requirements through structured questions and delivers professional design documents."),
+                        ("Done through conversation", "No complex forms to fill in: five key areas are collected through natural conversation. Document attachments and meeting recordings are supported too."),
+                        ("Two deliverables at once", "The proposal for the business owner and the technical documents for the development team are generated together, cutting communication costs by presenting the same content from two perspectives."),
+                        ("Switch freely between Korean and English", "Every deliverable can be switched between Korean and English instantly, ready for global teams and overseas partners."),
+                    ], 4),
+                ],
+            },
+            {
+                "key": "features",
+                "title": "2. Key Features",
+                "blocks": [
+                    ("h2", "2.1 AI Diagnostic Interview (5 Steps)"),
+                    ("body",
+                     "Acting as a senior solution architect, the AI asks structured questions about five key areas. "
+                     "Each step comes with concrete examples and tips, so people unfamiliar with IT can answer easily."),
+                    ("table", [
+                        ["Step", "Area", "What is collected"],
+                        ["Step 1", "Business background", "Current business, pain points, motivation for a new system"],
+                        ["Step 2", "System model", "Desired solution type (web, app, admin tool, SaaS, ...)"],
+                        ["Step 3", "Business process", "How real users will work with the system (workflow)"],
+                        ["Step 4", "Tech environment", "Tools in use and systems to integrate (Excel, ERP, ...)"],
+                        ["Step 5", "Success metrics (KPI)", "Business goals to reach after adoption"],
+                    ], {"widths": [20, 30, 110], "header": "DARK"}),
+                    ("spacer", 5),
+                    ("h2", "2.2 Document & Voice Analysis"),
+                    ("body", "Besides the conversation, existing material can be used for a more precise design."),
+                    ("bullets", [
+                        "<b>PDF analysis</b> — Upload business plans, requirement specs or ERDs and the AI extracts the key points into the design.",
+                        "<b>Text input</b> — Paste long requirement texts directly for analysis.",
+                        "<b>Meeting recording analysis</b> — Record a meeting and the AI writes the minutes and extracts the business requirements.",
+                        "<b>Instant design from documents/meetings</b> — Skip the 5-step interview and start designing from documents or meetings alone.",
+                    ]),
+                    ("spacer", 5),
+                    ("h2", "2.3 Development Schedule Constraints"),
+                    ("body",
+                     "Set a target completion date (e.g. '3 months', 'by June 2026') and the AI compresses the roadmap "
+                     "and milestones into that window. Scope stays the same; only the schedule is adjusted, and items "
+                     "that can run in parallel are scheduled concurrently."),
+                    ("spacer", 5),
+                    ("h2", "2.4 Form Mode"),
+                    ("body",
+                     "Requirements can also be entered through a structured form instead of the conversation. "
+                     "Form mode provides options and input fields per item for fast, systematic entry."),
+                ],
+            },
+            {
+                "key": "how_it_works",
+                "title": "3. How It Works",
+                "blocks": [
+                    ("body_dark", "The Architect process consists of three main stages."),
+                    ("spacer", 3),
+                    ("flow", [
+                        ("<b>STEP 1</b><br/>Collect requirements", "5-step diagnostic interview<br/>or form input<br/>+ document/voice analysis", "BLUE"),
+                        ("<b>STEP 2</b><br/>Parallel AI generation", "Google Gemini: business analysis<br/>Anthropic Claude: technical design<br/>(run in parallel)", "PURPLE"),
+                        ("<b>STEP 3</b><br/>Review & export", "Review client proposal<br/>Review developer design<br/>Export HTML/ZIP/JSON", "GREEN"),
+                    ], [50, 55, 55]),
+                    ("spacer", 6),
+                    ("h2", "Detailed Flow"),
+                    ("steps", [
+                        ("Collect requirements (5-10 min)", "The AI asks in turn about business background, desired system model, workflow, tech environment and target KPIs. Each question comes with examples and expert tips. PDF documents or meeting recordings can add further context."),
+                        ("Fill in missing information", "When documents or minutes leave gaps, the AI asks follow-up questions. Enter 'skip' to continue with the current information."),
+                        ("Set the schedule", "Enter a target completion date and the roadmap is fitted to it. Without one, a flexible schedule is used."),
+                        ("Approve and generate", "Enter 'start' or 'approve' and the AI begins the design. Google Gemini and Anthropic Claude work at the same time to produce results quickly."),
+                        ("Review and follow up", "Generated deliverables are shown on screen immediately. Continue the conversation to request changes."),
+                    ]),
+                ],
+            },
+            {
+                "key": "outputs",
+                "title": "4. Deliverables",
+                "blocks": [
+                    ("body_dark",
+                     "Architect presents one analysis from <b>two perspectives</b>. "
+                     "For the same project, the business owner and the development team each get the documents they need."),
+                    ("spacer", 4),
+                    ("h2", "4.1 Client Proposal"),
+                    ("body", "Written for non-developers (owners, decision makers) in business language, without technical jargon."),
+                    ("table", [
+                        ["Item", "Content"],
+                        ["Problem statement", "An empathetic summary of the current business problem"],
+                        ["Solution overview", "The solution explained in plain words (no technology names)"],
+                        ["Key features (7-10)", "Features described by business value"],
+                        ["Schedule (milestones)", "Phased schedule and the deliverables of each phase"],
+                        ["Calendar timeline", "Sprint-based visual calendar"],
+                        ["Expected impact", "Before/after scenarios"],
+                        ["Return on investment", "Qualitative ROI analysis with industry benchmarks"],
+                        ["Data protection", "Security and privacy measures (plain explanation)"],
+                    ], {"widths": [45, 115], "header": "BLUE", "padding": 5}),
+                    ("spacer", 6),
+                    ("h2", "4.2 Developer Technical Design"),
+                    ("body", "Technical documents detailed enough for the team to start building right away, organized in four tabs."),
+                    ("h3", "<b>Roadmap tab</b>"),
+                    ("bullets", [
+                        "Execution roadmap (6+ phases with duration, goals and deliverables)",
+                        "Sprint plan (goals, deliverables, prerequisites)",
+                        "Calendar timeline visualization",
+                        "Analysis summary, estimated ROI, security strategy",
+                    ]),
+                    ("h3", "<b>Architecture tab</b>"),
+                    ("bullets", [
+                        "System architecture diagram (Mermaid rendering + source)",
+                        "Tech stack diagram (frameworks, databases, infrastructure)",
+                        "Sequence flow diagram (user scenario flow)",
+                    ]),
+                    ("h3", "<b>Implementation tab</b>"),
+                    ("bullets", [
+                        "Project folder structure",
+                        "API endpoint specification (method, path, request/response, error codes)",
+                        "Database schema (tables, columns, types, constraints)",
+                        "Core module code (actual implementation code)",
+                        "Deployment plan and test strategy",
+                    ]),
+                    ("h3", "<b>Documents tab</b>"),
+                    ("bullets", [
+                        "PRD (product requirements document) — full markdown",
+                        "LLD (low-level design document) — full markdown",
+                    ]),
+                ],
+            },
+            {
+                "key": "multilingual",
+                "title": "5. Multilingual Support",
+                "page_break": False,
+                "blocks": [
+                    ("body_dark", "Architect <b>fully supports Korean and English</b>."),
+                    ("spacer", 3),
+                    ("h3", "Real-time UI label switching"),
+                    ("body",
+                     "A single KO/EN button at the top switches every interface label instantly. "
+                     "More than 100 UI elements, including menus, buttons, guidance text and tab names, are available in both languages."),
+                    ("h3", "Automatic translation of AI content"),
+                    ("body",
+                     "Switching languages also translates the AI-generated deliverables (analysis, roadmap, proposal, PRD/LLD, ...). "
+                     "Three AI translation engines run concurrently for speed, and results are cached so "
+                     "switching back is instant (no extra API calls)."),
+                    ("spacer", 3),
+                    ("h3", "Preserved during translation"),
+                    ("bullets", [
+                        "Mermaid diagrams (visual elements)",
+                        "Code blocks and file paths",
+                        "URLs, dates, numbers, version numbers",
+                        "Technical identifiers (function names, class names, ...)",
+                    ]),
+                    ("spacer", 3),
+                    ("h3", "Translation in exports"),
+                    ("body",
+                     "Choose a 'report language' in the export menu to download the deliverables in that language. "
+                     "Results generated in Korean can be exported in English, and vice versa."),
+                    ("spacer", 8),
+                ],
+            },
+            {
+                "key": "export",
+                "title": "6. Export",
+                "blocks": [
+                    ("body_dark", "Deliverables can be exported in several formats."),
+                    ("table", [
+                        ["Format", "Content", "Purpose"],
+                        ["Client HTML", "Full proposal (with milestone calendar)", "Send the proposal to the customer"],
+                        ["Developer HTML", "Roadmap, architecture, implementation plan, PRD, LLD", "Hand technical docs to the dev team"],
+                        ["Full ZIP", "All deliverables (MD, HTML, JSON, code, diagrams)", "Project archive"],
+                        ["Raw JSON", "Raw blueprint data", "System integration, data reuse"],
+                        ["Print", "Client or developer print layout", "Offline meetings, reporting"],
+                    ], {"widths": [35, 70, 55], "header": "DARK"}),
+                ],
+            },
+            {
+                "key": "ai_stack",
+                "title": "7. AI Stack",
+                "blocks": [
+                    ("body_dark",
+                     "Architect uses <b>Google Gemini</b> and <b>Anthropic Claude</b> side by side "
+                     "to get the best out of each model."),
+                    ("spacer", 4),
+                    ("table", [
+                        ["AI model", "Role", "Deliverables"],
+                        ["Google Gemini Pro", "Business analyst", "Roadmap, analysis summary, ROI, security strategy, client proposal"],
+                        ["Google Gemini Pro", "Architecture expert", "System architecture, sequence and tech stack diagrams"],
+                        ["Google Gemini Flash", "Conversation & analysis", "Diagnostic questions, document analysis, free chat, content translation"],
+                        ["Anthropic Claude", "Development designer", "PRD, LLD, sprint plan, API design, DB schema, code"],
+                    ], {"widths": [35, 40, 85], "header": "PURPLE"}),
+                    ("spacer", 5),
+                    ("info_box", "Benefits of parallel processing",
+                     "Because both AIs work at the same time, generation is much faster than sequential processing. "
+                     "Claude works on the technical design while Gemini runs the business analysis, so users can review "
+                     "Gemini's results first while Claude finishes. Without a Claude API key, Gemini results alone still work."),
+                    ("spacer", 5),
+                    ("h2", "Additional AI Capabilities"),
+                    ("bullets", [
+                        "<b>Google Search grounding</b> — Gemini Pro reflects market trends, competitor analysis and industry benchmarks from live web search, with sources cited.",
+                        "<b>Automatic tech reference matching</b> — Up-to-date official documentation patterns for the mentioned tech stack are referenced automatically to improve code quality.",
+                        "<b>AI meeting recording analysis</b> — Native audio AI analyzes meetings directly to extract minutes and design keywords.",
+                    ]),
+                ],
+            },
+            {
+                "key": "use_cases",
+                "title": "8. Use Cases",
+                "blocks": [
+                    ("h2", "Who uses it?"),
+                    ("entries", [
+                        ("SME owners", "When you want an IT system but don't know where to start. When you want to organize requirements and check feasibility before hiring a consultant."),
+                        ("Startup founders", "When you want to turn an idea into a concrete technical design quickly. When writing a PRD/LLD for the development team yourself is hard."),
+                        ("IT consultants / PMs", "When you need fast first drafts of proposals and technical documents after a customer meeting. When you want a systematic requirements-gathering process."),
+                        ("Corporate IT departments", "When you want to move fast on the initial design of an internal improvement project. When requirements from non-technical departments must become technical documents."),
+                    ], 6),
+                    ("spacer", 6),
+                    ("h2", "Example"),
+                    ("lead", "<b>Scenario: a logistics company wants an inventory management system</b>"),
+                    ("table", [
+                        ["Step", "User action", "System result"],
+                        ["1", "Business background: 'We run 3 warehouses and manage stock in Excel, with many mistakes'", "AI starts analysis in the logistics/inventory domain"],
+                        ["2", "System model: 'Web-based admin tool + mobile app'", "Hybrid web + app architecture design"],
+                        ["3", "Workflow: 'Receiving → inspection → storage → shipping → delivery tracking'", "Process-based module design"],
+                        ["4", "Existing tools: 'Excel, courier API, barcode scanners'", "Tech stack selection including integration architecture"],
+                        ["5", "Target KPIs: 'Stock error rate under 5%, 50% faster processing'", "KPI-based ROI analysis"],
+                        ["Result", "Approve (enter 'start')", "Proposal + PRD + LLD + sprint plan generated automatically"],
+                    ], {"widths": [15, 70, 75], "header": "GREEN", "padding": 5, "left_padding": 6, "valign": "TOP"}),
+                    ("spacer", 10),
+                    ("closing",
+                     "Architect Enterprise Builder uses AI to automate turning business ideas into professional design documents. "
+                     "One conversation gives both the business owner and the development team the documents they need.",
+                     "www.architect-builder.com"),
+                ],
+            },
+        ],
+    },
+}
 
-story = []
-
-# ═══════════════════════════════════
-#  COVER PAGE
-# ═══════════════════════════════════
-story.append(Spacer(1, 60*mm))
-story.append(Paragraph("Architect", make_style("LogoText", size=42, color=DARK, leading=50, bold=True, align=TA_CENTER)))
-story.append(Paragraph("Enterprise Builder", make_style("LogoSub", size=18, color=BLUE, leading=24, bold=True, align=TA_CENTER)))
-story.append(Spacer(1, 15*mm))
-story.append(HRFlowable(width="40%", thickness=2, color=BLUE, spaceBefore=0, spaceAfter=0))
-story.append(Spacer(1, 15*mm))
-story.append(Paragraph("AI 기반 엔터프라이즈 솔루션 설계 시스템", make_style("CoverTag", size=16, color=DARK, leading=24, bold=True, align=TA_CENTER)))
-story.append(Spacer(1, 8*mm))
-story.append(Paragraph("시스템 소개서", make_style("CoverDocType", size=14, color=SLATE, leading=20, align=TA_CENTER)))
-story.append(Spacer(1, 30*mm))
-story.append(Paragraph("비즈니스 요구사항 분석부터 기술 설계서 생성까지", style_cover_desc))
-story.append(Paragraph("AI가 전문 컨설턴트처럼 설계하는 올인원 솔루션", style_cover_desc))
-story.append(Spacer(1, 20*mm))
-story.append(Paragraph("2026", make_style("Year", size=11, color=SLATE_LIGHT, leading=14, align=TA_CENTER)))
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  TABLE OF CONTENTS
-# ═══════════════════════════════════
-story.append(Paragraph("목차", style_h1))
-story.append(Spacer(1, 5*mm))
-
-toc_items = [
-    ("1", "시스템 개요", "Architect Enterprise Builder란?"),
-    ("2", "핵심 기능", "AI 진단 대화, 문서/음성 분석, 설계 자동 생성"),
-    ("3", "작동 방식", "5단계 진단 대화 → 병렬 AI 생성 → 이중 결과물"),
-    ("4", "결과물 상세", "클라이언트 제안서 & 개발자 기술 설계서"),
-    ("5", "다국어 지원", "한국어/영어 실시간 전환 및 콘텐츠 번역"),
-    ("6", "내보내기 기능", "HTML, ZIP, JSON, 인쇄 지원"),
-    ("7", "AI 기술 구성", "Google Gemini + Anthropic Claude 이중 AI"),
-    ("8", "활용 시나리오", "누가, 언제, 어떻게 사용하나?"),
-]
-
-for num, title, desc in toc_items:
-    story.append(Paragraph(f"<b>{num}. {title}</b>", make_style("TOCTitle", size=11, color=DARK, leading=18, bold=True)))
-    story.append(Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;{desc}", make_style("TOCDesc", size=9, color=SLATE, leading=14, space_after=6)))
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  1. SYSTEM OVERVIEW
-# ═══════════════════════════════════
-story.append(Paragraph("1. 시스템 개요", style_h1))
-story.append(section_divider())
-
-story.append(Paragraph(
-    "Architect Enterprise Builder는 <b>AI 기반 엔터프라이즈 솔루션 설계 시스템</b>입니다. "
-    "사업을 운영하면서 '우리 회사에 맞는 시스템을 만들고 싶은데, 어디서부터 시작해야 할지 모르겠다'는 "
-    "고민을 가진 분들을 위해 만들어졌습니다.",
-    style_body_dark
-))
-story.append(Spacer(1, 3*mm))
-story.append(Paragraph(
-    "전문 IT 컨설턴트가 하는 일을 AI가 대신합니다. 사업 현황과 고민을 대화로 알려주시면, "
-    "AI가 분석하여 <b>클라이언트용 사업 제안서</b>와 <b>개발팀용 기술 설계서</b>를 동시에 생성합니다.",
-    style_body_dark
-))
-
-story.append(Spacer(1, 5*mm))
-story.append(info_box(
-    "한 줄 요약",
-    "대화만으로 비즈니스 요구사항을 분석하고, 전문가 수준의 제안서와 기술 설계서를 자동으로 만들어주는 AI 설계 도구입니다."
-))
-
-story.append(Spacer(1, 6*mm))
-story.append(Paragraph("핵심 가치", style_h2))
-
-values = [
-    ("전문가 없이도 전문가 수준의 설계", "IT 전문가나 컨설턴트가 없어도, AI가 체계적인 질문을 통해 요구사항을 정밀하게 파악하고 전문적인 설계 결과물을 제공합니다."),
-    ("대화만으로 완성", "복잡한 양식을 채울 필요 없이, 자연스러운 대화를 통해 5가지 핵심 요소를 수집합니다. 문서 첨부나 회의 녹음도 지원합니다."),
-    ("이중 결과물 동시 생성", "사업주가 보는 제안서와 개발팀이 보는 기술 문서를 한 번에 생성합니다. 같은 내용을 두 가지 관점으로 제공하여 소통 비용을 줄입니다."),
-    ("한국어/영어 자유 전환", "모든 결과물을 한국어와 영어로 즉시 전환할 수 있어, 글로벌 팀이나 해외 파트너와의 협업에 활용 가능합니다."),
-]
-
-for title, desc in values:
-    story.append(Paragraph(f"<b>{title}</b>", make_style("ValTitle", size=10, color=DARK, leading=16, bold=True, space_before=4)))
-    story.append(Paragraph(desc, style_body))
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  2. KEY FEATURES
-# ═══════════════════════════════════
-story.append(Paragraph("2. 핵심 기능", style_h1))
-story.append(section_divider())
-
-# Feature 1
-story.append(Paragraph("2.1 AI 진단 대화 (5단계 인터뷰)", style_h2))
-story.append(Paragraph(
-    "AI가 시니어 솔루션 아키텍트 역할로 5가지 핵심 영역에 대해 체계적으로 질문합니다. "
-    "각 단계마다 구체적인 예시와 팁을 제공하여, IT에 익숙하지 않은 분도 쉽게 답변할 수 있습니다.",
-    style_body
-))
-
-phase_data = [
-    ["단계", "질문 영역", "수집 내용"],
-    ["1단계", "비즈니스 배경", "현재 사업 현황, 겪고 있는 문제점, 시스템 도입 동기"],
-    ["2단계", "시스템 모델", "원하는 솔루션 형태 (웹, 앱, 관리도구, SaaS 등)"],
-    ["3단계", "업무 프로세스", "실제 사용자가 시스템을 어떻게 사용할지 (업무 흐름)"],
-    ["4단계", "기술 환경", "현재 사용 중인 도구, 연동 필요 시스템 (엑셀, ERP 등)"],
-    ["5단계", "성공 지표 (KPI)", "시스템 도입 후 달성하고자 하는 비즈니스 목표"],
-]
-
-col_widths = [20*mm, 30*mm, 110*mm]
-phase_table = Table(
-    [[Paragraph(cell, style_table_header if i == 0 else style_table_body) for cell in row]
-     for i, row in enumerate(phase_data)],
-    colWidths=col_widths
-)
-phase_table.setStyle(TableStyle([
-    ('BACKGROUND', (0,0), (-1,0), DARK),
-    ('TEXTCOLOR', (0,0), (-1,0), WHITE),
-    ('BACKGROUND', (0,1), (-1,-1), WHITE),
-    ('GRID', (0,0), (-1,-1), 0.5, BORDER),
-    ('TOPPADDING', (0,0), (-1,-1), 6),
-    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ('LEFTPADDING', (0,0), (-1,-1), 8),
-    ('ROWBACKGROUNDS', (0,1), (-1,-1), [WHITE, SLATE_BG]),
-    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-]))
-story.append(phase_table)
-
-# Feature 2
-story.append(Spacer(1, 5*mm))
-story.append(Paragraph("2.2 문서 & 음성 분석", style_h2))
-story.append(Paragraph(
-    "대화 외에도 기존 자료를 활용하여 더 정밀한 설계가 가능합니다.",
-    style_body
-))
-story.append(bullet("<b>PDF 문서 분석</b> — 기존 사업계획서, 요구사항 정의서, ERD 등을 업로드하면 AI가 자동으로 핵심 내용을 추출하여 설계에 반영합니다."))
-story.append(bullet("<b>텍스트 입력</b> — 긴 요구사항 텍스트를 직접 붙여넣어 분석할 수 있습니다."))
-story.append(bullet("<b>회의 녹음 분석</b> — 미팅 내용을 녹음하면 AI가 회의록을 생성하고, 비즈니스 요구사항을 자동으로 추출합니다."))
-story.append(bullet("<b>문서/회의 기반 즉시 설계</b> — 5단계 인터뷰를 건너뛰고, 문서나 회의 내용만으로 바로 설계를 시작할 수 있습니다."))
-
-# Feature 3
-story.append(Spacer(1, 5*mm))
-story.append(Paragraph("2.3 개발 일정 제약 설정", style_h2))
-story.append(Paragraph(
-    "희망 개발 완료 시점을 설정하면 (예: '3개월', '2026년 6월까지'), AI가 로드맵과 마일스톤을 "
-    "해당 기간 내에 자동으로 압축 배치합니다. 기능 범위를 줄이지 않고 일정만 조정하며, "
-    "병렬 작업 가능한 항목은 동시 진행으로 구성합니다.",
-    style_body
-))
-
-# Feature 4
-story.append(Spacer(1, 5*mm))
-story.append(Paragraph("2.4 양식 모드", style_h2))
-story.append(Paragraph(
-    "대화 방식 외에 구조화된 양식(폼)으로도 요구사항을 입력할 수 있습니다. "
-    "양식 모드에서는 각 항목별로 선택지와 입력란이 제공되어, 빠르고 체계적으로 정보를 입력할 수 있습니다.",
-    style_body
-))
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  3. HOW IT WORKS
-# ═══════════════════════════════════
-story.append(Paragraph("3. 작동 방식", style_h1))
-story.append(section_divider())
-
-story.append(Paragraph(
-    "Architect의 전체 프로세스는 크게 3단계로 이루어집니다.",
-    style_body_dark
-))
-story.append(Spacer(1, 3*mm))
-
-# Flow diagram as table
-flow_data = [
-    [Paragraph("<b>STEP 1</b><br/>요구사항 수집", make_style("FlowTitle", size=10, color=WHITE, leading=15, bold=True, align=TA_CENTER)),
-     Paragraph("<b>STEP 2</b><br/>AI 병렬 생성", make_style("FlowTitle", size=10, color=WHITE, leading=15, bold=True, align=TA_CENTER)),
-     Paragraph("<b>STEP 3</b><br/>결과 확인 & 내보내기", make_style("FlowTitle", size=10, color=WHITE, leading=15, bold=True, align=TA_CENTER))],
-    [Paragraph("5단계 진단 대화<br/>또는 양식 입력<br/>+ 문서/음성 분석", make_style("FlowBody", size=9, color=SLATE, leading=14, align=TA_CENTER)),
-     Paragraph("Google Gemini: 비즈니스 분석<br/>Anthropic Claude: 기술 설계<br/>(동시 병렬 처리)", make_style("FlowBody", size=9, color=SLATE, leading=14, align=TA_CENTER)),
-     Paragraph("클라이언트 제안서 확인<br/>개발자 설계서 확인<br/>HTML/ZIP/JSON 내보내기", make_style("FlowBody", size=9, color=SLATE, leading=14, align=TA_CENTER))],
-]
-
-flow_table = Table(flow_data, colWidths=[50*mm, 55*mm, 55*mm])
-flow_table.setStyle(TableStyle([
-    ('BACKGROUND', (0,0), (0,0), BLUE),
-    ('BACKGROUND', (1,0), (1,0), PURPLE),
-    ('BACKGROUND', (2,0), (2,0), GREEN),
-    ('BACKGROUND', (0,1), (-1,1), WHITE),
-    ('BOX', (0,0), (-1,-1), 1, BORDER),
-    ('INNERGRID', (0,0), (-1,-1), 0.5, BORDER),
-    ('TOPPADDING', (0,0), (-1,-1), 10),
-    ('BOTTOMPADDING', (0,0), (-1,-1), 10),
-    ('LEFTPADDING', (0,0), (-1,-1), 8),
-    ('RIGHTPADDING', (0,0), (-1,-1), 8),
-    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-]))
-story.append(flow_table)
-
-story.append(Spacer(1, 6*mm))
-story.append(Paragraph("상세 흐름", style_h2))
-
-steps_detail = [
-    ("요구사항 수집 (5~10분)", "AI가 사업 배경, 원하는 시스템 모델, 업무 흐름, 기술 환경, 목표 KPI를 순서대로 질문합니다. 각 질문에는 구체적인 예시와 전문가 팁이 함께 제공됩니다. 필요하면 PDF 문서를 첨부하거나 회의를 녹음하여 추가 맥락을 제공할 수 있습니다."),
-    ("추가 정보 확인", "문서나 회의록에서 누락된 정보가 감지되면, AI가 추가 질문을 통해 빠진 정보를 보완합니다. '건너뛰기'를 입력하면 현재 정보만으로 진행합니다."),
-    ("개발 일정 설정", "희망 완료 시점을 입력하면 일정에 맞춰 로드맵이 조정됩니다. 설정하지 않으면 유연한 일정으로 진행됩니다."),
-    ("승인 및 생성 시작", "'시작' 또는 '승인'을 입력하면 AI가 설계를 시작합니다. Google Gemini와 Anthropic Claude 두 개의 AI가 동시에 작업하여 빠르게 결과를 생성합니다."),
-    ("결과 확인 및 후속 대화", "생성된 결과물을 화면에서 즉시 확인할 수 있습니다. 수정이 필요하면 대화를 계속하여 추가 요청을 할 수 있습니다."),
-]
-for i, (title, desc) in enumerate(steps_detail):
-    story.append(numbered(i+1, f"<b>{title}</b>"))
-    story.append(Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;{desc}", style_body))
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  4. OUTPUT DETAILS
-# ═══════════════════════════════════
-story.append(Paragraph("4. 결과물 상세", style_h1))
-story.append(section_divider())
-
-story.append(Paragraph(
-    "Architect는 하나의 분석 결과를 <b>두 가지 관점</b>으로 제공합니다. "
-    "같은 프로젝트에 대해 사업주와 개발팀이 각자 필요한 형태의 문서를 받을 수 있습니다.",
-    style_body_dark
-))
-
-# Client View
-story.append(Spacer(1, 4*mm))
-story.append(Paragraph("4.1 클라이언트용 제안서", style_h2))
-story.append(Paragraph(
-    "비개발자(사업주, 의사결정자)가 읽는 문서입니다. 기술 용어 없이 비즈니스 언어로 작성됩니다.",
-    style_body
-))
-
-client_items = [
-    ["항목", "내용"],
-    ["문제 정의", "현재 겪고 있는 비즈니스 문제를 공감하며 정리"],
-    ["솔루션 개요", "해결 방안을 쉬운 말로 상세히 설명 (기술명 없이)"],
-    ["핵심 기능 (7~10개)", "비즈니스 가치 중심으로 기능 서술"],
-    ["추진 일정 (마일스톤)", "단계별 일정과 각 단계의 산출물"],
-    ["캘린더 타임라인", "스프린트 기반 시각적 캘린더 일정표"],
-    ["기대 효과", "도입 전후 비교 시나리오"],
-    ["투자 대비 효과", "정성적 ROI 분석 및 업계 벤치마크 참고"],
-    ["데이터 보호", "보안 및 개인정보 보호 방안 (쉬운 설명)"],
-]
-
-client_table = Table(
-    [[Paragraph(cell, style_table_header if i == 0 else style_table_body) for cell in row]
-     for i, row in enumerate(client_items)],
-    colWidths=[45*mm, 115*mm]
-)
-client_table.setStyle(TableStyle([
-    ('BACKGROUND', (0,0), (-1,0), BLUE),
-    ('GRID', (0,0), (-1,-1), 0.5, BORDER),
-    ('TOPPADDING', (0,0), (-1,-1), 5),
-    ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-    ('LEFTPADDING', (0,0), (-1,-1), 8),
-    ('ROWBACKGROUNDS', (0,1), (-1,-1), [WHITE, SLATE_BG]),
-    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-]))
-story.append(client_table)
-
-# Developer View
-story.append(Spacer(1, 6*mm))
-story.append(Paragraph("4.2 개발자용 기술 설계서", style_h2))
-story.append(Paragraph(
-    "개발팀이 바로 개발에 착수할 수 있는 수준의 기술 문서입니다. 4개의 탭으로 구성됩니다.",
-    style_body
-))
-
-story.append(Paragraph("<b>로드맵 탭</b>", style_h3))
-story.append(bullet("실행 로드맵 (6단계 이상, 기간/목표/산출물 포함)"))
-story.append(bullet("스프린트 계획 (목표, 산출물, 선행 조건 포함)"))
-story.append(bullet("캘린더 타임라인 시각화"))
-story.append(bullet("분석 요약, 예상 ROI, 보안 전략"))
-
-story.append(Paragraph("<b>아키텍처 탭</b>", style_h3))
-story.append(bullet("시스템 아키텍처 다이어그램 (Mermaid 시각화 + 코드)"))
-story.append(bullet("기술 스택 다이어그램 (프레임워크, DB, 인프라 등)"))
-story.append(bullet("시퀀스 플로우 다이어그램 (사용자 시나리오 흐름)"))
-
-story.append(Paragraph("<b>구현 탭</b>", style_h3))
-story.append(bullet("프로젝트 폴더 구조"))
-story.append(bullet("API 엔드포인트 명세 (메서드, 경로, 요청/응답, 에러코드)"))
-story.append(bullet("데이터베이스 스키마 (테이블, 컬럼, 타입, 제약조건)"))
-story.append(bullet("핵심 모듈 코드 (실제 구현 코드 포함)"))
-story.append(bullet("배포 계획 및 테스트 전략"))
-
-story.append(Paragraph("<b>문서 탭</b>", style_h3))
-story.append(bullet("PRD (제품 요구사항 문서) — 전체 마크다운"))
-story.append(bullet("LLD (상세 설계 문서) — 전체 마크다운"))
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  5. MULTILINGUAL
-# ═══════════════════════════════════
-story.append(Paragraph("5. 다국어 지원", style_h1))
-story.append(section_divider())
-
-story.append(Paragraph(
-    "Architect는 <b>한국어와 영어를 완벽하게 지원</b>합니다.",
-    style_body_dark
-))
-story.append(Spacer(1, 3*mm))
-
-story.append(Paragraph("UI 라벨 실시간 전환", style_h3))
-story.append(Paragraph(
-    "화면 상단의 KO/EN 버튼 하나로 모든 인터페이스 라벨이 즉시 전환됩니다. "
-    "메뉴, 버튼, 안내 텍스트, 탭 이름 등 100개 이상의 UI 요소가 양국어로 제공됩니다.",
-    style_body
-))
-
-story.append(Paragraph("AI 생성 콘텐츠 자동 번역", style_h3))
-story.append(Paragraph(
-    "언어를 전환하면 AI가 생성한 결과물(분석, 로드맵, 제안서, PRD/LLD 등)도 자동으로 번역됩니다. "
-    "3개의 AI 번역 엔진이 동시에 작동하여 빠르게 처리하며, 번역 결과는 캐시에 저장되어 "
-    "재전환 시 즉시 표시됩니다 (추가 API 호출 없음).",
-    style_body
-))
-
-story.append(Spacer(1, 3*mm))
-story.append(Paragraph("번역 시 보존되는 항목", style_h3))
-story.append(bullet("Mermaid 다이어그램 (시각화 요소)"))
-story.append(bullet("코드 블록 및 파일 경로"))
-story.append(bullet("URL, 날짜, 숫자, 버전 번호"))
-story.append(bullet("기술 식별자 (함수명, 클래스명 등)"))
-
-story.append(Spacer(1, 3*mm))
-story.append(Paragraph("내보내기 시 번역 반영", style_h3))
-story.append(Paragraph(
-    "내보내기 메뉴에서 '보고서 언어'를 선택하면 해당 언어의 번역된 결과물로 다운로드됩니다. "
-    "한국어로 생성한 결과를 영어로 내보내거나, 그 반대도 가능합니다.",
-    style_body
-))
-
-story.append(Spacer(1, 8*mm))
-
-# ═══════════════════════════════════
-#  6. EXPORT
-# ═══════════════════════════════════
-story.append(Paragraph("6. 내보내기 기능", style_h1))
-story.append(section_divider())
-
-story.append(Paragraph(
-    "생성된 결과물을 다양한 형식으로 내보낼 수 있습니다.",
-    style_body_dark
-))
-
-export_data = [
-    ["형식", "내용", "용도"],
-    ["클라이언트 HTML", "제안서 전체 (마일스톤 캘린더 포함)", "고객에게 제안서 전달"],
-    ["개발자 HTML", "로드맵, 아키텍처, 구현계획, PRD, LLD 전체", "개발팀에 기술 문서 전달"],
-    ["ZIP 전체", "모든 결과물 (MD, HTML, JSON, 코드, 다이어그램)", "프로젝트 아카이브"],
-    ["JSON 원본", "Blueprint 데이터 원본", "시스템 연동, 데이터 활용"],
-    ["인쇄", "클라이언트용 / 개발자용 선택 인쇄", "오프라인 미팅, 보고"],
-]
-
-export_table = Table(
-    [[Paragraph(cell, style_table_header if i == 0 else style_table_body) for cell in row]
-     for i, row in enumerate(export_data)],
-    colWidths=[35*mm, 70*mm, 55*mm]
-)
-export_table.setStyle(TableStyle([
-    ('BACKGROUND', (0,0), (-1,0), DARK),
-    ('GRID', (0,0), (-1,-1), 0.5, BORDER),
-    ('TOPPADDING', (0,0), (-1,-1), 6),
-    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ('LEFTPADDING', (0,0), (-1,-1), 8),
-    ('ROWBACKGROUNDS', (0,1), (-1,-1), [WHITE, SLATE_BG]),
-    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-]))
-story.append(export_table)
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  7. AI TECHNOLOGY
-# ═══════════════════════════════════
-story.append(Paragraph("7. AI 기술 구성", style_h1))
-story.append(section_divider())
-
-story.append(Paragraph(
-    "Architect는 <b>Google Gemini</b>와 <b>Anthropic Claude</b> 두 개의 AI를 동시에 활용하여 "
-    "각 AI의 장점을 극대화합니다.",
-    style_body_dark
-))
-
-story.append(Spacer(1, 4*mm))
-
-ai_data = [
-    ["AI 모델", "역할", "담당 결과물"],
-    ["Google Gemini Pro", "비즈니스 분석 전문가", "로드맵, 분석 요약, ROI, 보안 전략, 클라이언트 제안서"],
-    ["Google Gemini Pro", "아키텍처 전문가", "시스템 아키텍처, 시퀀스, 기술스택 다이어그램"],
-    ["Google Gemini Flash", "대화 및 분석 전문가", "진단 질문 생성, 문서 분석, 자유 대화, 콘텐츠 번역"],
-    ["Anthropic Claude", "개발 설계 전문가", "PRD, LLD, 스프린트 계획, API 설계, DB 스키마, 코드"],
-]
-
-ai_table = Table(
-    [[Paragraph(cell, style_table_header if i == 0 else style_table_body) for cell in row]
-     for i, row in enumerate(ai_data)],
-    colWidths=[35*mm, 40*mm, 85*mm]
-)
-ai_table.setStyle(TableStyle([
-    ('BACKGROUND', (0,0), (-1,0), PURPLE),
-    ('GRID', (0,0), (-1,-1), 0.5, BORDER),
-    ('TOPPADDING', (0,0), (-1,-1), 6),
-    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ('LEFTPADDING', (0,0), (-1,-1), 8),
-    ('ROWBACKGROUNDS', (0,1), (-1,-1), [WHITE, SLATE_BG]),
-    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-]))
-story.append(ai_table)
-
-story.append(Spacer(1, 5*mm))
-story.append(info_box(
-    "병렬 처리의 장점",
-    "두 AI가 동시에 작업하기 때문에, 순차적으로 처리하는 것보다 생성 시간이 크게 단축됩니다. "
-    "Gemini가 비즈니스 분석을 하는 동안 Claude가 기술 설계를 진행하여, 사용자는 Gemini 결과를 먼저 확인하면서 "
-    "Claude 결과를 기다릴 수 있습니다. Claude API 키가 없어도 Gemini 결과만으로 정상 동작합니다."
-))
-
-story.append(Spacer(1, 5*mm))
-story.append(Paragraph("추가 AI 기능", style_h2))
-story.append(bullet("<b>Google Search 연동</b> — Gemini Pro가 실시간 웹 검색으로 시장 동향, 경쟁사 분석, 업계 벤치마크를 반영합니다. 참고 자료 출처가 함께 제공됩니다."))
-story.append(bullet("<b>기술 레퍼런스 자동 매칭</b> — 사용자가 언급한 기술 스택에 맞는 최신 공식 문서 패턴을 자동으로 참조하여 코드 품질을 높입니다."))
-story.append(bullet("<b>회의 녹음 AI 분석</b> — 네이티브 오디오 AI가 회의 내용을 직접 분석하여 회의록과 설계 키워드를 추출합니다."))
-
-story.append(PageBreak())
-
-# ═══════════════════════════════════
-#  8. USE CASES
-# ═══════════════════════════════════
-story.append(Paragraph("8. 활용 시나리오", style_h1))
-story.append(section_divider())
-
-story.append(Paragraph("누가 사용하나요?", style_h2))
-
-users = [
-    ("중소기업 대표 / 사업주", "IT 시스템을 도입하고 싶지만 어디서 시작해야 할지 모를 때. 전문 컨설턴트를 고용하기 전에 요구사항을 정리하고, 사업 타당성을 검토하고 싶을 때."),
-    ("스타트업 창업자", "아이디어를 구체적인 기술 설계로 빠르게 전환하고 싶을 때. 개발팀에 전달할 PRD/LLD를 직접 작성하기 어려울 때."),
-    ("IT 컨설턴트 / PM", "고객 미팅 후 제안서와 기술 문서를 빠르게 초안 작성하고 싶을 때. 고객과의 요구사항 수집 과정을 체계화하고 싶을 때."),
-    ("기업 IT 부서", "내부 시스템 개선 프로젝트의 초기 설계를 빠르게 진행하고 싶을 때. 비개발 부서의 요구사항을 기술 문서로 변환해야 할 때."),
-]
-
-for title, desc in users:
-    story.append(Paragraph(f"<b>{title}</b>", make_style("UserTitle", size=10, color=DARK, leading=16, bold=True, space_before=6)))
-    story.append(Paragraph(desc, style_body))
-
-story.append(Spacer(1, 6*mm))
-story.append(Paragraph("실제 사용 예시", style_h2))
-
-story.append(Paragraph("<b>시나리오: 물류 회사가 재고 관리 시스템을 만들고 싶을 때</b>",
-    make_style("ScenTitle", size=10, color=BLUE, leading=16, bold=True, space_before=4)))
-
-scenario_data = [
-    ["단계", "사용자 행동", "시스템 결과"],
-    ["1", "사업 배경 설명: '물류 창고 3개 운영 중, 엑셀로 재고 관리하는데 실수가 많아요'", "AI가 물류/재고 관리 도메인으로 분석 시작"],
-    ["2", "시스템 모델 선택: '웹 기반 관리자 도구 + 모바일 앱'", "웹+앱 하이브리드 아키텍처 설계"],
-    ["3", "업무 흐름 설명: '입고 → 검수 → 적재 → 출고 → 배송 추적'", "프로세스 기반 모듈 설계"],
-    ["4", "기존 환경: '엑셀, 택배사 API, 바코드 스캐너'", "연동 아키텍처 포함한 기술 스택 선정"],
-    ["5", "목표 KPI: '재고 오차율 5% 이하, 처리 시간 50% 단축'", "KPI 기반 ROI 분석"],
-    ["결과", "승인 ('시작' 입력)", "제안서 + PRD + LLD + 스프린트 계획 자동 생성"],
-]
-
-scenario_table = Table(
-    [[Paragraph(cell, style_table_header if i == 0 else style_table_body) for cell in row]
-     for i, row in enumerate(scenario_data)],
-    colWidths=[15*mm, 70*mm, 75*mm]
-)
-scenario_table.setStyle(TableStyle([
-    ('BACKGROUND', (0,0), (-1,0), GREEN),
-    ('GRID', (0,0), (-1,-1), 0.5, BORDER),
-    ('TOPPADDING', (0,0), (-1,-1), 5),
-    ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-    ('LEFTPADDING', (0,0), (-1,-1), 6),
-    ('ROWBACKGROUNDS', (0,1), (-1,-1), [WHITE, SLATE_BG]),
-    ('VALIGN', (0,0), (-1,-1), 'TOP'),
-]))
-story.append(scenario_table)
-
-story.append(Spacer(1, 10*mm))
-story.append(HRFlowable(width="100%", thickness=1, color=BLUE, spaceBefore=0, spaceAfter=8))
-story.append(Paragraph(
-    "Architect Enterprise Builder는 비즈니스 아이디어를 전문적인 설계 문서로 변환하는 과정을 "
-    "AI가 자동화합니다. 대화 한 번으로 사업주와 개발팀 모두가 필요한 문서를 동시에 얻을 수 있습니다.",
-    make_style("Closing", size=11, color=DARK, leading=18, bold=True, align=TA_CENTER, space_after=4)
-))
-story.append(Paragraph(
-    "www.architect-builder.com",
-    make_style("URL", size=9, color=BLUE, leading=14, align=TA_CENTER)
-))
-
-# ═══════════════════════════════════
-#  BUILD
-# ═══════════════════════════════════
-doc.build(story, onFirstPage=draw_cover, onLaterPages=draw_page)
-print(f"PDF generated: {output_path}")
+# ══════════════════════════════════════
+#  STORY CONSTRUCTION
+# ══════════════════════════════════════
+def render_block(block):
+    """Turn one (kind, *args) content block into a list of flowables"""
+    kind, args = block[0], block[1:]
+    if kind == "spacer":
+        return [Spacer(1, args[0]*mm)]
+    if kind == "body":
+        return [Paragraph(args[0], style_body)]
+    if kind == "body_dark":
+        return [Paragraph(args[0], style_body_dark)]
+    if kind == "h2":
+        return [Paragraph(args[0], style_h2)]
+    if kind == "h3":
+        return [Paragraph(args[0], style_h3)]
+    if kind == "lead":
+        return [Paragraph(args[0], style_lead)]
+    if kind == "bullets":
+        return [bullet(text) for text in args[0]]
+    if kind == "info_box":
+        return [info_box(args[0], args[1])]
+    if kind == "table":
+        rows, options = args[0], (args[1] if len(args) > 1 else {})
+        return [data_table(rows, **options)]
+    if kind == "flow":
+        return [flow_table(args[0], args[1])]
+    if kind == "mermaid":
+        return [mermaid_diagram(args[0], **(args[1] if len(args) > 1 else {}))]
+    if kind == "entries":
+        entries, space_before = args[0], (args[1] if len(args) > 1 else 4)
+        title_style = make_style("EntryTitle", size=10, color=DARK, leading=16, bold=True, space_before=space_before)
+        out = []
+        for title, desc in entries:
+            out.append(Paragraph(f"<b>{title}</b>", title_style))
+            out.append(Paragraph(desc, style_body))
+        return out
+    if kind == "steps":
+        out = []
+        for i, (title, desc) in enumerate(args[0]):
+            out.append(numbered(i+1, f"<b>{title}</b>"))
+            out.append(Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;{desc}", style_body))
+        return out
+    if kind == "closing":
+        return [
+            HRFlowable(width="100%", thickness=1, color=BLUE, spaceBefore=0, spaceAfter=8),
+            Paragraph(args[0], make_style("Closing", size=11, color=DARK, leading=18, bold=True, align=TA_CENTER, space_after=4)),
+            Paragraph(args[1], make_style("URL", size=9, color=BLUE, leading=14, align=TA_CENTER)),
+        ]
+    raise ValueError(f"Unknown content block kind: {kind!r}")
+
+
+def cover_flowables(cover):
+    story = []
+    story.append(Spacer(1, 60*mm))
+    story.append(Paragraph(cover["logo"], make_style("LogoText", size=42, color=DARK, leading=50, bold=True, align=TA_CENTER)))
+    story.append(Paragraph(cover["logo_sub"], make_style("LogoSub", size=18, color=BLUE, leading=24, bold=True, align=TA_CENTER)))
+    story.append(Spacer(1, 15*mm))
+    story.append(HRFlowable(width="40%", thickness=2, color=BLUE, spaceBefore=0, spaceAfter=0))
+    story.append(Spacer(1, 15*mm))
+    story.append(Paragraph(cover["tagline"], make_style("CoverTag", size=16, color=DARK, leading=24, bold=True, align=TA_CENTER)))
+    story.append(Spacer(1, 8*mm))
+    story.append(Paragraph(cover["doc_type"], make_style("CoverDocType", size=14, color=SLATE, leading=20, align=TA_CENTER)))
+    if cover.get("customer"):
+        story.append(Spacer(1, 6*mm))
+        line = cover.get("customer_line", "{customer}").format(customer=cover["customer"])
+        story.append(Paragraph(line, make_style("CoverCustomer", size=12, color=BLUE, leading=18, bold=True, align=TA_CENTER)))
+        story.append(Spacer(1, 24*mm))
+    else:
+        story.append(Spacer(1, 30*mm))
+    for line in cover["description"]:
+        story.append(Paragraph(line, style_cover_desc))
+    story.append(Spacer(1, 20*mm))
+    story.append(Paragraph(cover["year"], make_style("Year", size=11, color=SLATE_LIGHT, leading=14, align=TA_CENTER)))
+    return story
+
+
+def toc_flowables(toc):
+    story = []
+    story.append(Paragraph(toc["title"], style_h1))
+    story.append(Spacer(1, 5*mm))
+    for num, title, desc in toc["items"]:
+        story.append(Paragraph(f"<b>{num}. {title}</b>", style_toc_title))
+        story.append(Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;{desc}", style_toc_desc))
+    return story
+
+
+def section_flowables(section):
+    story = []
+    story.append(Paragraph(section["title"], style_h1))
+    story.append(section_divider())
+    for block in section["blocks"]:
+        story.extend(render_block(block))
+    return story
+
+
+def page_groups(content):
+    """Split content into runs of parts that each start on a fresh page.
+
+    Every part is a (kind, data) pair: ("cover", cover), ("toc", toc) or
+    ("section", section). A section with `page_break: False` shares its
+    group with the section after it.
+    """
+    groups = [[("cover", content["cover"])], [("toc", content["toc"])]]
+    current = []
+    for section in content["sections"]:
+        current.append(("section", section))
+        if section.get("page_break", True):
+            groups.append(current)
+            current = []
+    if current:
+        groups.append(current)
+    return groups
+
+
+def group_flowables(group):
+    story = []
+    for kind, data in group:
+        if kind == "cover":
+            story.extend(cover_flowables(data))
+        elif kind == "toc":
+            story.extend(toc_flowables(data))
+        else:
+            story.extend(section_flowables(data))
+    return story
+
+
+def iter_story(content):
+    """Yield the story one page group at a time: cover, TOC, then each section"""
+    for i, group in enumerate(page_groups(content)):
+        if i:
+            yield PageBreak()
+        yield from group_flowables(group)
+
+
+def build_story(content):
+    """Build the full flowable list: cover, TOC, then each section"""
+    return list(iter_story(content))
+
+
+def merge_content(base, overrides):
+    """Copy of `base` with `overrides` applied.
+
+    Nested dicts are merged, everything else is replaced. `sections` may be
+    a dict of section key -> fields to replace in that section.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if key == "sections" and isinstance(value, dict):
+            by_key = {section["key"]: section for section in merged["sections"]}
+            for section_key, fields in value.items():
+                if section_key not in by_key:
+                    raise KeyError(f"Unknown section: {section_key!r}")
+                by_key[section_key].update(copy.deepcopy(fields))
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_content(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def make_doc(output, doc_class=StreamingDocTemplate):
+    return doc_class(
+        output,
+        pagesize=A4,
+        topMargin=22*mm,
+        bottomMargin=22*mm,
+        leftMargin=25*mm,
+        rightMargin=25*mm,
+    )
+
+
+# ══════════════════════════════════════
+#  BUILD DOCUMENT
+# ══════════════════════════════════════
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Architect_System_Introduction.pdf")
+
+
+def build_intro_pdf(output, *, lang="ko", content=None, fonts=None, profiler=None, invariant=False, appendices=None,
+                    theme=None, compact=None):
+    """Render the introduction document to `output` (path or binary file object).
+
+    `content` replaces the built-in content for `lang`; `fonts` maps the
+    `Korean`/`KoreanBold` aliases to font files. A `LayoutProfiler` passed
+    as `profiler` records the layout of this build. With `invariant` the
+    creation date and document ID are fixed, so equal input renders to
+    equal bytes. `appendices` are PDF paths grafted after the last page
+    with continued footer numbers (see architect_pdf.appendix). `theme`
+    selects the branding: colors, header and footer, logo, cover image and
+    fonts (see `use_theme`). `compact`, a zlib level 0-9, writes the
+    compact form: recompressed, with object streams, trimmed font subsets
+    and duplicate objects merged (see architect_pdf.compact). Returns the
+    page count.
+    """
+    if content is None:
+        if lang not in INTRO_CONTENT:
+            raise ValueError(f"Unsupported language: {lang!r} (expected one of {sorted(INTRO_CONTENT)})")
+        content = INTRO_CONTENT[lang]
+    register_fonts(fonts)
+    theme = use_theme(theme)
+    header = theme.header or content.get("header", DEFAULT_HEADER)
+    footer = theme.footer or content.get("footer", DEFAULT_FOOTER)
+
+    if compact is not None:
+        from architect_pdf.compact import compact_pdf
+        document = BytesIO()
+        pages = build_intro_pdf(document, lang=lang, content=content, fonts=fonts, profiler=profiler,
+                                invariant=invariant, appendices=appendices, theme=theme)
+        data = compact_pdf(document.getvalue(), level=compact)
+        if hasattr(output, "write"):
+            output.write(data)
+        else:
+            with open(output, "wb") as f:
+                f.write(data)
+        return pages
+
+    if appendices:
+        from architect_pdf.appendix import append_appendices
+        document = BytesIO()
+        build_intro_pdf(document, lang=lang, content=content, fonts=fonts, profiler=profiler, invariant=invariant,
+                        theme=theme)
+        return append_appendices(document.getvalue(), appendices, output, footer_text=footer)["pages"]
+
+    doc = make_doc(output)
+    if invariant:
+        doc.invariant = 1
+    doc.header_text = header
+    doc.footer_text = footer
+    story = iter_story(content)
+    if profiler is None:
+        doc.build(story, onFirstPage=draw_cover, onLaterPages=draw_page)
+    else:
+        with profiler:
+            doc.build(story, onFirstPage=profiler.page_callback(draw_cover),
+                      onLaterPages=profiler.page_callback(draw_page))
+    return doc.page
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the Architect system introduction PDF")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="output PDF path, or - for stdout")
+    parser.add_argument("--lang", default="ko", choices=sorted(INTRO_CONTENT))
+    parser.add_argument("--content", help="JSON file replacing the built-in content")
+    parser.add_argument("--profile", metavar="TRACE", help="profile the layout, write a Chrome trace to TRACE and print a summary")
+    parser.add_argument("--watch", action="store_true", help="stay running and rebuild whenever the content or script changes")
+    parser.add_argument("--dry-run", action="store_true", help="print the pagination as JSON instead of writing a PDF")
+    parser.add_argument("--theme", help="theme profile name or JSON file (see architect_pdf.themes)")
+    parser.add_argument("--appendix", action="append", default=[], metavar="PDF",
+                        help="append this PDF after the last section (repeatable, in order)")
+    parser.add_argument("--compact", type=int, nargs="?", const=9, choices=range(10), metavar="LEVEL",
+                        help="write the compact form at this zlib level (default 9) and report its size breakdown")
+    parser.add_argument("--max-kb", type=float, help="with --compact, fail when the PDF is larger than this")
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        from architect_pdf import dryrun
+        dryrun.main(["--lang", args.lang] + (["--content", args.content] if args.content else [])
+                    + (["--theme", args.theme] if args.theme else []))
+        return
+
+    if args.max_kb is not None and args.compact is None:
+        parser.error("--max-kb needs --compact")
+    if args.watch:
+        if args.output == "-" or args.profile or args.appendix or args.theme or args.compact is not None:
+            parser.error("--watch writes to a file and cannot be combined with -o -, --profile, --appendix, "
+                         "--theme or --compact")
+        from architect_pdf import watch
+        watch.main([arg for arg in (argv if argv is not None else sys.argv[1:]) if arg != "--watch"])
+        return
+
+    content = None
+    if args.content:
+        with open(args.content, encoding="utf-8") as f:
+            content = json.load(f)
+    profiler = LayoutProfiler() if args.profile else None
+    to_stdout = args.output == "-"
+    # Messages go to stderr when stdout carries the PDF
+    log = sys.stderr if to_stdout else sys.stdout
+    output = sys.stdout.buffer if to_stdout else args.output
+    options = dict(lang=args.lang, content=content, profiler=profiler, appendices=args.appendix, theme=args.theme)
+    if args.compact is not None:
+        from architect_pdf import compact
+        try:
+            result = compact.build_compact(output, level=args.compact,
+                                           max_bytes=None if args.max_kb is None else int(args.max_kb * 1024),
+                                           **options)
+        except compact.SizeBudgetError as e:
+            print("\n".join(compact.report(e.breakdown)), file=sys.stderr)
+            sys.exit(f"error: {e}")
+        print(f"PDF generated: {'<stdout>' if to_stdout else args.output} "
+              f"({result['original_bytes'] / 1024:.1f} KB uncompacted)", file=log)
+        print("\n".join(compact.report(result["breakdown"])), file=log)
+    else:
+        build_intro_pdf(output, **options)
+        print(f"PDF generated: {'<stdout>' if to_stdout else args.output}", file=log)
+    if profiler:
+        profiler.write_trace(args.profile)
+        print(f"Trace written: {args.profile}\n", file=log)
+        print(profiler.summary(), file=log)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    # Font, asset, page and output caches go to a fresh directory per test
+    monkeypatch.setenv("ARCHITECT_PDF_CACHE", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def fonts():
+    """The registered font aliases; tests that render skip where no Korean face is installed"""
+    from reportlab.pdfbase.ttfonts import TTFError
+
+    import generate_intro_pdf as intro
+
+    try:
+        return intro.register_fonts()
+    except TTFError as e:
+        pytest.skip(str(e))
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import NameObject
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.pdfgen import canvas
+
+from architect_pdf.appendix import append_appendices, footer_overlay
+from architect_pdf.pagecache import stamp_footers
+
+
+def pdf(*sizes, rotate=0):
+    buf = BytesIO()
+    c = canvas.Canvas(buf, invariant=1)
+    for size in sizes:
+        c.setPageSize(size)
+        c.drawString(100, 400, "appendix body")
+        c.showPage()
+    c.save()
+    if not rotate:
+        return buf.getvalue()
+    writer = PdfWriter(clone_from=PdfReader(BytesIO(buf.getvalue())))
+    for page in writer.pages:
+        page.rotate(rotate)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def footer_position(page):
+    """Where the footer's text starts, in the coordinates of the page as displayed"""
+    found = []
+
+    def visit(text, cm, tm, font, size):
+        if "Page" in text:
+            found.append((tm[4] * cm[0] + tm[5] * cm[2] + cm[4], tm[4] * cm[1] + tm[5] * cm[3] + cm[5]))
+    page.extract_text(visitor_text=visit)
+    (x, y), = found
+    box = page.mediabox
+    x, y = x - float(box.left), y - float(box.bottom)
+    width, height = float(box.width), float(box.height)
+    return {0: (x, y), 90: (y, width - x), 180: (width - x, height - y), 270: (height - y, x)}[page.rotation % 360]
+
+
+def appended(tmp_path, appendix):
+    document = pdf(A4)
+    path = tmp_path / "appendix.pdf"
+    path.write_bytes(appendix)
+    out = BytesIO()
+    append_appendices(document, [str(path)], out, footer_text="Page {page}")
+    return PdfReader(BytesIO(out.getvalue())).pages[1:]
+
+
+@pytest.mark.parametrize("size", [A4, letter, (400, 300)], ids=["a4", "letter", "landscape"])
+@pytest.mark.parametrize("rotate", [0, 90, 180, 270])
+def test_footer_sits_at_the_bottom_centre_as_displayed(tmp_path, fonts, size, rotate):
+    page, = appended(tmp_path, pdf(size, rotate=rotate))
+    x, y = footer_position(page)
+    shown_width = size[1] if rotate in (90, 270) else size[0]
+    # drawCentredString starts half the text width left of the centre
+    assert shown_width / 2 - 40 < x < shown_width / 2
+    assert 30 < y < 40
+
+
+def test_shared_resources_are_not_changed(fonts):
+    writer = PdfWriter(clone_from=PdfReader(BytesIO(pdf(A4, A4))))
+    shared = writer._add_object(writer.pages[0]["/Resources"])
+    for page in writer.pages:
+        page[NameObject("/Resources")] = shared
+    overlay = footer_overlay(writer.pages, 1, "Page {page}")
+
+    stamp_footers(writer, overlay, isolate=True)
+    assert list(shared.get_object()["/Font"]) == ["/F1"]
+    for page in writer.pages:
+        assert page.raw_get("/Resources") is not shared
+        names = list(page["/Resources"]["/Font"])
+        assert "/F1" in names and any(name.startswith("/PageNo") for name in names)
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+from architect_pdf import batch
+
+_render_variant = batch.render_variant
+
+
+def crash_on_boom(variant, out_dir="."):
+    # Pickled by reference; forked workers see this module as the test left it
+    if variant["name"] == "boom":
+        os._exit(1)
+    return _render_variant(variant, out_dir)
+
+
+def write_manifest(tmp_path, manifest):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    return str(path)
+
+
+def test_manifest_defaults_and_names(tmp_path):
+    variants = batch.load_manifest(write_manifest(tmp_path, {
+        "defaults": {"lang": "en"},
+        "variants": [{"name": "a"}, {"lang": "ko"}],
+    }))
+    assert variants == [{"lang": "en", "name": "a"}, {"lang": "ko", "name": "variant-2"}]
+
+
+@pytest.mark.parametrize("variants", [
+    [{"name": "a"}, {"name": "a", "lang": "en"}],
+    [{"name": "a"}, {"name": "b", "output": "a.pdf"}],
+    [{"name": "a", "output": "out/x.pdf"}, {"name": "b", "output": "out/./x.pdf"}],
+])
+def test_manifest_rejects_variants_writing_one_file(tmp_path, variants):
+    with pytest.raises(ValueError):
+        batch.load_manifest(write_manifest(tmp_path, variants))
+
+
+def test_render_errors_are_reported(tmp_path):
+    result = batch.render_variant({"name": "bad", "lang": "xx"}, str(tmp_path))
+    assert not result["ok"]
+    assert "Unsupported language" in result["error"]
+
+
+def test_a_crashing_variant_fails_alone(tmp_path, fonts, monkeypatch):
+    monkeypatch.setattr(batch, "render_variant", crash_on_boom)
+    variants = [{"name": f"v{i}", "lang": "en"} for i in range(3)] + [{"name": "boom"}, {"name": "bad", "lang": "xx"}]
+    results = {r["name"]: r for r in batch.iter_batch(variants, workers=2, out_dir=str(tmp_path))}
+    assert sorted(results) == ["bad", "boom", "v0", "v1", "v2"]
+    assert all(results[f"v{i}"]["ok"] for i in range(3))
+    assert os.path.exists(results["v0"]["output"])
+    assert not results["boom"]["ok"] and "BrokenProcessPool" in results["boom"]["error"]
+    assert not results["bad"]["ok"] and "Unsupported language" in results["bad"]["error"]
+
+
+def test_a_failing_initializer_fails_every_variant(tmp_path):
+    fonts = {"Korean": str(tmp_path / "missing.ttf"), "KoreanBold": str(tmp_path / "missing.ttf")}
+    variants = [{"name": f"v{i}"} for i in range(4)]
+    results = list(batch.iter_batch(variants, workers=2, out_dir=str(tmp_path), fonts=fonts))
+    assert sorted(r["name"] for r in results) == ["v0", "v1", "v2", "v3"]
+    assert not any(r["ok"] for r in results)
+
+
+def test_a_pool_broken_during_submission_loses_no_variant(tmp_path, monkeypatch):
+    pools = []
+
+    class BreaksOnThirdSubmit(batch.ProcessPoolExecutor):
+        def submit(self, *args, **kwargs):
+            self.submitted = getattr(self, "submitted", 0) + 1
+            if not pools and self.submitted == 3:
+                pools.append(self)
+                raise batch.BrokenProcessPool("a worker died")
+            return super().submit(*args, **kwargs)
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", BreaksOnThirdSubmit)
+    variants = [{"name": f"v{i}", "lang": "xx"} for i in range(5)]
+    results = list(batch.iter_batch(variants, workers=1, out_dir=str(tmp_path)))
+    # Every variant gets its own result: the render error, not a lost submission
+    assert sorted(r["name"] for r in results) == [f"v{i}" for i in range(5)]
+    assert all("Unsupported language" in r["error"] for r in results)
@@ -0,0 +1,61 @@
+import os
+import shutil
+import subprocess
+import sys
+
+from conftest import ROOT
+
+from architect_pdf import pagecache
+
+KEYS = """
+import generate_intro_pdf as intro
+from architect_pdf.outputcache import render_key
+from architect_pdf.pagecache import group_key
+content = intro.INTRO_CONTENT["en"]
+print(render_key(content, "en", {}), group_key(intro.page_groups(content)[1], False, "header", {}))
+"""
+
+
+def keys(tree):
+    out = subprocess.run([sys.executable, "-c", KEYS], cwd=tree, capture_output=True, text=True, check=True)
+    return out.stdout.split()
+
+
+def test_renderer_sources_cover_the_render_path():
+    names = [os.path.basename(path) for path in pagecache.renderer_sources()]
+    for module in ("metrics.py", "fonts.py", "assets.py", "themes.py", "streaming.py", "styles.py", "mermaid.py"):
+        assert module in names
+    # Dependencies come before their importers; the script is last
+    assert names.index("metrics.py") < names.index("fonts.py") < names.index("mermaid.py")
+    assert names[-1] == "generate_intro_pdf.py"
+    # Post-processing modules are imported lazily and are not part of the render
+    assert "compact.py" not in names and "appendix.py" not in names
+
+
+def test_editing_a_renderer_module_changes_the_cache_keys(tmp_path):
+    tree = tmp_path / "tree"
+    shutil.copytree(os.path.join(ROOT, "architect_pdf"), tree / "architect_pdf",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copy(os.path.join(ROOT, "generate_intro_pdf.py"), tree)
+    before = keys(tree)
+    assert keys(tree) == before
+    for module in ("metrics.py", "fonts.py", "tables.py"):
+        with open(tree / "architect_pdf" / module, "a", encoding="utf-8") as f:
+            f.write("\n# tweak\n")
+        after = keys(tree)
+        assert after[0] != before[0] and after[1] != before[1]
+        before = after
+    # A module outside the render path leaves them alone
+    with open(tree / "architect_pdf" / "delivery.py", "a", encoding="utf-8") as f:
+        f.write("\n# tweak\n")
+    assert keys(tree) == before
+
+
+def test_long_tables_render_through_a_hashed_module():
+    # data_table hands tables over LONG_TABLE_ROWS rows to DataTable
+    import generate_intro_pdf as intro
+    from architect_pdf import tables
+
+    rows = [["#", "Item"]] + [[str(i), f"row {i}"] for i in range(intro.LONG_TABLE_ROWS + 1)]
+    assert isinstance(intro.data_table(rows, [20, 100]), tables.DataTable)
+    assert os.path.abspath(tables.__file__) in pagecache.renderer_sources()
@@ -0,0 +1,148 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+import pytest
+
+from architect_pdf.delivery import Deliverer, Ledger
+
+
+class Receiver:
+    """Upload endpoint answering with scripted (status, body) pairs, the last one repeated"""
+
+    def __init__(self, answers, protocol="HTTP/1.1"):
+        self.answers = list(answers)
+        self.uploads = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = protocol
+
+            def do_POST(self):
+                receiver.uploads.append(self.rfile.read(int(self.headers["Content-Length"])))
+                status, body = receiver.answers.pop(0) if len(receiver.answers) > 1 else receiver.answers[0]
+                body = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc-{i}.pdf"
+        path.write_bytes(b"%%PDF-1.4 document %d" % i)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def receiver():
+    receivers = []
+
+    def make(answers, protocol="HTTP/1.1"):
+        receivers.append(Receiver(answers, protocol))
+        return receivers[-1]
+
+    yield make
+    for r in receivers:
+        r.close()
+
+
+def deliverer(url, **kwargs):
+    return Deliverer(upload_url=url, concurrency=2, backoff=0, **kwargs)
+
+
+def test_upload_to_a_closing_receiver_is_delivered_once(receiver, documents):
+    # HTTP/1.0 ends the connection after every answer; the 200 still counts
+    r = receiver([(200, {"id": "file-1"})], protocol="HTTP/1.0")
+    d = deliverer(r.url)
+    results = list(d.deliver_all([{"document": doc, "target": "gdrive"} for doc in documents]))
+    d.close()
+    assert [(x["status"], x["attempts"]) for x in results] == [("delivered", 1)] * 3
+    assert len(r.uploads) == 3
+
+
+def test_transient_errors_are_retried(receiver, documents):
+    r = receiver([(503, {"error": "busy"}), (429, {"error": "slow down"}), (200, {"id": "file-1"})])
+    d = deliverer(r.url)
+    result = d.deliver({"document": documents[0], "target": "gdrive"})
+    d.close()
+    assert result["status"] == "delivered"
+    assert result["attempts"] == 3
+    assert result["receipt"] == "file-1"
+
+
+def test_permanent_and_exhausted_failures(receiver, documents):
+    d = deliverer(receiver([(403, {"error": "forbidden"})]).url)
+    result = d.deliver({"document": documents[0], "target": "gdrive"})
+    assert (result["status"], result["attempts"]) == ("failed", 1)
+    assert "HTTP 403" in result["error"]
+    d.close()
+
+    d = deliverer(receiver([(503, {"error": "busy"})]).url, attempts=3)
+    result = d.deliver({"document": documents[0], "target": "gdrive"})
+    assert (result["status"], result["attempts"]) == ("failed", 3)
+    d.close()
+
+
+@pytest.mark.parametrize("body", [b"<html>proxy login</html>", b"[1, 2]"])
+def test_unexpected_2xx_body_fails_without_stopping_the_rest(receiver, documents, body):
+    r = receiver([(200, body), (200, {"id": "file-2"})])
+    d = deliverer(r.url)
+    d.concurrency = 1
+    results = list(d.deliver_all([{"document": doc, "target": "gdrive"} for doc in documents]))
+    d.close()
+    assert [x["status"] for x in results] == ["failed", "delivered", "delivered"]
+    assert results[0]["attempts"] == 1
+    assert "unexpected body" in results[0]["error"]
+
+
+def test_ledger_skips_a_repeated_delivery(receiver, documents, tmp_path):
+    r = receiver([(200, {"id": "file-1"})])
+    ledger = Ledger(str(tmp_path / "deliveries.db"))
+    d = deliverer(r.url, ledger=ledger)
+    delivery = {"document": documents[0], "target": "gdrive", "folder": "f"}
+    first, again = d.deliver(delivery), d.deliver(delivery)
+    other = d.deliver({**delivery, "folder": "g"})
+    d.close()
+    ledger.close()
+    assert (first["status"], again["status"], other["status"]) == ("delivered", "skipped", "delivered")
+    assert again["receipt"] == "file-1"
+    assert len(r.uploads) == 2
+
+
+def test_bad_email_header_fails_permanently_and_the_rest_continue(documents):
+    # Nothing listens on the SMTP port: the message is refused before a connection is made
+    d = Deliverer(smtp="127.0.0.1:9", concurrency=1, backoff=0)
+    deliveries = [
+        {"document": documents[0], "target": "email", "to": "pm@acme.example", "subject": "two\nlines"},
+        {"document": documents[1], "target": "email", "to": "pm@acme.example\r\nBcc: x@evil.example"},
+        {"document": documents[2], "target": "ftp"},
+    ]
+    results = list(d.deliver_all(deliveries))
+    d.close()
+    assert [(x["status"], x["attempts"]) for x in results[:2]] == [("failed", 1)] * 2
+    assert all("bad message" in x["error"] for x in results[:2])
+    assert results[2]["status"] == "failed"
+
+
+def test_missing_document_fails(tmp_path):
+    d = Deliverer(upload_url="http://127.0.0.1:9")
+    result = d.deliver({"document": str(tmp_path / "missing.pdf"), "target": "gdrive"})
+    d.close()
+    assert result["status"] == "failed"
+    assert result["attempts"] == 0
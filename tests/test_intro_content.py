@@ -0,0 +1,23 @@
+from io import BytesIO
+
+import generate_intro_pdf as intro
+
+
+def shape(content):
+    return {
+        "keys": sorted(content),
+        "cover": sorted(content["cover"]),
+        "toc": [number for number, _, _ in content["toc"]["items"]],
+        "sections": [(section["key"], [block[0] for block in section["blocks"]]) for section in content["sections"]],
+    }
+
+
+def test_languages_have_the_same_document_structure():
+    ko = shape(intro.INTRO_CONTENT["ko"])
+    for lang, content in intro.INTRO_CONTENT.items():
+        assert shape(content) == ko, lang
+
+
+def test_every_language_renders(fonts):
+    for lang in intro.INTRO_CONTENT:
+        assert intro.build_intro_pdf(BytesIO(), lang=lang) > 1
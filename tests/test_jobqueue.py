@@ -0,0 +1,134 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+
+import pytest
+
+from architect_pdf import jobqueue
+from architect_pdf.jobqueue import JobQueue
+
+OK = {"ok": True, "seconds": 0.1, "pages": 3, "bytes": 1000}
+FAILED = {"ok": False, "seconds": 0.1, "error": "ValueError: broken"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(str(tmp_path / "jobs.db"))
+    yield q
+    q.close()
+
+
+def insert(queue, *names, max_attempts=3):
+    # Rows as `add` writes them, without hashing render inputs
+    for name in names:
+        queue.db.execute(
+            "INSERT INTO jobs (name, variant, content_hash, output, max_attempts) VALUES (?, ?, '', ?, ?)",
+            (name, json.dumps({"name": name}), f"/out/{name}.pdf", max_attempts),
+        )
+
+
+def status(queue, name):
+    return dict(queue.db.execute("SELECT * FROM jobs WHERE name = ?", (name,)).fetchone())
+
+
+def test_claims_are_exclusive_and_in_order(queue):
+    insert(queue, "a", "b")
+    assert queue.claim("host:1")[1]["name"] == "a"
+    assert queue.claim("host:2")[1]["name"] == "b"
+    assert queue.claim("host:3") is None
+
+
+def test_failed_renders_retry_until_max_attempts(queue):
+    insert(queue, "a", max_attempts=2)
+    for expected in ("pending", "failed"):
+        job_id = queue.claim()[0]
+        assert queue.complete(job_id, FAILED)
+        assert status(queue, "a")["status"] == expected
+    assert queue.claim() is None
+    assert queue.retry_failed() == 1
+    job_id = queue.claim()[0]
+    assert queue.complete(job_id, OK)
+    row = status(queue, "a")
+    assert (row["status"], row["attempts"], row["pages"]) == ("done", 1, 3)
+
+
+def test_jobs_of_a_dead_worker_are_reclaimed(queue):
+    insert(queue, "a")
+    dead = f"{socket.gethostname()}:{2**22 + 12345}"
+    job_id = queue.claim(dead)[0]
+    assert queue.claim()[0] == job_id
+    assert status(queue, "a")["attempts"] == 2
+
+
+def test_expired_leases_are_reclaimed_even_with_a_live_pid(queue):
+    insert(queue, "a", "b")
+    # Our own PID is alive; on another host only the lease counts
+    for worker in (jobqueue.worker_id(), "elsewhere:1"):
+        queue.claim(worker)
+    assert queue.claim() is None
+    queue.db.execute("UPDATE jobs SET lease_until = ?", (time.time() - 1,))
+    assert {queue.claim("host:9")[1]["name"], queue.claim("host:9")[1]["name"]} == {"a", "b"}
+
+
+def test_renewed_leases_are_kept(queue):
+    insert(queue, "a")
+    job_id = queue.claim("elsewhere:1")[0]
+    queue.db.execute("UPDATE jobs SET lease_until = ?", (time.time() - 1,))
+    assert queue.renew(job_id, "elsewhere:1")
+    assert queue.claim() is None
+    assert not queue.renew(job_id, "elsewhere:2")
+
+
+def test_a_stale_worker_cannot_overwrite_the_new_owner(queue):
+    insert(queue, "a")
+    job_id = queue.claim("elsewhere:1")[0]
+    queue.db.execute("UPDATE jobs SET lease_until = ?", (time.time() - 1,))
+    assert queue.claim("elsewhere:2")[0] == job_id
+    assert not queue.complete(job_id, FAILED, "elsewhere:1")
+    assert not queue.renew(job_id, "elsewhere:1")
+    row = status(queue, "a")
+    assert (row["status"], row["worker"]) == ("running", "elsewhere:2")
+    assert queue.complete(job_id, OK, "elsewhere:2")
+    assert status(queue, "a")["status"] == "done"
+
+
+def test_heartbeat_keeps_a_long_render(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = JobQueue(path, lease=0.3)
+    insert(queue, "a")
+    job_id = queue.claim("elsewhere:1")[0]
+    with jobqueue.heartbeat(path, job_id, "elsewhere:1", lease=0.3):
+        for _ in range(4):
+            time.sleep(0.25)
+            assert queue.claim("elsewhere:2") is None
+    time.sleep(0.4)
+    assert queue.claim("elsewhere:2")[0] == job_id
+    queue.close()
+
+
+def test_databases_without_lease_column_are_upgraded(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = sqlite3.connect(path)
+    db.executescript(jobqueue.SCHEMA.replace("    lease_until REAL,\n", ""))
+    db.execute("INSERT INTO jobs (name, variant, content_hash, output, max_attempts, status, worker, claimed_at)"
+               " VALUES ('a', '{\"name\": \"a\"}', '', 'a.pdf', 3, 'running', 'elsewhere:1', ?)", (time.time(),))
+    db.commit()
+    db.close()
+    queue = JobQueue(path)
+    # The old claim keeps its lease from claimed_at
+    assert queue.claim() is None
+    queue.close()
+
+
+def test_add_requeues_changed_inputs(tmp_path, queue, fonts):
+    theme = tmp_path / "theme.json"
+    theme.write_text(json.dumps({"name": "t", "colors": {"BLUE": "#c2410c"}}), encoding="utf-8")
+    variants = [{"name": "a", "lang": "en"}, {"name": "b", "lang": "en", "theme": str(theme)}, {"name": "c", "lang": "xx"}]
+    assert queue.add(variants, str(tmp_path)) == (3, 0, 0)
+    assert queue.add(variants, str(tmp_path)) == (0, 0, 3)
+    theme.write_text(json.dumps({"name": "t", "colors": {"BLUE": "#0000ff"}}), encoding="utf-8")
+    assert queue.add(variants, str(tmp_path)) == (0, 1, 2)
+    assert queue.add(variants, str(tmp_path / "elsewhere")) == (0, 3, 0)
+    assert status(queue, "a")["output"] == os.path.join(str(tmp_path / "elsewhere"), "a.pdf")
@@ -0,0 +1,66 @@
+import io
+import json
+
+import pytest
+
+from architect_pdf.jsonstream import JsonStream
+
+DOC = {
+    "title": "블루프린트 \"quoted\" \\u00e9",
+    "numbers": [0, -1, 12345678901234567890, 3.25e-10, 1.5E+3, True, False, None],
+    "nested": {"empty": {}, "list": [], "deep": [[{"a": [1, {"b": "c"}]}]]},
+    "sections": [{"key": f"s{i}", "body": "x" * (i * 7)} for i in range(40)],
+}
+
+
+class Reads(io.StringIO):
+    """StringIO counting the characters handed out"""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def walk(stream):
+    ch = stream.peek()
+    if ch == "{":
+        return {key: walk(stream) for key in stream.items()}
+    if ch == "[":
+        return [walk(stream) for _ in stream.elements()]
+    return stream.value()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_walk_and_value_match_json_loads(chunk_size):
+    text = json.dumps(DOC, ensure_ascii=False, indent=1)
+    assert walk(JsonStream(io.StringIO(text), chunk_size)) == DOC
+    assert JsonStream(io.StringIO(text), chunk_size).value() == DOC
+
+
+def test_skip_and_iter_array():
+    stream = JsonStream(io.StringIO(json.dumps(DOC)), 5)
+    seen = {}
+    for key in stream.items():
+        if key == "numbers":
+            seen[key] = list(stream.iter_array())
+        else:
+            stream.skip()
+    assert seen == {"numbers": DOC["numbers"]}
+
+
+def test_a_long_value_is_read_in_growing_chunks():
+    text = json.dumps([{"i": i, "pad": "y" * 50} for i in range(20000)])
+    f = Reads(text)
+    assert JsonStream(f, chunk_size=1024).value()[-1]["i"] == 19999
+    # Doubling reads: about log2(len / chunk_size) of them, not len / chunk_size
+    assert f.reads < 15
+
+
+@pytest.mark.parametrize("text", ['{"a": 1,}', '{"a" 1}', "[1 2]", '{"a": [1, 2}', '{"a": "unterminated'])
+def test_malformed_input_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        walk(JsonStream(io.StringIO(text), 3))
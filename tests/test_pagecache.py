@@ -0,0 +1,26 @@
+import os
+
+from architect_pdf import pagecache
+
+
+def entries(cache_dir):
+    directory = os.path.join(cache_dir, "pages")
+    return {name: os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory) if name.endswith(".pdf")}
+
+
+def test_rebuild_reuses_unchanged_groups(tmp_path, fonts):
+    first = pagecache.build_incremental(str(tmp_path / "a.pdf"), lang="en", cache_dir=str(tmp_path))
+    again = pagecache.build_incremental(str(tmp_path / "b.pdf"), lang="en", cache_dir=str(tmp_path))
+    assert first["rendered"] == again["reused"] > 0
+    assert again["rendered"] == 0
+    assert first["pages"] == again["pages"]
+
+
+def test_page_groups_are_evicted_beyond_the_budget(tmp_path, fonts, monkeypatch):
+    pagecache.build_incremental(str(tmp_path / "a.pdf"), lang="en", cache_dir=str(tmp_path))
+    full = sum(entries(tmp_path).values())
+    monkeypatch.setattr(pagecache, "MAX_BYTES", full)
+    pagecache.build_incremental(str(tmp_path / "b.pdf"), lang="ko", cache_dir=str(tmp_path))
+    assert 0 < sum(entries(tmp_path).values()) <= full
+    # The most recent build's groups are the ones kept
+    assert pagecache.build_incremental(str(tmp_path / "c.pdf"), lang="ko", cache_dir=str(tmp_path))["reused"] > 0
@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import pytest
+
+from architect_pdf import service
+from architect_pdf.service import HTTPError, RenderService
+
+
+def read_head(data):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await service._read_head(reader)
+    return asyncio.run(run())
+
+
+def exchange(data, **kwargs):
+    """Send raw bytes to a service that was never started and return what it answers"""
+    async def run():
+        svc = RenderService(access_log=False, **kwargs)
+        server = await asyncio.start_server(svc.handle, "127.0.0.1", 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(data)
+            await writer.drain()
+            answer = await asyncio.wait_for(reader.read(), 10)
+            writer.close()
+            return answer
+    answer = asyncio.run(run())
+    head, _, body = answer.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), head.decode("latin-1"), body
+
+
+def test_parses_request_line_and_headers():
+    method, target, headers = read_head(b"POST /intro?lang=en HTTP/1.1\r\nHost: x\r\nContent-Length: 2\r\n\r\n{}")
+    assert (method, target) == ("POST", "/intro?lang=en")
+    assert headers == {"host": "x", "content-length": "2"}
+
+
+def test_end_of_stream_is_not_a_request():
+    assert read_head(b"") is None
+
+
+@pytest.mark.parametrize("data, status", [
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"POST /intro HTTP/1.1\r\nContent-Length: -1\r\n\r\n", 400),
+    (b"POST /intro HTTP/1.1\r\nContent-Length: 1e3\r\n\r\n", 400),
+    (b"GET /" + b"a" * 2**17 + b" HTTP/1.1\r\n\r\n", 431),
+    (b"GET / HTTP/1.1\r\n" + b"X-A: b\r\n" * (service.MAX_HEADERS + 1) + b"\r\n", 431),
+    (b"GET / HTTP/1.1\r\n" + b"X-Pad: " + b"a" * 40000 + b"\r\nX-Pad: " + b"a" * 40000 + b"\r\n\r\n", 431),
+], ids=["request-line", "negative-length", "non-digit-length", "long-line", "many-headers", "large-head"])
+def test_unparseable_heads_are_rejected(data, status):
+    with pytest.raises(HTTPError) as e:
+        read_head(data)
+    assert e.value.status == status
+
+
+def test_header_limit_is_answered_and_closes_the_connection():
+    status, head, body = exchange(b"GET /health HTTP/1.1\r\n" + b"X-A: b\r\n" * 1000 + b"\r\n")
+    assert status == 431
+    assert "Connection: close" in head
+    assert "exceed" in json.loads(body)["error"]
+
+
+def test_endless_headers_do_not_keep_the_connection(monkeypatch):
+    monkeypatch.setattr(service, "HEADER_TIMEOUT", 0.5)
+    # Never sends the blank line; the server gives up instead of waiting forever
+    async def run():
+        server = await asyncio.start_server(RenderService(access_log=False).handle, "127.0.0.1", 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(b"GET /health HTTP/1.1\r\nX-A: b\r\n")
+            answer = await asyncio.wait_for(reader.read(), 10)
+            writer.close()
+            return answer
+    assert asyncio.run(run()) == b""
+
+
+@pytest.mark.parametrize("request_, status", [
+    (b"GET /nowhere HTTP/1.1\r\nConnection: close\r\n\r\n", 404),
+    (b"GET /intro HTTP/1.1\r\nConnection: close\r\n\r\n", 405),
+    (b"POST /intro?lang=xx HTTP/1.1\r\nConnection: close\r\n\r\n", 400),
+    (b"POST /blueprint/client HTTP/1.1\r\nConnection: close\r\n\r\n", 400),
+    (b"POST /intro HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", 411),
+    (b"POST /intro HTTP/1.1\r\nContent-Length: 101\r\n\r\n", 413),
+], ids=["unknown-route", "wrong-method", "bad-lang", "missing-blueprint", "chunked", "body-too-large"])
+def test_requests_refused_before_rendering(request_, status):
+    assert exchange(request_, max_body=100)[0] == status
+
+
+def test_health_answers_without_workers():
+    status, _, body = exchange(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n", workers=2)
+    assert status == 200
+    assert json.loads(body)["workers"] == 2
+
+
+@pytest.mark.parametrize("theme", ["../themes/dark.json", "/etc/passwd", {"primary": "#000000"}])
+def test_theme_must_be_a_profile_name(theme):
+    with pytest.raises(ValueError, match="profile name"):
+        service.render_job("intro", "ko", json.dumps({"theme": theme}).encode())
@@ -0,0 +1,34 @@
+import generate_intro_pdf as intro
+from architect_pdf.styles import StyleRegistry
+
+
+def test_equal_parameters_share_one_style():
+    registry = StyleRegistry()
+    a = registry.style("A", fontSize=10, leading=14)
+    assert registry.style("B", leading=14, fontSize=10) is a
+    assert registry.style("A", fontSize=11, leading=14) is not a
+    assert len(registry) == 2
+
+
+def test_names_map_to_the_latest_style():
+    registry = StyleRegistry()
+    first = registry.style("Body", fontSize=10)
+    second = registry.style("Body", fontSize=12)
+    assert registry["Body"] is second is not first
+    assert "Body" in registry and registry.names() == ["Body"]
+    registry.clear()
+    assert len(registry) == 0 and "Body" not in registry
+
+
+def test_use_theme_rebuilds_named_styles(fonts):
+    try:
+        default = intro.STYLES["H2"]
+        for i in range(5):
+            intro.use_theme({"name": f"t{i}", "colors": {"BLUE": f"#00000{i}"}})
+            assert intro.STYLES["H2"] is intro.style_h2
+            assert intro.STYLES["H2"].textColor.hexval() == f"0x00000{i}"
+            # Only the current look's styles are kept
+            assert len(intro.STYLES) <= len(intro._styles())
+    finally:
+        intro.use_theme()
+    assert intro.STYLES["H2"].textColor == default.textColor